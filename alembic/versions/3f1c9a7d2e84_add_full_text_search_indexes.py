@@ -0,0 +1,53 @@
+"""add full text search indexes for passages and messages
+
+Revision ID: 3f1c9a7d2e84
+Revises: 1c28e167b74f
+Create Date: 2026-10-17 09:12:41.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from letta.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2e84"
+down_revision: Union[str, None] = "1c28e167b74f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    connection = op.get_bind()
+    connection.commit()
+    autocommit_connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+    # expressions must match letta.helpers.hybrid_search.fts_document exactly for the planner to use them
+    autocommit_connection.exec_driver_sql(
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_archival_passages_text_fts
+        ON archival_passages USING gin (to_tsvector('english'::regconfig, text))
+        """
+    )
+    autocommit_connection.exec_driver_sql(
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_content_fts
+        ON messages USING gin (to_tsvector('english'::regconfig, (content)::jsonb))
+        """
+    )
+
+
+def downgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    connection = op.get_bind()
+    connection.commit()
+    autocommit_connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+    autocommit_connection.exec_driver_sql("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_content_fts")
+    autocommit_connection.exec_driver_sql("DROP INDEX CONCURRENTLY IF EXISTS ix_archival_passages_text_fts")
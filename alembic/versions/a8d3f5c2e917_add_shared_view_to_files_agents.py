@@ -0,0 +1,27 @@
+"""add shared_view to files_agents
+
+Revision ID: a8d3f5c2e917
+Revises: 7c4e2b9d1a63
+Create Date: 2026-10-17 14:05:41.217306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f5c2e917"
+down_revision: Union[str, None] = "7c4e2b9d1a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("files_agents", sa.Column("shared_view", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("files_agents", "shared_view")
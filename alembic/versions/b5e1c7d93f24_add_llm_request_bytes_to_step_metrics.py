@@ -0,0 +1,27 @@
+"""add llm_request_bytes to step_metrics
+
+Revision ID: b5e1c7d93f24
+Revises: a8d3f5c2e917
+Create Date: 2026-10-17 16:22:08.514390
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e1c7d93f24"
+down_revision: Union[str, None] = "a8d3f5c2e917"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("step_metrics", sa.Column("llm_request_bytes", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("step_metrics", "llm_request_bytes")
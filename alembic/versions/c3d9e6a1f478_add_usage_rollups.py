@@ -0,0 +1,137 @@
+"""add run, agent and organization usage rollups
+
+Revision ID: c3d9e6a1f478
+Revises: b5e1c7d93f24
+Create Date: 2026-10-17 18:41:52.306117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from letta.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d9e6a1f478"
+down_revision: Union[str, None] = "b5e1c7d93f24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = ("prompt_tokens", "completion_tokens", "total_tokens", "cached_input_tokens", "cache_write_tokens", "reasoning_tokens")
+
+# per-step usage as the rollups count it; older steps only carry the cache and reasoning counts in the details JSON
+STEP_USAGE = """
+    SELECT
+        id, organization_id, agent_id, run_id,
+        COALESCE(created_at, now()) AS created_at,
+        COALESCE(prompt_tokens, 0) AS prompt_tokens,
+        COALESCE(completion_tokens, 0) AS completion_tokens,
+        COALESCE(total_tokens, 0) AS total_tokens,
+        COALESCE(
+            cached_input_tokens,
+            NULLIF((prompt_tokens_details->>'cached_tokens')::bigint, 0),
+            (prompt_tokens_details->>'cache_read_tokens')::bigint,
+            0
+        ) AS cached_input_tokens,
+        COALESCE(cache_write_tokens, (prompt_tokens_details->>'cache_creation_tokens')::bigint, 0) AS cache_write_tokens,
+        COALESCE(reasoning_tokens, (completion_tokens_details->>'reasoning_tokens')::bigint, 0) AS reasoning_tokens
+    FROM steps
+    WHERE organization_id IS NOT NULL
+"""
+
+
+def _counter_columns() -> list:
+    return [
+        sa.Column("step_count", sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.BigInteger(), nullable=False) for name in COUNTER_COLUMNS],
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    ]
+
+
+def _sums() -> str:
+    return ", ".join(["count(*)", *[f"sum({name})" for name in COUNTER_COLUMNS]])
+
+
+def upgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    op.create_table(
+        "run_usage_rollups",
+        sa.Column("run_id", sa.String(), nullable=False),
+        sa.Column("organization_id", sa.String(), nullable=False),
+        sa.Column("agent_id", sa.String(), nullable=True),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+    op.create_table(
+        "agent_usage_rollups",
+        sa.Column("agent_id", sa.String(), nullable=False),
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("organization_id", sa.String(), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("agent_id", "granularity", "bucket_start"),
+    )
+    op.create_index("ix_agent_usage_rollups_org_bucket", "agent_usage_rollups", ["organization_id", "granularity", "bucket_start"])
+    op.create_table(
+        "organization_usage_rollups",
+        sa.Column("organization_id", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("organization_id", "bucket_start"),
+    )
+
+    # backfill from the existing steps, bucketed by UTC hour/day of their creation time
+    counters = ", ".join(["step_count", *COUNTER_COLUMNS])
+    op.execute(
+        f"""
+        INSERT INTO run_usage_rollups (run_id, organization_id, agent_id, {counters})
+        SELECT run_id, min(organization_id), min(agent_id), {_sums()}
+        FROM ({STEP_USAGE}) AS step_usage
+        WHERE run_id IS NOT NULL
+        GROUP BY run_id
+        """
+    )
+    for granularity in ("hour", "day"):
+        op.execute(
+            f"""
+            INSERT INTO agent_usage_rollups (agent_id, granularity, bucket_start, organization_id, {counters})
+            SELECT agent_id, '{granularity}', bucket_start, min(organization_id), {_sums()}
+            FROM (
+                SELECT *, date_trunc('{granularity}', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket_start
+                FROM ({STEP_USAGE}) AS step_usage
+                WHERE agent_id IS NOT NULL
+            ) AS bucketed
+            GROUP BY agent_id, bucket_start
+            """
+        )
+    op.execute(
+        f"""
+        INSERT INTO organization_usage_rollups (organization_id, bucket_start, {counters})
+        SELECT organization_id, bucket_start, {_sums()}
+        FROM (
+            SELECT *, date_trunc('day', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket_start
+            FROM ({STEP_USAGE}) AS step_usage
+        ) AS bucketed
+        GROUP BY organization_id, bucket_start
+        """
+    )
+
+
+def downgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    op.drop_table("organization_usage_rollups")
+    op.drop_index("ix_agent_usage_rollups_org_bucket", table_name="agent_usage_rollups")
+    op.drop_table("agent_usage_rollups")
+    op.drop_table("run_usage_rollups")
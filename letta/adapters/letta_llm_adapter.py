@@ -58,6 +58,8 @@ class LettaLLMAdapter(ABC):
         self.usage: LettaUsageStatistics = LettaUsageStatistics()
         self.telemetry_manager: TelemetryManager = TelemetryManager()
         self.llm_request_finish_timestamp_ns: int | None = None
+        # Size of the request body sent to the provider, where the adapter measures it
+        self.request_bytes: int | None = None
         self._finish_reason: str | None = None
 
     @abstractmethod
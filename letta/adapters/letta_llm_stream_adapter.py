@@ -9,6 +9,7 @@ from letta.helpers.datetime_helpers import get_utc_timestamp_ns
 from letta.interfaces.anthropic_streaming_interface import AnthropicStreamingInterface
 from letta.interfaces.openai_streaming_interface import OpenAIStreamingInterface
 from letta.llm_api.llm_client_base import LLMClientBase
+from letta.llm_api.openai_responses_chain import ResponsesChain
 from letta.llm_api.openai_ws_session import OpenAIWSSessionManager
 from letta.otel.tracing import log_attributes, safe_json_dumps, trace_method
 from letta.schemas.enums import LLMCallType, ProviderType
@@ -42,6 +43,7 @@ class LettaLLMStreamAdapter(LettaLLMAdapter):
         user_id: str | None = None,
         billing_context: "BillingContext | None" = None,
         use_openai_responses_websocket: bool = False,
+        use_openai_responses_chaining: bool | None = None,
     ) -> None:
         super().__init__(
             llm_client,
@@ -57,6 +59,10 @@ class LettaLLMStreamAdapter(LettaLLMAdapter):
         self.interface: OpenAIStreamingInterface | AnthropicStreamingInterface | None = None
         self.use_openai_responses_websocket: bool = use_openai_responses_websocket
         self._ws_session: OpenAIWSSessionManager | None = None  # lazy, created on first WS call
+        if use_openai_responses_chaining is None:
+            use_openai_responses_chaining = settings.openai_responses_stateful
+        # chains the run's OpenAI Responses requests so each step sends only its new input items
+        self._responses_chain: ResponsesChain | None = ResponsesChain() if use_openai_responses_chaining else None
 
     async def _get_or_create_ws_session(self) -> OpenAIWSSessionManager:
         """Lazily create and return the WebSocket session for reuse across steps."""
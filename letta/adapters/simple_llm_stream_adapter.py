@@ -10,6 +10,7 @@ from letta.helpers.datetime_helpers import get_utc_timestamp_ns
 from letta.interfaces.anthropic_parallel_tool_call_streaming_interface import SimpleAnthropicStreamingInterface
 from letta.interfaces.gemini_streaming_interface import SimpleGeminiStreamingInterface
 from letta.interfaces.openai_streaming_interface import SimpleOpenAIResponsesStreamingInterface, SimpleOpenAIStreamingInterface
+from letta.llm_api.local_llm_client import LOCAL_LLM_ENDPOINT_TYPES
 from letta.llm_api.openai_client import OpenAIClient
 from letta.otel.tracing import log_attributes, safe_json_dumps, trace_method
 from letta.schemas.enums import ProviderType
@@ -70,6 +71,8 @@ class SimpleLLMStreamAdapter(LettaLLMStreamAdapter):
         """
         # Store request data
         self.request_data = request_data
+        self.request_bytes = None
+        responses_chain = None
 
         # Track request start time for latency calculation
         request_start_ns = get_utc_timestamp_ns()
@@ -95,6 +98,8 @@ class SimpleLLMStreamAdapter(LettaLLMStreamAdapter):
             ProviderType.baseten,
             ProviderType.fireworks,
             ProviderType.chatgpt_oauth,
+            # prompt-formatter backends, streamed as chat completion chunks by LocalLLMClient
+            *LOCAL_LLM_ENDPOINT_TYPES,
         ]:
             # Decide interface based on payload shape
             use_responses = "input" in request_data and "messages" not in request_data
@@ -107,6 +112,8 @@ class SimpleLLMStreamAdapter(LettaLLMStreamAdapter):
                 is_proxy = False
 
             if use_responses and not is_proxy:
+                if isinstance(self.llm_client, OpenAIClient):
+                    responses_chain = self._responses_chain
                 self.interface = SimpleOpenAIResponsesStreamingInterface(
                     is_openai_proxy=False,
                     messages=messages,
@@ -151,7 +158,10 @@ class SimpleLLMStreamAdapter(LettaLLMStreamAdapter):
                     self.llm_config,
                     use_websocket=True,
                     ws_session=ws_session,
+                    responses_chain=responses_chain,
                 )
+            elif responses_chain is not None:
+                stream = await self.llm_client.stream_async(request_data, self.llm_config, responses_chain=responses_chain)
             else:
                 stream = await self.llm_client.stream_async(request_data, self.llm_config)
         except Exception as e:
@@ -178,6 +188,8 @@ class SimpleLLMStreamAdapter(LettaLLMStreamAdapter):
                     # Yield each chunk immediately as it arrives
                     yield chunk
             except BaseException as e:
+                if responses_chain is not None:
+                    responses_chain.reset()
                 self.llm_request_finish_timestamp_ns = get_utc_timestamp_ns()
                 latency_ms = int((self.llm_request_finish_timestamp_ns - request_start_ns) / 1_000_000)
                 await self.llm_client.log_provider_trace_async(
@@ -196,10 +208,16 @@ class SimpleLLMStreamAdapter(LettaLLMStreamAdapter):
             else:
                 # After streaming completes, extract the accumulated data
                 self.llm_request_finish_timestamp_ns = get_utc_timestamp_ns()
+                if responses_chain is not None:
+                    final_response = getattr(self.interface, "final_response", None)
+                    responses_chain.record(final_response.id if final_response is not None else None)
         finally:
             if not stream_started:
                 return
 
+            if responses_chain is not None:
+                self.request_bytes = responses_chain.last_request_bytes
+
             if self.llm_request_finish_timestamp_ns is None:
                 self.llm_request_finish_timestamp_ns = get_utc_timestamp_ns()
 
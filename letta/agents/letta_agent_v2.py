@@ -60,12 +60,14 @@ from letta.services.archive_manager import ArchiveManager
 from letta.services.block_manager import BlockManager
 from letta.services.credit_verification_service import CreditVerificationService
 from letta.services.helpers.tool_parser_helper import runtime_override_tool_json_schema
+from letta.services.memory_write_buffer import MemoryWriteBuffer
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
 from letta.services.run_manager import RunManager
 from letta.services.step_manager import StepManager
 from letta.services.summarizer.enums import SummarizationMode
 from letta.services.summarizer.summarizer import Summarizer
+from letta.services.system_prompt_rebuild_scheduler import get_system_prompt_rebuild_scheduler
 from letta.services.telemetry_manager import TelemetryManager
 from letta.services.tool_executor.tool_execution_manager import ToolExecutionManager
 from letta.settings import settings, summarizer_settings
@@ -575,6 +577,7 @@ class LettaAgentV2(BaseAgentV2):
                 step_progression, step_metrics = self._step_checkpoint_llm_request_finish(
                     step_metrics, agent_step_span, llm_adapter.llm_request_finish_timestamp_ns
                 )
+                step_metrics.llm_request_bytes = llm_adapter.request_bytes
 
                 self._update_global_usage_stats(llm_adapter.usage)
 
@@ -734,6 +737,7 @@ class LettaAgentV2(BaseAgentV2):
         self.last_function_response = None
         self.response_messages = []
         self.override_system: str | None = None
+        self.memory_write_buffer: MemoryWriteBuffer | None = None
 
     async def _check_credits(self) -> bool:
         """Check if the organization still has credits. Returns True if OK or not configured."""
@@ -774,6 +778,15 @@ class LettaAgentV2(BaseAgentV2):
         Returns:
             Refreshed in-context messages.
         """
+        # A shared block changed and this agent's rebuild was deferred (see SystemPromptRebuildScheduler): do it now
+        claimed_deferred_rebuild = False
+        if not force_system_prompt_refresh and self.conversation_id is None:
+            try:
+                scheduler = await get_system_prompt_rebuild_scheduler()
+                claimed_deferred_rebuild = force_system_prompt_refresh = await scheduler.claim(self.agent_state.id)
+            except Exception as e:
+                self.logger.warning(f"Failed to check for a deferred system prompt rebuild: {e}")
+
         # Only rebuild when explicitly forced (e.g., after compaction).
         # Normal turns should not trigger system prompt recompilation.
         if force_system_prompt_refresh:
@@ -785,6 +798,9 @@ class LettaAgentV2(BaseAgentV2):
                     force=True,
                 )
             except Exception:
+                if claimed_deferred_rebuild:
+                    # hand it back to the background drain
+                    await scheduler.mark_dirty([self.agent_state.id], self.actor)
                 raise
 
         # Always scrub inner thoughts regardless of system prompt refresh
@@ -1324,6 +1340,7 @@ class LettaAgentV2(BaseAgentV2):
             passage_manager=self.passage_manager,
             sandbox_env_vars=sandbox_env_vars,
             actor=self.actor,
+            memory_write_buffer=self.memory_write_buffer,
         )
         # TODO: Integrate sandbox result
         log_event(name=f"start_{tool_name}_execution", attributes=tool_args)
@@ -1421,6 +1438,7 @@ class LettaAgentV2(BaseAgentV2):
                 actor=self.actor,
                 step_id=step_id,
                 llm_request_ns=step_metrics.llm_request_ns,
+                llm_request_bytes=step_metrics.llm_request_bytes,
                 tool_execution_ns=step_metrics.tool_execution_ns,
                 step_ns=step_metrics.step_ns,
                 agent_id=self.agent_state.id,
@@ -31,11 +31,13 @@ from letta.errors import (
     SystemPromptTokenExceededError,
 )
 from letta.helpers import ToolRulesSolver
-from letta.helpers.datetime_helpers import get_utc_time, get_utc_timestamp_ns
+from letta.helpers.datetime_helpers import get_utc_time, get_utc_timestamp_ns, ns_to_ms
 from letta.helpers.tool_execution_helper import enable_strict_mode
 from letta.llm_api.llm_client import LLMClient
 from letta.local_llm.constants import INNER_THOUGHTS_KWARG
-from letta.otel.tracing import trace_method
+from letta.otel.context import get_ctx_attributes
+from letta.otel.metric_registry import MetricRegistry
+from letta.otel.tracing import log_event, trace_method
 from letta.schemas.agent import AgentState
 from letta.schemas.enums import LLMCallType
 from letta.schemas.letta_message import (
@@ -68,6 +70,7 @@ from letta.server.rest_api.utils import (
 from letta.services.conversation_manager import ConversationManager
 from letta.services.helpers.tool_parser_helper import runtime_override_tool_json_schema
 from letta.services.llm_router import get_llm_routing_client
+from letta.services.memory_write_buffer import open_memory_write_buffer
 from letta.services.provider_manager import AUTO_MODE_HANDLES
 from letta.services.summarizer.compact import compact_messages
 from letta.services.summarizer.summarizer_config import CompactionSettings
@@ -776,45 +779,39 @@ class LettaAgentV3(LettaAgentV2):
             message.run_id = run_id
             message.conversation_id = self.conversation_id
 
+        # write the step's memory edits (and the one system prompt rebuild they need) before its messages
+        if self.memory_write_buffer is not None:
+            await self.memory_write_buffer.flush()
+
         # persist the new message objects - ONLY place where messages are persisted
-        await self.message_manager.create_many_messages_async(
-            new_messages,
+        # messages, conversation membership/positions (or agent.message_ids) are written in one transaction
+        in_context_message_ids = [m.id for m in in_context_messages]
+        checkpoint_start_ns = get_utc_timestamp_ns()
+        await self.message_manager.checkpoint_step_messages_async(
+            new_messages=new_messages,
+            in_context_message_ids=in_context_message_ids,
+            agent_id=self.agent_state.id,
             actor=self.actor,
-            run_id=run_id,
+            conversation_id=self.conversation_id,
             project_id=self.agent_state.project_id,
             template_id=self.agent_state.template_id,
         )
+        self._record_checkpoint_metrics(get_utc_timestamp_ns() - checkpoint_start_ns, new_messages)
 
-        if self.conversation_id:
-            # Conversation mode: update conversation_messages table
-            # Add new messages to conversation tracking
-            new_message_ids = [m.id for m in new_messages]
-            if new_message_ids:
-                await ConversationManager().add_messages_to_conversation(
-                    conversation_id=self.conversation_id,
-                    agent_id=self.agent_state.id,
-                    message_ids=new_message_ids,
-                    actor=self.actor,
-                )
-
-            # Update which messages are in context
-            # Note: update_in_context_messages also updates positions to preserve order
-            await ConversationManager().update_in_context_messages(
-                conversation_id=self.conversation_id,
-                in_context_message_ids=[m.id for m in in_context_messages],
-                actor=self.actor,
-            )
-        else:
-            # Default mode: update agent.message_ids
-            await self.agent_manager.update_message_ids_async(
-                agent_id=self.agent_state.id,
-                message_ids=[m.id for m in in_context_messages],
-                actor=self.actor,
-            )
-            self.agent_state.message_ids = [m.id for m in in_context_messages]  # update in-memory state
-
+        if not self.conversation_id:
+            self.agent_state.message_ids = in_context_message_ids  # update in-memory state
         self.in_context_messages = in_context_messages  # update in-memory state
 
+    def _record_checkpoint_metrics(self, checkpoint_ns: int, new_messages: list[Message]) -> None:
+        # The split checkpoint opened a transaction for the run_id check, the message insert, and one
+        # (agent.message_ids) or two (conversation membership, then in-context/positions) context updates
+        mode = "conversation" if self.conversation_id else "agent"
+        transactions_saved = (1 if any(m.run_id for m in new_messages) else 0) + (2 if self.conversation_id and new_messages else 1)
+        attributes = {**get_ctx_attributes(), "mode": mode}
+        MetricRegistry().step_checkpoint_time_ms_histogram.record(ns_to_ms(checkpoint_ns), attributes)
+        MetricRegistry().step_checkpoint_transactions_saved_counter.add(transactions_saved, attributes)
+        log_event(name="step_checkpoint_ms", attributes={"duration_ms": ns_to_ms(checkpoint_ns), "transactions_saved": transactions_saved})
+
     def _create_compaction_event_message(
         self,
         step_id: str | None,
@@ -939,6 +936,8 @@ class LettaAgentV3(LettaAgentV2):
 
         step_progression = StepProgression.START
         caught_exception = None
+        # memory tool edits made during this step are written once, at its checkpoint (not for sleeptime agents)
+        self.memory_write_buffer = open_memory_write_buffer(self.agent_manager, self.actor, self.agent_state)
         # TODO(@caren): clean this up
         tool_calls, content, agent_step_span, _first_chunk, step_id, logged_step, _step_start_ns, step_metrics = (
             None,
@@ -1301,6 +1300,7 @@ class LettaAgentV3(LettaAgentV2):
                 step_progression, step_metrics = self._step_checkpoint_llm_request_finish(
                     step_metrics, agent_step_span, llm_adapter.llm_request_finish_timestamp_ns
                 )
+                step_metrics.llm_request_bytes = llm_adapter.request_bytes
                 # update metrics
                 self._update_global_usage_stats(llm_adapter.usage)
                 self.context_token_estimate = llm_adapter.usage.total_tokens
@@ -1539,6 +1539,12 @@ class LettaAgentV3(LettaAgentV2):
                 self.logger.warning("Error occurred during step processing, with unexpected stop reason: %s", self.stop_reason.stop_reason)
             raise e
         finally:
+            if self.memory_write_buffer is not None and self.memory_write_buffer.pending:
+                # a step that fails before its checkpoint keeps its memory edits, as when each edit was written immediately
+                try:
+                    await self.memory_write_buffer.flush()
+                except Exception as e:
+                    self.logger.error(f"Failed to write memory edits of step {step_id}: {e}")
             # always make sure we update the step/run metadata
             self.logger.debug("Running cleanup for agent loop run: %s", run_id)
             self.logger.info("Running final update. Step Progression: %s", step_progression)
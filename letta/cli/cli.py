@@ -42,6 +42,19 @@ def server(
         raise NotImplementedError("WS suppport deprecated")
 
 
+def sleeptime_worker():
+    """Run queued sleeptime agent runs (pair with LETTA_SLEEPTIME_EXECUTOR_EXTERNAL=true on the servers)"""
+    import asyncio
+
+    from letta.services.sleeptime_executor import run_sleeptime_worker
+
+    try:
+        asyncio.run(run_sleeptime_worker())
+    except KeyboardInterrupt:
+        typer.secho("Terminating the sleeptime worker...")
+        sys.exit(0)
+
+
 def version() -> str:
     import letta
 
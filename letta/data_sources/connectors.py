@@ -7,6 +7,7 @@ import typer
 
 from letta.constants import EMBEDDING_BATCH_SIZE
 from letta.data_sources.connectors_helper import assert_all_files_exist_locally, extract_metadata_from_files, get_filenames_in_dir
+from letta.helpers.embedding_cache import request_embeddings_cached
 from letta.schemas.file import FileMetadata
 from letta.schemas.passage import Passage
 from letta.schemas.source import Source
@@ -79,7 +80,7 @@ async def load_data(connector: DataConnector, source: Source, passage_manager: P
 
             if len(texts) >= EMBEDDING_BATCH_SIZE:
                 # Process the batch
-                embeddings = await client.request_embeddings(texts, embedding_config)
+                embeddings = await request_embeddings_cached(client, texts, embedding_config)
                 passages = []
 
                 for text, embedding, passage_metadata in zip(texts, embeddings, metadatas):
@@ -114,7 +115,7 @@ async def load_data(connector: DataConnector, source: Source, passage_manager: P
 
         # Process final remaining texts for this file
         if len(texts) > 0:
-            embeddings = await client.request_embeddings(texts, embedding_config)
+            embeddings = await request_embeddings_cached(client, texts, embedding_config)
             passages = []
 
             for text, embedding, passage_metadata in zip(texts, embeddings, metadatas):
@@ -21,12 +21,14 @@ from letta.settings import settings
 try:
     from redis import RedisError
     from redis.asyncio import ConnectionPool, Redis
+    from redis.asyncio.client import PubSub
     from redis.asyncio.lock import Lock
 except ImportError:
     RedisError = None
     Redis = None
     ConnectionPool = None
     Lock = None
+    PubSub = None
 
 logger = get_logger(__name__)
 
@@ -191,6 +193,26 @@ class AsyncRedisClient:
         client = await self.get_client()
         return await client.delete(*keys)
 
+    @with_retry()
+    async def mget(self, *keys: str) -> List[Optional[str]]:
+        """Get values for several keys in one round trip (missing keys are None)."""
+        if not keys:
+            return []
+        client = await self.get_client()
+        return await client.mget(*keys)
+
+    @with_retry()
+    async def mset(self, mapping: Dict[str, Union[str, int, float]], ex: Optional[int] = None) -> bool:
+        """Set several keys in one pipelined round trip, optionally with a shared expiry in seconds."""
+        if not mapping:
+            return True
+        client = await self.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex)
+            results = await pipe.execute()
+        return all(results)
+
     async def acquire_conversation_lock(
         self,
         conversation_id: str,
@@ -413,6 +435,59 @@ class AsyncRedisClient:
         client = await self.get_client()
         return await client.decr(key)
 
+    @with_retry()
+    async def incr_many(self, *keys: str, ex: Optional[int] = None) -> List[int]:
+        """Increment several counters in one pipelined round trip, optionally refreshing their expiry in seconds."""
+        if not keys:
+            return []
+        client = await self.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+                if ex is not None:
+                    pipe.expire(key, ex)
+            results = await pipe.execute()
+        return results[:: 2 if ex is not None else 1]
+
+    # Hash operations
+    @with_retry()
+    async def hset_many(self, key: str, mapping: Dict[str, str]) -> int:
+        """Set several hash fields in one round trip, returning the number of fields that were added."""
+        if not mapping:
+            return 0
+        client = await self.get_client()
+        return await client.hset(key, mapping=mapping)
+
+    @with_retry()
+    async def hdel(self, key: str, *fields: str) -> int:
+        """Delete hash fields, returning how many existed."""
+        if not fields:
+            return 0
+        client = await self.get_client()
+        return await client.hdel(key, *fields)
+
+    @with_retry()
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        client = await self.get_client()
+        return await client.hgetall(key)
+
+    @with_retry()
+    async def hlen(self, key: str) -> int:
+        client = await self.get_client()
+        return await client.hlen(key)
+
+    # Pub/sub operations
+    @with_retry()
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message to a channel, returning the number of subscribers that received it."""
+        client = await self.get_client()
+        return await client.publish(channel, message)
+
+    async def pubsub(self) -> "PubSub":
+        """Create a pub/sub handle on its own connection (the caller subscribes and closes it)."""
+        client = await self.get_client()
+        return client.pubsub(ignore_subscribe_messages=True)
+
     # Stream operations
     @with_retry()
     async def xadd(self, stream: str, fields: Dict[str, Any], id: str = "*", maxlen: Optional[int] = None, approximate: bool = True) -> str:
@@ -590,6 +665,15 @@ class NoopAsyncRedisClient(AsyncRedisClient):
     async def delete(self, *keys: str) -> int:
         return 0
 
+    async def mget(self, *keys: str) -> List[Optional[str]]:
+        return [None] * len(keys)
+
+    async def mset(self, mapping: Dict[str, Union[str, int, float]], ex: Optional[int] = None) -> bool:
+        return False
+
+    async def incr_many(self, *keys: str, ex: Optional[int] = None) -> List[int]:
+        return [0] * len(keys)
+
     async def acquire_conversation_lock(
         self,
         conversation_id: str,
@@ -635,6 +719,21 @@ class NoopAsyncRedisClient(AsyncRedisClient):
         return 0
 
     # Stream operations
+    async def publish(self, channel: str, message: str) -> int:
+        return 0
+
+    async def hset_many(self, key: str, mapping: Dict[str, str]) -> int:
+        return 0
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        return 0
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return {}
+
+    async def hlen(self, key: str) -> int:
+        return 0
+
     async def xadd(self, stream: str, fields: Dict[str, Any], id: str = "*", maxlen: Optional[int] = None, approximate: bool = True) -> str:
         return ""
 
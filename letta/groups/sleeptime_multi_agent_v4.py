@@ -15,10 +15,13 @@ from letta.schemas.letta_response import LettaResponse
 from letta.schemas.letta_stop_reason import StopReasonType
 from letta.schemas.message import Message, MessageCreate
 from letta.schemas.provider_trace import BillingContext
-from letta.schemas.run import Run, RunUpdate
+from letta.schemas.run import RunUpdate
 from letta.schemas.user import User
+from letta.services.agent_manager import AgentManager
 from letta.services.group_manager import GroupManager
-from letta.utils import safe_create_task
+from letta.services.message_manager import MessageManager
+from letta.services.run_manager import RunManager
+from letta.services.sleeptime_executor import SleeptimeJob, get_sleeptime_executor
 
 
 class SleeptimeMultiAgentV4(LettaAgentV3):
@@ -175,115 +178,98 @@ class SleeptimeMultiAgentV4(LettaAgentV3):
         last_processed_message_id: str,
         billing_context: BillingContext | None,
     ) -> str:
-        run = Run(
-            agent_id=sleeptime_agent_id,
-            status=RunStatus.created,
-            metadata={
-                "run_type": "sleeptime_agent_send_message_async",  # is this right?
-                "agent_id": sleeptime_agent_id,
-            },
-        )
-        run = await self.run_manager.create_run(pydantic_run=run, actor=self.actor)
-
-        safe_create_task(
-            self._participant_agent_step(
-                foreground_agent_id=self.agent_state.id,
-                sleeptime_agent_id=sleeptime_agent_id,
-                response_messages=response_messages,
-                last_processed_message_id=last_processed_message_id,
-                run_id=run.id,
-                billing_context=billing_context,
-            ),
-            label=f"participant_agent_step_{sleeptime_agent_id}",
+        job = SleeptimeJob(
+            group_id=self.group.id,
+            foreground_agent_id=self.agent_state.id,
+            actor_id=self.actor.id,
+            last_processed_message_id=last_processed_message_id,
+            response_message_ids=[message.id for message in response_messages],
+            billing_context=billing_context.model_dump(mode="json") if billing_context else None,
         )
-        return run.id
+        return await get_sleeptime_executor().enqueue(job, sleeptime_agent_id=sleeptime_agent_id, actor=self.actor)
 
-    @trace_method
-    async def _participant_agent_step(
-        self,
-        foreground_agent_id: str,
-        sleeptime_agent_id: str,
-        response_messages: list[Message],
-        last_processed_message_id: str,
-        run_id: str,
-        billing_context: BillingContext | None,
-    ) -> LettaResponse:
-        try:
-            # Update run status
-            run_update = RunUpdate(status=RunStatus.running)
-            await self.run_manager.update_run_by_id_async(run_id=run_id, update=run_update, actor=self.actor)
 
-            # Create conversation transcript
-            prior_messages = []
-            if self.group.sleeptime_agent_frequency:
-                try:
-                    prior_messages = await self.message_manager.list_messages(
-                        agent_id=foreground_agent_id,
-                        actor=self.actor,
-                        after=last_processed_message_id,
-                        before=response_messages[0].id,
-                    )
-                except Exception:
-                    pass  # continue with just latest messages
+@trace_method
+async def run_sleeptime_job(run_id: str, sleeptime_agent_id: str, job: SleeptimeJob, actor: User) -> LettaResponse:
+    """Step a sleeptime agent over the transcript of a claimed run (called by ``SleeptimeExecutor``)."""
+    agent_manager = AgentManager()
+    message_manager = MessageManager()
+    run_manager = RunManager()
+    try:
+        group = await GroupManager().retrieve_group_async(group_id=job.group_id, actor=actor)
+        response_messages = await message_manager.get_messages_by_ids_async(message_ids=job.response_message_ids, actor=actor)
 
-            message_strings = [stringify_message(message) for message in prior_messages + response_messages]
-            message_strings = [s for s in message_strings if s is not None]
-            messages_text = "\n".join(message_strings)
+        # Create conversation transcript, covering every turn folded into this run
+        prior_messages = []
+        if (group.sleeptime_agent_frequency or job.coalesced_turns > 1) and response_messages:
+            try:
+                prior_messages = await message_manager.list_messages(
+                    agent_id=job.foreground_agent_id,
+                    actor=actor,
+                    after=job.last_processed_message_id,
+                    before=response_messages[0].id,
+                )
+            except Exception:
+                pass  # continue with just latest messages
 
-            message_text = (
-                "<system-reminder>\n"
-                "You are a sleeptime agent - a background agent that asynchronously processes conversations after they occur.\n\n"
-                "IMPORTANT: You are NOT the primary agent. You are reviewing a conversation that already happened between a primary agent and its user:\n"
-                '- Messages labeled "assistant" are from the primary agent (not you)\n'
-                '- Messages labeled "user" are from the primary agent\'s user\n\n'
-                "Your primary role is memory management. Review the conversation and use your memory tools to update any relevant memory blocks with information worth preserving. "
-                "Check your memory_persona block for any additional instructions or policies.\n"
-                "</system-reminder>\n\n"
-                f"Messages:\n{messages_text}"
-            )
+        message_strings = [stringify_message(message) for message in prior_messages + response_messages]
+        message_strings = [s for s in message_strings if s is not None]
+        messages_text = "\n".join(message_strings)
 
-            sleeptime_agent_messages = [
-                MessageCreate(
-                    role="user",
-                    content=[TextContent(text=message_text)],
-                    id=Message.generate_id(),
-                    agent_id=sleeptime_agent_id,
-                    group_id=self.group.id,
-                )
-            ]
+        message_text = (
+            "<system-reminder>\n"
+            "You are a sleeptime agent - a background agent that asynchronously processes conversations after they occur.\n\n"
+            "IMPORTANT: You are NOT the primary agent. You are reviewing a conversation that already happened between a primary agent and its user:\n"
+            '- Messages labeled "assistant" are from the primary agent (not you)\n'
+            '- Messages labeled "user" are from the primary agent\'s user\n\n'
+            "Your primary role is memory management. Review the conversation and use your memory tools to update any relevant memory blocks with information worth preserving. "
+            "Check your memory_persona block for any additional instructions or policies.\n"
+            "</system-reminder>\n\n"
+            f"Messages:\n{messages_text}"
+        )
 
-            # Load sleeptime agent
-            sleeptime_agent_state = await self.agent_manager.get_agent_by_id_async(agent_id=sleeptime_agent_id, actor=self.actor)
-            sleeptime_agent = LettaAgentV3(
-                agent_state=sleeptime_agent_state,
-                actor=self.actor,
+        sleeptime_agent_messages = [
+            MessageCreate(
+                role="user",
+                content=[TextContent(text=message_text)],
+                id=Message.generate_id(),
+                agent_id=sleeptime_agent_id,
+                group_id=group.id,
             )
+        ]
 
-            # Perform sleeptime agent step
-            result = await sleeptime_agent.step(
-                input_messages=sleeptime_agent_messages,
-                run_id=run_id,
-                billing_context=billing_context,
-            )
+        # Load sleeptime agent
+        sleeptime_agent_state = await agent_manager.get_agent_by_id_async(agent_id=sleeptime_agent_id, actor=actor)
+        sleeptime_agent = LettaAgentV3(
+            agent_state=sleeptime_agent_state,
+            actor=actor,
+        )
 
-            # Update run status
-            run_update = RunUpdate(
-                status=RunStatus.completed,
-                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
-                stop_reason=result.stop_reason.stop_reason if result.stop_reason else StopReasonType.end_turn,
-                metadata={
-                    "result": result.model_dump(mode="json"),
-                    "agent_id": sleeptime_agent_state.id,
-                },
-            )
-            await self.run_manager.update_run_by_id_async(run_id=run_id, update=run_update, actor=self.actor)
-            return result
-        except Exception as e:
-            run_update = RunUpdate(
-                status=RunStatus.failed,
-                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
-                stop_reason=StopReasonType.error,
-                metadata={"error": str(e)},
-            )
-            await self.run_manager.update_run_by_id_async(run_id=run_id, update=run_update, actor=self.actor)
-            raise
+        # Perform sleeptime agent step
+        result = await sleeptime_agent.step(
+            input_messages=sleeptime_agent_messages,
+            run_id=run_id,
+            billing_context=BillingContext.model_validate(job.billing_context) if job.billing_context else None,
+        )
+
+        # Update run status
+        run_update = RunUpdate(
+            status=RunStatus.completed,
+            completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            stop_reason=result.stop_reason.stop_reason if result.stop_reason else StopReasonType.end_turn,
+            metadata={
+                "result": result.model_dump(mode="json"),
+                "agent_id": sleeptime_agent_state.id,
+            },
+        )
+        await run_manager.update_run_by_id_async(run_id=run_id, update=run_update, actor=actor)
+        return result
+    except Exception as e:
+        run_update = RunUpdate(
+            status=RunStatus.failed,
+            completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            stop_reason=StopReasonType.error,
+            metadata={"error": str(e)},
+        )
+        await run_manager.update_run_by_id_async(run_id=run_id, update=run_update, actor=actor)
+        raise
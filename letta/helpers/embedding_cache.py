@@ -0,0 +1,212 @@
+"""Content-addressed cache for embedding requests.
+
+Embeddings are a pure function of (endpoint, model, dimension, text), so re-uploading a file or re-importing
+an agent file should not re-embed chunks we have already seen. Entries are keyed on
+``(endpoint type, endpoint, model, dim, sha256(text))`` and looked up tier by tier: an in-process LRU first, then
+Redis when it is configured. Lookups are batch-aware: only the texts that miss every tier are sent to
+the provider, once per distinct text, and the results are written back to all tiers.
+"""
+
+import base64
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from letta.constants import REDIS_DEFAULT_CACHE_PREFIX
+from letta.errors import LLMServerError
+from letta.log import get_logger
+from letta.otel.metric_registry import MetricRegistry
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.settings import settings
+
+if TYPE_CHECKING:
+    from letta.llm_api.llm_client_base import LLMClientBase
+
+logger = get_logger(__name__)
+
+
+def embedding_cache_key(embedding_config: EmbeddingConfig, text: str) -> str:
+    """Cache key for the embedding of ``text`` under ``embedding_config``."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    # the same model name served from different endpoints (e.g. self-hosted vs provider) may not produce the same vectors
+    endpoint = hashlib.sha256((embedding_config.embedding_endpoint or "").encode("utf-8")).hexdigest()[:16]
+    return (
+        f"{REDIS_DEFAULT_CACHE_PREFIX}:embedding:{embedding_config.embedding_endpoint_type}:{endpoint}:"
+        f"{embedding_config.embedding_model}:{embedding_config.embedding_dim}:{digest}"
+    )
+
+
+class EmbeddingCacheBackend(ABC):
+    """A single storage tier of the embedding cache."""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return the cached vector for each key, or None on a miss."""
+
+    @abstractmethod
+    async def set_many(self, entries: Dict[str, np.ndarray]) -> None:
+        """Store vectors. Implementations must not raise on storage errors."""
+
+
+class InMemoryEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """Process-local LRU. Vectors are kept as float32 arrays to bound memory."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        results = []
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                results.append(vector)
+        return results
+
+    async def set_many(self, entries: Dict[str, np.ndarray]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, vector in entries.items():
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """Shared tier backed by Redis. Vectors are stored as base64-encoded float32 bytes."""
+
+    name = "redis"
+
+    def __init__(self, redis_client, ttl_s: int):
+        self.redis_client = redis_client
+        self.ttl_s = ttl_s
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        try:
+            values = await self.redis_client.mget(*keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache read from Redis failed: {e}")
+            return [None] * len(keys)
+        return [np.frombuffer(base64.b64decode(value), dtype=np.float32) if value else None for value in values]
+
+    async def set_many(self, entries: Dict[str, np.ndarray]) -> None:
+        try:
+            await self.redis_client.mset(
+                {key: base64.b64encode(vector.tobytes()).decode("ascii") for key, vector in entries.items()},
+                ex=self.ttl_s,
+            )
+        except Exception as e:
+            logger.warning(f"Embedding cache write to Redis failed: {e}")
+
+
+class EmbeddingCache:
+    """Tiered, batch-aware embedding cache. Tiers are checked in order; hits in lower tiers are promoted."""
+
+    def __init__(self, tiers: List[EmbeddingCacheBackend]):
+        self.tiers = tiers
+
+    async def _lookup(self, keys: List[str], metric_attributes: dict) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        remaining = keys
+        for i, tier in enumerate(self.tiers):
+            if not remaining:
+                break
+            tier_hits = {key: vector for key, vector in zip(remaining, await tier.get_many(remaining)) if vector is not None}
+            if not tier_hits:
+                continue
+            MetricRegistry().embedding_cache_hit_counter.add(len(tier_hits), attributes={**metric_attributes, "tier": tier.name})
+            for upper in self.tiers[:i]:
+                await upper.set_many(tier_hits)
+            found.update(tier_hits)
+            remaining = [key for key in remaining if key not in tier_hits]
+        return found
+
+    async def embed(
+        self,
+        texts: List[str],
+        embedding_config: EmbeddingConfig,
+        embed_fn: Callable[[List[str]], Awaitable[List[List[float]]]],
+    ) -> List[List[float]]:
+        """Return one embedding per text, calling ``embed_fn`` only for distinct texts missing from every tier."""
+        if not texts:
+            return []
+
+        metric_attributes = {"embedding_model": embedding_config.embedding_model}
+        keys = [embedding_cache_key(embedding_config, text) for text in texts]
+        # preserves first-seen order, so duplicates within a batch are embedded once
+        unique: Dict[str, str] = dict(zip(keys, texts))
+        found = await self._lookup(list(unique), metric_attributes)
+
+        missing = {key: text for key, text in unique.items() if key not in found}
+        fresh: Dict[str, List[float]] = {}
+        if missing:
+            MetricRegistry().embedding_cache_miss_counter.add(len(missing), attributes=metric_attributes)
+            embeddings = await embed_fn(list(missing.values()))
+            if len(embeddings) != len(missing):
+                raise LLMServerError(f"Embedding provider returned {len(embeddings)} embeddings for {len(missing)} texts")
+            fresh = {key: embedding for key, embedding in zip(missing, embeddings) if embedding is not None}
+            if fresh:
+                to_store = {key: np.asarray(embedding, dtype=np.float32) for key, embedding in fresh.items()}
+                for tier in self.tiers:
+                    await tier.set_many(to_store)
+
+        results = []
+        for key in keys:
+            if key in fresh:
+                results.append(fresh[key])
+            elif key in found:
+                results.append(found[key].tolist())
+            else:
+                results.append(None)
+        return results
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+async def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache, with a Redis tier if Redis is configured."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        from letta.data_sources.redis_client import NoopAsyncRedisClient, get_redis_client
+
+        tiers: List[EmbeddingCacheBackend] = [InMemoryEmbeddingCacheBackend(max_entries=settings.embedding_cache_max_entries)]
+        redis_client = await get_redis_client()
+        if not isinstance(redis_client, NoopAsyncRedisClient):
+            tiers.append(RedisEmbeddingCacheBackend(redis_client, ttl_s=settings.embedding_cache_ttl_seconds))
+        _embedding_cache = EmbeddingCache(tiers)
+    return _embedding_cache
+
+
+async def request_embeddings_cached(client: "LLMClientBase", texts: List[str], embedding_config: EmbeddingConfig) -> List[List[float]]:
+    """Drop-in replacement for ``client.request_embeddings`` that goes through the embedding cache."""
+    if not settings.embedding_cache_enabled:
+        return await client.request_embeddings(texts, embedding_config)
+    cache = await get_embedding_cache()
+    return await cache.embed(texts, embedding_config, lambda misses: client.request_embeddings(misses, embedding_config))
+
+
+def reset_embedding_cache() -> None:
+    """Drop the process-wide cache (and its in-process entries); the next request rebuilds it from settings."""
+    global _embedding_cache
+    _embedding_cache = None
@@ -0,0 +1,93 @@
+"""Rank fusion and full-text search helpers shared by Turbopuffer and the local (SQL) hybrid search."""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
+
+# standard RRF constant from Cormack et al. (2009)
+RRF_K = 60
+
+# text search configuration used for both the GIN expression indexes and the queries that hit them;
+# the expressions must match the indexes exactly for Postgres to use them
+FTS_REGCONFIG = literal_column("'english'::regconfig")
+
+
+def reciprocal_rank_fusion(
+    vector_results: List[Any],
+    fts_results: List[Any],
+    get_id_func: Callable[[Any], str],
+    vector_weight: float = 0.5,
+    fts_weight: float = 0.5,
+    top_k: Optional[int] = None,
+) -> List[Tuple[Any, float, dict]]:
+    """RRF implementation that works with any object type.
+
+    RRF score = vector_weight * (1/(k + rank)) + fts_weight * (1/(k + rank))
+    where k is a constant (typically 60) to avoid division by zero
+
+    This is a pure rank-based fusion following the standard RRF algorithm.
+
+    Args:
+        vector_results: List of items from vector search (ordered by relevance)
+        fts_results: List of items from FTS (ordered by relevance)
+        get_id_func: Function to extract ID from an item
+        vector_weight: Weight for vector search results
+        fts_weight: Weight for FTS results
+        top_k: Number of results to return (all if None)
+
+    Returns:
+        List of (item, score, metadata) tuples sorted by RRF score
+        metadata contains ranks from each result list
+    """
+    # create rank mappings based on position in result lists
+    # rank starts at 1, not 0
+    vector_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(vector_results)}
+    fts_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(fts_results)}
+
+    # combine all unique items from both result sets
+    all_items = {}
+    for item in vector_results:
+        all_items[get_id_func(item)] = item
+    for item in fts_results:
+        all_items[get_id_func(item)] = item
+
+    # calculate RRF scores based purely on ranks
+    rrf_scores = {}
+    score_metadata = {}
+    for item_id in all_items:
+        # RRF formula: sum of 1/(k + rank) across result lists
+        # If item not in a list, we don't add anything (equivalent to rank = infinity)
+        vector_rrf_score = 0.0
+        fts_rrf_score = 0.0
+
+        if item_id in vector_ranks:
+            vector_rrf_score = vector_weight / (RRF_K + vector_ranks[item_id])
+        if item_id in fts_ranks:
+            fts_rrf_score = fts_weight / (RRF_K + fts_ranks[item_id])
+
+        combined_score = vector_rrf_score + fts_rrf_score
+
+        rrf_scores[item_id] = combined_score
+        score_metadata[item_id] = {
+            "combined_score": combined_score,  # Final RRF score
+            "vector_rank": vector_ranks.get(item_id),
+            "fts_rank": fts_ranks.get(item_id),
+        }
+
+    # sort by RRF score and return with metadata
+    sorted_results = sorted(
+        [(all_items[iid], score, score_metadata[iid]) for iid, score in rrf_scores.items()], key=lambda x: x[1], reverse=True
+    )
+
+    return sorted_results[:top_k] if top_k is not None else sorted_results
+
+
+def fts_document(column: ColumnElement) -> ColumnElement:
+    """Postgres ``tsvector`` for a text or jsonb column (for jsonb, every string value is indexed)."""
+    return func.to_tsvector(FTS_REGCONFIG, column)
+
+
+def fts_query(query_text: str) -> ColumnElement:
+    """Postgres ``tsquery`` for free-form user input (quotes, ``or`` and ``-`` are supported, syntax errors are not raised)."""
+    return func.websearch_to_tsquery(FTS_REGCONFIG, query_text)
@@ -0,0 +1,90 @@
+"""Memoized provider dicts for persisted messages.
+
+Every step converts the whole in-context window to the provider's format (``Message.to_*_dicts_from_list``), though
+all but the last few messages are unchanged since the previous step. Conversions are cached per message under
+``(message id, updated_at, provider, conversion options)``, so a step only converts new or edited messages.
+
+A message is only cached while its stored row describes it: it has been persisted (``updated_at`` is set), no field
+has been reassigned in memory since it was loaded (``Message.__setattr__`` marks it), and it is not the system
+message, which request builders override in place with the same id.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Union
+
+import orjson
+
+from letta.settings import settings
+
+
+def _freeze(message_dicts: List[dict]) -> Union[bytes, List[dict]]:
+    # Callers decorate the dicts they get back (cache_control, image parts), so every hit must hand out fresh ones;
+    # decoding serialized dicts is much cheaper than copying them in Python
+    try:
+        # anything that would not decode back to the same value (datetimes, dataclasses) takes the slow path
+        return orjson.dumps(message_dicts, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+    except TypeError:
+        return copy.deepcopy(message_dicts)
+
+
+def _thaw(frozen: Union[bytes, List[dict]]) -> List[dict]:
+    if isinstance(frozen, bytes):
+        return orjson.loads(frozen)
+    return copy.deepcopy(frozen)
+
+
+class MessageDictCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Union[bytes, List[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def convert(self, message, provider: str, options: Hashable, convert: Callable[[], List[dict]]) -> List[dict]:
+        """Provider dicts for ``message``: cached if it has been converted with these options before, else ``convert()``."""
+        if (
+            not self.max_entries
+            or message.updated_at is None
+            or message.role == "system"
+            or message.__pydantic_private__.get("_modified_in_memory")
+        ):
+            return convert()
+
+        key = (message.id, message.updated_at, provider, options)
+        with self._lock:
+            frozen = self._entries.get(key)
+            if frozen is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if frozen is not None:
+            return _thaw(frozen)
+
+        message_dicts = convert()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _freeze(message_dicts)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return message_dicts
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[MessageDictCache] = None
+
+
+def get_message_dict_cache() -> MessageDictCache:
+    global _cache
+    if _cache is None:
+        _cache = MessageDictCache(max_entries=settings.message_dict_cache_max_entries)
+    return _cache
+
+
+def reset_message_dict_cache() -> None:
+    """Drop the process-wide cache; the next conversion rebuilds it from settings."""
+    global _cache
+    _cache = None
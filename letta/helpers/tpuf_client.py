@@ -16,6 +16,8 @@ import httpx
 
 from letta.constants import DEFAULT_EMBEDDING_CHUNK_SIZE
 from letta.errors import LettaInvalidArgumentError
+from letta.helpers.embedding_cache import request_embeddings_cached
+from letta.helpers.hybrid_search import reciprocal_rank_fusion
 from letta.otel.tracing import log_event, trace_method
 from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.enums import MessageRole, TagMatchMode
@@ -305,7 +307,7 @@ class TurbopufferClient:
             provider_type=self.default_embedding_config.embedding_endpoint_type,
             actor=actor,
         )
-        embeddings = await embedding_client.request_embeddings(filtered_texts, self.default_embedding_config)
+        embeddings = await request_embeddings_cached(embedding_client, filtered_texts, self.default_embedding_config)
         return embeddings
 
     @trace_method
@@ -1495,69 +1497,16 @@ class TurbopufferClient:
         fts_weight: float,
         top_k: int,
     ) -> List[Tuple[Any, float, dict]]:
-        """RRF implementation that works with any object type.
-
-        RRF score = vector_weight * (1/(k + rank)) + fts_weight * (1/(k + rank))
-        where k is a constant (typically 60) to avoid division by zero
-
-        This is a pure rank-based fusion following the standard RRF algorithm.
-
-        Args:
-            vector_results: List of items from vector search (ordered by relevance)
-            fts_results: List of items from FTS (ordered by relevance)
-            get_id_func: Function to extract ID from an item
-            vector_weight: Weight for vector search results
-            fts_weight: Weight for FTS results
-            top_k: Number of results to return
-
-        Returns:
-            List of (item, score, metadata) tuples sorted by RRF score
-            metadata contains ranks from each result list
-        """
-        k = 60  # standard RRF constant from Cormack et al. (2009)
-
-        # create rank mappings based on position in result lists
-        # rank starts at 1, not 0
-        vector_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(vector_results)}
-        fts_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(fts_results)}
-
-        # combine all unique items from both result sets
-        all_items = {}
-        for item in vector_results:
-            all_items[get_id_func(item)] = item
-        for item in fts_results:
-            all_items[get_id_func(item)] = item
-
-        # calculate RRF scores based purely on ranks
-        rrf_scores = {}
-        score_metadata = {}
-        for item_id in all_items:
-            # RRF formula: sum of 1/(k + rank) across result lists
-            # If item not in a list, we don't add anything (equivalent to rank = infinity)
-            vector_rrf_score = 0.0
-            fts_rrf_score = 0.0
-
-            if item_id in vector_ranks:
-                vector_rrf_score = vector_weight / (k + vector_ranks[item_id])
-            if item_id in fts_ranks:
-                fts_rrf_score = fts_weight / (k + fts_ranks[item_id])
-
-            combined_score = vector_rrf_score + fts_rrf_score
-
-            rrf_scores[item_id] = combined_score
-            score_metadata[item_id] = {
-                "combined_score": combined_score,  # Final RRF score
-                "vector_rank": vector_ranks.get(item_id),
-                "fts_rank": fts_ranks.get(item_id),
-            }
-
-        # sort by RRF score and return with metadata
-        sorted_results = sorted(
-            [(all_items[iid], score, score_metadata[iid]) for iid, score in rrf_scores.items()], key=lambda x: x[1], reverse=True
+        """RRF over vector and FTS result lists; see ``letta.helpers.hybrid_search.reciprocal_rank_fusion``."""
+        return reciprocal_rank_fusion(
+            vector_results=vector_results,
+            fts_results=fts_results,
+            get_id_func=get_id_func,
+            vector_weight=vector_weight,
+            fts_weight=fts_weight,
+            top_k=top_k,
         )
 
-        return sorted_results[:top_k]
-
     @trace_method
     @async_retry_with_backoff()
     async def delete_passage(self, archive_id: str, passage_id: str) -> bool:
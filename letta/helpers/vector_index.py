@@ -0,0 +1,210 @@
+"""In-process vector index for SQLite passage search.
+
+Postgres deployments rank passages with pgvector inside the database. SQLite has no native
+vector index, so ordering by the ``cosine_distance`` UDF decodes every embedding blob in Python
+once per row. This module keeps one contiguous, L2-normalized float32 matrix per archive/source
+and ranks all candidates with a single matrix-vector product instead.
+
+Indexes are built lazily on the first vector query for a scope and are kept up to date by the
+passage manager's create/update/delete paths. Any index that may have drifted from the database
+is simply invalidated and rebuilt on the next query.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from letta.constants import MAX_EMBEDDING_DIM
+from letta.log import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_SCOPE = "archive"
+SOURCE_SCOPE = "source"
+
+# Maximum number of per-scope indexes kept in memory before the least recently used is evicted
+DEFAULT_MAX_INDEXES = 256
+
+
+def _as_row(embedding, dim: int) -> np.ndarray:
+    """Convert an embedding into a zero-padded float32 row of length ``dim``."""
+    vec = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    if vec.shape[0] > dim:
+        raise ValueError(f"Invalid embedding dimension: got {vec.shape[0]}, expected at most {dim}")
+    if vec.shape[0] < dim:
+        vec = np.pad(vec, (0, dim - vec.shape[0]), mode="constant")
+    return vec
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in place. Zero rows stay zero (similarity 0 to everything)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class PassageVectorIndex:
+    """Exact cosine top-k over the passages of a single archive or source.
+
+    Rows live in a contiguous float32 matrix that grows geometrically; deletes swap the last row
+    into the freed slot so the matrix stays dense and search is a single ``matrix @ query``.
+    """
+
+    def __init__(self, dim: int = MAX_EMBEDDING_DIM, initial_capacity: int = 64):
+        self.dim = dim
+        self._matrix = np.zeros((max(initial_capacity, 1), dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, passage_id: str) -> bool:
+        return passage_id in self._positions
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[: len(self._ids)] = self._matrix[: len(self._ids)]
+        self._matrix = grown
+
+    def add(self, passage_ids: Sequence[str], embeddings: Sequence) -> None:
+        """Insert or replace embeddings for the given passage ids."""
+        if not passage_ids:
+            return
+        rows = _normalize_rows(np.stack([_as_row(e, self.dim) for e in embeddings]))
+        with self._lock:
+            self._ensure_capacity(len(self._ids) + len(passage_ids))
+            for passage_id, row in zip(passage_ids, rows):
+                position = self._positions.get(passage_id)
+                if position is None:
+                    position = len(self._ids)
+                    self._ids.append(passage_id)
+                    self._positions[passage_id] = position
+                self._matrix[position] = row
+
+    def remove(self, passage_ids: Iterable[str]) -> None:
+        """Remove passages from the index. Unknown ids are ignored."""
+        with self._lock:
+            for passage_id in passage_ids:
+                position = self._positions.pop(passage_id, None)
+                if position is None:
+                    continue
+                last = len(self._ids) - 1
+                if position != last:
+                    moved_id = self._ids[last]
+                    self._matrix[position] = self._matrix[last]
+                    self._ids[position] = moved_id
+                    self._positions[moved_id] = position
+                self._ids.pop()
+
+    def search(self, query_embedding, k: Optional[int], candidate_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(passage_id, cosine_distance)`` pairs, closest first.
+
+        If ``candidate_ids`` is given, only those passages are considered (ids that are not in the
+        index are skipped).
+        """
+        query = _normalize_rows(_as_row(query_embedding, self.dim)[None, :])[0]
+        with self._lock:
+            if candidate_ids is None:
+                positions = None
+                matrix = self._matrix[: len(self._ids)]
+            else:
+                positions = np.fromiter(
+                    (self._positions[pid] for pid in candidate_ids if pid in self._positions),
+                    dtype=np.int64,
+                )
+                matrix = self._matrix[positions]
+            if matrix.shape[0] == 0:
+                return []
+
+            distances = 1.0 - matrix @ query
+            n = distances.shape[0]
+            if k is None or k >= n:
+                order = np.argsort(distances, kind="stable")
+            else:
+                top = np.argpartition(distances, k - 1)[:k]
+                order = top[np.argsort(distances[top], kind="stable")]
+
+            if positions is not None:
+                return [(self._ids[positions[i]], float(distances[i])) for i in order]
+            return [(self._ids[i], float(distances[i])) for i in order]
+
+
+class VectorIndexRegistry:
+    """Process-wide, bounded LRU of ``PassageVectorIndex`` objects keyed by ``(scope, scope_id)``."""
+
+    def __init__(self, max_indexes: int = DEFAULT_MAX_INDEXES, dim: int = MAX_EMBEDDING_DIM):
+        self.max_indexes = max_indexes
+        self.dim = dim
+        self._indexes: "OrderedDict[Tuple[str, str], PassageVectorIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, scope_id: str) -> Optional[PassageVectorIndex]:
+        with self._lock:
+            index = self._indexes.get((scope, scope_id))
+            if index is not None:
+                self._indexes.move_to_end((scope, scope_id))
+            return index
+
+    def put(self, scope: str, scope_id: str, index: PassageVectorIndex) -> None:
+        with self._lock:
+            self._indexes[(scope, scope_id)] = index
+            self._indexes.move_to_end((scope, scope_id))
+            while len(self._indexes) > self.max_indexes:
+                evicted, _ = self._indexes.popitem(last=False)
+                logger.debug(f"Evicted vector index for {evicted[0]} {evicted[1]}")
+
+    def invalidate(self, scope: str, scope_id: str) -> None:
+        with self._lock:
+            self._indexes.pop((scope, scope_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+    async def get_or_build(
+        self,
+        scope: str,
+        scope_id: str,
+        loader: Callable[[], Awaitable[List[Tuple[str, object]]]],
+    ) -> PassageVectorIndex:
+        """Return the index for a scope, building it from ``loader`` (``[(passage_id, embedding)]``) on a miss."""
+        index = self.get(scope, scope_id)
+        if index is not None:
+            return index
+
+        rows = [(passage_id, embedding) for passage_id, embedding in await loader() if embedding is not None]
+        index = PassageVectorIndex(dim=self.dim, initial_capacity=max(len(rows), 64))
+        if rows:
+            index.add([r[0] for r in rows], [r[1] for r in rows])
+        self.put(scope, scope_id, index)
+        logger.debug(f"Built vector index for {scope} {scope_id} with {len(index)} passages")
+        return index
+
+    def add_passages(self, scope: str, scope_id: str, passage_ids: Sequence[str], embeddings: Sequence) -> None:
+        """Incrementally add passages to an already-built index. No-op if the index has not been built yet."""
+        index = self.get(scope, scope_id)
+        if index is None:
+            return
+        rows = [(pid, emb) for pid, emb in zip(passage_ids, embeddings) if emb is not None]
+        try:
+            index.add([r[0] for r in rows], [r[1] for r in rows])
+        except ValueError as e:
+            logger.warning(f"Invalidating vector index for {scope} {scope_id}: {e}")
+            self.invalidate(scope, scope_id)
+
+    def remove_passages(self, scope: str, scope_id: str, passage_ids: Iterable[str]) -> None:
+        index = self.get(scope, scope_id)
+        if index is not None:
+            index.remove(passage_ids)
+
+
+passage_vector_indexes = VectorIndexRegistry()
@@ -6,7 +6,7 @@ from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, Choice,
 
 from letta.constants import PRE_EXECUTION_MESSAGE_ARG
 from letta.interfaces.utils import _format_sse_chunk
-from letta.server.rest_api.json_parser import OptimisticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 
 
 class OpenAIChatCompletionsStreamingInterface:
@@ -17,18 +17,20 @@ class OpenAIChatCompletionsStreamingInterface:
     """
 
     def __init__(self, stream_pre_execution_message: bool = True):
-        self.optimistic_json_parser: OptimisticJSONParser = OptimisticJSONParser()
         self.stream_pre_execution_message: bool = stream_pre_execution_message
 
-        self.current_parsed_json_result: dict[str, Any] = {}
         self.content_buffer: list[str] = []
         self.tool_call_happened: bool = False
         self.finish_reason_stop: bool = False
 
         self.tool_call_name: str | None = None
-        self.tool_call_args_str: str = ""
+        self.tool_call_args_parser = IncrementalJSONParser()
         self.tool_call_id: str | None = None
 
+    @property
+    def tool_call_args_str(self) -> str:
+        return self.tool_call_args_parser.text
+
     async def process(self, stream: AsyncStream[ChatCompletionChunk]) -> AsyncGenerator[str, None]:
         """
         Iterates over the OpenAI stream, yielding SSE events.
@@ -67,8 +69,8 @@ class OpenAIChatCompletionsStreamingInterface:
         self._update_tool_call_info(tool_call)
 
         if self.stream_pre_execution_message and tool_call.function.arguments:
-            self.tool_call_args_str += tool_call.function.arguments
-            async for sse_chunk in self._stream_pre_execution_message(chunk, tool_call):
+            field_deltas = self.tool_call_args_parser.feed(tool_call.function.arguments)
+            async for sse_chunk in self._stream_pre_execution_message(chunk, field_deltas):
                 yield sse_chunk
 
     def _update_tool_call_info(self, tool_call: Any) -> None:
@@ -78,23 +80,10 @@ class OpenAIChatCompletionsStreamingInterface:
         if tool_call.id:
             self.tool_call_id = tool_call.id
 
-    async def _stream_pre_execution_message(self, chunk: ChatCompletionChunk, tool_call: Any) -> AsyncGenerator[str, None]:
-        """Parses and streams pre-execution messages if they have changed."""
-        parsed_args = self.optimistic_json_parser.parse(self.tool_call_args_str)
-
-        if parsed_args.get(PRE_EXECUTION_MESSAGE_ARG) and parsed_args[PRE_EXECUTION_MESSAGE_ARG] != self.current_parsed_json_result.get(
-            PRE_EXECUTION_MESSAGE_ARG
-        ):
-            # Extract old and new message content
-            old = self.current_parsed_json_result.get(PRE_EXECUTION_MESSAGE_ARG, "")
-            new = parsed_args[PRE_EXECUTION_MESSAGE_ARG]
-
-            # Compute the new content by slicing off the old prefix
-            content = new[len(old) :] if old else new
-
-            # Update current state
-            self.current_parsed_json_result = parsed_args
-
+    async def _stream_pre_execution_message(self, chunk: ChatCompletionChunk, field_deltas: dict[str, str]) -> AsyncGenerator[str, None]:
+        """Streams the newly received part of the pre-execution message, if any."""
+        content = field_deltas.get(PRE_EXECUTION_MESSAGE_ARG)
+        if content:
             # Yield the formatted SSE chunk
             yield _format_sse_chunk(
                 ChatCompletionChunk(
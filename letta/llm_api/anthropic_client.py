@@ -34,6 +34,7 @@ from letta.helpers.datetime_helpers import get_utc_time_int
 from letta.helpers.decorators import deprecated
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
 from letta.llm_api.anthropic_constants import ANTHROPIC_MAX_STRICT_TOOLS, ANTHROPIC_STRICT_MODE_ALLOWLIST
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.error_utils import is_insufficient_credits_message
 from letta.llm_api.helpers import add_inner_thoughts_to_functions, unpack_all_inner_thoughts_from_kwargs
 from letta.llm_api.llm_client_base import LLMClientBase
@@ -436,7 +437,9 @@ class AnthropicClient(LLMClientBase):
         if async_client:
             if api_key:
                 if is_oauth_provider:
-                    return anthropic.AsyncAnthropic(
+                    return get_pooled_client(
+                        anthropic.AsyncAnthropic,
+                        "anthropic",
                         max_retries=model_settings.anthropic_max_retries,
                         default_headers={
                             "Authorization": f"Bearer {api_key}",
@@ -444,8 +447,10 @@ class AnthropicClient(LLMClientBase):
                             "anthropic-beta": "oauth-2025-04-20",
                         },
                     )
-                return anthropic.AsyncAnthropic(api_key=api_key, max_retries=model_settings.anthropic_max_retries)
-            return anthropic.AsyncAnthropic(max_retries=model_settings.anthropic_max_retries)
+                return get_pooled_client(
+                    anthropic.AsyncAnthropic, "anthropic", api_key=api_key, max_retries=model_settings.anthropic_max_retries
+                )
+            return get_pooled_client(anthropic.AsyncAnthropic, "anthropic", max_retries=model_settings.anthropic_max_retries)
 
         if api_key:
             if is_oauth_provider:
@@ -472,7 +477,9 @@ class AnthropicClient(LLMClientBase):
         if async_client:
             if api_key:
                 if is_oauth_provider:
-                    return anthropic.AsyncAnthropic(
+                    return get_pooled_client(
+                        anthropic.AsyncAnthropic,
+                        "anthropic",
                         max_retries=model_settings.anthropic_max_retries,
                         default_headers={
                             "Authorization": f"Bearer {api_key}",
@@ -480,8 +487,10 @@ class AnthropicClient(LLMClientBase):
                             "anthropic-beta": "oauth-2025-04-20",
                         },
                     )
-                return anthropic.AsyncAnthropic(api_key=api_key, max_retries=model_settings.anthropic_max_retries)
-            return anthropic.AsyncAnthropic(max_retries=model_settings.anthropic_max_retries)
+                return get_pooled_client(
+                    anthropic.AsyncAnthropic, "anthropic", api_key=api_key, max_retries=model_settings.anthropic_max_retries
+                )
+            return get_pooled_client(anthropic.AsyncAnthropic, "anthropic", max_retries=model_settings.anthropic_max_retries)
 
         if api_key:
             if is_oauth_provider:
@@ -796,7 +805,7 @@ class AnthropicClient(LLMClientBase):
     ) -> int:
         logging.getLogger("httpx").setLevel(logging.WARNING)
         # Use the default client; token counting is lightweight and does not require BYOK overrides
-        client = anthropic.AsyncAnthropic()
+        client = get_pooled_client(anthropic.AsyncAnthropic, "anthropic")
         if messages and len(messages) == 0:
             messages = None
         if tools and len(tools) > 0:
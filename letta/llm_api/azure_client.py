@@ -8,6 +8,7 @@ from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.responses.response_stream_event import ResponseStreamEvent
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.log import get_logger
 from letta.otel.tracing import trace_method
@@ -85,9 +86,9 @@ class AzureClient(OpenAIClient):
 
         try:
             if self._is_v1_endpoint(base_url):
-                client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+                client = get_pooled_client(AsyncOpenAI, "azure", api_key=api_key, base_url=base_url)
             else:
-                client = AsyncAzureOpenAI(api_key=api_key, azure_endpoint=base_url, api_version=api_version)
+                client = get_pooled_client(AsyncAzureOpenAI, "azure", api_key=api_key, azure_endpoint=base_url, api_version=api_version)
 
             # Route based on payload shape: Responses uses 'input', Chat Completions uses 'messages'
             if "input" in request_data and "messages" not in request_data:
@@ -110,9 +111,9 @@ class AzureClient(OpenAIClient):
         api_key, base_url, api_version = self._resolve_credentials(api_key, base_url, api_version)
 
         if self._is_v1_endpoint(base_url):
-            client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+            client = get_pooled_client(AsyncOpenAI, "azure", api_key=api_key, base_url=base_url)
         else:
-            client = AsyncAzureOpenAI(api_key=api_key, azure_endpoint=base_url, api_version=api_version)
+            client = get_pooled_client(AsyncAzureOpenAI, "azure", api_key=api_key, azure_endpoint=base_url, api_version=api_version)
 
         # Route based on payload shape: Responses uses 'input', Chat Completions uses 'messages'
         if "input" in request_data and "messages" not in request_data:
@@ -144,9 +145,9 @@ class AzureClient(OpenAIClient):
         api_version = model_settings.azure_api_version or os.environ.get("AZURE_API_VERSION")
 
         if self._is_v1_endpoint(base_url):
-            client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+            client = get_pooled_client(AsyncOpenAI, "azure", api_key=api_key, base_url=base_url)
         else:
-            client = AsyncAzureOpenAI(api_key=api_key, api_version=api_version, azure_endpoint=base_url)
+            client = get_pooled_client(AsyncAzureOpenAI, "azure", api_key=api_key, api_version=api_version, azure_endpoint=base_url)
 
         response = await client.embeddings.create(model=embedding_config.embedding_model, input=inputs)
 
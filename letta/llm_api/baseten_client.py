@@ -6,6 +6,7 @@ from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.otel.tracing import trace_method
 from letta.schemas.enums import AgentType
@@ -158,14 +159,14 @@ class BasetenClient(OpenAIClient):
     @trace_method
     async def request_async(self, request_data: dict, llm_config: LLMConfig) -> dict:
         request_data = sanitize_unicode_surrogates(request_data)
-        client = AsyncOpenAI(**self._build_client_kwargs(llm_config))
+        client = get_pooled_client(AsyncOpenAI, "baseten", **self._build_client_kwargs(llm_config))
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
 
     @trace_method
     async def stream_async(self, request_data: dict, llm_config: LLMConfig) -> AsyncStream[ChatCompletionChunk]:
         request_data = sanitize_unicode_surrogates(request_data)
-        client = AsyncOpenAI(**self._build_client_kwargs(llm_config))
+        client = get_pooled_client(AsyncOpenAI, "baseten", **self._build_client_kwargs(llm_config))
         response_stream: AsyncStream[ChatCompletionChunk] = await client.chat.completions.create(
             **request_data, stream=True, stream_options={"include_usage": True}
         )
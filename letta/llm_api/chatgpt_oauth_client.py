@@ -41,6 +41,7 @@ from letta.errors import (
     LLMTimeoutError,
 )
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import shared_http_client
 from letta.llm_api.llm_client_base import LLMClientBase
 from letta.log import get_logger
 from letta.otel.tracing import trace_method
@@ -396,17 +397,19 @@ class ChatGPTOAuthClient(LLMClientBase):
         # Retry on transient network errors with exponential backoff
         for attempt in range(self.MAX_RETRIES):
             try:
-                async with httpx.AsyncClient() as client:
-                    async with client.stream(
+                async with (
+                    shared_http_client("chatgpt_oauth", endpoint) as client,
+                    client.stream(
                         "POST",
                         endpoint,
                         json=request_data,
                         headers=headers,
                         timeout=120.0,
-                    ) as response:
-                        response.raise_for_status()
-                        # Accumulate SSE events into a final response
-                        return await self._accumulate_sse_response(response)
+                    ) as response,
+                ):
+                    response.raise_for_status()
+                    # Accumulate SSE events into a final response
+                    return await self._accumulate_sse_response(response)
 
             except httpx.HTTPStatusError as e:
                 mapped = self._handle_http_error(e)
@@ -628,69 +631,71 @@ class ChatGPTOAuthClient(LLMClientBase):
 
             for attempt in range(self.MAX_RETRIES):
                 try:
-                    async with httpx.AsyncClient() as client:
-                        async with client.stream(
+                    async with (
+                        shared_http_client("chatgpt_oauth", endpoint) as client,
+                        client.stream(
                             "POST",
                             endpoint,
                             json=request_data,
                             headers=headers,
                             timeout=120.0,
-                        ) as response:
-                            # Check for error status
-                            if response.status_code != 200:
-                                error_body = await response.aread()
-                                logger.error(f"ChatGPT SSE error: {response.status_code} - {error_body}")
-                                raise self._handle_http_error_from_status(response.status_code, error_body.decode())
-
-                            async for line in response.aiter_lines():
-                                if not line or not line.startswith("data: "):
-                                    continue
-
-                                data_str = line[6:]
-                                if data_str == "[DONE]":
-                                    break
-
-                                try:
-                                    raw_event = json.loads(data_str)
-                                    event_type = raw_event.get("type")
-
-                                    # Check for error events from the API (context window, rate limit, etc.)
-                                    if event_type == "error":
-                                        logger.error(f"ChatGPT SSE error event: {json.dumps(raw_event, default=str)[:1000]}")
-                                        raise self._handle_sse_error_event(raw_event)
-
-                                    # Check for response.failed or response.incomplete events
-                                    if event_type in ("response.failed", "response.incomplete"):
-                                        logger.error(f"ChatGPT SSE {event_type} event: {json.dumps(raw_event, default=str)[:1000]}")
-                                        resp_obj = raw_event.get("response", {})
-                                        error_info = resp_obj.get("error", {})
-                                        if error_info:
-                                            raise self._handle_sse_error_event({"error": error_info, "type": event_type})
-                                        else:
-                                            raise LLMBadRequestError(
-                                                message=f"ChatGPT request failed with status '{event_type}' (no error details provided)",
-                                                code=ErrorCode.INTERNAL_SERVER_ERROR,
-                                            )
-
-                                    # Use backend-provided sequence_number if available, else use counter
-                                    # This ensures proper ordering even if backend doesn't provide it
-                                    if "sequence_number" not in raw_event:
-                                        raw_event["sequence_number"] = sequence_counter
-                                    sequence_counter = raw_event["sequence_number"] + 1
-
-                                    # Track output index for output_item.added events
-                                    if event_type == "response.output_item.added":
-                                        output_index = raw_event.get("output_index", output_index)
-
-                                    # Convert to OpenAI SDK ResponseStreamEvent
-                                    sdk_event = self._convert_to_sdk_event(raw_event, output_index)
-                                    if sdk_event:
-                                        yield sdk_event
-                                        has_yielded = True
-
-                                except json.JSONDecodeError:
-                                    logger.warning(f"Failed to parse SSE event: {data_str[:100]}")
-                                    continue
+                        ) as response,
+                    ):
+                        # Check for error status
+                        if response.status_code != 200:
+                            error_body = await response.aread()
+                            logger.error(f"ChatGPT SSE error: {response.status_code} - {error_body}")
+                            raise self._handle_http_error_from_status(response.status_code, error_body.decode())
+
+                        async for line in response.aiter_lines():
+                            if not line or not line.startswith("data: "):
+                                continue
+
+                            data_str = line[6:]
+                            if data_str == "[DONE]":
+                                break
+
+                            try:
+                                raw_event = json.loads(data_str)
+                                event_type = raw_event.get("type")
+
+                                # Check for error events from the API (context window, rate limit, etc.)
+                                if event_type == "error":
+                                    logger.error(f"ChatGPT SSE error event: {json.dumps(raw_event, default=str)[:1000]}")
+                                    raise self._handle_sse_error_event(raw_event)
+
+                                # Check for response.failed or response.incomplete events
+                                if event_type in ("response.failed", "response.incomplete"):
+                                    logger.error(f"ChatGPT SSE {event_type} event: {json.dumps(raw_event, default=str)[:1000]}")
+                                    resp_obj = raw_event.get("response", {})
+                                    error_info = resp_obj.get("error", {})
+                                    if error_info:
+                                        raise self._handle_sse_error_event({"error": error_info, "type": event_type})
+                                    else:
+                                        raise LLMBadRequestError(
+                                            message=f"ChatGPT request failed with status '{event_type}' (no error details provided)",
+                                            code=ErrorCode.INTERNAL_SERVER_ERROR,
+                                        )
+
+                                # Use backend-provided sequence_number if available, else use counter
+                                # This ensures proper ordering even if backend doesn't provide it
+                                if "sequence_number" not in raw_event:
+                                    raw_event["sequence_number"] = sequence_counter
+                                sequence_counter = raw_event["sequence_number"] + 1
+
+                                # Track output index for output_item.added events
+                                if event_type == "response.output_item.added":
+                                    output_index = raw_event.get("output_index", output_index)
+
+                                # Convert to OpenAI SDK ResponseStreamEvent
+                                sdk_event = self._convert_to_sdk_event(raw_event, output_index)
+                                if sdk_event:
+                                    yield sdk_event
+                                    has_yielded = True
+
+                            except json.JSONDecodeError:
+                                logger.warning(f"Failed to parse SSE event: {data_str[:100]}")
+                                continue
 
                     # Stream completed successfully
                     return
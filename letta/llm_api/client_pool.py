@@ -0,0 +1,269 @@
+"""Process-wide pool of provider SDK clients.
+
+Constructing ``AsyncOpenAI`` / ``AsyncAnthropic`` per request builds a fresh httpx client each time, so every
+LLM call pays DNS + TCP + TLS setup again. Clients are immutable once built, so we cache them keyed by
+``(client class, provider, base_url, sha256(api_key), remaining constructor kwargs)`` and hand the same
+instance to every request with that configuration. Underneath, clients for the same ``(provider, base_url)``
+share one keep-alive ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed), so BYOK keys against the same
+endpoint reuse the same connections as well.
+
+Pools are kept per event loop, since httpx connections are bound to the loop that opened them. Each pool
+is an LRU bounded by ``llm_client_pool_max_size`` with idle eviction after ``llm_client_pool_idle_seconds``.
+Evicted SDK clients are simply dropped; evicted HTTP clients are closed once their in-flight requests and streams
+have finished, so eviction neither cuts off a stream nor leaks the client's connections.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import httpx
+
+from letta.log import get_logger
+from letta.otel.metric_registry import MetricRegistry
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Mirrors the SDK defaults, but with a longer keep-alive so warm connections survive gaps between agent steps
+_HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=120.0)
+_HTTP_TIMEOUT = httpx.Timeout(timeout=600.0, connect=10.0)
+
+
+def _hash_secret(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, httpx.Timeout):
+        return ("timeout", value.connect, value.read, value.write, value.pool)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def client_pool_key(client_cls: type, provider: str, kwargs: Dict[str, Any]) -> Tuple:
+    """Pool key for an SDK client built as ``client_cls(**kwargs)``. Secrets are hashed, never stored."""
+    frozen = []
+    for name, value in sorted(kwargs.items()):
+        if name == "api_key":
+            value = _hash_secret(value)
+        elif name == "default_headers" and value:
+            # Header values carry bearer tokens for OAuth providers
+            value = tuple(sorted((str(k), _hash_secret(v)) for k, v in value.items()))
+        frozen.append((name, _freeze(value)))
+    return (client_cls, provider, str(kwargs.get("base_url") or kwargs.get("azure_endpoint") or ""), tuple(frozen))
+
+
+class _LRUPool:
+    """Bounded LRU with idle eviction. Not thread-safe; each instance belongs to a single event loop."""
+
+    def __init__(self, name: str, max_size: int, idle_seconds: float, on_evict: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], T], provider: str) -> T:
+        now = time.monotonic()
+        self._evict_idle(now)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], now)
+            self._entries.move_to_end(key)
+            MetricRegistry().llm_client_pool_hit_counter.add(1, attributes={"provider": provider, "pool": self.name})
+            return entry[0]
+
+        MetricRegistry().llm_client_pool_miss_counter.add(1, attributes={"provider": provider, "pool": self.name})
+        value = factory()
+        self._entries[key] = (value, now)
+        while len(self._entries) > self.max_size:
+            self._evicted(self._entries.popitem(last=False)[1][0])
+        return value
+
+    def _evict_idle(self, now: float) -> None:
+        # Entries are in last-used order, so idle ones are always at the front
+        while self._entries:
+            key, (_, last_used) = next(iter(self._entries.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            self._evicted(self._entries.pop(key)[0])
+
+    def _evicted(self, value: Any) -> None:
+        if self.on_evict is not None:
+            self.on_evict(value)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that calls ``release`` once, when the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class _TrackingTransport(httpx.AsyncBaseTransport):
+    """Keep-alive transport that knows whether any request, response stream or lease is still using it."""
+
+    def __init__(self):
+        self._transport = httpx.AsyncHTTPTransport(limits=_HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+        self._in_use = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def acquire(self) -> None:
+        self._in_use += 1
+        self._idle.clear()
+
+    def release(self) -> None:
+        self._in_use -= 1
+        if self._in_use == 0:
+            self._idle.set()
+
+    async def wait_until_idle(self) -> None:
+        await self._idle.wait()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _PooledHTTPClient:
+    def __init__(self):
+        self.transport = _TrackingTransport()
+        self.client = httpx.AsyncClient(transport=self.transport, timeout=_HTTP_TIMEOUT, follow_redirects=True)
+
+
+# close tasks of evicted HTTP clients, referenced until they finish
+_closing: "set[asyncio.Task]" = set()
+
+
+async def _close_when_idle(pooled: _PooledHTTPClient) -> None:
+    try:
+        # a response that is never closed would otherwise keep the client open forever
+        await asyncio.wait_for(pooled.transport.wait_until_idle(), timeout=_HTTP_TIMEOUT.read)
+    except asyncio.TimeoutError:
+        logger.warning("Closing an evicted pooled HTTP client with requests still open")
+    await pooled.client.aclose()
+
+
+def _close_evicted_http_client(pooled: _PooledHTTPClient) -> None:
+    task = asyncio.get_running_loop().create_task(_close_when_idle(pooled))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+class _LoopPools:
+    def __init__(self):
+        self.sdk = _LRUPool("sdk", settings.llm_client_pool_max_size, settings.llm_client_pool_idle_seconds)
+        self.http = _LRUPool(
+            "http", settings.llm_client_pool_max_size, settings.llm_client_pool_idle_seconds, on_evict=_close_evicted_http_client
+        )
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPools]" = weakref.WeakKeyDictionary()
+
+
+def _current_pools() -> Optional[_LoopPools]:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    pools = _pools.get(loop)
+    if pools is None:
+        pools = _pools[loop] = _LoopPools()
+    return pools
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, follow_redirects=True, http2=HTTP2_AVAILABLE)
+
+
+@asynccontextmanager
+async def shared_http_client(provider: str, base_url: Optional[str] = None) -> AsyncIterator[httpx.AsyncClient]:
+    """Keep-alive ``httpx.AsyncClient`` shared by every caller talking to ``base_url`` on this event loop.
+
+    When pooling is disabled or there is no running loop, yields a fresh client instead and closes it on exit.
+    """
+    pools = _current_pools() if settings.llm_client_pool_enabled else None
+    if pools is None:
+        async with _build_http_client() as client:
+            yield client
+        return
+    pooled = _pooled_http_client(pools, provider, base_url)
+    # held for the whole block, so an eviction meanwhile waits for the caller to finish with the client
+    pooled.transport.acquire()
+    try:
+        yield pooled.client
+    finally:
+        pooled.transport.release()
+
+
+def _pooled_http_client(pools: _LoopPools, provider: str, base_url: Optional[str]) -> _PooledHTTPClient:
+    return pools.http.get_or_create((provider, base_url or ""), _PooledHTTPClient, provider)
+
+
+def get_pooled_client(client_cls: Callable[..., T], provider: str, **kwargs) -> T:
+    """Return a shared ``client_cls(**kwargs)`` for this configuration, constructing it on first use.
+
+    Only for async SDK clients (``AsyncOpenAI``, ``AsyncAzureOpenAI``, ``AsyncAnthropic``), which accept an
+    ``http_client``. When pooling is disabled or no event loop is running this is a plain constructor call.
+    """
+    pools = _current_pools() if settings.llm_client_pool_enabled else None
+    if pools is None:
+        return client_cls(**kwargs)
+
+    # looked up on every call so the HTTP client stays warm while its SDK clients are in use; an SDK client whose
+    # HTTP client was evicted (and closed) is keyed on the old instance and never handed out again
+    base_url = kwargs.get("base_url") or kwargs.get("azure_endpoint")
+    http_client = _pooled_http_client(pools, provider, str(base_url) if base_url else None).client
+    key = (*client_pool_key(client_cls, provider, kwargs), id(http_client))
+    return pools.sdk.get_or_create(key, lambda: client_cls(**kwargs, http_client=http_client), provider)
+
+
+def reset_client_pools() -> None:
+    """Drop every pooled client (used by tests)."""
+    _pools.clear()
@@ -6,6 +6,7 @@ from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.log import get_logger
 from letta.otel.tracing import trace_method
@@ -103,7 +104,7 @@ class DeepseekClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = model_settings.deepseek_api_key or os.environ.get("DEEPSEEK_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "deepseek", api_key=api_key, base_url=llm_config.model_endpoint)
 
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
@@ -116,7 +117,7 @@ class DeepseekClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = model_settings.deepseek_api_key or os.environ.get("DEEPSEEK_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "deepseek", api_key=api_key, base_url=llm_config.model_endpoint)
         response_stream: AsyncStream[ChatCompletionChunk] = await client.chat.completions.create(
             **request_data, stream=True, stream_options={"include_usage": True}
         )
@@ -5,6 +5,7 @@ from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.llm_api.zai_client import is_zai_reasoning_model
 from letta.otel.tracing import trace_method
@@ -113,7 +114,7 @@ class FireworksClient(OpenAIClient):
     async def request_async(self, request_data: dict, llm_config: LLMConfig) -> dict:
         request_data = sanitize_unicode_surrogates(request_data)
         api_key = model_settings.fireworks_api_key
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "fireworks", api_key=api_key, base_url=llm_config.model_endpoint)
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
 
@@ -121,7 +122,7 @@ class FireworksClient(OpenAIClient):
     async def stream_async(self, request_data: dict, llm_config: LLMConfig) -> AsyncStream[ChatCompletionChunk]:
         request_data = sanitize_unicode_surrogates(request_data)
         api_key = model_settings.fireworks_api_key
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "fireworks", api_key=api_key, base_url=llm_config.model_endpoint)
         response_stream: AsyncStream[ChatCompletionChunk] = await client.chat.completions.create(
             **request_data, stream=True, stream_options={"include_usage": True}
         )
@@ -6,6 +6,7 @@ from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.otel.tracing import trace_method
 from letta.schemas.embedding_config import EmbeddingConfig
@@ -88,7 +89,7 @@ class GroqClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = model_settings.groq_api_key or os.environ.get("GROQ_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "groq", api_key=api_key, base_url=llm_config.model_endpoint)
 
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
@@ -97,7 +98,7 @@ class GroqClient(OpenAIClient):
     async def request_embeddings(self, inputs: List[str], embedding_config: EmbeddingConfig) -> List[List[float]]:
         """Request embeddings given texts and embedding config"""
         api_key = model_settings.groq_api_key or os.environ.get("GROQ_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=embedding_config.embedding_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "groq", api_key=api_key, base_url=embedding_config.embedding_endpoint)
         response = await client.embeddings.create(model=embedding_config.embedding_model, input=inputs)
 
         # TODO: add total usage
@@ -136,6 +136,14 @@ class LLMClient:
                     put_inner_thoughts_first=put_inner_thoughts_first,
                     actor=actor,
                 )
+            # local backends that take a prompt built by a prompt formatter rather than a chat completions request
+            case "webui" | "webui-legacy" | "lmstudio" | "lmstudio-legacy" | "llamacpp" | "koboldcpp":
+                from letta.llm_api.local_llm_client import LocalLLMClient
+
+                return LocalLLMClient(
+                    put_inner_thoughts_first=put_inner_thoughts_first,
+                    actor=actor,
+                )
             case _:
                 from letta.llm_api.openai_client import OpenAIClient
 
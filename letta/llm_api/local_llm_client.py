@@ -0,0 +1,181 @@
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+from openai.types.completion_usage import CompletionUsage
+
+from letta.errors import ErrorCode, LLMConnectionError, LLMError, LocalLLMConnectionError, LocalLLMError
+from letta.llm_api.chatgpt_oauth_client import AsyncStreamWrapper
+from letta.llm_api.llm_client_base import LLMClientBase
+from letta.local_llm.chat_completion_proxy import get_chat_completion, get_chat_completion_async
+from letta.otel.tracing import trace_method
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.enums import AgentType
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message as PydanticMessage
+from letta.schemas.openai.chat_completion_response import ChatCompletionResponse
+from letta.schemas.usage import LettaUsageStatistics
+from letta.settings import model_settings
+
+# endpoint types served by LocalLLMClient
+LOCAL_LLM_ENDPOINT_TYPES = ("webui", "webui-legacy", "lmstudio", "lmstudio-legacy", "llamacpp", "koboldcpp")
+
+
+class LocalLLMClient(LLMClientBase):
+    """Client for local backends driven through a prompt formatter (see ``letta.local_llm``).
+
+    The request carries the OpenAI-style messages and function schemas; the prompt is built and the completion
+    parsed back into a tool call by ``get_chat_completion_async``. Grammar-constrained formatters need the tools'
+    Python functions, which only the legacy agent has, so they are rejected here.
+
+    ``stream_async`` streams from the backend, but the formatter's raw output only becomes a tool call once it is
+    complete: while it is generated the stream carries empty chunks, then the parsed completion as chat completion
+    chunks.
+    """
+
+    @trace_method
+    def build_request_data(
+        self,
+        agent_type: AgentType,
+        messages: List[PydanticMessage],
+        llm_config: LLMConfig,
+        tools: Optional[List[dict]] = None,
+        force_tool_call: Optional[str] = None,
+        requires_subsequent_tool_call: bool = False,
+        tool_return_truncation_chars: Optional[int] = None,
+        system: Optional[str] = None,
+    ) -> dict:
+        if llm_config.model_wrapper and "grammar" in llm_config.model_wrapper:
+            raise LocalLLMError(
+                f"Prompt formatter '{llm_config.model_wrapper}' needs the tools' Python functions; use a formatter without grammar"
+            )
+        message_dicts = PydanticMessage.to_openai_dicts_from_list(messages)
+        if system is not None and message_dicts and message_dicts[0]["role"] == "system":
+            message_dicts[0] = {**message_dicts[0], "content": system}
+        return {"model": llm_config.model, "messages": message_dicts, "functions": tools or None}
+
+    def _completion_kwargs(self, request_data: dict, llm_config: LLMConfig) -> dict:
+        return dict(
+            model=request_data["model"],
+            messages=request_data["messages"],
+            functions=request_data["functions"],
+            context_window=llm_config.context_window,
+            endpoint=llm_config.model_endpoint,
+            endpoint_type=llm_config.model_endpoint_type,
+            wrapper=llm_config.model_wrapper,
+            user=str(self.actor.id) if self.actor else None,
+            auth_type=model_settings.openllm_auth_type,
+            auth_key=model_settings.openllm_api_key,
+        )
+
+    @trace_method
+    def request(self, request_data: dict, llm_config: LLMConfig) -> dict:
+        return get_chat_completion(**self._completion_kwargs(request_data, llm_config)).model_dump()
+
+    @trace_method
+    async def request_async(self, request_data: dict, llm_config: LLMConfig) -> dict:
+        response = await get_chat_completion_async(**self._completion_kwargs(request_data, llm_config))
+        return response.model_dump()
+
+    async def request_embeddings(self, texts: List[str], embedding_config: EmbeddingConfig) -> List[List[float]]:
+        # these backends expose embeddings, if at all, through their OpenAI-compatible API
+        from letta.llm_api.openai_client import OpenAIClient
+
+        return await OpenAIClient(actor=self.actor).request_embeddings(texts, embedding_config)
+
+    @trace_method
+    async def convert_response_to_chat_completion(
+        self,
+        response_data: dict,
+        input_messages: List[PydanticMessage],
+        llm_config: LLMConfig,
+    ) -> ChatCompletionResponse:
+        return ChatCompletionResponse.model_validate(response_data)
+
+    def extract_usage_statistics(self, response_data: Optional[dict], llm_config: LLMConfig) -> LettaUsageStatistics:
+        usage = (response_data or {}).get("usage") or {}
+        return LettaUsageStatistics(
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            completion_tokens=usage.get("completion_tokens") or 0,
+            total_tokens=usage.get("total_tokens") or 0,
+        )
+
+    @trace_method
+    async def stream_async(self, request_data: dict, llm_config: LLMConfig) -> AsyncStreamWrapper:
+        return AsyncStreamWrapper(self._stream_chunks(request_data, llm_config))
+
+    async def _stream_chunks(self, request_data: dict, llm_config: LLMConfig) -> AsyncIterator[ChatCompletionChunk]:
+        tokens: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        completion = asyncio.create_task(
+            get_chat_completion_async(**self._completion_kwargs(request_data, llm_config), on_token=tokens.put_nowait)
+        )
+        completion.add_done_callback(lambda _: tokens.put_nowait(None))
+        try:
+            # one empty chunk per token keeps the consumer's cancellation checks running during generation
+            while await tokens.get() is not None:
+                yield ChatCompletionChunk(
+                    id="",
+                    choices=[ChunkChoice(index=0, delta=ChoiceDelta())],
+                    created=0,
+                    model=llm_config.model,
+                    object="chat.completion.chunk",
+                )
+            response = await completion
+        finally:
+            if not completion.done():
+                completion.cancel()
+                await asyncio.gather(completion, return_exceptions=True)
+
+        for chunk in _response_to_chunks(response):
+            yield chunk
+
+    def is_reasoning_model(self, llm_config: LLMConfig) -> bool:
+        return False
+
+    def handle_llm_error(self, e: Exception, llm_config: Optional[LLMConfig] = None) -> Exception:
+        if isinstance(e, LocalLLMConnectionError):
+            return LLMConnectionError(message=str(e), code=ErrorCode.INTERNAL_SERVER_ERROR)
+        if isinstance(e, LocalLLMError):
+            return LLMError(message=str(e))
+        return super().handle_llm_error(e, llm_config)
+
+
+def _response_to_chunks(response: ChatCompletionResponse) -> List[ChatCompletionChunk]:
+    """A parsed completion as the chunks a chat completions stream would have delivered."""
+    created = response.created if isinstance(response.created, int) else int(response.created.timestamp())
+
+    def chunk(choices: list, usage: Optional[CompletionUsage] = None) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id=response.id, choices=choices, created=created, model=response.model, object="chat.completion.chunk", usage=usage
+        )
+
+    choice = response.choices[0]
+    message = choice.message
+    chunks = []
+    if message.reasoning_content:
+        chunks.append(chunk([ChunkChoice(index=0, delta=ChoiceDelta(role="assistant", reasoning_content=message.reasoning_content))]))
+    if message.content:
+        chunks.append(chunk([ChunkChoice(index=0, delta=ChoiceDelta(role="assistant", content=message.content))]))
+    for index, tool_call in enumerate(message.tool_calls or []):
+        delta_tool_call = ChoiceDeltaToolCall(
+            index=index,
+            id=tool_call.id,
+            type="function",
+            function=ChoiceDeltaToolCallFunction(name=tool_call.function.name, arguments=tool_call.function.arguments),
+        )
+        chunks.append(chunk([ChunkChoice(index=0, delta=ChoiceDelta(role="assistant", tool_calls=[delta_tool_call]))]))
+    chunks.append(chunk([ChunkChoice(index=0, delta=ChoiceDelta(), finish_reason=choice.finish_reason or "stop")]))
+    if response.usage:
+        usage = CompletionUsage(
+            prompt_tokens=response.usage.prompt_tokens or 0,
+            completion_tokens=response.usage.completion_tokens or 0,
+            total_tokens=response.usage.total_tokens or 0,
+        )
+        chunks.append(chunk([], usage=usage))
+    return chunks
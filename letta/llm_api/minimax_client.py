@@ -6,6 +6,7 @@ from anthropic.types.beta import BetaMessage, BetaRawMessageStreamEvent
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
 from letta.llm_api.anthropic_client import AnthropicClient
+from letta.llm_api.client_pool import get_pooled_client
 from letta.log import get_logger
 from letta.otel.tracing import trace_method
 from letta.schemas.agent import AgentType
@@ -45,7 +46,9 @@ class MiniMaxClient(AnthropicClient):
         base_url = llm_config.model_endpoint
 
         if async_client:
-            return anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=model_settings.anthropic_max_retries)
+            return get_pooled_client(
+                anthropic.AsyncAnthropic, "minimax", api_key=api_key, base_url=base_url, max_retries=model_settings.anthropic_max_retries
+            )
         return anthropic.Anthropic(api_key=api_key, base_url=base_url, max_retries=model_settings.anthropic_max_retries)
 
     @trace_method
@@ -62,7 +65,9 @@ class MiniMaxClient(AnthropicClient):
         base_url = llm_config.model_endpoint
 
         if async_client:
-            return anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=model_settings.anthropic_max_retries)
+            return get_pooled_client(
+                anthropic.AsyncAnthropic, "minimax", api_key=api_key, base_url=base_url, max_retries=model_settings.anthropic_max_retries
+            )
         return anthropic.Anthropic(api_key=api_key, base_url=base_url, max_retries=model_settings.anthropic_max_retries)
 
     @trace_method
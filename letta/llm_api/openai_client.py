@@ -32,6 +32,7 @@ from letta.errors import (
     LLMUnprocessableEntityError,
 )
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.error_utils import is_context_window_overflow_message, is_insufficient_credits_message
 from letta.llm_api.helpers import (
     add_inner_thoughts_to_functions,
@@ -39,6 +40,7 @@ from letta.llm_api.helpers import (
     unpack_all_inner_thoughts_from_kwargs,
 )
 from letta.llm_api.llm_client_base import LLMClientBase
+from letta.llm_api.openai_responses_chain import ResponsesChain, is_previous_response_error
 from letta.llm_api.openai_ws_session import AsyncStreamCompat, OpenAIWSSessionManager
 from letta.local_llm.constants import INNER_THOUGHTS_KWARG, INNER_THOUGHTS_KWARG_DESCRIPTION, INNER_THOUGHTS_KWARG_DESCRIPTION_GO_FIRST
 from letta.log import get_logger
@@ -772,7 +774,7 @@ class OpenAIClient(LLMClientBase):
         request_data = sanitize_unicode_surrogates(request_data)
 
         kwargs = await self._prepare_client_kwargs_async(llm_config)
-        client = AsyncOpenAI(**kwargs)
+        client = get_pooled_client(AsyncOpenAI, "openai", **kwargs)
         # Route based on payload shape: Responses uses 'input', Chat Completions uses 'messages'
         try:
             if "input" in request_data and "messages" not in request_data:
@@ -1010,6 +1012,7 @@ class OpenAIClient(LLMClientBase):
         llm_config: LLMConfig,
         use_websocket: bool = False,
         ws_session: OpenAIWSSessionManager | None = None,
+        responses_chain: ResponsesChain | None = None,
     ) -> AsyncStream[ChatCompletionChunk | ResponseStreamEvent] | AsyncIterator[ResponseStreamEvent]:
         """
         Performs underlying asynchronous streaming request to OpenAI and returns the async stream iterator.
@@ -1021,6 +1024,9 @@ class OpenAIClient(LLMClientBase):
                 ``use_websocket`` is True, the request is sent over WebSocket.
                 If ``use_websocket`` is True but no session is given, one is created
                 on-the-fly (but won't persist across steps — prefer passing one).
+            responses_chain: A ``ResponsesChain`` shared by the steps of a run. A Responses API request is then
+                chained to the previous step's response and sends only the new input items, falling back to the
+                full input when it can't be chained or the previous response is gone.
         """
         # Sanitize Unicode surrogates to prevent encoding errors
         request_data = sanitize_unicode_surrogates(request_data)
@@ -1035,6 +1041,8 @@ class OpenAIClient(LLMClientBase):
                 ws_session = OpenAIWSSessionManager(client_kwargs=kwargs)
             try:
                 # Wrap in AsyncStreamCompat so callers can use ``async with stream:``
+                if responses_chain is not None:
+                    return AsyncStreamCompat(self._stream_chained_ws(ws_session, responses_chain, request_data))
                 return AsyncStreamCompat(ws_session.stream_responses(request_data))
             except Exception as e:
                 logger.error(f"Error streaming OpenAI Responses WebSocket request: {e}")
@@ -1042,10 +1050,25 @@ class OpenAIClient(LLMClientBase):
 
         # --- HTTP SSE path (default) ---
         kwargs = await self._prepare_client_kwargs_async(llm_config)
-        client = AsyncOpenAI(**kwargs)
+        client = get_pooled_client(AsyncOpenAI, "openai", **kwargs)
 
         # Route based on payload shape: Responses uses 'input', Chat Completions uses 'messages'
-        if is_responses_request:
+        if is_responses_request and responses_chain is not None:
+            sent = responses_chain.prepare(request_data)
+            try:
+                try:
+                    response_stream: AsyncStream[ResponseStreamEvent] = await client.responses.create(**sent, stream=True)
+                except Exception as e:
+                    if "previous_response_id" not in sent or not is_previous_response_error(e):
+                        raise
+                    logger.info(f"Previous response can't be continued ({e}), resending the full input")
+                    sent = responses_chain.full_request(request_data)
+                    response_stream = await client.responses.create(**sent, stream=True)
+            except Exception as e:
+                responses_chain.reset()
+                logger.error(f"Error streaming OpenAI Responses request: {e} with request data: {json.dumps(sent)}")
+                raise e
+        elif is_responses_request:
             try:
                 response_stream: AsyncStream[ResponseStreamEvent] = await client.responses.create(
                     **request_data,
@@ -1067,6 +1090,27 @@ class OpenAIClient(LLMClientBase):
                 raise e
         return response_stream
 
+    @staticmethod
+    async def _stream_chained_ws(
+        ws_session: OpenAIWSSessionManager, responses_chain: ResponsesChain, request_data: dict
+    ) -> AsyncIterator[ResponseStreamEvent]:
+        """Stream a chained request over the WebSocket session, resending the full input if the server reports that
+        the previous response is gone (the session reconnected, or it expired)."""
+        # responses are kept on the connection, so they needn't be stored
+        sent = responses_chain.prepare(request_data, store=False)
+        events = ws_session.stream_responses(sent)
+        first = await anext(events, None)
+        if "previous_response_id" in sent and getattr(first, "type", None) == "error" and is_previous_response_error(first):
+            logger.info(f"Previous response can't be continued ({first.message}), resending the full input")
+            await events.aclose()
+            events = ws_session.stream_responses(responses_chain.full_request(request_data, store=False))
+            first = await anext(events, None)
+        if first is None:
+            return
+        yield first
+        async for event in events:
+            yield event
+
     @trace_method
     async def stream_async_responses(self, request_data: dict, llm_config: LLMConfig) -> AsyncStream[ResponseStreamEvent]:
         """
@@ -1076,7 +1120,7 @@ class OpenAIClient(LLMClientBase):
         request_data = sanitize_unicode_surrogates(request_data)
 
         kwargs = await self._prepare_client_kwargs_async(llm_config)
-        client = AsyncOpenAI(**kwargs)
+        client = get_pooled_client(AsyncOpenAI, "openai", **kwargs)
         response_stream: AsyncStream[ResponseStreamEvent] = await client.responses.create(**request_data, stream=True)
         return response_stream
 
@@ -1121,7 +1165,7 @@ class OpenAIClient(LLMClientBase):
         inputs = valid_inputs
 
         kwargs = self._prepare_client_kwargs_embedding(embedding_config)
-        client = AsyncOpenAI(**kwargs)
+        client = get_pooled_client(AsyncOpenAI, "openai", **kwargs)
 
         # track results by original index to maintain order
         results = [None] * len(inputs)
@@ -0,0 +1,126 @@
+"""
+Stateful chaining of OpenAI Responses API requests across agent steps.
+
+Every step of a run normally sends the whole input list built by
+``Message.to_openai_responses_dicts_from_list``, although the previous
+response already holds all of it plus the model's own output. A
+``ResponsesChain`` (one per run, like ``OpenAIWSSessionManager``) remembers
+the input it last sent and the id of the response it produced; when the next
+step's input extends that input, only the new items are sent, with
+``previous_response_id`` pointing at the response to continue.
+
+The full input is sent instead when the new input does not extend the last
+one (compaction or a system prompt change rewrites the head of the list) and,
+via ``is_previous_response_error``, when the server no longer has the response.
+
+Usage:
+    chain = ResponsesChain()
+    request_data = chain.prepare(request_data, store=True)
+    ...  # stream the response
+    chain.record(response_id)  # or chain.reset() if the step failed
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+from letta.log import get_logger
+
+logger = get_logger(__name__)
+
+# Request fields that must match for a chained request to continue the previous response.
+_CHAIN_KEYS = ("model", "instructions")
+
+
+def _is_model_output(item: dict) -> bool:
+    """Items the previous response produced itself, which the server already holds."""
+    return item.get("type") in ("reasoning", "function_call") or item.get("role") == "assistant"
+
+
+def _request_bytes(request_data: dict) -> int:
+    return len(json.dumps(request_data, ensure_ascii=False).encode("utf-8"))
+
+
+def is_previous_response_error(error: Any) -> bool:
+    """Whether an exception or error event says the ``previous_response_id`` can't be used (expired, not found, not stored)."""
+    code = getattr(error, "code", None)
+    body = getattr(error, "body", None)
+    if code is None and isinstance(body, dict):
+        code = (body.get("error") or body).get("code")
+    text = f"{code or ''} {getattr(error, 'message', None) or error}"
+    return "previous_response" in text
+
+
+class ResponsesChain:
+    """Chains the Responses API requests of one run with ``previous_response_id``."""
+
+    def __init__(self) -> None:
+        self.response_id: Optional[str] = None
+        self.chained_requests = 0
+        self.full_requests = 0
+        self.last_request_bytes: Optional[int] = None
+        self._sent_input: Optional[list] = None
+        self._sent_keys: Optional[tuple] = None
+        self._pending_input: Optional[list] = None
+        self._pending_keys: Optional[tuple] = None
+
+    def reset(self) -> None:
+        """Forget the previous response; the next request sends the full input."""
+        self.response_id = None
+        self._sent_input = self._sent_keys = None
+        self._pending_input = self._pending_keys = None
+
+    def _delta(self, full_input: list, keys: tuple) -> Optional[list]:
+        if self.response_id is None or self._sent_input is None or keys != self._sent_keys:
+            return None
+        sent = self._sent_input
+        if len(full_input) <= len(sent):
+            return None
+        if any(new is not old and new != old for new, old in zip(full_input, sent)):
+            return None
+        # skip what the previous response generated, then send the rest
+        start = len(sent)
+        while start < len(full_input) and _is_model_output(full_input[start]):
+            start += 1
+        delta = full_input[start:]
+        return delta or None
+
+    def prepare(self, request_data: dict, store: bool = True) -> dict:
+        """Return the request to send for ``request_data`` (a full Responses request), chained to the previous response
+        when its input extends the last one.
+
+        Args:
+            store: Ask the server to store responses so later steps can chain to them. Over a WebSocket session the
+                previous response is kept on the connection and this can stay off.
+        """
+        full_input = request_data["input"]
+        keys = tuple(request_data.get(key) for key in _CHAIN_KEYS)
+        delta = self._delta(full_input, keys)
+        self._pending_input, self._pending_keys = full_input, keys
+
+        if delta is None:
+            sent = {**request_data, "store": True} if store else dict(request_data)
+            sent.pop("previous_response_id", None)
+            self.full_requests += 1
+        else:
+            sent = {**request_data, "input": delta, "previous_response_id": self.response_id}
+            if store:
+                sent["store"] = True
+            self.chained_requests += 1
+        self.last_request_bytes = _request_bytes(sent)
+        return sent
+
+    def full_request(self, request_data: dict, store: bool = True) -> dict:
+        """The unchained form of a request ``prepare`` chained, to resend after the previous response was rejected."""
+        self.reset()
+        return self.prepare(request_data, store=store)
+
+    def record(self, response_id: Optional[str]) -> None:
+        """Chain the next request to ``response_id``, the response to the request last prepared."""
+        if response_id is None or self._pending_input is None:
+            self.reset()
+            return
+        self.response_id = response_id
+        self._sent_input, self._sent_keys = self._pending_input, self._pending_keys
+        self._pending_input = self._pending_keys = None
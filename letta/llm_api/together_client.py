@@ -5,6 +5,7 @@ from openai import AsyncOpenAI, OpenAI
 from openai.types.chat.chat_completion import ChatCompletion
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.otel.tracing import trace_method
 from letta.schemas.embedding_config import EmbeddingConfig
@@ -41,7 +42,7 @@ class TogetherClient(OpenAIClient):
 
         if not api_key:
             api_key = model_settings.together_api_key or os.environ.get("TOGETHER_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "together", api_key=api_key, base_url=llm_config.model_endpoint)
 
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
@@ -50,7 +51,7 @@ class TogetherClient(OpenAIClient):
     async def request_embeddings(self, inputs: List[str], embedding_config: EmbeddingConfig) -> List[List[float]]:
         """Request embeddings given texts and embedding config"""
         api_key = model_settings.together_api_key or os.environ.get("TOGETHER_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=embedding_config.embedding_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "together", api_key=api_key, base_url=embedding_config.embedding_endpoint)
         response = await client.embeddings.create(model=embedding_config.embedding_model, input=inputs)
 
         # TODO: add total usage
@@ -6,6 +6,7 @@ from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.otel.tracing import trace_method
 from letta.schemas.embedding_config import EmbeddingConfig
@@ -73,7 +74,7 @@ class XAIClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = model_settings.xai_api_key or os.environ.get("XAI_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "xai", api_key=api_key, base_url=llm_config.model_endpoint)
 
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
@@ -86,7 +87,7 @@ class XAIClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = model_settings.xai_api_key or os.environ.get("XAI_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "xai", api_key=api_key, base_url=llm_config.model_endpoint)
         response_stream: AsyncStream[ChatCompletionChunk] = await client.chat.completions.create(
             **request_data, stream=True, stream_options={"include_usage": True}
         )
@@ -96,7 +97,7 @@ class XAIClient(OpenAIClient):
     async def request_embeddings(self, inputs: List[str], embedding_config: EmbeddingConfig) -> List[List[float]]:
         """Request embeddings given texts and embedding config"""
         api_key = model_settings.xai_api_key or os.environ.get("XAI_API_KEY")
-        client = AsyncOpenAI(api_key=api_key, base_url=embedding_config.embedding_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "xai", api_key=api_key, base_url=embedding_config.embedding_endpoint)
         response = await client.embeddings.create(model=embedding_config.embedding_model, input=inputs)
 
         # TODO: add total usage
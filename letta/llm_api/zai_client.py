@@ -5,6 +5,7 @@ from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.helpers.json_helpers import sanitize_unicode_surrogates
+from letta.llm_api.client_pool import get_pooled_client
 from letta.llm_api.openai_client import OpenAIClient
 from letta.otel.tracing import trace_method
 from letta.schemas.embedding_config import EmbeddingConfig
@@ -157,7 +158,7 @@ class ZAIClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = await self._get_api_key_async(llm_config)
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "zai", api_key=api_key, base_url=llm_config.model_endpoint)
 
         response: ChatCompletion = await client.chat.completions.create(**request_data)
         return response.model_dump()
@@ -170,7 +171,7 @@ class ZAIClient(OpenAIClient):
         request_data = sanitize_unicode_surrogates(request_data)
 
         api_key = await self._get_api_key_async(llm_config)
-        client = AsyncOpenAI(api_key=api_key, base_url=llm_config.model_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "zai", api_key=api_key, base_url=llm_config.model_endpoint)
         response_stream: AsyncStream[ChatCompletionChunk] = await client.chat.completions.create(
             **request_data, stream=True, stream_options={"include_usage": True}
         )
@@ -180,7 +181,7 @@ class ZAIClient(OpenAIClient):
     async def request_embeddings(self, inputs: List[str], embedding_config: EmbeddingConfig) -> List[List[float]]:
         """Request embeddings given texts and embedding config"""
         api_key = model_settings.zai_api_key
-        client = AsyncOpenAI(api_key=api_key, base_url=embedding_config.embedding_endpoint)
+        client = get_pooled_client(AsyncOpenAI, "zai", api_key=api_key, base_url=embedding_config.embedding_endpoint)
         response = await client.embeddings.create(model=embedding_config.embedding_model, input=inputs)
 
         return [r.embedding for r in response.data]
@@ -1,7 +1,10 @@
 """Key idea: create drop-in replacement for agent's ChatCompletion call that runs on an OpenLLM backend"""
 
+import asyncio
 import uuid
+from typing import Callable, Optional
 
+import httpx
 import requests
 
 from letta.constants import CLI_WARNING_PREFIX
@@ -11,14 +14,15 @@ from letta.helpers.json_helpers import json_dumps
 from letta.local_llm.constants import DEFAULT_WRAPPER
 from letta.local_llm.function_parser import patch_function
 from letta.local_llm.grammars.gbnf_grammar_generator import create_dynamic_model_from_function, generate_gbnf_grammar_and_documentation
-from letta.local_llm.koboldcpp.api import get_koboldcpp_completion
-from letta.local_llm.llamacpp.api import get_llamacpp_completion
+from letta.local_llm.grammars.grammar_cache import grammar_cache, grammar_cache_key
+from letta.local_llm.koboldcpp.api import get_koboldcpp_completion, get_koboldcpp_completion_async
+from letta.local_llm.llamacpp.api import get_llamacpp_completion, get_llamacpp_completion_async
 from letta.local_llm.llm_chat_completion_wrappers import simple_summary_wrapper
-from letta.local_llm.lmstudio.api import get_lmstudio_completion, get_lmstudio_completion_chatcompletions
-from letta.local_llm.ollama.api import get_ollama_completion
+from letta.local_llm.lmstudio.api import get_lmstudio_completion, get_lmstudio_completion_async, get_lmstudio_completion_chatcompletions
+from letta.local_llm.ollama.api import get_ollama_completion, get_ollama_completion_async
 from letta.local_llm.utils import get_available_wrappers
 from letta.local_llm.vllm.api import get_vllm_completion
-from letta.local_llm.webui.api import get_webui_completion
+from letta.local_llm.webui.api import get_webui_completion, get_webui_completion_async
 from letta.local_llm.webui.legacy_api import get_webui_completion as get_webui_completion_legacy
 from letta.otel.tracing import log_event
 from letta.prompts.gpt_summarize import SYSTEM as SUMMARIZE_SYSTEM_MESSAGE
@@ -52,11 +56,131 @@ def get_chat_completion(
     auth_type=None,
     auth_key=None,
 ) -> ChatCompletionResponse:
-    from letta.utils import printd
+    assert context_window is not None, "Local LLM calls need the context length to be explicitly set"
+    assert endpoint is not None, "Local LLM calls need the endpoint (eg http://localendpoint:1234) to be explicitly set"
+    assert endpoint_type is not None, "Local LLM calls need the endpoint type (eg webui) to be explicitly set"
 
+    messages, llm_wrapper, prompt, grammar = _prepare_prompt(
+        messages, functions, functions_python, function_call, wrapper, endpoint_type, first_message
+    )
+
+    # Run the LLM
+    try:
+        result_reasoning = None
+        if endpoint_type == "webui":
+            result, usage = get_webui_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
+        elif endpoint_type == "webui-legacy":
+            result, usage = get_webui_completion_legacy(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
+        elif endpoint_type == "lmstudio-chatcompletions":
+            result, usage, result_reasoning = get_lmstudio_completion_chatcompletions(endpoint, auth_type, auth_key, model, messages)
+        elif endpoint_type == "lmstudio":
+            result, usage = get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_window, api="completions")
+        elif endpoint_type == "lmstudio-legacy":
+            result, usage = get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_window, api="chat")
+        elif endpoint_type == "llamacpp":
+            result, usage = get_llamacpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
+        elif endpoint_type == "koboldcpp":
+            result, usage = get_koboldcpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
+        elif endpoint_type == "ollama":
+            result, usage = get_ollama_completion(endpoint, auth_type, auth_key, model, prompt, context_window)
+        elif endpoint_type == "vllm":
+            result, usage = get_vllm_completion(endpoint, auth_type, auth_key, model, prompt, context_window, user)
+        else:
+            raise LocalLLMError(
+                f"Invalid endpoint type {endpoint_type}, please set variable depending on your backend (webui, lmstudio, llamacpp, koboldcpp)"
+            )
+    except requests.exceptions.ConnectionError:
+        raise LocalLLMConnectionError(f"Unable to connect to endpoint {endpoint}")
+
+    return _to_chat_completion_response(
+        result, usage, result_reasoning, llm_wrapper, messages, prompt, model, endpoint, first_message, function_correction
+    )
+
+
+async def get_chat_completion_async(
+    model,
+    messages,
+    functions=None,
+    functions_python=None,
+    function_call="auto",
+    context_window=None,
+    user=None,
+    wrapper=None,
+    endpoint=None,
+    endpoint_type=None,
+    function_correction=True,
+    first_message=False,
+    auth_type=None,
+    auth_key=None,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> ChatCompletionResponse:
+    """Async version of ``get_chat_completion``.
+
+    The webui, lmstudio, llamacpp, koboldcpp and ollama backends are called over a pooled ``httpx`` client; with
+    ``on_token`` their completions are streamed and the raw text is passed to it as it arrives (the response is
+    still parsed once complete). The remaining backends run the blocking client in a worker thread.
+    """
     assert context_window is not None, "Local LLM calls need the context length to be explicitly set"
     assert endpoint is not None, "Local LLM calls need the endpoint (eg http://localendpoint:1234) to be explicitly set"
     assert endpoint_type is not None, "Local LLM calls need the endpoint type (eg webui) to be explicitly set"
+
+    messages, llm_wrapper, prompt, grammar = _prepare_prompt(
+        messages, functions, functions_python, function_call, wrapper, endpoint_type, first_message
+    )
+
+    # Run the LLM
+    try:
+        result_reasoning = None
+        if endpoint_type == "webui":
+            result, usage = await get_webui_completion_async(
+                endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar, on_token=on_token
+            )
+        elif endpoint_type == "webui-legacy":
+            result, usage = await asyncio.to_thread(
+                get_webui_completion_legacy, endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar
+            )
+        elif endpoint_type == "lmstudio-chatcompletions":
+            result, usage, result_reasoning = await asyncio.to_thread(
+                get_lmstudio_completion_chatcompletions, endpoint, auth_type, auth_key, model, messages
+            )
+        elif endpoint_type == "lmstudio":
+            result, usage = await get_lmstudio_completion_async(
+                endpoint, auth_type, auth_key, prompt, context_window, api="completions", on_token=on_token
+            )
+        elif endpoint_type == "lmstudio-legacy":
+            result, usage = await get_lmstudio_completion_async(
+                endpoint, auth_type, auth_key, prompt, context_window, api="chat", on_token=on_token
+            )
+        elif endpoint_type == "llamacpp":
+            result, usage = await get_llamacpp_completion_async(
+                endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar, on_token=on_token
+            )
+        elif endpoint_type == "koboldcpp":
+            result, usage = await get_koboldcpp_completion_async(
+                endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar, on_token=on_token
+            )
+        elif endpoint_type == "ollama":
+            result, usage = await get_ollama_completion_async(
+                endpoint, auth_type, auth_key, model, prompt, context_window, on_token=on_token
+            )
+        elif endpoint_type == "vllm":
+            result, usage = await asyncio.to_thread(get_vllm_completion, endpoint, auth_type, auth_key, model, prompt, context_window, user)
+        else:
+            raise LocalLLMError(
+                f"Invalid endpoint type {endpoint_type}, please set variable depending on your backend (webui, lmstudio, llamacpp, koboldcpp)"
+            )
+    except (requests.exceptions.ConnectionError, httpx.ConnectError):
+        raise LocalLLMConnectionError(f"Unable to connect to endpoint {endpoint}")
+
+    return _to_chat_completion_response(
+        result, usage, result_reasoning, llm_wrapper, messages, prompt, model, endpoint, first_message, function_correction
+    )
+
+
+def _prepare_prompt(messages, functions, functions_python, function_call, wrapper, endpoint_type, first_message):
+    """Pick the prompt formatter and turn the message sequence into (messages, wrapper, prompt, grammar)"""
+    from letta.utils import printd
+
     global has_shown_warning
     grammar = None
 
@@ -152,33 +276,14 @@ def get_chat_completion(
         model_schema = None
     """
     log_event(name="llm_request_sent", attributes={"prompt": prompt, "grammar": grammar})
-    # Run the LLM
-    try:
-        result_reasoning = None
-        if endpoint_type == "webui":
-            result, usage = get_webui_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
-        elif endpoint_type == "webui-legacy":
-            result, usage = get_webui_completion_legacy(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
-        elif endpoint_type == "lmstudio-chatcompletions":
-            result, usage, result_reasoning = get_lmstudio_completion_chatcompletions(endpoint, auth_type, auth_key, model, messages)
-        elif endpoint_type == "lmstudio":
-            result, usage = get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_window, api="completions")
-        elif endpoint_type == "lmstudio-legacy":
-            result, usage = get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_window, api="chat")
-        elif endpoint_type == "llamacpp":
-            result, usage = get_llamacpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
-        elif endpoint_type == "koboldcpp":
-            result, usage = get_koboldcpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=grammar)
-        elif endpoint_type == "ollama":
-            result, usage = get_ollama_completion(endpoint, auth_type, auth_key, model, prompt, context_window)
-        elif endpoint_type == "vllm":
-            result, usage = get_vllm_completion(endpoint, auth_type, auth_key, model, prompt, context_window, user)
-        else:
-            raise LocalLLMError(
-                f"Invalid endpoint type {endpoint_type}, please set variable depending on your backend (webui, lmstudio, llamacpp, koboldcpp)"
-            )
-    except requests.exceptions.ConnectionError:
-        raise LocalLLMConnectionError(f"Unable to connect to endpoint {endpoint}")
+    return messages, llm_wrapper, prompt, grammar
+
+
+def _to_chat_completion_response(
+    result, usage, result_reasoning, llm_wrapper, messages, prompt, model, endpoint, first_message, function_correction
+) -> ChatCompletionResponse:
+    """Parse the raw completion text of the local LLM into a ChatCompletionResponse"""
+    from letta.utils import printd
 
     attributes = usage if isinstance(usage, dict) else {"usage": usage}
     attributes.update({"result": result})
@@ -261,6 +366,25 @@ def generate_grammar_and_documentation(
     add_inner_thoughts_top_level: bool,
     add_inner_thoughts_param_level: bool,
     allow_only_inner_thoughts: bool,
+):
+    """Grammar and documentation for ``functions_python``, reused from ``grammar_cache`` for a tool set and options
+    seen before"""
+    options = dict(
+        add_inner_thoughts_top_level=add_inner_thoughts_top_level,
+        add_inner_thoughts_param_level=add_inner_thoughts_param_level,
+        allow_only_inner_thoughts=allow_only_inner_thoughts,
+    )
+    return grammar_cache.get_or_create(
+        grammar_cache_key(functions_python, **options),
+        lambda: _generate_grammar_and_documentation(functions_python=functions_python, **options),
+    )
+
+
+def _generate_grammar_and_documentation(
+    functions_python: dict,
+    add_inner_thoughts_top_level: bool,
+    add_inner_thoughts_param_level: bool,
+    allow_only_inner_thoughts: bool,
 ):
     from letta.utils import printd
 
@@ -0,0 +1,67 @@
+"""Cache of the GBNF grammars (and function documentation) generated for local LLM tool sets.
+
+Building a grammar turns every function into a pydantic model (``create_dynamic_model_from_function``) and renders
+the grammar and documentation from them, which costs far more than the request that uses it, yet an agent sends
+the same tool set on every step. Entries are keyed by a hash of the functions' schemas as the grammar generator
+sees them (name, signature and docstring) together with the wrapper's grammar options, so any agent with an
+identical tool set and wrapper reuses the same grammar.
+"""
+
+import hashlib
+import inspect
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+GRAMMAR_CACHE_MAX_ENTRIES = 128
+
+
+def grammar_cache_key(functions_python: Dict[str, Callable], **options) -> str:
+    """Hash of the function schemas in ``functions_python`` and the grammar ``options``."""
+    schemas = [
+        (name, getattr(func, "__name__", name), str(inspect.signature(func)), inspect.getdoc(func) or "")
+        for name, func in sorted(functions_python.items())
+    ]
+    payload = json.dumps({"functions": schemas, "options": options}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GrammarCache:
+    """LRU of ``(grammar, documentation)`` pairs, shared by the threads and event loops of the process."""
+
+    def __init__(self, max_entries: int = GRAMMAR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_create(self, key: str, factory: Callable[[], Tuple[str, str]]) -> Tuple[str, str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # generated outside the lock; a concurrent miss on the same key just builds the same grammar twice
+        entry = factory()
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+grammar_cache = GrammarCache()
@@ -1,23 +1,22 @@
+import asyncio
+from typing import Callable, Optional
 from urllib.parse import urljoin
 
 from letta.local_llm.settings.settings import get_completions_settings
-from letta.local_llm.utils import post_json_auth_request
+from letta.local_llm.utils import post_json_auth_request, post_json_auth_request_async, stream_json_auth_request_async
 
 KOBOLDCPP_API_SUFFIX = "/api/v1/generate"
+KOBOLDCPP_API_STREAM_SUFFIX = "/api/extra/generate/stream"
 
 
-def get_koboldcpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=None):
-    """See https://lite.koboldai.net/koboldcpp_api for API spec"""
-    from letta.utils import printd
-
+def _prepare_request(endpoint, prompt, context_window, grammar, settings, suffix=KOBOLDCPP_API_SUFFIX):
     # Approximate token count: bytes / 4
     prompt_tokens = len(prompt.encode("utf-8")) // 4
     if prompt_tokens > context_window:
         raise Exception(f"Request exceeds maximum context length ({prompt_tokens} > {context_window} tokens)")
 
     # Settings for the generation, includes the prompt + stop tokens, max length, etc
-    settings = get_completions_settings()
-    request = settings
+    request = dict(settings)
     request["prompt"] = prompt
     request["max_context_length"] = context_window
     request["max_length"] = 400  # if we don't set this, it'll default to 100 which is quite short
@@ -29,35 +28,66 @@ def get_koboldcpp_completion(endpoint, auth_type, auth_key, prompt, context_wind
     if not endpoint.startswith(("http://", "https://")):
         raise ValueError(f"Provided OPENAI_API_BASE value ({endpoint}) must begin with http:// or https://")
 
-    try:
-        # NOTE: llama.cpp server returns the following when it's out of context
-        # curl: (52) Empty reply from server
-        URI = urljoin(endpoint.strip("/") + "/", KOBOLDCPP_API_SUFFIX.strip("/"))
-        response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
-        if response.status_code == 200:
-            result_full = response.json()
-            printd(f"JSON API response:\n{result_full}")
-            result = result_full["results"][0]["text"]
-        else:
-            raise Exception(
-                f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
-                + f" Make sure that the koboldcpp server is running and reachable at {URI}."
-            )
-
-    except:
-        # TODO handle gracefully
-        raise
+    # NOTE: llama.cpp server returns the following when it's out of context
+    # curl: (52) Empty reply from server
+    URI = urljoin(endpoint.strip("/") + "/", suffix.strip("/"))
+    return URI, request, prompt_tokens
+
 
+def _usage(prompt_tokens):
     # Pass usage statistics back to main thread
     # These are used to compute memory warning messages
     # KoboldCpp doesn't return anything?
     # https://lite.koboldai.net/koboldcpp_api#/v1/post_v1_generate
     completion_tokens = None
     total_tokens = prompt_tokens + completion_tokens if completion_tokens is not None else None
-    usage = {
+    return {
         "prompt_tokens": prompt_tokens,
         "completion_tokens": completion_tokens,
         "total_tokens": total_tokens,
     }
 
-    return result, usage
+
+def _raise_for_status(response, URI):
+    if response.status_code != 200:
+        raise Exception(
+            f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
+            + f" Make sure that the koboldcpp server is running and reachable at {URI}."
+        )
+
+
+def get_koboldcpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=None):
+    """See https://lite.koboldai.net/koboldcpp_api for API spec"""
+    from letta.utils import printd
+
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, get_completions_settings())
+    response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+    _raise_for_status(response, URI)
+    result_full = response.json()
+    printd(f"JSON API response:\n{result_full}")
+    return result_full["results"][0]["text"], _usage(prompt_tokens)
+
+
+async def get_koboldcpp_completion_async(
+    endpoint, auth_type, auth_key, prompt, context_window, grammar=None, on_token: Optional[Callable[[str], None]] = None
+):
+    """Async version of ``get_koboldcpp_completion``. With ``on_token``, the completion is streamed (from
+    ``/api/extra/generate/stream``) and each token is passed to it as it arrives."""
+    from letta.utils import printd
+
+    settings = await asyncio.to_thread(get_completions_settings)
+    if on_token is None:
+        URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, settings)
+        response = await post_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+        _raise_for_status(response, URI)
+        result_full = response.json()
+        printd(f"JSON API response:\n{result_full}")
+        return result_full["results"][0]["text"], _usage(prompt_tokens)
+
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, settings, suffix=KOBOLDCPP_API_STREAM_SUFFIX)
+    parts = []
+    async for chunk in stream_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key):
+        if chunk.get("token"):
+            parts.append(chunk["token"])
+            on_token(chunk["token"])
+    return "".join(parts), _usage(prompt_tokens)
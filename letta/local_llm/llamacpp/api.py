@@ -1,23 +1,21 @@
+import asyncio
+from typing import Callable, Optional
 from urllib.parse import urljoin
 
 from letta.local_llm.settings.settings import get_completions_settings
-from letta.local_llm.utils import post_json_auth_request
+from letta.local_llm.utils import post_json_auth_request, post_json_auth_request_async, stream_json_auth_request_async
 
 LLAMACPP_API_SUFFIX = "/completion"
 
 
-def get_llamacpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=None):
-    """See https://github.com/ggerganov/llama.cpp/blob/master/examples/server/README.md for instructions on how to run the LLM web server"""
-    from letta.utils import printd
-
+def _prepare_request(endpoint, prompt, context_window, grammar, settings):
     # Approximate token count: bytes / 4
     prompt_tokens = len(prompt.encode("utf-8")) // 4
     if prompt_tokens > context_window:
         raise Exception(f"Request exceeds maximum context length ({prompt_tokens} > {context_window} tokens)")
 
     # Settings for the generation, includes the prompt + stop tokens, max length, etc
-    settings = get_completions_settings()
-    request = settings
+    request = dict(settings)
     request["prompt"] = prompt
 
     # Set grammar
@@ -27,33 +25,67 @@ def get_llamacpp_completion(endpoint, auth_type, auth_key, prompt, context_windo
     if not endpoint.startswith(("http://", "https://")):
         raise ValueError(f"Provided OPENAI_API_BASE value ({endpoint}) must begin with http:// or https://")
 
-    try:
-        # NOTE: llama.cpp server returns the following when it's out of context
-        # curl: (52) Empty reply from server
-        URI = urljoin(endpoint.strip("/") + "/", LLAMACPP_API_SUFFIX.strip("/"))
-        response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
-        if response.status_code == 200:
-            result_full = response.json()
-            printd(f"JSON API response:\n{result_full}")
-            result = result_full["content"]
-        else:
-            raise Exception(
-                f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
-                + f" Make sure that the llama.cpp server is running and reachable at {URI}."
-            )
-
-    except:
-        # TODO handle gracefully
-        raise
+    # NOTE: llama.cpp server returns the following when it's out of context
+    # curl: (52) Empty reply from server
+    URI = urljoin(endpoint.strip("/") + "/", LLAMACPP_API_SUFFIX.strip("/"))
+    return URI, request, prompt_tokens
+
 
+def _usage(prompt_tokens, result_full):
     # Pass usage statistics back to main thread
     # These are used to compute memory warning messages
     completion_tokens = result_full.get("tokens_predicted", None)
     total_tokens = prompt_tokens + completion_tokens if completion_tokens is not None else None
-    usage = {
+    return {
         "prompt_tokens": prompt_tokens,  # can grab from "tokens_evaluated", but it's usually wrong (set to 0)
         "completion_tokens": completion_tokens,
         "total_tokens": total_tokens,
     }
 
-    return result, usage
+
+def _raise_for_status(response, URI):
+    if response.status_code != 200:
+        raise Exception(
+            f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
+            + f" Make sure that the llama.cpp server is running and reachable at {URI}."
+        )
+
+
+def get_llamacpp_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=None):
+    """See https://github.com/ggerganov/llama.cpp/blob/master/examples/server/README.md for instructions on how to run the LLM web server"""
+    from letta.utils import printd
+
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, get_completions_settings())
+    response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+    _raise_for_status(response, URI)
+    result_full = response.json()
+    printd(f"JSON API response:\n{result_full}")
+    return result_full["content"], _usage(prompt_tokens, result_full)
+
+
+async def get_llamacpp_completion_async(
+    endpoint, auth_type, auth_key, prompt, context_window, grammar=None, on_token: Optional[Callable[[str], None]] = None
+):
+    """Async version of ``get_llamacpp_completion``. With ``on_token``, the completion is streamed and each piece of
+    text is passed to it as it arrives."""
+    from letta.utils import printd
+
+    settings = await asyncio.to_thread(get_completions_settings)
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, settings)
+    if on_token is None:
+        response = await post_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+        _raise_for_status(response, URI)
+        result_full = response.json()
+        printd(f"JSON API response:\n{result_full}")
+        return result_full["content"], _usage(prompt_tokens, result_full)
+
+    request["stream"] = True
+    parts, result_full = [], {}
+    async for chunk in stream_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key):
+        if chunk.get("content"):
+            parts.append(chunk["content"])
+            on_token(chunk["content"])
+        if chunk.get("stop"):
+            # the final chunk carries the generation stats
+            result_full = chunk
+    return "".join(parts), _usage(prompt_tokens, result_full)
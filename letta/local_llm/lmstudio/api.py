@@ -1,8 +1,10 @@
+import asyncio
 import json
+from typing import Callable, Optional
 from urllib.parse import urljoin
 
 from letta.local_llm.settings.settings import get_completions_settings
-from letta.local_llm.utils import post_json_auth_request
+from letta.local_llm.utils import post_json_auth_request, post_json_auth_request_async, stream_json_auth_request_async
 
 LMSTUDIO_API_CHAT_SUFFIX = "/v1/chat/completions"
 LMSTUDIO_API_COMPLETIONS_SUFFIX = "/v1/completions"
@@ -75,16 +77,13 @@ def get_lmstudio_completion_chatcompletions(endpoint, auth_type, auth_key, model
     return result, usage, result_reasoning
 
 
-def get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_window, api="completions"):
-    """Based on the example for using LM Studio as a backend from https://github.com/lmstudio-ai/examples/tree/main/Hello%2C%20world%20-%20OpenAI%20python%20client"""
-    from letta.utils import printd
-
+def _prepare_request(endpoint, prompt, context_window, api, settings):
     # Approximate token count: bytes / 4
     prompt_tokens = len(prompt.encode("utf-8")) // 4
     if prompt_tokens > context_window:
         raise Exception(f"Request exceeds maximum context length ({prompt_tokens} > {context_window} tokens)")
 
-    settings = get_completions_settings()
+    settings = dict(settings)
     settings.update(
         {
             "input_prefix": "",
@@ -130,45 +129,86 @@ def get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_windo
     if not endpoint.startswith(("http://", "https://")):
         raise ValueError(f"Provided OPENAI_API_BASE value ({endpoint}) must begin with http:// or https://")
 
-    try:
-        response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
-        if response.status_code == 200:
-            result_full = response.json()
-            printd(f"JSON API response:\n{result_full}")
-            if api == "chat":
-                result = result_full["choices"][0]["message"]["content"]
-                usage = result_full.get("usage", None)
-            elif api == "completions":
-                result = result_full["choices"][0]["text"]
-                usage = result_full.get("usage", None)
-            elif api == "chat/completions":
-                result = result_full["choices"][0]["content"]
-                result_full["choices"][0]["reasoning_content"]
-                usage = result_full.get("usage", None)
+    return URI, request, prompt_tokens
 
-        else:
-            # Example error: msg={"error":"Context length exceeded. Tokens in context: 8000, Context length: 8000"}
-            if "context length" in str(response.text).lower():
-                # "exceeds context length" is what appears in the LM Studio error message
-                # raise an alternate exception that matches OpenAI's message, which is "maximum context length"
-                raise Exception(f"Request exceeds maximum context length (code={response.status_code}, msg={response.text}, URI={URI})")
-            else:
-                raise Exception(
-                    f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
-                    + f" Make sure that the LM Studio local inference server is running and reachable at {URI}."
-                )
-    except:
-        # TODO handle gracefully
-        raise
 
+def _parse_response(result_full, api):
+    if api == "chat":
+        result = result_full["choices"][0]["message"]["content"]
+        usage = result_full.get("usage", None)
+    elif api == "completions":
+        result = result_full["choices"][0]["text"]
+        usage = result_full.get("usage", None)
+    elif api == "chat/completions":
+        result = result_full["choices"][0]["content"]
+        result_full["choices"][0]["reasoning_content"]
+        usage = result_full.get("usage", None)
+    return result, usage
+
+
+def _usage(prompt_tokens, usage):
     # Pass usage statistics back to main thread
     # These are used to compute memory warning messages
     completion_tokens = usage.get("completion_tokens", None) if usage is not None else None
     total_tokens = prompt_tokens + completion_tokens if completion_tokens is not None else None
-    usage = {
+    return {
         "prompt_tokens": prompt_tokens,  # can grab from usage dict, but it's usually wrong (set to 0)
         "completion_tokens": completion_tokens,
         "total_tokens": total_tokens,
     }
 
-    return result, usage
+
+def _raise_for_status(response, URI):
+    if response.status_code != 200:
+        # Example error: msg={"error":"Context length exceeded. Tokens in context: 8000, Context length: 8000"}
+        if "context length" in str(response.text).lower():
+            # "exceeds context length" is what appears in the LM Studio error message
+            # raise an alternate exception that matches OpenAI's message, which is "maximum context length"
+            raise Exception(f"Request exceeds maximum context length (code={response.status_code}, msg={response.text}, URI={URI})")
+        else:
+            raise Exception(
+                f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
+                + f" Make sure that the LM Studio local inference server is running and reachable at {URI}."
+            )
+
+
+def get_lmstudio_completion(endpoint, auth_type, auth_key, prompt, context_window, api="completions"):
+    """Based on the example for using LM Studio as a backend from https://github.com/lmstudio-ai/examples/tree/main/Hello%2C%20world%20-%20OpenAI%20python%20client"""
+    from letta.utils import printd
+
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, api, get_completions_settings())
+    response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+    _raise_for_status(response, URI)
+    result_full = response.json()
+    printd(f"JSON API response:\n{result_full}")
+    result, usage = _parse_response(result_full, api)
+    return result, _usage(prompt_tokens, usage)
+
+
+async def get_lmstudio_completion_async(
+    endpoint, auth_type, auth_key, prompt, context_window, api="completions", on_token: Optional[Callable[[str], None]] = None
+):
+    """Async version of ``get_lmstudio_completion``. With ``on_token``, the completion is streamed and each piece of
+    text is passed to it as it arrives."""
+    from letta.utils import printd
+
+    settings = await asyncio.to_thread(get_completions_settings)
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, api, settings)
+    if on_token is None:
+        response = await post_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+        _raise_for_status(response, URI)
+        result_full = response.json()
+        printd(f"JSON API response:\n{result_full}")
+        result, usage = _parse_response(result_full, api)
+        return result, _usage(prompt_tokens, usage)
+
+    request["stream"] = True
+    parts, usage = [], None
+    async for chunk in stream_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key):
+        choice = chunk["choices"][0] if chunk.get("choices") else {}
+        text = choice.get("delta", {}).get("content") if api == "chat" else choice.get("text")
+        if text:
+            parts.append(text)
+            on_token(text)
+        usage = chunk.get("usage") or usage
+    return "".join(parts), _usage(prompt_tokens, usage)
@@ -1,16 +1,15 @@
+import asyncio
+from typing import Callable, Optional
 from urllib.parse import urljoin
 
 from letta.errors import LocalLLMError
 from letta.local_llm.settings.settings import get_completions_settings
-from letta.local_llm.utils import post_json_auth_request
+from letta.local_llm.utils import post_json_auth_request, post_json_auth_request_async, stream_json_auth_request_async
 
 OLLAMA_API_SUFFIX = "/api/generate"
 
 
-def get_ollama_completion(endpoint, auth_type, auth_key, model, prompt, context_window, grammar=None):
-    """See https://github.com/jmorganca/ollama/blob/main/docs/api.md for instructions on how to run the LLM web server"""
-    from letta.utils import printd
-
+def _prepare_request(endpoint, model, prompt, context_window, grammar, settings):
     # Approximate token count: bytes / 4
     prompt_tokens = len(prompt.encode("utf-8")) // 4
     if prompt_tokens > context_window:
@@ -23,7 +22,7 @@ def get_ollama_completion(endpoint, auth_type, auth_key, model, prompt, context_
 
     # Settings for the generation, includes the prompt + stop tokens, max length, etc
     # https://github.com/jmorganca/ollama/blob/main/docs/modelfile.md#valid-parameters-and-values
-    settings = get_completions_settings()
+    settings = dict(settings)
     settings.update(
         {
             # specific naming for context length
@@ -56,33 +55,67 @@ def get_ollama_completion(endpoint, auth_type, auth_key, model, prompt, context_
     if not endpoint.startswith(("http://", "https://")):
         raise ValueError(f"Provided OPENAI_API_BASE value ({endpoint}) must begin with http:// or https://")
 
-    try:
-        URI = urljoin(endpoint.strip("/") + "/", OLLAMA_API_SUFFIX.strip("/"))
-        response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
-        if response.status_code == 200:
-            # https://github.com/jmorganca/ollama/blob/main/docs/api.md
-            result_full = response.json()
-            printd(f"JSON API response:\n{result_full}")
-            result = result_full["response"]
-        else:
-            raise Exception(
-                f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
-                + f" Make sure that the ollama API server is running and reachable at {URI}."
-            )
-
-    except:
-        # TODO handle gracefully
-        raise
+    URI = urljoin(endpoint.strip("/") + "/", OLLAMA_API_SUFFIX.strip("/"))
+    return URI, request, prompt_tokens
+
 
+def _usage(prompt_tokens, result_full):
     # Pass usage statistics back to main thread
     # These are used to compute memory warning messages
     # https://github.com/jmorganca/ollama/blob/main/docs/api.md#response
     completion_tokens = result_full.get("eval_count", None)
     total_tokens = prompt_tokens + completion_tokens if completion_tokens is not None else None
-    usage = {
+    return {
         "prompt_tokens": prompt_tokens,  # can also grab from "prompt_eval_count"
         "completion_tokens": completion_tokens,
         "total_tokens": total_tokens,
     }
 
-    return result, usage
+
+def _raise_for_status(response, URI):
+    if response.status_code != 200:
+        raise Exception(
+            f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
+            + f" Make sure that the ollama API server is running and reachable at {URI}."
+        )
+
+
+def get_ollama_completion(endpoint, auth_type, auth_key, model, prompt, context_window, grammar=None):
+    """See https://github.com/jmorganca/ollama/blob/main/docs/api.md for instructions on how to run the LLM web server"""
+    from letta.utils import printd
+
+    URI, request, prompt_tokens = _prepare_request(endpoint, model, prompt, context_window, grammar, get_completions_settings())
+    response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+    _raise_for_status(response, URI)
+    # https://github.com/jmorganca/ollama/blob/main/docs/api.md
+    result_full = response.json()
+    printd(f"JSON API response:\n{result_full}")
+    return result_full["response"], _usage(prompt_tokens, result_full)
+
+
+async def get_ollama_completion_async(
+    endpoint, auth_type, auth_key, model, prompt, context_window, grammar=None, on_token: Optional[Callable[[str], None]] = None
+):
+    """Async version of ``get_ollama_completion``. With ``on_token``, the completion is streamed and each piece of text
+    is passed to it as it arrives."""
+    from letta.utils import printd
+
+    settings = await asyncio.to_thread(get_completions_settings)
+    URI, request, prompt_tokens = _prepare_request(endpoint, model, prompt, context_window, grammar, settings)
+    if on_token is None:
+        response = await post_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+        _raise_for_status(response, URI)
+        result_full = response.json()
+        printd(f"JSON API response:\n{result_full}")
+        return result_full["response"], _usage(prompt_tokens, result_full)
+
+    # streamed as newline-delimited JSON objects, the last one ("done": true) with the generation stats
+    request["stream"] = True
+    parts, result_full = [], {}
+    async for chunk in stream_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key):
+        if chunk.get("response"):
+            parts.append(chunk["response"])
+            on_token(chunk["response"])
+        if chunk.get("done"):
+            result_full = chunk
+    return "".join(parts), _usage(prompt_tokens, result_full)
@@ -1,6 +1,9 @@
+import json
 import os
-from typing import List, Union
+from typing import AsyncIterator, List, Union
+from urllib.parse import urlparse
 
+import httpx
 import requests
 import tiktoken
 
@@ -10,37 +13,80 @@ import letta.local_llm.llm_chat_completion_wrappers.configurable_wrapper as conf
 import letta.local_llm.llm_chat_completion_wrappers.dolphin as dolphin
 import letta.local_llm.llm_chat_completion_wrappers.llama3 as llama3
 import letta.local_llm.llm_chat_completion_wrappers.zephyr as zephyr
+from letta.errors import LocalLLMError
+from letta.llm_api.client_pool import shared_http_client
 from letta.log import get_logger
 from letta.schemas.openai.chat_completion_request import Tool, ToolCall
 
 logger = get_logger(__name__)
 
 
-def post_json_auth_request(uri, json_payload, auth_type, auth_key):
-    """Send a POST request with a JSON payload and optional authentication"""
+def _auth_headers(auth_type, auth_key) -> dict:
+    """Request headers for the local LLM server's authentication type"""
 
     # By default most local LLM inference servers do not have authorization enabled
     if auth_type is None or auth_type == "":
-        response = requests.post(uri, json=json_payload)
+        return {}
 
     # Used by OpenAI, together.ai, Mistral AI
     elif auth_type == "bearer_token":
         if not auth_key:
             raise ValueError(f"auth_type is {auth_type}, but auth_key is null or empty")
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {auth_key}"}
-        response = requests.post(uri, json=json_payload, headers=headers)
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {auth_key}"}
 
     # Used by OpenAI Azure
     elif auth_type == "api_key":
         if not auth_key:
             raise ValueError(f"auth_type is {auth_type}, but auth_key is null or empty")
-        headers = {"Content-Type": "application/json", "api-key": f"{auth_key}"}
-        response = requests.post(uri, json=json_payload, headers=headers)
+        return {"Content-Type": "application/json", "api-key": f"{auth_key}"}
 
     else:
         raise ValueError(f"Unsupport authentication type: {auth_type}")
 
-    return response
+
+def post_json_auth_request(uri, json_payload, auth_type, auth_key):
+    """Send a POST request with a JSON payload and optional authentication"""
+    headers = _auth_headers(auth_type, auth_key)
+    if headers:
+        return requests.post(uri, json=json_payload, headers=headers)
+    return requests.post(uri, json=json_payload)
+
+
+def _http_client(uri):
+    """Keep-alive client shared by all requests to the server at ``uri`` (on this event loop)"""
+    parsed = urlparse(uri)
+    return shared_http_client("local_llm", f"{parsed.scheme}://{parsed.netloc}")
+
+
+async def post_json_auth_request_async(uri, json_payload, auth_type, auth_key) -> httpx.Response:
+    """Async version of ``post_json_auth_request``, over a pooled ``httpx`` client"""
+    async with _http_client(uri) as client:
+        return await client.post(uri, json=json_payload, headers=_auth_headers(auth_type, auth_key))
+
+
+async def stream_json_auth_request_async(uri, json_payload, auth_type, auth_key) -> AsyncIterator[dict]:
+    """POST a streaming request and yield the JSON objects the server streams back.
+
+    Handles both server-sent events (``data: {...}`` lines, as sent by llama.cpp, koboldcpp and the OpenAI-compatible
+    servers) and newline-delimited JSON (Ollama). Raises ``LocalLLMError`` if the server doesn't answer with 200.
+    """
+    async with (
+        _http_client(uri) as client,
+        client.stream("POST", uri, json=json_payload, headers=_auth_headers(auth_type, auth_key)) as response,
+    ):
+        if response.status_code != 200:
+            text = (await response.aread()).decode("utf-8", errors="replace")
+            raise LocalLLMError(f"API call got non-200 response code (code={response.status_code}, msg={text}) for address: {uri}.")
+        async for line in response.aiter_lines():
+            line = line.strip()
+            if line.startswith("data:"):
+                line = line[len("data:") :].strip()
+            elif not line.startswith("{"):
+                # blank separators, "event:" / "id:" fields and comments
+                continue
+            if not line or line == "[DONE]":
+                continue
+            yield json.loads(line)
 
 
 def load_grammar_file(grammar):
@@ -1,23 +1,21 @@
+import asyncio
+from typing import Callable, Optional
 from urllib.parse import urljoin
 
 from letta.local_llm.settings.settings import get_completions_settings
-from letta.local_llm.utils import post_json_auth_request
+from letta.local_llm.utils import post_json_auth_request, post_json_auth_request_async, stream_json_auth_request_async
 
 WEBUI_API_SUFFIX = "/v1/completions"
 
 
-def get_webui_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=None):
-    """Compatibility for the new OpenAI API: https://github.com/oobabooga/text-generation-webui/wiki/12-%E2%80%90-OpenAI-API#examples"""
-    from letta.utils import printd
-
+def _prepare_request(endpoint, prompt, context_window, grammar, settings):
     # Approximate token count: bytes / 4
     prompt_tokens = len(prompt.encode("utf-8")) // 4
     if prompt_tokens > context_window:
         raise Exception(f"Request exceeds maximum context length ({prompt_tokens} > {context_window} tokens)")
 
     # Settings for the generation, includes the prompt + stop tokens, max length, etc
-    settings = get_completions_settings()
-    request = settings
+    request = dict(settings)
     request["prompt"] = prompt
     request["truncation_length"] = context_window
     request["max_tokens"] = int(context_window - prompt_tokens)
@@ -30,32 +28,64 @@ def get_webui_completion(endpoint, auth_type, auth_key, prompt, context_window,
     if not endpoint.startswith(("http://", "https://")):
         raise ValueError(f"Endpoint value ({endpoint}) must begin with http:// or https://")
 
-    try:
-        URI = urljoin(endpoint.strip("/") + "/", WEBUI_API_SUFFIX.strip("/"))
-        response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
-        if response.status_code == 200:
-            result_full = response.json()
-            printd(f"JSON API response:\n{result_full}")
-            result = result_full["choices"][0]["text"]
-            usage = result_full.get("usage", None)
-        else:
-            raise Exception(
-                f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
-                + f" Make sure that the web UI server is running and reachable at {URI}."
-            )
-
-    except:
-        # TODO handle gracefully
-        raise
+    URI = urljoin(endpoint.strip("/") + "/", WEBUI_API_SUFFIX.strip("/"))
+    return URI, request, prompt_tokens
+
 
+def _usage(prompt_tokens, usage):
     # Pass usage statistics back to main thread
     # These are used to compute memory warning messages
     completion_tokens = usage.get("completion_tokens", None) if usage is not None else None
     total_tokens = prompt_tokens + completion_tokens if completion_tokens is not None else None
-    usage = {
+    return {
         "prompt_tokens": prompt_tokens,  # can grab from usage dict, but it's usually wrong (set to 0)
         "completion_tokens": completion_tokens,
         "total_tokens": total_tokens,
     }
 
-    return result, usage
+
+def _raise_for_status(response, URI):
+    if response.status_code != 200:
+        raise Exception(
+            f"API call got non-200 response code (code={response.status_code}, msg={response.text}) for address: {URI}."
+            + f" Make sure that the web UI server is running and reachable at {URI}."
+        )
+
+
+def get_webui_completion(endpoint, auth_type, auth_key, prompt, context_window, grammar=None):
+    """Compatibility for the new OpenAI API: https://github.com/oobabooga/text-generation-webui/wiki/12-%E2%80%90-OpenAI-API#examples"""
+    from letta.utils import printd
+
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, get_completions_settings())
+    response = post_json_auth_request(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+    _raise_for_status(response, URI)
+    result_full = response.json()
+    printd(f"JSON API response:\n{result_full}")
+    return result_full["choices"][0]["text"], _usage(prompt_tokens, result_full.get("usage", None))
+
+
+async def get_webui_completion_async(
+    endpoint, auth_type, auth_key, prompt, context_window, grammar=None, on_token: Optional[Callable[[str], None]] = None
+):
+    """Async version of ``get_webui_completion``. With ``on_token``, the completion is streamed and each piece of text
+    is passed to it as it arrives."""
+    from letta.utils import printd
+
+    settings = await asyncio.to_thread(get_completions_settings)
+    URI, request, prompt_tokens = _prepare_request(endpoint, prompt, context_window, grammar, settings)
+    if on_token is None:
+        response = await post_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key)
+        _raise_for_status(response, URI)
+        result_full = response.json()
+        printd(f"JSON API response:\n{result_full}")
+        return result_full["choices"][0]["text"], _usage(prompt_tokens, result_full.get("usage", None))
+
+    request["stream"] = True
+    parts, usage = [], None
+    async for chunk in stream_json_auth_request_async(uri=URI, json_payload=request, auth_type=auth_type, auth_key=auth_key):
+        text = chunk["choices"][0].get("text") if chunk.get("choices") else None
+        if text:
+            parts.append(text)
+            on_token(text)
+        usage = chunk.get("usage") or usage
+    return "".join(parts), _usage(prompt_tokens, usage)
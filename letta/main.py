@@ -1,11 +1,12 @@
 import typer
 
-from letta.cli.cli import server
+from letta.cli.cli import server, sleeptime_worker
 
 app = typer.Typer(pretty_exceptions_enable=False)
 
 # Register server as both the default command and as a subcommand
 app.command(name="server")(server)
+app.command(name="sleeptime-worker")(sleeptime_worker)
 
 
 # Also make server the default when no command is specified
@@ -74,6 +74,12 @@ class LoadGate:
             count = self._bg_count
         self._check_bg(count)
 
+    @property
+    def fg_in_flight(self) -> int:
+        """Foreground runs currently in progress on this pod (background work yields to these)."""
+        with self._lock:
+            return self._fg_count
+
     def on_admission_wait(self, wait_ms: float) -> None:
         """Evaluate admission wait after each lock acquisition."""
         try:
@@ -31,6 +31,7 @@ from letta.orm.prompt import Prompt as Prompt
 from letta.orm.provider import Provider as Provider
 from letta.orm.provider_model import ProviderModel as ProviderModel
 from letta.orm.provider_trace import ProviderTrace as ProviderTrace
+from letta.orm.provider_trace_blob import ProviderTraceBlob as ProviderTraceBlob
 from letta.orm.provider_trace_metadata import ProviderTraceMetadata as ProviderTraceMetadata
 from letta.orm.run import Run as Run
 from letta.orm.run_metrics import RunMetrics as RunMetrics
@@ -45,4 +46,9 @@ from letta.orm.step import Step as Step
 from letta.orm.step_metrics import StepMetrics as StepMetrics
 from letta.orm.tool import Tool as Tool
 from letta.orm.tools_agents import ToolsAgents as ToolsAgents
+from letta.orm.usage_rollup import (
+    AgentUsageRollup as AgentUsageRollup,
+    OrganizationUsageRollup as OrganizationUsageRollup,
+    RunUsageRollup as RunUsageRollup,
+)
 from letta.orm.user import User as User
@@ -475,6 +475,14 @@ class Agent(SqlalchemyBase, OrganizationMixin, ProjectMixin, TemplateEntityMixin
             tags, tools, sources, memory, identities, multi_agent_group, tool_exec_environment_variables, file_agents, pending_approval
         )
 
+        per_file_view_window_char_limit = self._get_per_file_view_window_char_limit()
+        shared_views = {}
+        if any(b.shared_view for b in file_agents) and (session := async_object_session(self)) is not None:
+            # imported here to avoid a circular import: the renderer imports the ORM models
+            from letta.services.file_processor.file_views import render_file_views
+
+            shared_views = await render_file_views(session, file_agents, max_chars=per_file_view_window_char_limit)
+
         state["tags"] = [t.tag for t in tags]
         state["tools"] = [t.to_pydantic() for t in tools]
         state["sources"] = [s.to_pydantic() for s in sources]
@@ -483,7 +491,10 @@ class Agent(SqlalchemyBase, OrganizationMixin, ProjectMixin, TemplateEntityMixin
             file_blocks=[
                 block
                 for b in file_agents
-                if (block := b.to_pydantic_block(per_file_view_window_char_limit=self._get_per_file_view_window_char_limit())) is not None
+                if (
+                    block := b.to_pydantic_block(per_file_view_window_char_limit=per_file_view_window_char_limit, shared_views=shared_views)
+                )
+                is not None
             ],
             agent_type=self.agent_type,
             git_enabled="git-memory-enabled" in state["tags"],
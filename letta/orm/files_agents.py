@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, false, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from letta.orm.mixins import OrganizationMixin
@@ -70,6 +70,13 @@ class FileAgent(SqlalchemyBase, OrganizationMixin):
 
     is_open: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True, doc="True if the agent currently has the file open.")
     visible_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True, doc="Portion of the file the agent is focused on.")
+    shared_view: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=false(),
+        doc="True if the view is rendered from the shared file content for [start_line, end_line) instead of stored in visible_content.",
+    )
     last_accessed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -92,8 +99,10 @@ class FileAgent(SqlalchemyBase, OrganizationMixin):
     )
 
     # TODO: This is temporary as we figure out if we want FileBlock as a first class citizen
-    def to_pydantic_block(self, per_file_view_window_char_limit: int) -> PydanticFileBlock:
-        visible_content = truncate_file_visible_content(self.visible_content, self.is_open, per_file_view_window_char_limit)
+    def to_pydantic_block(self, per_file_view_window_char_limit: int, shared_views: Optional[Dict[str, str]] = None) -> PydanticFileBlock:
+        """``shared_views`` holds the rendered views of shared-view rows by row id (see ``file_views.render_file_views``)."""
+        visible_content = (shared_views or {}).get(self.id) if self.shared_view else self.visible_content
+        visible_content = truncate_file_visible_content(visible_content, self.is_open, per_file_view_window_char_limit)
 
         return PydanticFileBlock(
             value=visible_content,
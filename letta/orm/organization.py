@@ -22,6 +22,7 @@ if TYPE_CHECKING:
     from letta.orm.provider import Provider
     from letta.orm.provider_model import ProviderModel
     from letta.orm.provider_trace import ProviderTrace
+    from letta.orm.provider_trace_blob import ProviderTraceBlob
     from letta.orm.run import Run
     from letta.orm.sandbox_config import AgentEnvironmentVariable, SandboxConfig, SandboxEnvironmentVariable
     from letta.orm.tool import Tool
@@ -79,3 +80,6 @@ class Organization(SqlalchemyBase):
     provider_traces: Mapped[List["ProviderTrace"]] = relationship(
         "ProviderTrace", back_populates="organization", cascade="all, delete-orphan"
     )
+    provider_trace_blobs: Mapped[List["ProviderTraceBlob"]] = relationship(
+        "ProviderTraceBlob", back_populates="organization", cascade="all, delete-orphan"
+    )
@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import JSON, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from letta.orm.mixins import OrganizationMixin
+from letta.orm.sqlalchemy_base import SqlalchemyBase
+
+if TYPE_CHECKING:
+    from letta.orm.organization import Organization
+
+
+class ProviderTraceBlob(SqlalchemyBase, OrganizationMixin):
+    """A content-addressed piece of a provider request (one message, tool schema or system prompt).
+
+    In deduplicated storage mode, provider_traces.request_json holds a manifest of blob ids instead of the repeated
+    context window, so consecutive steps of an agent only store the messages that are new.
+    """
+
+    __tablename__ = "provider_trace_blobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, doc="Content hash of the blob, scoped to the organization")
+    content: Mapped[dict] = mapped_column(JSON, doc="JSON content of the request element")
+
+    # Relationships
+    organization: Mapped["Organization"] = relationship("Organization", back_populates="provider_trace_blobs")
@@ -59,6 +59,11 @@ class StepMetrics(SqlalchemyBase, ProjectMixin, AgentMixin):
         nullable=True,
         doc="Time spent on the LLM request in nanoseconds",
     )
+    llm_request_bytes: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        doc="Size of the request body sent to the LLM provider in bytes",
+    )
     tool_execution_ns: Mapped[Optional[int]] = mapped_column(
         BigInteger,
         nullable=True,
@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, declarative_mixin, mapped_column
+
+from letta.orm.base import Base
+
+
+@declarative_mixin
+class UsageCountersMixin:
+    """Token and step counters shared by the usage rollup tables."""
+
+    step_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, doc="Number of steps logged")
+    prompt_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, doc="Number of tokens in the prompts")
+    completion_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, doc="Number of tokens generated")
+    total_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, doc="Total number of tokens processed")
+    cached_input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, doc="Number of input tokens served from cache")
+    cache_write_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, doc="Number of input tokens written to cache")
+    reasoning_tokens: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, doc="Number of reasoning/thinking tokens generated"
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RunUsageRollup(UsageCountersMixin, Base):
+    """Usage of a run, summed over its steps."""
+
+    __tablename__ = "run_usage_rollups"
+
+    run_id: Mapped[str] = mapped_column(String, ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True)
+    organization_id: Mapped[str] = mapped_column(String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    agent_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, doc="The agent that performed the run's steps")
+
+
+class AgentUsageRollup(UsageCountersMixin, Base):
+    """Usage of an agent per hour or per day, bucketed by step creation time (UTC)."""
+
+    __tablename__ = "agent_usage_rollups"
+    __table_args__ = (Index("ix_agent_usage_rollups_org_bucket", "organization_id", "granularity", "bucket_start"),)
+
+    # no foreign key to agents: like steps, usage outlives the agent it was recorded for
+    agent_id: Mapped[str] = mapped_column(String, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String, primary_key=True, doc="Bucket width, 'hour' or 'day'")
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, doc="Start of the bucket (UTC)")
+    organization_id: Mapped[str] = mapped_column(String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+
+
+class OrganizationUsageRollup(UsageCountersMixin, Base):
+    """Usage of an organization per day, bucketed by step creation time (UTC)."""
+
+    __tablename__ = "organization_usage_rollups"
+
+    organization_id: Mapped[str] = mapped_column(String, ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, doc="Start of the day (UTC)")
@@ -166,6 +166,44 @@ class MetricRegistry:
             ),
         )
 
+    # (includes mode)
+    @property
+    def step_checkpoint_time_ms_histogram(self) -> Histogram:
+        return self._get_or_create_metric(
+            "hist_step_checkpoint_time_ms",
+            partial(
+                self._meter.create_histogram,
+                name="hist_step_checkpoint_time_ms",
+                description="Histogram for the time spent persisting a step checkpoint (ms)",
+                unit="ms",
+            ),
+        )
+
+    # (includes mode)
+    @property
+    def step_checkpoint_transactions_saved_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "step_checkpoint_transactions_saved_total",
+            partial(
+                self._meter.create_counter,
+                name="step_checkpoint_transactions_saved_total",
+                description="DB transactions avoided by writing each step checkpoint in a single transaction.",
+                unit="1",
+            ),
+        )
+
+    @property
+    def memory_edits_coalesced_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "memory_edits_coalesced_total",
+            partial(
+                self._meter.create_counter,
+                name="memory_edits_coalesced_total",
+                description="Memory tool edits written together with an earlier edit of the same step instead of on their own.",
+                unit="1",
+            ),
+        )
+
     # TODO (cliandy): instrument this
     @property
     def message_cost(self) -> Histogram:
@@ -319,6 +357,31 @@ class MetricRegistry:
             ),
         )
 
+    @property
+    def system_prompt_rebuild_queue_depth_gauge(self) -> Gauge:
+        return self._get_or_create_metric(
+            "system_prompt_rebuild_queue_depth",
+            partial(
+                self._meter.create_gauge,
+                name="system_prompt_rebuild_queue_depth",
+                description="Agents with a deferred system prompt rebuild pending after a shared block changed.",
+                unit="1",
+            ),
+        )
+
+    # (includes reason)
+    @property
+    def provider_trace_dropped_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "provider_trace_dropped_total",
+            partial(
+                self._meter.create_counter,
+                name="provider_trace_dropped_total",
+                description="Provider traces dropped by the batched writer because its queue was full or a batch failed to write.",
+                unit="1",
+            ),
+        )
+
     # (includes operation)
     @property
     def redis_timeout_counter(self) -> Counter:
@@ -332,6 +395,96 @@ class MetricRegistry:
             ),
         )
 
+    # (includes embedding_model, tier)
+    @property
+    def embedding_cache_hit_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "embedding_cache_hit_total",
+            partial(
+                self._meter.create_counter,
+                name="embedding_cache_hit_total",
+                description="Number of texts whose embedding was served from the embedding cache.",
+                unit="1",
+            ),
+        )
+
+    # (includes embedding_model)
+    @property
+    def embedding_cache_miss_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "embedding_cache_miss_total",
+            partial(
+                self._meter.create_counter,
+                name="embedding_cache_miss_total",
+                description="Number of texts that had to be embedded by the provider.",
+                unit="1",
+            ),
+        )
+
+    @property
+    def agent_state_cache_hit_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "agent_state_cache_hit_total",
+            partial(
+                self._meter.create_counter,
+                name="agent_state_cache_hit_total",
+                description="Number of agent loads served from the in-process AgentState cache.",
+                unit="1",
+            ),
+        )
+
+    # (includes reason: absent, stale, expired)
+    @property
+    def agent_state_cache_miss_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "agent_state_cache_miss_total",
+            partial(
+                self._meter.create_counter,
+                name="agent_state_cache_miss_total",
+                description="Number of agent loads that went to the database; stale means another write bumped the version.",
+                unit="1",
+            ),
+        )
+
+    # (includes scope: agent, global)
+    @property
+    def agent_state_cache_invalidation_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "agent_state_cache_invalidation_total",
+            partial(
+                self._meter.create_counter,
+                name="agent_state_cache_invalidation_total",
+                description="Number of AgentState version bumps published after committed writes.",
+                unit="1",
+            ),
+        )
+
+    # (includes provider, pool)
+    @property
+    def llm_client_pool_hit_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "llm_client_pool_hit_total",
+            partial(
+                self._meter.create_counter,
+                name="llm_client_pool_hit_total",
+                description="Number of requests that reused a pooled provider SDK client or HTTP connection pool.",
+                unit="1",
+            ),
+        )
+
+    # (includes provider, pool)
+    @property
+    def llm_client_pool_miss_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "llm_client_pool_miss_total",
+            partial(
+                self._meter.create_counter,
+                name="llm_client_pool_miss_total",
+                description="Number of provider SDK clients or HTTP connection pools that had to be constructed.",
+                unit="1",
+            ),
+        )
+
     # (includes provider)
     @property
     def provider_timeout_counter(self) -> Counter:
@@ -3,8 +3,9 @@ import inspect
 import itertools
 import json
 import re
+import reprlib
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Dict, List, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, Request
@@ -19,7 +20,7 @@ from opentelemetry.trace import Status, StatusCode
 
 from letta.log import get_logger
 from letta.otel.resource import get_resource, is_pytest_environment
-from letta.settings import settings
+from letta.settings import settings, telemetry_settings
 
 logger = get_logger(__name__)  # TODO: set up logger config for this
 tracer = trace.get_tracer(__name__)
@@ -225,8 +226,222 @@ def setup_tracing(
         app.exception_handler(Exception)(_trace_error_handler)
 
 
+# How @trace_method records call parameters on spans that are sampled (telemetry_settings.trace_parameter_capture)
+CAPTURE_IDS = "ids"  # only *_id parameters and the ids of objects passed in
+CAPTURE_CAPPED = "capped"  # every parameter, each cut to trace_parameter_max_chars (request_data included)
+CAPTURE_FULL = "full"  # every parameter, up to 2MB each
+CAPTURE_POLICIES = (CAPTURE_IDS, CAPTURE_CAPPED, CAPTURE_FULL)
+
+# Parameters to skip entirely (known to be large)
+# This is opt-out: only skip specific large objects
+SKIP_PARAMS = frozenset(
+    {
+        "agent_state",
+        "messages",
+        "in_context_messages",
+        "message_sequence",
+        "content",  # File content, large text
+        "tool_returns",
+        "memory",
+        "sources",
+        "context",
+        "source_code",  # Full code files
+        "system",  # System prompts
+        "text_chunks",  # Large arrays of text
+        "embeddings",  # Vector arrays
+        "embedding",  # Single vectors
+        "file_bytes",  # Binary data
+        "chunks",  # Large chunk arrays
+    }
+)
+
+# Priority parameters that should ALWAYS be logged (exempt from opt-out)
+NEVER_SKIP_PARAMS = frozenset({"request_data"})
+
+# Max size for parameter value strings under the "full" policy
+FULL_MAX_PARAM_SIZE = 1024 * 1024 * 2  # 2MB (supports ~500k tokens)
+# Max total size for all parameters
+MAX_TOTAL_SIZE = 1024 * 1024 * 4  # 4MB
+
+
+@lru_cache(maxsize=8)
+def _parse_capture_overrides(raw: str) -> Dict[str, str]:
+    overrides = {}
+    for entry in raw.split(","):
+        name, _, policy = entry.partition("=")
+        if name.strip() and policy.strip() in CAPTURE_POLICIES:
+            overrides[name.strip()] = policy.strip()
+        elif entry.strip():
+            logger.warning(f"Ignoring invalid trace parameter capture override: {entry!r}")
+    return overrides
+
+
+def get_parameter_capture_policy(qualname: str) -> str:
+    """Capture policy for the function with this ``__qualname__``, from telemetry settings."""
+    overrides = _parse_capture_overrides(telemetry_settings.trace_parameter_capture_overrides)
+    return overrides.get(qualname, telemetry_settings.trace_parameter_capture)
+
+
+@lru_cache(maxsize=8)
+def _bounded_repr(max_chars: int) -> reprlib.Repr:
+    # Stops walking containers early instead of repr-ing them whole and truncating afterwards
+    bounded = reprlib.Repr()
+    bounded.maxstring = bounded.maxother = bounded.maxlong = max_chars
+    bounded.maxlist = bounded.maxtuple = bounded.maxset = bounded.maxfrozenset = bounded.maxdeque = bounded.maxdict = 8
+    bounded.maxlevel = 3
+    return bounded
+
+
+def _excluded_param_value(value) -> str:
+    # Try to extract ID for observability
+    type_name = type(value).__name__
+    id_info = ""
+
+    try:
+        # Handle lists/iterables (e.g., messages)
+        if hasattr(value, "__iter__") and not isinstance(value, (str, bytes, dict)):
+            ids = []
+            count = 0
+            # Use itertools.islice to avoid converting entire iterable
+            for item in itertools.islice(value, 5):
+                count += 1
+                if hasattr(item, "id"):
+                    ids.append(str(item.id))
+
+            # Try to get total count if it's a sized iterable
+            total_count = None
+            if hasattr(value, "__len__"):
+                try:
+                    total_count = len(value)
+                except (TypeError, AttributeError):
+                    pass
+
+            if ids:
+                suffix = ""
+                if total_count is not None and total_count > 5:
+                    suffix = f"... ({total_count} total)"
+                elif count == 5:
+                    suffix = "..."
+                id_info = f", ids=[{','.join(ids)}{suffix}]"
+        # Handle single objects with id attribute
+        elif hasattr(value, "id"):
+            id_info = f", id={value.id}"
+    except (TypeError, AttributeError, ValueError):
+        pass
+
+    return f"<{type_name} (excluded{id_info})>"
+
+
+def _param_value(value, max_size: int, policy: str) -> str:
+    # For simple types, use str directly
+    if isinstance(value, (str, int, float, bool, type(None))):
+        str_value = str(value)
+    elif policy != CAPTURE_FULL and isinstance(value, (list, tuple, dict, set, frozenset)):
+        try:
+            str_value = _bounded_repr(max_size).repr(value)
+        except Exception as e:
+            str_value = f"<serialization failed: {type(e).__name__}>"
+    else:
+        # For complex objects, try to get a truncated representation
+        try:
+            # Test if str() works (some objects have broken __str__)
+            try:
+                str(value)
+                # If str() works and is reasonable, use repr
+                str_value = repr(value)
+            except Exception:
+                # If str() fails, mark as serialization failed
+                raise ValueError("str() failed")
+
+            # If repr is already too long, try to be smarter
+            if len(str_value) > max_size * 2:
+                # For collections, show just the type and size
+                if hasattr(value, "__len__"):
+                    try:
+                        str_value = f"<{type(value).__name__} with {len(value)} items>"
+                    except (TypeError, AttributeError):
+                        str_value = f"<{type(value).__name__}>"
+                else:
+                    str_value = f"<{type(value).__name__}>"
+        except (RecursionError, MemoryError, ValueError):
+            # Handle cases where repr or str causes issues
+            str_value = f"<serialization failed: {type(value).__name__}>"
+        except Exception as e:
+            # Fallback for any other issues
+            str_value = f"<serialization failed: {type(e).__name__}>"
+
+    # Apply size limit
+    original_size = len(str_value)
+    if original_size > max_size:
+        str_value = str_value[:max_size] + f"... (truncated, original size: {original_size} chars)"
+    return str_value
+
+
+def _add_parameters_to_span(span, signature: inspect.Signature, skips_self: bool, args, kwargs, policy: str) -> None:
+    try:
+        # Add method parameters as span attributes
+        bound_args = signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+
+        # Skip 'self' when adding parameters if it exists
+        param_items = list(bound_args.arguments.items())
+        if skips_self:
+            param_items = param_items[1:]
+
+        max_size = FULL_MAX_PARAM_SIZE if policy == CAPTURE_FULL else telemetry_settings.trace_parameter_max_chars
+        total_size = 0
+
+        for name, value in param_items:
+            try:
+                # Check if we've exceeded total size limit (except for priority params)
+                if total_size > MAX_TOTAL_SIZE and name not in NEVER_SKIP_PARAMS:
+                    span.set_attribute("parameters.truncated", True)
+                    span.set_attribute("parameters.truncated_reason", f"Total size exceeded {MAX_TOTAL_SIZE} bytes")
+                    break
+
+                if policy == CAPTURE_IDS:
+                    if name == "id" or name.endswith("_id") or name.endswith("_ids"):
+                        param_value = _param_value(value, max_size, policy)
+                    elif hasattr(value, "id") and not isinstance(value, type):
+                        param_value = f"<{type(value).__name__} id={value.id}>"
+                    else:
+                        continue
+                # Skip parameters known to be large (opt-out list, but respect ALWAYS_LOG)
+                elif name in SKIP_PARAMS and name not in NEVER_SKIP_PARAMS:
+                    param_value = _excluded_param_value(value)
+                else:
+                    param_value = _param_value(value, max_size, policy)
+
+                span.set_attribute(f"parameter.{name}", param_value)
+                total_size += len(param_value)
+
+            except (TypeError, ValueError, AttributeError, RecursionError, MemoryError) as e:
+                try:
+                    error_msg = f"<serialization failed: {type(e).__name__}>"
+                    span.set_attribute(f"parameter.{name}", error_msg)
+                    total_size += len(error_msg)
+                except Exception:
+                    # If even the fallback fails, skip this parameter
+                    pass
+
+    except (TypeError, ValueError, AttributeError) as e:
+        logger.debug(f"Failed to add parameters to span: {type(e).__name__}: {e}")
+    except Exception as e:
+        # Catch-all for any other unexpected exceptions
+        logger.debug(f"Unexpected error adding parameters to span: {type(e).__name__}: {e}")
+
+
 def trace_method(func):
-    """Decorator that traces function execution with OpenTelemetry"""
+    """Decorator that traces function execution with OpenTelemetry.
+
+    Parameters are only captured on spans the sampler records, following the function's capture policy
+    (see ``get_parameter_capture_policy``). The signature is inspected once, when the function is decorated.
+    """
+
+    signature = inspect.signature(func)
+    first_param = next(iter(signature.parameters), None)
+    skips_self = first_param in ("self", "cls")
+    qualname = func.__qualname__
 
     def _get_span_name(func, args):
         if args and hasattr(args[0], "__class__"):
@@ -235,156 +450,9 @@ def trace_method(func):
             class_name = func.__module__
         return f"{class_name}.{func.__name__}"
 
-    def _add_parameters_to_span(span, func, args, kwargs):
-        try:
-            # Add method parameters as span attributes
-            sig = inspect.signature(func)
-            bound_args = sig.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-
-            # Skip 'self' when adding parameters if it exists
-            param_items = list(bound_args.arguments.items())
-            if args and hasattr(args[0], "__class__"):
-                param_items = param_items[1:]
-
-            # Parameters to skip entirely (known to be large)
-            # This is opt-out: only skip specific large objects
-            SKIP_PARAMS = {
-                "agent_state",
-                "messages",
-                "in_context_messages",
-                "message_sequence",
-                "content",  # File content, large text
-                "tool_returns",
-                "memory",
-                "sources",
-                "context",
-                "source_code",  # Full code files
-                "system",  # System prompts
-                "text_chunks",  # Large arrays of text
-                "embeddings",  # Vector arrays
-                "embedding",  # Single vectors
-                "file_bytes",  # Binary data
-                "chunks",  # Large chunk arrays
-            }
-
-            # Priority parameters that should ALWAYS be logged (exempt from opt-out)
-            NEVER_SKIP_PARAMS = {"request_data"}
-
-            # Max size for parameter value strings
-            MAX_PARAM_SIZE = 1024 * 1024 * 2  # 2MB (supports ~500k tokens)
-            # Max total size for all parameters
-            MAX_TOTAL_SIZE = 1024 * 1024 * 4  # 4MB
-            total_size = 0
-
-            for name, value in param_items:
-                try:
-                    # Check if we've exceeded total size limit (except for priority params)
-                    if total_size > MAX_TOTAL_SIZE and name not in NEVER_SKIP_PARAMS:
-                        span.set_attribute("parameters.truncated", True)
-                        span.set_attribute("parameters.truncated_reason", f"Total size exceeded {MAX_TOTAL_SIZE} bytes")
-                        break
-
-                    # Skip parameters known to be large (opt-out list, but respect ALWAYS_LOG)
-                    if name in SKIP_PARAMS and name not in NEVER_SKIP_PARAMS:
-                        # Try to extract ID for observability
-                        type_name = type(value).__name__
-                        id_info = ""
-
-                        try:
-                            # Handle lists/iterables (e.g., messages)
-                            if hasattr(value, "__iter__") and not isinstance(value, (str, bytes, dict)):
-                                ids = []
-                                count = 0
-                                # Use itertools.islice to avoid converting entire iterable
-                                for item in itertools.islice(value, 5):
-                                    count += 1
-                                    if hasattr(item, "id"):
-                                        ids.append(str(item.id))
-
-                                # Try to get total count if it's a sized iterable
-                                total_count = None
-                                if hasattr(value, "__len__"):
-                                    try:
-                                        total_count = len(value)
-                                    except (TypeError, AttributeError):
-                                        pass
-
-                                if ids:
-                                    suffix = ""
-                                    if total_count is not None and total_count > 5:
-                                        suffix = f"... ({total_count} total)"
-                                    elif count == 5:
-                                        suffix = "..."
-                                    id_info = f", ids=[{','.join(ids)}{suffix}]"
-                            # Handle single objects with id attribute
-                            elif hasattr(value, "id"):
-                                id_info = f", id={value.id}"
-                        except (TypeError, AttributeError, ValueError):
-                            pass
-
-                        param_value = f"<{type_name} (excluded{id_info})>"
-                        span.set_attribute(f"parameter.{name}", param_value)
-                        total_size += len(param_value)
-                        continue
-
-                    # Try repr first with length limit, fallback to str if needed
-                    str_value = None
-
-                    # For simple types, use str directly
-                    if isinstance(value, (str, int, float, bool, type(None))):
-                        str_value = str(value)
-                    else:
-                        # For complex objects, try to get a truncated representation
-                        try:
-                            # Test if str() works (some objects have broken __str__)
-                            try:
-                                str(value)
-                                # If str() works and is reasonable, use repr
-                                str_value = repr(value)
-                            except Exception:
-                                # If str() fails, mark as serialization failed
-                                raise ValueError("str() failed")
-
-                            # If repr is already too long, try to be smarter
-                            if len(str_value) > MAX_PARAM_SIZE * 2:
-                                # For collections, show just the type and size
-                                if hasattr(value, "__len__"):
-                                    try:
-                                        str_value = f"<{type(value).__name__} with {len(value)} items>"
-                                    except (TypeError, AttributeError):
-                                        str_value = f"<{type(value).__name__}>"
-                                else:
-                                    str_value = f"<{type(value).__name__}>"
-                        except (RecursionError, MemoryError, ValueError):
-                            # Handle cases where repr or str causes issues
-                            str_value = f"<serialization failed: {type(value).__name__}>"
-                        except Exception as e:
-                            # Fallback for any other issues
-                            str_value = f"<serialization failed: {type(e).__name__}>"
-
-                    # Apply size limit
-                    original_size = len(str_value)
-                    if original_size > MAX_PARAM_SIZE:
-                        str_value = str_value[:MAX_PARAM_SIZE] + f"... (truncated, original size: {original_size} chars)"
-
-                    span.set_attribute(f"parameter.{name}", str_value)
-                    total_size += len(str_value)
-
-                except (TypeError, ValueError, AttributeError, RecursionError, MemoryError) as e:
-                    try:
-                        error_msg = f"<serialization failed: {type(e).__name__}>"
-                        span.set_attribute(f"parameter.{name}", error_msg)
-                        total_size += len(error_msg)
-                    except Exception:
-                        # If even the fallback fails, skip this parameter
-                        pass
-
-        except (TypeError, ValueError, AttributeError) as e:
-            logger.debug(f"Failed to add parameters to span: {type(e).__name__}: {e}")
-        except Exception as e:
-            # Catch-all for any other unexpected exceptions
-            logger.debug(f"Unexpected error adding parameters to span: {type(e).__name__}: {e}")
+    def _record_parameters(span, args, kwargs):
+        if span.is_recording():
+            _add_parameters_to_span(span, signature, skips_self and bool(args), args, kwargs, get_parameter_capture_policy(qualname))
 
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
@@ -392,7 +460,7 @@ def trace_method(func):
             return await func(*args, **kwargs)
 
         with tracer.start_as_current_span(_get_span_name(func, args)) as span:
-            _add_parameters_to_span(span, func, args, kwargs)
+            _record_parameters(span, args, kwargs)
 
             try:
                 result = await func(*args, **kwargs)
@@ -426,7 +494,7 @@ def trace_method(func):
             return func(*args, **kwargs)
 
         with tracer.start_as_current_span(_get_span_name(func, args)) as span:
-            _add_parameters_to_span(span, func, args, kwargs)
+            _record_parameters(span, args, kwargs)
 
             result = func(*args, **kwargs)
             span.set_status(Status(StatusCode.OK))
@@ -295,3 +295,10 @@ class ComparisonOperator(str, Enum):
     EQ = "eq"  # equals
     GTE = "gte"  # greater than or equal
     LTE = "lte"  # less than or equal
+
+
+class UsageRollupGranularity(str, Enum):
+    """Width of the time buckets that usage is rolled up into"""
+
+    HOUR = "hour"
+    DAY = "day"
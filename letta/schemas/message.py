@@ -14,11 +14,12 @@ from enum import Enum
 from typing import Any, Dict, List, Literal, Optional, Union
 
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall as OpenAIToolCall, Function as OpenAIFunction
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
 from letta.constants import DEFAULT_MESSAGE_TOOL, DEFAULT_MESSAGE_TOOL_KWARG, REQUEST_HEARTBEAT_PARAM, TOOL_CALL_ID_MAX_LEN
 from letta.helpers.datetime_helpers import get_utc_time, is_utc_datetime
 from letta.helpers.json_helpers import json_dumps
+from letta.helpers.message_dict_cache import get_message_dict_cache
 from letta.local_llm.constants import INNER_THOUGHTS_KWARG, INNER_THOUGHTS_KWARG_VERTEX
 from letta.otel.tracing import trace_method
 from letta.schemas.enums import MessageRole, PrimitiveType
@@ -101,6 +102,10 @@ def tool_return_to_text(func_response: Optional[Union[str, List]]) -> Optional[s
     return result if result else None
 
 
+def _as_list(message_dict: Optional[dict]) -> List[dict]:
+    return [message_dict] if message_dict is not None else []
+
+
 def add_inner_thoughts_to_tool_call(
     tool_call: OpenAIToolCall,
     inner_thoughts: str,
@@ -308,6 +313,14 @@ class Message(BaseMessage):
     approvals: Optional[List[ApprovalReturn | ToolReturn]] = Field(default=None, description="The list of approvals for this message.")
     # This overrides the optional base orm schema, created_at MUST exist on all messages objects
     created_at: datetime = Field(default_factory=get_utc_time, description="The timestamp when the object was created.")
+    # Set once a field is reassigned after construction, after which the message may no longer match its stored row
+    # (see letta.helpers.message_dict_cache)
+    _modified_in_memory: bool = PrivateAttr(default=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.__pydantic_private__["_modified_in_memory"] = True
 
     # validate that run_id is set
     # @model_validator(mode="after")
@@ -1507,37 +1520,61 @@ class Message(BaseMessage):
         tool_return_truncation_chars: Optional[int] = None,
     ) -> List[dict]:
         messages = Message.filter_messages_for_llm_api(messages)
+        cache = get_message_dict_cache()
+        options = (max_tool_id_length, put_inner_thoughts_in_kwargs, use_developer_message, tool_return_truncation_chars)
         result: List[dict] = []
 
         for m in messages:
-            # Special case: OpenAI Chat Completions requires a separate tool message per tool_call_id
-            # If we have multiple explicit tool_returns on a single Message, expand into one dict per return
-            if m.role == MessageRole.tool and m.tool_returns and len(m.tool_returns) > 0:
-                for tr in m.tool_returns:
-                    if not tr.tool_call_id:
-                        raise TypeError("ToolReturn came back without a tool_call_id.")
-                    # Convert multi-modal to text (images → placeholders), then truncate
-                    func_response_text = tool_return_to_text(tr.func_response)
-                    func_response = truncate_tool_return(func_response_text, tool_return_truncation_chars)
-                    result.append(
-                        {
-                            "content": func_response,
-                            "role": "tool",
-                            "tool_call_id": tr.tool_call_id[:max_tool_id_length] if max_tool_id_length else tr.tool_call_id,
-                        }
-                    )
-                continue
+            result.extend(
+                cache.convert(
+                    m,
+                    "openai",
+                    options,
+                    lambda m=m: m._to_openai_dicts(
+                        max_tool_id_length=max_tool_id_length,
+                        put_inner_thoughts_in_kwargs=put_inner_thoughts_in_kwargs,
+                        use_developer_message=use_developer_message,
+                        tool_return_truncation_chars=tool_return_truncation_chars,
+                    ),
+                )
+            )
 
-            d = m.to_openai_dict(
+        return result
+
+    def _to_openai_dicts(
+        self,
+        max_tool_id_length: int,
+        put_inner_thoughts_in_kwargs: bool,
+        use_developer_message: bool,
+        tool_return_truncation_chars: Optional[int],
+    ) -> List[dict]:
+        # Special case: OpenAI Chat Completions requires a separate tool message per tool_call_id
+        # If we have multiple explicit tool_returns on a single Message, expand into one dict per return
+        if self.role == MessageRole.tool and self.tool_returns and len(self.tool_returns) > 0:
+            result = []
+            for tr in self.tool_returns:
+                if not tr.tool_call_id:
+                    raise TypeError("ToolReturn came back without a tool_call_id.")
+                # Convert multi-modal to text (images → placeholders), then truncate
+                func_response_text = tool_return_to_text(tr.func_response)
+                func_response = truncate_tool_return(func_response_text, tool_return_truncation_chars)
+                result.append(
+                    {
+                        "content": func_response,
+                        "role": "tool",
+                        "tool_call_id": tr.tool_call_id[:max_tool_id_length] if max_tool_id_length else tr.tool_call_id,
+                    }
+                )
+            return result
+
+        return _as_list(
+            self.to_openai_dict(
                 max_tool_id_length=max_tool_id_length,
                 put_inner_thoughts_in_kwargs=put_inner_thoughts_in_kwargs,
                 use_developer_message=use_developer_message,
                 tool_return_truncation_chars=tool_return_truncation_chars,
             )
-            if d is not None:
-                result.append(d)
-
-        return result
+        )
 
     def to_openai_responses_dicts(
         self,
@@ -1765,11 +1802,18 @@ class Message(BaseMessage):
         tool_return_truncation_chars: Optional[int] = None,
     ) -> List[dict]:
         messages = Message.filter_messages_for_llm_api(messages)
+        cache = get_message_dict_cache()
+        options = (max_tool_id_length, tool_return_truncation_chars)
         result = []
         for message in messages:
             result.extend(
-                message.to_openai_responses_dicts(
-                    max_tool_id_length=max_tool_id_length, tool_return_truncation_chars=tool_return_truncation_chars
+                cache.convert(
+                    message,
+                    "openai_responses",
+                    options,
+                    lambda message=message: message.to_openai_responses_dicts(
+                        max_tool_id_length=max_tool_id_length, tool_return_truncation_chars=tool_return_truncation_chars
+                    ),
                 )
             )
         return result
@@ -2126,18 +2170,34 @@ class Message(BaseMessage):
         tool_return_truncation_chars: Optional[int] = None,
     ) -> List[dict]:
         messages = Message.filter_messages_for_llm_api(messages)
-        result = [
-            m.to_anthropic_dict(
-                current_model=current_model,
-                inner_thoughts_xml_tag=inner_thoughts_xml_tag,
-                put_inner_thoughts_in_kwargs=put_inner_thoughts_in_kwargs,
-                native_content=native_content,
-                strip_request_heartbeat=strip_request_heartbeat,
-                tool_return_truncation_chars=tool_return_truncation_chars,
+        cache = get_message_dict_cache()
+        options = (
+            current_model,
+            inner_thoughts_xml_tag,
+            put_inner_thoughts_in_kwargs,
+            native_content,
+            strip_request_heartbeat,
+            tool_return_truncation_chars,
+        )
+        result = []
+        for m in messages:
+            result.extend(
+                cache.convert(
+                    m,
+                    "anthropic",
+                    options,
+                    lambda m=m: _as_list(
+                        m.to_anthropic_dict(
+                            current_model=current_model,
+                            inner_thoughts_xml_tag=inner_thoughts_xml_tag,
+                            put_inner_thoughts_in_kwargs=put_inner_thoughts_in_kwargs,
+                            native_content=native_content,
+                            strip_request_heartbeat=strip_request_heartbeat,
+                            tool_return_truncation_chars=tool_return_truncation_chars,
+                        )
+                    ),
+                )
             )
-            for m in messages
-        ]
-        result = [m for m in result if m is not None]
         return result
 
     def to_google_dict(
@@ -2435,16 +2495,25 @@ class Message(BaseMessage):
         tool_return_truncation_chars: Optional[int] = None,
     ):
         messages = Message.filter_messages_for_llm_api(messages)
-        result = [
-            m.to_google_dict(
-                current_model=current_model,
-                put_inner_thoughts_in_kwargs=put_inner_thoughts_in_kwargs,
-                native_content=native_content,
-                tool_return_truncation_chars=tool_return_truncation_chars,
+        cache = get_message_dict_cache()
+        options = (current_model, put_inner_thoughts_in_kwargs, native_content, tool_return_truncation_chars)
+        result = []
+        for m in messages:
+            result.extend(
+                cache.convert(
+                    m,
+                    "google",
+                    options,
+                    lambda m=m: _as_list(
+                        m.to_google_dict(
+                            current_model=current_model,
+                            put_inner_thoughts_in_kwargs=put_inner_thoughts_in_kwargs,
+                            native_content=native_content,
+                            tool_return_truncation_chars=tool_return_truncation_chars,
+                        )
+                    ),
+                )
             )
-            for m in messages
-        ]
-        result = [m for m in result if m is not None]
         return result
 
     def is_approval_request(self) -> bool:
@@ -2573,7 +2642,8 @@ class Message(BaseMessage):
 
                 if unique_returns:
                     # Replace with unique set; keep message
-                    m.tool_returns = unique_returns
+                    if len(unique_returns) != len(m.tool_returns):
+                        m.tool_returns = unique_returns
                     result.append(m)
                 else:
                     # No unique returns left; if legacy content exists, fall back to legacy handling below
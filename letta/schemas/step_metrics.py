@@ -19,6 +19,7 @@ class StepMetrics(StepMetricsBase):
     step_start_ns: Optional[int] = Field(None, description="The timestamp of the start of the step in nanoseconds.")
     llm_request_start_ns: Optional[int] = Field(None, description="The timestamp of the start of the llm request in nanoseconds.")
     llm_request_ns: Optional[int] = Field(None, description="Time spent on LLM requests in nanoseconds.")
+    llm_request_bytes: Optional[int] = Field(None, description="Size of the request body sent to the LLM provider in bytes.")
     tool_execution_ns: Optional[int] = Field(None, description="Time spent on tool execution in nanoseconds.")
     step_ns: Optional[int] = Field(None, description="Total time for the step in nanoseconds.")
     base_template_id: Optional[str] = Field(None, description="The base template ID that the step belongs to (cloud only).")
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from letta.schemas.enums import UsageRollupGranularity
+
+
+class UsageRollupBucket(BaseModel):
+    """Usage summed over the steps created in one time bucket."""
+
+    bucket_start: datetime = Field(..., description="The start of the bucket (UTC).")
+    granularity: UsageRollupGranularity = Field(..., description="The width of the bucket.")
+    step_count: int = Field(0, description="The number of steps logged in the bucket.")
+    prompt_tokens: int = Field(0, description="The number of tokens in the prompts.")
+    completion_tokens: int = Field(0, description="The number of tokens generated.")
+    total_tokens: int = Field(0, description="The total number of tokens processed.")
+    cached_input_tokens: int = Field(0, description="The number of input tokens served from cache.")
+    cache_write_tokens: int = Field(0, description="The number of input tokens written to cache.")
+    reasoning_tokens: int = Field(0, description="The number of reasoning/thinking tokens generated.")
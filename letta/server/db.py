@@ -67,6 +67,22 @@ async_session_factory = async_sessionmaker(
 )
 
 
+# Coroutine functions registered in ``session.info[AFTER_COMMIT_HOOKS_KEY]`` (keyed by name, so each runs once per session)
+# are awaited after the session commits successfully. They must not assume the session is still usable for writes.
+AFTER_COMMIT_HOOKS_KEY = "letta_after_commit_hooks"
+
+
+async def _run_after_commit_hooks(session: AsyncSession) -> None:
+    hooks = session.info.pop(AFTER_COMMIT_HOOKS_KEY, None)
+    if not hooks:
+        return
+    for name, hook in hooks.items():
+        try:
+            await hook(session)
+        except Exception as e:
+            logger.warning(f"After-commit hook {name} failed: {e}")
+
+
 class DatabaseRegistry:
     """Dummy registry to maintain the existing interface."""
 
@@ -90,6 +106,7 @@ class DatabaseRegistry:
                     try:
                         yield session
                         await session.commit()
+                        await _run_after_commit_hooks(session)
                     except asyncio.CancelledError:
                         # Task was cancelled (client disconnect, timeout, explicit cancellation)
                         # Must rollback to avoid returning connection with open transaction
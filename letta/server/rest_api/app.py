@@ -253,6 +253,20 @@ async def lifespan(app_: FastAPI):
     except Exception as e:
         logger.error(f"[Worker {worker_id}] Scheduler initialization failed: {e}", exc_info=True)
 
+    try:
+        from letta.services.run_cancellation_bus import start_run_cancellation_bus
+
+        await start_run_cancellation_bus()
+        logger.info(f"[Worker {worker_id}] Run cancellation listener started")
+    except Exception as e:
+        logger.warning(f"[Worker {worker_id}] Run cancellation listener startup failed: {e}")
+
+    if not settings.sleeptime_executor_external:
+        # Resume sleeptime runs still queued when the previous process stopped, and ones abandoned by dead workers
+        from letta.services.sleeptime_executor import get_sleeptime_executor
+
+        get_sleeptime_executor().start_recovery()
+
     set_readiness_state(reason="ready", source="lifespan_startup_complete")
     logger.info(f"[Worker {worker_id}] Lifespan startup completed")
     yield
@@ -278,6 +292,27 @@ async def lifespan(app_: FastAPI):
     except Exception as e:
         logger.error(f"[Worker {worker_id}] Scheduler shutdown failed: {e}", exc_info=True)
 
+    try:
+        from letta.services.run_cancellation_bus import reset_run_cancellation_buses
+
+        await reset_run_cancellation_buses()
+    except Exception as e:
+        logger.warning(f"[Worker {worker_id}] Run cancellation listener shutdown failed: {e}")
+
+    try:
+        from letta.services.sleeptime_executor import reset_sleeptime_executors
+
+        await reset_sleeptime_executors()
+    except Exception as e:
+        logger.warning(f"[Worker {worker_id}] Sleeptime executor shutdown failed: {e}")
+
+    try:
+        from letta.services.provider_trace_backends.postgres_writer import reset_provider_trace_writers
+
+        await reset_provider_trace_writers()
+    except Exception as e:
+        logger.warning(f"[Worker {worker_id}] Provider trace writer shutdown failed: {e}")
+
     # Cleanup SQLAlchemy instrumentation
     if not settings.disable_tracing and settings.sqlalchemy_tracing:
         try:
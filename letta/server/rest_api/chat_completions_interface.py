@@ -12,7 +12,7 @@ from letta.schemas.enums import MessageStreamStatus
 from letta.schemas.letta_message import LettaMessage
 from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_response import ChatCompletionChunkResponse
-from letta.server.rest_api.json_parser import OptimisticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 from letta.streaming_interface import AgentChunkStreamingInterface
 
 logger = get_logger(__name__)
@@ -55,7 +55,7 @@ class ChatCompletionsStreamingInterface(AgentChunkStreamingInterface):
         # Parsing state for incremental function-call data
         self.current_function_name = ""
         self.current_function_arguments = []
-        self.current_json_parse_result = {}
+        self.current_function_arguments_parser = IncrementalJSONParser()
         self._found_message_tool_kwarg = False
 
         # Internal chunk buffer and event for async notification
@@ -224,18 +224,14 @@ class ChatCompletionsStreamingInterface(AgentChunkStreamingInterface):
             tool_call = delta.tool_calls[0]
             if tool_call.function.name:
                 self.current_function_name += tool_call.function.name
+            field_deltas = {}
             if tool_call.function.arguments:
                 self.current_function_arguments.append(tool_call.function.arguments)
+                field_deltas = self.current_function_arguments_parser.feed(tool_call.function.arguments)
 
-            # Only parse arguments for "send_message" to stream partial text
+            # Only stream partial text for "send_message"
             if self.current_function_name.strip() == self.assistant_message_tool_name:
-                combined_args = "".join(self.current_function_arguments)
-                parsed_args = OptimisticJSONParser().parse(combined_args)
-
-                if parsed_args.get(self.assistant_message_tool_kwarg) and parsed_args.get(
-                    self.assistant_message_tool_kwarg
-                ) != self.current_json_parse_result.get(self.assistant_message_tool_kwarg):
-                    self.current_json_parse_result = parsed_args
+                if field_deltas.get(self.assistant_message_tool_kwarg):
                     return ChatCompletionChunk(
                         id=chunk.id,
                         object=chunk.object,
@@ -274,5 +270,5 @@ class ChatCompletionsStreamingInterface(AgentChunkStreamingInterface):
         """Clears internal buffers for function call name/args."""
         self.current_function_name = ""
         self.current_function_arguments = []
-        self.current_json_parse_result = {}
+        self.current_function_arguments_parser = IncrementalJSONParser()
         self._found_message_tool_kwarg = False
@@ -1,6 +1,7 @@
 import json
+import re
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List, Optional, Set
 
 from pydantic_core import from_json
 
@@ -228,6 +229,255 @@ class OptimisticJSONParser(JSONParser):
         raise decode_error
 
 
+# States of IncrementalJSONParser
+_BEFORE_OBJECT = 0
+_EXPECT_KEY = 1
+_IN_KEY = 2
+_EXPECT_COLON = 3
+_EXPECT_VALUE = 4
+_IN_STRING_VALUE = 5
+_IN_NESTED_VALUE = 6
+_IN_SCALAR_VALUE = 7
+_AFTER_VALUE = 8
+_DONE = 9
+_INVALID = 10
+
+_WHITESPACE = " \t\r\n"
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NESTED_SPECIAL = re.compile(r'["\\{}\[\]]')
+_SCALAR_END = re.compile(r"[,}\s]")
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class IncrementalJSONParser:
+    """
+    Resumable parser for a JSON object that arrives in pieces (e.g. streamed tool-call arguments).
+
+    Re-parsing the whole buffer on every delta and diffing against the previous parse is O(n^2) in the
+    argument length. This parser keeps its position between calls, so each ``feed`` only scans the new
+    text, and it returns the decoded characters appended to each top-level string field directly.
+
+    Only top-level string values are decoded; nested objects/arrays and scalars are skipped over (use
+    ``json.loads(parser.text)`` once the object is complete). Malformed input stops parsing silently:
+    callers fall back to parsing ``text`` with a lenient parser.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._state = _BEFORE_OBJECT
+        self._key_parts: List[str] = []
+        self._current_key: Optional[str] = None
+        self._values: Dict[str, List[str]] = {}
+        self._keys: List[str] = []
+        self._completed: Set[str] = set()
+        # escape sequence being decoded inside a string ("" right after the backslash), None when not in one
+        self._escape: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        # bookkeeping for skipping nested values
+        self._depth = 0
+        self._nested_in_string = False
+        self._nested_escape = False
+
+    @property
+    def text(self) -> str:
+        """All input fed so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    @property
+    def keys(self) -> List[str]:
+        """Top-level keys whose value has started, in order."""
+        return list(self._keys)
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the top-level object has been seen."""
+        return self._state == _DONE
+
+    def get(self, key: str, default: str = "") -> str:
+        """Decoded (possibly partial) value of a top-level string field."""
+        parts = self._values.get(key)
+        if parts is None:
+            return default
+        if len(parts) > 1:
+            parts[:] = ["".join(parts)]
+        return parts[0] if parts else ""
+
+    def is_complete(self, key: str) -> bool:
+        """Whether the top-level string field ``key`` has been fully received."""
+        return key in self._completed
+
+    def feed(self, chunk: str) -> Dict[str, str]:
+        """Consume the next piece of input and return ``{key: newly decoded text}`` for top-level string fields."""
+        deltas: Dict[str, str] = {}
+        if not chunk:
+            return deltas
+        self._parts.append(chunk)
+
+        i, n = 0, len(chunk)
+        while i < n:
+            state = self._state
+            if state == _IN_STRING_VALUE or state == _IN_KEY:
+                if self._escape is not None:
+                    i = self._consume_escape(chunk, i, deltas)
+                    continue
+                match = _STRING_SPECIAL.search(chunk, i)
+                end = match.start() if match else n
+                if end > i:
+                    self._emit(chunk[i:end], deltas)
+                if match is None:
+                    break
+                if chunk[end] == "\\":
+                    self._escape = ""
+                else:
+                    self._close_string(deltas)
+                i = end + 1
+            elif state == _IN_NESTED_VALUE:
+                i = self._skip_nested(chunk, i)
+            elif state == _IN_SCALAR_VALUE:
+                match = _SCALAR_END.search(chunk, i)
+                if match is None:
+                    break
+                self._state = _AFTER_VALUE
+                i = match.start()
+            elif state == _DONE or state == _INVALID:
+                break
+            else:
+                char = chunk[i]
+                i += 1
+                if char in _WHITESPACE:
+                    continue
+                self._structural(char)
+        return deltas
+
+    def _structural(self, char: str) -> None:
+        state = self._state
+        if state == _BEFORE_OBJECT:
+            self._state = _EXPECT_KEY if char == "{" else _INVALID
+        elif state == _EXPECT_KEY:
+            if char == '"':
+                self._key_parts = []
+                self._state = _IN_KEY
+            elif char == "}":
+                self._state = _DONE
+            elif char != ",":
+                self._state = _INVALID
+        elif state == _EXPECT_COLON:
+            self._state = _EXPECT_VALUE if char == ":" else _INVALID
+        elif state == _EXPECT_VALUE:
+            key = self._current_key
+            if key not in self._values:
+                self._keys.append(key)
+            if char == '"':
+                self._values[key] = []
+                self._state = _IN_STRING_VALUE
+            elif char in "{[":
+                self._depth = 1
+                self._nested_in_string = False
+                self._nested_escape = False
+                self._state = _IN_NESTED_VALUE
+            else:
+                self._state = _IN_SCALAR_VALUE
+        elif state == _AFTER_VALUE:
+            if char == ",":
+                self._state = _EXPECT_KEY
+            elif char == "}":
+                self._state = _DONE
+            else:
+                self._state = _INVALID
+
+    def _emit(self, text: str, deltas: Dict[str, str]) -> None:
+        if self._high_surrogate is not None:
+            # unpaired high surrogate: pass it through like json.loads does
+            text = chr(self._high_surrogate) + text
+            self._high_surrogate = None
+        if self._state == _IN_KEY:
+            self._key_parts.append(text)
+        else:
+            key = self._current_key
+            self._values[key].append(text)
+            deltas[key] = deltas.get(key, "") + text
+
+    def _close_string(self, deltas: Dict[str, str]) -> None:
+        if self._high_surrogate is not None:
+            self._emit("", deltas)
+        if self._state == _IN_KEY:
+            self._current_key = "".join(self._key_parts)
+            self._state = _EXPECT_COLON
+        else:
+            self._completed.add(self._current_key)
+            self._state = _AFTER_VALUE
+
+    def _consume_escape(self, chunk: str, i: int, deltas: Dict[str, str]) -> int:
+        escape = self._escape
+        if not escape:
+            char = chunk[i]
+            if char != "u":
+                self._escape = None
+                self._emit(_SIMPLE_ESCAPES.get(char, char), deltas)
+                return i + 1
+            escape = "u"
+            i += 1
+        needed = 5 - len(escape)
+        escape += chunk[i : i + needed]
+        i += min(needed, len(chunk) - i)
+        if len(escape) < 5:
+            self._escape = escape
+            return i
+
+        self._escape = None
+        try:
+            code = int(escape[1:], 16)
+        except ValueError:
+            self._emit("\\" + escape, deltas)
+            return i
+        if 0xD800 <= code < 0xDC00:
+            if self._high_surrogate is not None:
+                self._emit("", deltas)
+            self._high_surrogate = code
+        elif 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            combined = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._emit(chr(combined), deltas)
+        else:
+            self._emit(chr(code), deltas)
+        return i
+
+    def _skip_nested(self, chunk: str, i: int) -> int:
+        n = len(chunk)
+        while i < n:
+            if self._nested_escape:
+                self._nested_escape = False
+                i += 1
+                continue
+            if self._nested_in_string:
+                match = _STRING_SPECIAL.search(chunk, i)
+                if match is None:
+                    return n
+                if chunk[match.start()] == "\\":
+                    self._nested_escape = True
+                else:
+                    self._nested_in_string = False
+                i = match.end()
+                continue
+            match = _NESTED_SPECIAL.search(chunk, i)
+            if match is None:
+                return n
+            char = chunk[match.start()]
+            i = match.end()
+            if char == '"':
+                self._nested_in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._state = _AFTER_VALUE
+                    return i
+        return i
+
+
 # TODO: Keeping this around for posterity
 # def main():
 #     test_string = '{"inner_thoughts":}'
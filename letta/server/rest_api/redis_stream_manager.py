@@ -6,9 +6,9 @@ import time
 from collections import defaultdict
 from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import aclosing
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from letta.data_sources.redis_client import AsyncRedisClient
+from letta.data_sources.redis_client import AsyncRedisClient, NoopAsyncRedisClient
 from letta.errors import LettaError
 from letta.log import get_logger
 from letta.schemas.enums import RunStatus
@@ -18,6 +18,7 @@ from letta.schemas.run import RunUpdate
 from letta.schemas.user import User
 from letta.server.rest_api.streaming_response import RunCancelledException
 from letta.services.run_manager import RunManager
+from letta.settings import settings
 from letta.utils import safe_create_task
 
 logger = get_logger(__name__)
@@ -460,6 +461,171 @@ async def create_background_stream_processor(
             logger.warning(f"Failed to append terminal [DONE] for run {run_id}: {e}")
 
 
+def _format_stream_chunk(run_id: str, fields: Dict[str, str]) -> str:
+    """Fill in ids the writer could not know when the chunk was produced."""
+    data = fields.get("data", "")
+    if '"run_id":null' in data:
+        data = data.replace('"run_id":null', f'"run_id":"{run_id}"')
+    if '"seq_id":null' in data:
+        data = data.replace('"seq_id":null', f'"seq_id":{int(fields.get("seq_id", 0))}')
+    return data
+
+
+def _iter_xread_response(response) -> Iterator[Tuple[str, List[Tuple[str, Dict[str, str]]]]]:
+    """Normalize XREAD replies (RESP2 list of [stream, entries] pairs or RESP3 dict) to (stream, entries)."""
+    if not response:
+        return
+    if isinstance(response, dict):
+        # RESP3 wraps each stream's entries in an extra list
+        for stream_key, wrapped in response.items():
+            yield stream_key, wrapped[0] if wrapped else []
+        return
+    for stream_key, entries in response:
+        yield stream_key, entries
+
+
+class RedisSSEStreamHub:
+    """
+    Per-process fan-out of Redis SSE streams to in-process subscribers.
+
+    Instead of every connected client polling its own stream with XRANGE, one background task issues a
+    single blocking XREAD over all streams that have subscribers and pushes new entries onto each
+    subscriber's asyncio queue. Redis load is one XREAD per ``block_ms`` (or per batch of new chunks)
+    regardless of how many clients are connected, and live chunks are delivered as soon as they are written.
+
+    Late joiners replay history with XRANGE before switching to the live queue. The subscriber's queue is
+    registered *before* the replay, so anything the hub reads afterwards is queued and anything it read
+    before is already in Redis; duplicates are dropped by ``seq_id``.
+    """
+
+    def __init__(self, redis_client: AsyncRedisClient, block_ms: int = 100, batch_size: int = 100, error_backoff: float = 0.5):
+        self.redis = redis_client
+        self.block_ms = block_ms
+        self.batch_size = batch_size
+        self.error_backoff = error_backoff
+
+        # stream_key -> subscriber queues
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        # stream_key -> last Redis entry id read by the hub (None until the first subscriber finished replaying)
+        self._cursors: Dict[str, Optional[str]] = {}
+        self._activated = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def active_streams(self) -> int:
+        return sum(1 for cursor in self._cursors.values() if cursor is not None)
+
+    def _register(self, stream_key: str, queue: asyncio.Queue) -> None:
+        self._subscribers[stream_key].add(queue)
+        self._cursors.setdefault(stream_key, None)
+        if self._task is None or self._task.done():
+            self._task = safe_create_task(self._run(), label="redis_sse_stream_hub")
+
+    def _activate(self, stream_key: str, last_entry_id: str) -> None:
+        if stream_key in self._cursors and self._cursors[stream_key] is None:
+            self._cursors[stream_key] = last_entry_id
+            self._activated.set()
+
+    def _unregister(self, stream_key: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(stream_key)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[stream_key]
+            self._cursors.pop(stream_key, None)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            streams = {stream_key: cursor for stream_key, cursor in self._cursors.items() if cursor is not None}
+            if not streams:
+                # every subscriber is still replaying history
+                self._activated.clear()
+                try:
+                    await asyncio.wait_for(self._activated.wait(), timeout=self.block_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                response = await self.redis.xread(streams, count=self.batch_size, block=self.block_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"SSE stream hub XREAD over {len(streams)} streams failed: {e}")
+                await asyncio.sleep(self.error_backoff)
+                continue
+
+            for stream_key, entries in _iter_xread_response(response):
+                if self._cursors.get(stream_key) is None:
+                    # all subscribers left while we were blocked
+                    continue
+                queues = self._subscribers.get(stream_key, ())
+                for entry in entries:
+                    for queue in queues:
+                        queue.put_nowait(entry)
+                if entries:
+                    self._cursors[stream_key] = entries[-1][0]
+
+        self._task = None
+
+    async def subscribe(self, run_id: str, starting_after: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield SSE chunks for ``run_id`` with ``seq_id > starting_after`` until the completion marker."""
+        stream_key = f"sse:run:{run_id}"
+        cursor_seq_id = starting_after or 0
+        queue: asyncio.Queue = asyncio.Queue()
+        self._register(stream_key, queue)
+        try:
+            # replay whatever is already in Redis
+            last_entry_id = "-"
+            while True:
+                entries = await self.redis.xrange(stream_key, start=last_entry_id, count=self.batch_size)
+                new_entries = [(entry_id, fields) for entry_id, fields in entries if entry_id != last_entry_id]
+                for entry_id, fields in new_entries:
+                    last_entry_id = entry_id
+                    chunk_seq_id = int(fields.get("seq_id", 0))
+                    if chunk_seq_id <= cursor_seq_id:
+                        continue
+                    cursor_seq_id = chunk_seq_id
+                    if fields.get("data"):
+                        yield _format_stream_chunk(run_id, fields)
+                    if fields.get("complete") == "true":
+                        return
+                if not new_entries or len(entries) < self.batch_size:
+                    break
+
+            # then follow live chunks pushed by the hub
+            self._activate(stream_key, "0-0" if last_entry_id == "-" else last_entry_id)
+            while True:
+                _, fields = await queue.get()
+                chunk_seq_id = int(fields.get("seq_id", 0))
+                if chunk_seq_id <= cursor_seq_id:
+                    continue
+                cursor_seq_id = chunk_seq_id
+                if fields.get("data"):
+                    yield _format_stream_chunk(run_id, fields)
+                else:
+                    logger.debug(f"No data found for chunk {chunk_seq_id} in run {run_id}")
+                if fields.get("complete") == "true":
+                    return
+        finally:
+            self._unregister(stream_key, queue)
+
+
+_stream_hub: Optional[RedisSSEStreamHub] = None
+
+
+def get_sse_stream_hub(redis_client: AsyncRedisClient) -> RedisSSEStreamHub:
+    """Return the process-wide hub for ``redis_client`` (recreated if the client or event loop changed)."""
+    global _stream_hub
+    loop = asyncio.get_running_loop()
+    if _stream_hub is None or _stream_hub.redis is not redis_client or _stream_hub._loop is not loop:
+        _stream_hub = RedisSSEStreamHub(redis_client, block_ms=settings.sse_stream_hub_block_ms)
+        _stream_hub._loop = loop
+    return _stream_hub
+
+
 async def redis_sse_stream_generator(
     redis_client: AsyncRedisClient,
     run_id: str,
@@ -473,6 +639,9 @@ async def redis_sse_stream_generator(
     This generator reads chunks stored in Redis streams and yields them as SSE events.
     It supports cursor-based recovery by allowing you to start from a specific seq_id.
 
+    By default chunks are delivered through the process-wide ``RedisSSEStreamHub``; ``poll_interval``
+    and ``batch_size`` only apply to the legacy per-client XRANGE polling used when the hub is disabled.
+
     Args:
         redis_client: Redis client instance
         run_id: The run ID to read chunks for
@@ -483,6 +652,13 @@ async def redis_sse_stream_generator(
     Yields:
         SSE-formatted chunks from the Redis stream
     """
+    if settings.enable_sse_stream_hub and not isinstance(redis_client, NoopAsyncRedisClient):
+        logger.debug(f"Subscribing to SSE stream hub for run_id={run_id}")
+        async with aclosing(get_sse_stream_hub(redis_client).subscribe(run_id, starting_after)) as chunks:
+            async for chunk in chunks:
+                yield chunk
+        return
+
     stream_key = f"sse:run:{run_id}"
     last_redis_id = "-"
     cursor_seq_id = starting_after or 0
@@ -505,13 +681,7 @@ async def redis_sse_stream_generator(
                         logger.debug(f"No data found for chunk {chunk_seq_id} in run {run_id}")
                         continue
 
-                    if '"run_id":null' in data:
-                        data = data.replace('"run_id":null', f'"run_id":"{run_id}"')
-
-                    if '"seq_id":null' in data:
-                        data = data.replace('"seq_id":null', f'"seq_id":{chunk_seq_id}')
-
-                    yield data
+                    yield _format_stream_chunk(run_id, fields)
                     yielded_any = True
 
                     if fields.get("complete") == "true":
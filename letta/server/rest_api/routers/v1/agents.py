@@ -30,7 +30,7 @@ from letta.otel.metric_registry import MetricRegistry
 from letta.schemas.agent import AgentRelationships, AgentState, CreateAgent, UpdateAgent
 from letta.schemas.agent_file import AgentFileSchema, SkillSchema
 from letta.schemas.block import BlockResponse, BlockUpdate
-from letta.schemas.enums import AgentType, MessageRole, RunStatus
+from letta.schemas.enums import AgentType, MessageRole, RunStatus, UsageRollupGranularity
 from letta.schemas.file import AgentFileAttachment, PaginatedAgentFiles
 from letta.schemas.group import Group
 from letta.schemas.job import LettaRequestConfig
@@ -55,6 +55,7 @@ from letta.schemas.source import Source
 from letta.schemas.tool import Tool
 from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.usage import LettaUsageStatistics
+from letta.schemas.usage_rollup import UsageRollupBucket
 from letta.schemas.user import User
 from letta.serialize_schemas.pydantic_agent_schema import AgentSchema
 from letta.server.rest_api.dependencies import HeaderParams, get_headers, get_letta_server
@@ -64,7 +65,7 @@ from letta.services.run_manager import RunManager
 from letta.services.streaming_service import StreamingService
 from letta.services.summarizer.summarizer_config import CompactionSettings
 from letta.settings import settings
-from letta.utils import is_1_0_sdk_version, safe_create_shielded_task, safe_create_task, truncate_file_visible_content
+from letta.utils import is_1_0_sdk_version, safe_create_shielded_task, safe_create_task
 from letta.validators import AgentId, BlockId, FileId, MessageId, SourceId, ToolId
 
 # These can be forward refs, but because Fastapi needs them at runtime the must be imported normally
@@ -601,6 +602,24 @@ async def retrieve_agent_context_window(
     return await server.agent_manager.get_context_window(agent_id=agent_id, actor=actor, conversation_id=conversation_id)
 
 
+@router.get("/{agent_id}/usage", response_model=List[UsageRollupBucket], operation_id="list_agent_usage")
+async def list_agent_usage(
+    agent_id: AgentId,
+    granularity: UsageRollupGranularity = Query(UsageRollupGranularity.DAY, description="Roll usage up per hour or per day (UTC)"),
+    start_date: Optional[datetime] = Query(None, description="Return usage from the bucket containing this ISO datetime"),
+    end_date: Optional[datetime] = Query(None, description="Return usage from buckets starting before this ISO datetime"),
+    server: "SyncServer" = Depends(get_letta_server),
+    headers: HeaderParams = Depends(get_headers),
+):
+    """
+    Get the token usage of an agent per hour or per day.
+    """
+    actor = await server.user_manager.get_actor_or_default_async(actor_id=headers.actor_id)
+    return await server.usage_rollup_manager.list_agent_usage_async(
+        agent_id=agent_id, actor=actor, granularity=granularity, start_date=start_date, end_date=end_date
+    )
+
+
 class CreateAgentRequest(CreateAgent):
     """
     CreateAgent model specifically for POST request body, excluding user_id which comes from headers
@@ -972,32 +991,21 @@ async def open_file_for_agent(
     actor = await server.user_manager.get_actor_or_default_async(actor_id=headers.actor_id)
 
     # Get the agent to access files configuration
-    per_file_view_window_char_limit, max_files_open = await server.agent_manager.get_agent_files_config_async(
-        agent_id=agent_id, actor=actor
-    )
+    _, max_files_open = await server.agent_manager.get_agent_files_config_async(agent_id=agent_id, actor=actor)
 
     # Get file metadata
-    file_metadata = await server.file_manager.get_file_by_id(file_id=file_id, actor=actor, include_content=True)
+    file_metadata = await server.file_manager.get_file_by_id(file_id=file_id, actor=actor)
     if not file_metadata:
         raise HTTPException(status_code=404, detail=f"File with id={file_id} not found")
 
-    # Process file content with line numbers using LineChunker
-    from letta.services.file_processor.chunker.line_chunker import LineChunker
-
-    content_lines = LineChunker().chunk_text(file_metadata=file_metadata, validate_range=False)
-    visible_content = "\n".join(content_lines)
-
-    # Truncate if needed
-    visible_content = truncate_file_visible_content(visible_content, True, per_file_view_window_char_limit)
-
-    # Use enforce_max_open_files_and_open for efficient LRU handling
+    # Use enforce_max_open_files_and_open for efficient LRU handling; the file opens as a shared view of the whole file
     closed_files, _was_already_open, _ = await server.file_agent_manager.enforce_max_open_files_and_open(
         agent_id=agent_id,
         file_id=file_id,
         file_name=file_metadata.file_name,
         source_id=file_metadata.source_id,
         actor=actor,
-        visible_content=visible_content,
+        visible_content=None,
         max_files_open=max_files_open,
     )
 
@@ -1598,7 +1606,9 @@ async def list_messages(
     include_err: bool | None = Query(
         None, description="Whether to include error messages and error statuses. For debugging purposes only."
     ),
-    include_return_message_types: Optional[List[MessageType]] = Query(None, description="Message types to include in response. When null, all message types are returned."),
+    include_return_message_types: Optional[List[MessageType]] = Query(
+        None, description="Message types to include in response. When null, all message types are returned."
+    ),
     headers: HeaderParams = Depends(get_headers),
 ):
     """
@@ -9,6 +9,7 @@ from letta.schemas.message import Message
 from letta.schemas.provider_trace import ProviderTrace
 from letta.schemas.step import Step
 from letta.schemas.step_metrics import StepMetrics
+from letta.schemas.usage_rollup import UsageRollupBucket
 from letta.server.rest_api.dependencies import HeaderParams, get_headers, get_letta_server
 from letta.server.server import SyncServer
 from letta.services.step_manager import FeedbackType
@@ -68,6 +69,20 @@ async def list_steps(
     )
 
 
+@router.get("/usage", response_model=List[UsageRollupBucket], operation_id="list_organization_usage")
+async def list_organization_usage(
+    start_date: Optional[datetime] = Query(None, description="Return usage from the day containing this ISO datetime"),
+    end_date: Optional[datetime] = Query(None, description="Return usage from days starting before this ISO datetime"),
+    server: SyncServer = Depends(get_letta_server),
+    headers: HeaderParams = Depends(get_headers),
+):
+    """
+    Get the daily token usage (UTC) of all steps in the organization.
+    """
+    actor = await server.user_manager.get_actor_or_default_async(actor_id=headers.actor_id)
+    return await server.usage_rollup_manager.list_organization_usage_async(actor=actor, start_date=start_date, end_date=end_date)
+
+
 @router.get("/{step_id}", response_model=Step, operation_id="retrieve_step")
 async def retrieve_step(
     step_id: StepId,
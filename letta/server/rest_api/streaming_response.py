@@ -8,7 +8,7 @@ import re
 import time
 from collections.abc import AsyncIterator
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Optional
 from uuid import uuid4
 
 import anyio
@@ -22,23 +22,13 @@ from letta.schemas.enums import RunStatus
 from letta.schemas.letta_message import LettaPing
 from letta.schemas.user import User
 from letta.server.rest_api.utils import capture_sentry_exception
+from letta.services.run_cancellation_bus import get_cancellation_event_for_run, get_run_cancellation_bus
 from letta.services.run_manager import RunManager
 from letta.settings import settings
 from letta.utils import safe_create_task
 
 logger = get_logger(__name__)
 
-# Global registry of cancellation events per run_id
-# Note: Events are small and we don't bother cleaning them up
-_cancellation_events: Dict[str, asyncio.Event] = {}
-
-
-def get_cancellation_event_for_run(run_id: str) -> asyncio.Event:
-    """Get or create a cancellation event for a run."""
-    if run_id not in _cancellation_events:
-        _cancellation_events[run_id] = asyncio.Event()
-    return _cancellation_events[run_id]
-
 
 class RunCancelledException(Exception):
     """Exception raised when a run is explicitly cancelled (not due to client timeout)"""
@@ -155,21 +145,22 @@ async def cancellation_aware_stream_wrapper(
     run_manager: RunManager,
     run_id: str,
     actor: User,
-    cancellation_check_interval: float = 0.5,
     cancellation_event: Optional[asyncio.Event] = None,
 ) -> AsyncIterator[str | bytes]:
     """
     Wraps a stream generator to provide real-time run cancellation checking.
 
-    This wrapper periodically checks for run cancellation while streaming and
-    can interrupt the stream at any point, not just at step boundaries.
+    Cancellation is pushed: cancelling a run publishes it on the run cancellation bus, which sets the run's
+    cancellation event on every worker. The wrapper reads the run once when it starts (to catch a cancel that
+    happened before it subscribed) and afterwards only checks the event between chunks, so it can interrupt
+    the stream at any point, not just at step boundaries.
 
     Args:
         stream_generator: The original stream generator to wrap
         run_manager: Run manager instance for checking run status
         run_id: ID of the run to monitor for cancellation
         actor: User/actor making the request
-        cancellation_check_interval: How often to check for cancellation (seconds)
+        cancellation_event: The run's cancellation event (defaults to ``get_cancellation_event_for_run(run_id)``)
 
     Yields:
         Stream chunks from the original generator until cancelled
@@ -177,41 +168,33 @@ async def cancellation_aware_stream_wrapper(
     Raises:
         asyncio.CancelledError: If the run is cancelled during streaming
     """
-    last_cancellation_check = asyncio.get_event_loop().time()
+    if cancellation_event is None:
+        cancellation_event = get_cancellation_event_for_run(run_id)
+
+    try:
+        await get_run_cancellation_bus()
+        run = await run_manager.get_run_by_id(run_id=run_id, actor=actor)
+        if run.status == RunStatus.cancelled:
+            cancellation_event.set()
+    except Exception as e:
+        # Log warning but don't fail the stream if cancellation check fails
+        logger.warning(f"Failed to check run cancellation for run {run_id}: {e}")
 
     try:
         async for chunk in stream_generator:
-            # Check for cancellation periodically (not on every chunk for performance)
-            current_time = asyncio.get_event_loop().time()
-            if current_time - last_cancellation_check >= cancellation_check_interval:
+            if cancellation_event.is_set():
+                logger.info(f"Stream cancelled for run {run_id}, interrupting stream")
+
+                # Send cancellation event to client
+                stop_event = {"message_type": "stop_reason", "stop_reason": "cancelled"}
+                yield f"data: {json.dumps(stop_event)}\n\n"
+
+                # Inject exception INTO the generator so its except blocks can catch it
                 try:
-                    run = await run_manager.get_run_by_id(run_id=run_id, actor=actor)
-                    if run.status == RunStatus.cancelled:
-                        logger.info(f"Stream cancelled for run {run_id}, interrupting stream")
-
-                        # Signal cancellation via shared event if available
-                        if cancellation_event:
-                            cancellation_event.set()
-                            logger.info(f"Set cancellation event for run {run_id}")
-
-                        # Send cancellation event to client
-                        stop_event = {"message_type": "stop_reason", "stop_reason": "cancelled"}
-                        yield f"data: {json.dumps(stop_event)}\n\n"
-
-                        # Inject exception INTO the generator so its except blocks can catch it
-                        try:
-                            await stream_generator.athrow(RunCancelledException(run_id, f"Run {run_id} was cancelled"))
-                        except (StopAsyncIteration, RunCancelledException):
-                            # Generator closed gracefully or raised the exception back
-                            break
-                except RunCancelledException:
-                    # Re-raise cancellation immediately, don't catch it
-                    raise
-                except Exception as e:
-                    # Log warning but don't fail the stream if cancellation check fails
-                    logger.warning(f"Failed to check run cancellation for run {run_id}: {e}")
-
-                last_cancellation_check = current_time
+                    await stream_generator.athrow(RunCancelledException(run_id, f"Run {run_id} was cancelled"))
+                except (StopAsyncIteration, RunCancelledException):
+                    # Generator closed gracefully or raised the exception back
+                    break
 
             yield chunk
 
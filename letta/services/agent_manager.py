@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Literal, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
@@ -28,17 +27,20 @@ from letta.constants import (
 from letta.errors import LettaError
 from letta.helpers import ToolRulesSolver
 from letta.helpers.datetime_helpers import get_utc_time
+from letta.helpers.hybrid_search import reciprocal_rank_fusion
 from letta.log import get_logger
 from letta.orm import (
     Agent as AgentModel,
     AgentsTags,
     ArchivalPassage,
+    ArchivesAgents,
     Block as BlockModel,
     BlocksAgents,
     BlocksTags,
     Group as GroupModel,
     GroupsAgents,
     IdentitiesAgents,
+    Message as MessageModel,
     Source as SourceModel,
     SourcePassage,
     SourcesAgents,
@@ -73,12 +75,12 @@ from letta.schemas.tool import Tool as PydanticTool
 from letta.schemas.tool_rule import ContinueToolRule, RequiresApprovalToolRule, TerminalToolRule
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.agent_state_cache import agent_state_cache_key, get_agent_state_cache
 from letta.services.archive_manager import ArchiveManager
 from letta.services.block_manager import BlockManager
 from letta.services.context_window_calculator.context_window_calculator import ContextWindowCalculator
 from letta.services.context_window_calculator.token_counter import create_token_counter
 from letta.services.conversation_manager import ConversationManager
-from letta.services.file_processor.chunker.line_chunker import LineChunker
 from letta.services.files_agents_manager import FileAgentManager
 from letta.services.helpers.agent_manager_helper import (
     _apply_filters,
@@ -95,9 +97,12 @@ from letta.services.helpers.agent_manager_helper import (
     check_supports_structured_output,
     compile_system_message,
     derive_system_message,
+    embed_passage_query,
     initialize_message_sequence,
     initialize_message_sequence_async,
     package_initial_message_sequence,
+    search_passages_with_vector_index,
+    use_in_process_vector_index,
     validate_agent_exists_async,
 )
 from letta.services.identity_manager import IdentityManager
@@ -1222,7 +1227,26 @@ class AgentManager:
         include: List[str] = [],
     ) -> PydanticAgentState:
         """Fetch an agent by its ID."""
+        cache = await get_agent_state_cache()
+        version = await cache.current_version(agent_id) if cache is not None else None
+        if version is not None:
+            cache_key = agent_state_cache_key(agent_id, actor.organization_id, include_relationships, include)
+            cached = cache.get(cache_key, version)
+            if cached is not None:
+                return cached
+
+        agent_state = await self._get_agent_by_id_uncached_async(agent_id, actor, include_relationships, include)
+        if version is not None:
+            cache.put(cache_key, version, agent_state)
+        return agent_state
 
+    async def _get_agent_by_id_uncached_async(
+        self,
+        agent_id: str,
+        actor: PydanticUser,
+        include_relationships: Optional[List[str]],
+        include: List[str],
+    ) -> PydanticAgentState:
         try:
             async with db_registry.async_session() as session:
                 query = select(AgentModel)
@@ -1538,8 +1562,6 @@ class AgentManager:
         num_archival_memories = await self.passage_manager.agent_passage_size_async(actor=actor, agent_id=agent_id)
         agent_state = await self.get_agent_by_id_async(agent_id=agent_id, include_relationships=["memory", "sources", "tools"], actor=actor)
 
-        tool_rules_solver = ToolRulesSolver(agent_state.tool_rules)
-
         if not agent_state.message_ids:  # Handles both None and empty list
             curr_system_message = None
         else:
@@ -1549,6 +1571,33 @@ class AgentManager:
             logger.warning(f"No system message found for agent {agent_state.id} and user {actor}")
             return agent_state, curr_system_message, num_messages, num_archival_memories
 
+        rebuilt_message = self._build_rebuilt_system_message(
+            agent_state, curr_system_message, num_messages, num_archival_memories, force=force, update_timestamp=update_timestamp
+        )
+        if rebuilt_message is not None:
+            if not dry_run:
+                await self.message_manager.update_message_by_id_async(
+                    message_id=curr_system_message.id,
+                    message_update=MessageUpdate(**rebuilt_message.model_dump()),
+                    actor=actor,
+                    project_id=agent_state.project_id,
+                )
+            else:
+                curr_system_message = rebuilt_message
+
+        return agent_state, curr_system_message, num_messages, num_archival_memories
+
+    @staticmethod
+    def _build_rebuilt_system_message(
+        agent_state: PydanticAgentState,
+        curr_system_message: PydanticMessage,
+        num_messages: int,
+        num_archival_memories: int,
+        force: bool = False,
+        update_timestamp: bool = True,
+    ) -> Optional[PydanticMessage]:
+        """Return the agent's system message recompiled from its current memory, or None if it would not change."""
+        tool_rules_solver = ToolRulesSolver(agent_state.tool_rules)
         curr_system_message_openai = curr_system_message.to_openai_dict()
 
         # note: we only update the system prompt if the core memory is changed
@@ -1561,10 +1610,8 @@ class AgentManager:
         )
         if curr_memory_str in curr_system_message_openai["content"] and not force:
             # NOTE: could this cause issues if a block is removed? (substring match would still work)
-            logger.debug(
-                f"Memory hasn't changed for agent id={agent_id} and actor=({actor.id}, {actor.name}), skipping system prompt rebuild"
-            )
-            return agent_state, curr_system_message, num_messages, num_archival_memories
+            logger.debug(f"Memory hasn't changed for agent id={agent_state.id}, skipping system prompt rebuild")
+            return None
 
         # If the memory didn't update, we probably don't want to update the timestamp inside
         # For example, if we're doing a system prompt swap, this should probably be False
@@ -1588,28 +1635,106 @@ class AgentManager:
         )
 
         diff = united_diff(curr_system_message_openai["content"], new_system_message_str)
-        if len(diff) > 0:  # there was a diff
-            logger.debug(f"Rebuilding system with new memory...\nDiff:\n{diff}")
+        if len(diff) == 0:
+            return None
+        logger.debug(f"Rebuilding system with new memory...\nDiff:\n{diff}")
 
-            # Swap the system message out (only if there is a diff)
-            temp_message = PydanticMessage.dict_to_message(
-                agent_id=agent_id,
-                model=agent_state.llm_config.model,
-                openai_message_dict={"role": "system", "content": new_system_message_str},
+        # Swap the system message out (only if there is a diff)
+        rebuilt_message = PydanticMessage.dict_to_message(
+            agent_id=agent_state.id,
+            model=agent_state.llm_config.model,
+            openai_message_dict={"role": "system", "content": new_system_message_str},
+        )
+        rebuilt_message.id = curr_system_message.id
+        return rebuilt_message
+
+    @enforce_types
+    @trace_method
+    async def rebuild_system_prompts_async(
+        self,
+        agent_ids: List[str],
+        actor: PydanticUser,
+        max_concurrency: int = 8,
+    ) -> int:
+        """Force-rebuild the system prompts of many agents, e.g. after a block they share changed.
+
+        Equivalent to ``rebuild_system_prompt_async(force=True, update_timestamp=False)`` for each agent, but agents,
+        system messages and message/passage counts are loaded with one query each for the whole batch, and only
+        the system message writes run per agent (``max_concurrency`` at a time).
+
+        Returns:
+            The number of system messages that were rewritten.
+        """
+        if not agent_ids:
+            return 0
+
+        agent_states = await self.get_agents_by_ids_async(
+            agent_ids=agent_ids, actor=actor, include_relationships=["memory", "sources", "tools"]
+        )
+        agent_states = [agent_state for agent_state in agent_states if agent_state.message_ids]
+        if not agent_states:
+            return 0
+        loaded_ids = [agent_state.id for agent_state in agent_states]
+
+        async with db_registry.async_session() as session:
+            result = await session.execute(
+                select(MessageModel.agent_id, func.count(MessageModel.id))
+                .where(MessageModel.agent_id.in_(loaded_ids), MessageModel.organization_id == actor.organization_id)
+                .group_by(MessageModel.agent_id)
             )
-            temp_message.id = curr_system_message.id
+            message_counts = dict(result.all())
+            result = await session.execute(
+                select(ArchivesAgents.agent_id, func.count(ArchivalPassage.id))
+                .join(ArchivesAgents, ArchivalPassage.archive_id == ArchivesAgents.archive_id)
+                .where(
+                    ArchivesAgents.agent_id.in_(loaded_ids),
+                    ArchivalPassage.organization_id == actor.organization_id,
+                    ArchivalPassage.is_deleted == False,
+                )
+                .group_by(ArchivesAgents.agent_id)
+            )
+            passage_counts = dict(result.all())
 
-            if not dry_run:
+        system_messages = await self.message_manager.get_messages_by_ids_async(
+            message_ids=[agent_state.message_ids[0] for agent_state in agent_states], actor=actor
+        )
+        system_messages_by_id = {message.id: message for message in system_messages}
+
+        async def write(agent_state: PydanticAgentState, rebuilt_message: PydanticMessage) -> bool:
+            try:
                 await self.message_manager.update_message_by_id_async(
-                    message_id=curr_system_message.id,
-                    message_update=MessageUpdate(**temp_message.model_dump()),
+                    message_id=rebuilt_message.id,
+                    message_update=MessageUpdate(**rebuilt_message.model_dump()),
                     actor=actor,
                     project_id=agent_state.project_id,
                 )
-            else:
-                curr_system_message = temp_message
+                return True
+            except Exception:
+                logger.exception(f"Failed to write rebuilt system prompt for agent {agent_state.id}")
+                return False
 
-        return agent_state, curr_system_message, num_messages, num_archival_memories
+        writes = []
+        for agent_state in agent_states:
+            curr_system_message = system_messages_by_id.get(agent_state.message_ids[0])
+            if curr_system_message is None:
+                logger.warning(f"No system message found for agent {agent_state.id} and user {actor}")
+                continue
+            try:
+                rebuilt_message = self._build_rebuilt_system_message(
+                    agent_state,
+                    curr_system_message,
+                    message_counts.get(agent_state.id, 0),
+                    passage_counts.get(agent_state.id, 0),
+                    force=True,
+                    update_timestamp=False,
+                )
+            except Exception:
+                logger.exception(f"Failed to rebuild system prompt for agent {agent_state.id}")
+                continue
+            if rebuilt_message is not None:
+                writes.append(write(agent_state, rebuilt_message))
+
+        return sum(await bounded_gather(writes, max_concurrency=max_concurrency))
 
     @enforce_types
     @trace_method
@@ -1800,6 +1925,101 @@ class AgentManager:
 
         return agent_state
 
+    @enforce_types
+    @trace_method
+    async def apply_memory_edits_async(self, agent_state: PydanticAgentState, edited_block_ids: List[str], actor: PydanticUser) -> bool:
+        """
+        Write memory blocks edited in ``agent_state`` and recompile the system prompt, in one transaction.
+
+        The batched counterpart of ``update_memory_if_changed_async`` used by ``MemoryWriteBuffer``: the agent is not
+        reloaded, only the edited blocks are written (if their value differs from the database), and the system
+        message is rewritten once if the memory compiled from the agent's blocks changed. Other agents sharing an
+        edited block have their prompts rebuilt after the commit.
+
+        Args:
+            agent_state: The agent whose in-memory blocks hold the edits
+            edited_block_ids: IDs of the blocks that were edited
+            actor: User performing the action
+
+        Returns:
+            bool: whether the system prompt was rewritten
+        """
+        blocks_by_id = {block.id: block for block in agent_state.memory.get_blocks()}
+        edited_block_ids = [block_id for block_id in edited_block_ids if block_id in blocks_by_id]
+        changed_block_ids = []
+        system_message = None
+
+        async with db_registry.async_session() as session:
+            result = await session.execute(
+                select(BlockModel).where(BlockModel.id.in_(blocks_by_id), BlockModel.organization_id == actor.organization_id)
+            )
+            block_orms = {block.id: block for block in result.scalars().all()}
+            for block_id in edited_block_ids:
+                block = block_orms.get(block_id)
+                if block is not None and block.value != blocks_by_id[block_id].value:
+                    block.value = blocks_by_id[block_id].value
+                    await block.update_async(db_session=session, actor=actor, no_commit=True, no_refresh=True)
+                    changed_block_ids.append(block_id)
+
+            # Blocks that only exist in memory (never persisted) are left out, like a refresh from the DB would
+            memory = Memory(
+                blocks=[block_orms[block_id].to_pydantic() for block_id in blocks_by_id if block_id in block_orms],
+                file_blocks=agent_state.memory.file_blocks,
+                agent_type=agent_state.agent_type,
+                git_enabled=agent_state.memory.git_enabled,
+            )
+
+            message_ids = (
+                await session.execute(
+                    select(AgentModel.message_ids).where(
+                        AgentModel.id == agent_state.id, AgentModel.organization_id == actor.organization_id
+                    )
+                )
+            ).scalar_one_or_none()
+            if message_ids:
+                curr_system_message = (
+                    await MessageModel.read_async(db_session=session, identifier=message_ids[0], actor=actor)
+                ).to_pydantic()
+                num_messages = await MessageModel.size_async(db_session=session, actor=actor, agent_id=agent_state.id)
+                num_archival_memories = (
+                    await session.execute(
+                        select(func.count(ArchivalPassage.id))
+                        .join(ArchivesAgents, ArchivalPassage.archive_id == ArchivesAgents.archive_id)
+                        .where(
+                            ArchivesAgents.agent_id == agent_state.id,
+                            ArchivalPassage.organization_id == actor.organization_id,
+                            ArchivalPassage.is_deleted == False,
+                        )
+                    )
+                ).scalar() or 0
+                rebuilt_message = self._build_rebuilt_system_message(
+                    agent_state.model_copy(update={"memory": memory, "message_ids": message_ids}),
+                    curr_system_message,
+                    num_messages,
+                    num_archival_memories,
+                )
+                if rebuilt_message is not None:
+                    system_message = await self.message_manager._update_message_by_id_with_session(
+                        session, rebuilt_message.id, MessageUpdate(**rebuilt_message.model_dump()), actor
+                    )
+            else:
+                logger.warning(f"No system message found for agent {agent_state.id} and user {actor}")
+
+        if system_message is not None:
+            await self.message_manager._sync_updated_message_embedding(system_message, actor, project_id=agent_state.project_id)
+
+        if changed_block_ids:
+            async with db_registry.async_session() as session:
+                result = await session.execute(
+                    select(BlocksAgents.agent_id)
+                    .where(BlocksAgents.block_id.in_(changed_block_ids), BlocksAgents.agent_id != agent_state.id)
+                    .distinct()
+                )
+                shared_agent_ids = list(result.scalars().all())
+            await self.block_manager._rebuild_system_prompts_for_agents(shared_agent_ids, actor)
+
+        return system_message is not None
+
     @enforce_types
     @trace_method
     async def refresh_memory_async(self, agent_state: PydanticAgentState, actor: PydanticUser) -> PydanticAgentState:
@@ -2383,6 +2603,24 @@ class AgentManager:
         embedding_config: Optional[EmbeddingConfig] = None,
     ) -> List[PydanticPassage]:
         """Lists all passages attached to an agent."""
+        if embed_query and use_in_process_vector_index():
+            assert embedding_config is not None, "embedding_config must be specified for vector search"
+            assert query_text is not None, "query_text must be specified for vector search"
+            query_embedding = await embed_passage_query(actor=actor, query_text=query_text, embedding_config=embedding_config)
+            async with db_registry.async_session() as session:
+                filter_query = await build_source_passage_query(
+                    actor=actor,
+                    agent_id=agent_id,
+                    file_id=file_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    before=before,
+                    after=after,
+                    source_id=source_id,
+                )
+                ranked = await search_passages_with_vector_index(session, filter_query, SourcePassage, query_embedding, limit=limit)
+                return [p.to_pydantic() for p, _ in ranked]
+
         async with db_registry.async_session() as session:
             main_query = await build_source_passage_query(
                 actor=actor,
@@ -2475,12 +2713,13 @@ class AgentManager:
                     # Return full tuples with metadata
                     return passages_with_scores
 
-        # Fall back to SQL-based search for non-vector queries or NATIVE archives
-        async with db_registry.async_session() as session:
-            main_query = await build_agent_passage_query(
+        # Self-hosted hybrid search: Postgres full-text ranking fused with pgvector similarity
+        if query_text and settings.use_local_hybrid_search and settings.database_engine is DatabaseChoice.POSTGRES:
+            return await self._query_agent_passages_hybrid_async(
                 actor=actor,
                 agent_id=agent_id,
                 archive_id=archive_id,
+                limit=limit,
                 query_text=query_text,
                 start_date=start_date,
                 end_date=end_date,
@@ -2489,46 +2728,97 @@ class AgentManager:
                 embed_query=embed_query,
                 ascending=ascending,
                 embedding_config=embedding_config,
+                tags=tags,
+                tag_match_mode=tag_match_mode,
             )
 
-            # Add limit
-            if limit:
-                main_query = main_query.limit(limit)
+        # Fall back to SQL-based search for non-vector queries or NATIVE archives
+        async with db_registry.async_session() as session:
+            if embed_query and query_text and embedding_config and use_in_process_vector_index():
+                # SQLite: rank with the in-process vector index instead of a per-row cosine_distance UDF
+                query_embedding = await embed_passage_query(actor=actor, query_text=query_text, embedding_config=embedding_config)
+                filter_query = await build_agent_passage_query(
+                    actor=actor,
+                    agent_id=agent_id,
+                    archive_id=archive_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    before=before,
+                    after=after,
+                    tags=tags,
+                    tag_match_mode=tag_match_mode,
+                )
+                ranked = await search_passages_with_vector_index(session, filter_query, ArchivalPassage, query_embedding, limit=limit)
+                pydantic_passages = [p.to_pydantic() for p, _ in ranked]
+            else:
+                main_query = await build_agent_passage_query(
+                    actor=actor,
+                    agent_id=agent_id,
+                    archive_id=archive_id,
+                    query_text=query_text,
+                    start_date=start_date,
+                    end_date=end_date,
+                    before=before,
+                    after=after,
+                    embed_query=embed_query,
+                    ascending=ascending,
+                    embedding_config=embedding_config,
+                    tags=tags,
+                    tag_match_mode=tag_match_mode,
+                )
 
-            # Execute query
-            result = await session.execute(main_query)
+                # Add limit
+                if limit:
+                    main_query = main_query.limit(limit)
 
-            # Get ORM objects directly using scalars()
-            passages = result.scalars().all()
+                # Execute query
+                result = await session.execute(main_query)
 
-            # Convert to Pydantic models
-            pydantic_passages = [p.to_pydantic() for p in passages]
-
-            # TODO: Integrate tag filtering directly into the SQL query for better performance.
-            # Currently using post-filtering which is less efficient but simpler to implement.
-            # Future optimization: Add JOIN with passage_tags table and WHERE clause for tag filtering.
-            if tags:
-                filtered_passages = []
-                for passage in pydantic_passages:
-                    if passage.tags:
-                        passage_tags = set(passage.tags)
-                        query_tags = set(tags)
-
-                        if tag_match_mode == TagMatchMode.ALL:
-                            # ALL mode: passage must have all query tags
-                            if query_tags.issubset(passage_tags):
-                                filtered_passages.append(passage)
-                        else:
-                            # ANY mode (default): passage must have at least one query tag
-                            if query_tags.intersection(passage_tags):
-                                filtered_passages.append(passage)
-
-                # Return as tuples with empty metadata for SQL path
-                return [(p, 0.0, {}) for p in filtered_passages]
+                # Get ORM objects directly using scalars()
+                passages = result.scalars().all()
+
+                # Convert to Pydantic models
+                pydantic_passages = [p.to_pydantic() for p in passages]
 
             # Return as tuples with empty metadata for SQL path
             return [(p, 0.0, {}) for p in pydantic_passages]
 
+    @trace_method
+    async def _query_agent_passages_hybrid_async(
+        self,
+        actor: PydanticUser,
+        query_text: str,
+        limit: Optional[int] = 50,
+        embed_query: bool = False,
+        embedding_config: Optional[EmbeddingConfig] = None,
+        **filters,
+    ) -> List[Tuple[PydanticPassage, float, dict]]:
+        """Rank passages with Postgres full-text search and (if an embedding config is given) pgvector, fused with RRF.
+
+        Returns the same (passage, score, metadata) tuples as the Turbopuffer hybrid search.
+        """
+        async with db_registry.async_session() as session:
+            fts_query = await build_agent_passage_query(actor=actor, query_text=query_text, full_text_search=True, **filters)
+            if limit:
+                fts_query = fts_query.limit(limit)
+            fts_passages = [p.to_pydantic() for p in (await session.execute(fts_query)).scalars().all()]
+
+            vector_passages = []
+            if embed_query and embedding_config:
+                vector_query = await build_agent_passage_query(
+                    actor=actor, query_text=query_text, embed_query=True, embedding_config=embedding_config, **filters
+                )
+                if limit:
+                    vector_query = vector_query.limit(limit)
+                vector_passages = [p.to_pydantic() for p in (await session.execute(vector_query)).scalars().all()]
+
+        return reciprocal_rank_fusion(
+            vector_results=vector_passages,
+            fts_results=fts_passages,
+            get_id_func=lambda p: p.id,
+            top_k=limit,
+        )
+
     @enforce_types
     @trace_method
     async def search_agent_archival_memory_async(
@@ -3308,28 +3598,15 @@ class AgentManager:
         logger.info(f"Inserting document into context window for source: {source_id}")
         logger.info(f"Attached agents: {[a.id for a in agent_states]}")
 
-        # Generate visible content for the file
-        line_chunker = LineChunker()
-        content_lines = line_chunker.chunk_text(file_metadata=file_metadata_with_content)
-        visible_content = "\n".join(content_lines)
-        visible_content_map = {file_metadata_with_content.file_name: visible_content}
-
-        all_closed_files: List[str] = []
-
-        for agent_state in agent_states:
-            # To avoid exhausting the db connection pool when many agents are attached,
-            # perform the operations sequentially instead of concurrently.
-            closed_for_agent = await self.file_agent_manager.attach_files_bulk(
-                agent_id=agent_state.id,
-                files_metadata=[file_metadata_with_content],
-                visible_content_map=visible_content_map,
-                actor=actor,
-                max_files_open=agent_state.max_files_open,
-            )
-            all_closed_files.extend(closed_for_agent)
+        # The file is opened as a shared view: agents' rows only reference it and the view is rendered from the
+        # file's line index when memory is compiled, so nothing is chunked or copied per agent here
+        closed_files = await self.file_agent_manager.attach_file_to_agents(
+            file_metadata=file_metadata_with_content,
+            max_files_open_by_agent={agent_state.id: agent_state.max_files_open for agent_state in agent_states},
+            actor=actor,
+        )
 
         # Log if any files were closed
-        closed_files = all_closed_files
         if closed_files:
             logger.info(f"LRU eviction closed {len(closed_files)} files during bulk attach: {closed_files}")
 
@@ -3344,22 +3621,12 @@ class AgentManager:
         """
         logger.info(f"Inserting {len(file_metadata_with_content)} documents into context window for agent_state: {agent_state.id}")
 
-        # Generate visible content for each file
-        line_chunker = LineChunker()
-        visible_content_map = {}
-        for i, file_metadata in enumerate(file_metadata_with_content):
-            content_lines = line_chunker.chunk_text(file_metadata=file_metadata)
-            visible_content_map[file_metadata.file_name] = "\n".join(content_lines)
-
-            # Yield to event loop every 100 files to prevent saturation
-            if i > 0 and i % 100 == 0:
-                await asyncio.sleep(0)
-
-        # Use bulk attach to avoid race conditions and duplicate LRU eviction decisions
+        # Use bulk attach to avoid race conditions and duplicate LRU eviction decisions; the files are opened as
+        # shared views rendered from their line indexes when memory is compiled
         closed_files = await self.file_agent_manager.attach_files_bulk(
             agent_id=agent_state.id,
             files_metadata=file_metadata_with_content,
-            visible_content_map=visible_content_map,
+            shared_views=True,
             actor=actor,
             max_files_open=agent_state.max_files_open,
         )
@@ -0,0 +1,301 @@
+"""Read-through cache for ``AgentManager.get_agent_by_id_async``.
+
+Loading an agent pulls ~8 ``selectin`` relationships and decrypts its secrets, on every request. This module
+keeps recently loaded ``AgentState`` objects in process, keyed by ``(agent id, org, relationship set, include)``,
+and validates them against version stamps kept in Redis:
+
+- ``agent_state:version:<agent_id>`` is bumped whenever a committed transaction touched that agent;
+- ``agent_state:epoch`` is bumped when we cannot tell which agents a write affected (e.g. a deleted tool).
+
+A cached entry is served only if both stamps still match the ones read before it was loaded, so every worker
+drops its copy after any other worker writes. Writes are detected at the session level rather than by
+sprinkling calls over every manager method: ORM flushes and DML statements against agent-related tables
+record the affected ids in ``session.info``, and an after-commit hook (see ``letta.server.db``) resolves shared
+rows (blocks, tools, sources, identities) to agents and bumps the stamps.
+
+Version stamps need a shared store, so the cache is a pass-through when Redis is not configured.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import column, event, inspect as sa_inspect, select, table
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+from sqlalchemy.sql.visitors import iterate
+
+from letta.constants import REDIS_DEFAULT_CACHE_PREFIX
+from letta.log import get_logger
+from letta.otel.metric_registry import MetricRegistry
+from letta.schemas.agent import AgentState
+from letta.server.db import AFTER_COMMIT_HOOKS_KEY
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+EPOCH_KEY = f"{REDIS_DEFAULT_CACHE_PREFIX}:agent_state:epoch"
+# Stamps outlive cached entries by a wide margin, so an expired stamp can never resurrect a stale entry
+VERSION_TTL_SECONDS = 24 * 3600
+
+# table -> column holding the agent id for rows that belong to exactly one agent
+_AGENT_ID_COLUMNS: Dict[str, str] = {
+    "agents": "id",
+    "agents_tags": "agent_id",
+    "agent_environment_variables": "agent_id",
+    "blocks_agents": "agent_id",
+    "files_agents": "agent_id",
+    "groups": "manager_agent_id",
+    "identities_agents": "agent_id",
+    "sources_agents": "agent_id",
+    "tools_agents": "agent_id",
+}
+
+# table -> (association table, column referencing this table) for rows shared between agents
+_SHARED_TABLES: Dict[str, Tuple[str, str]] = {
+    "block": ("blocks_agents", "block_id"),
+    "tools": ("tools_agents", "tool_id"),
+    "sources": ("sources_agents", "source_id"),
+    "identities": ("identities_agents", "identity_id"),
+}
+
+_DIRTY_KEY = "letta_agent_state_dirty"
+_MULTI_VALUES_PARAM = re.compile(r"^(?P<name>.+)_m\d+$")
+
+
+def agent_version_key(agent_id: str) -> str:
+    return f"{REDIS_DEFAULT_CACHE_PREFIX}:agent_state:version:{agent_id}"
+
+
+def agent_state_cache_key(
+    agent_id: str, organization_id: str, include_relationships: Optional[List[str]], include: Optional[List[str]]
+) -> Hashable:
+    relationships: Optional[FrozenSet[str]] = None if include_relationships is None else frozenset(include_relationships)
+    return (agent_id, organization_id, relationships, frozenset(include or ()))
+
+
+class AgentStateCache:
+    """Process-local LRU of ``AgentState`` validated against Redis version stamps."""
+
+    def __init__(self, redis_client, max_entries: int, ttl_seconds: float):
+        self.redis_client = redis_client
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, int], float, AgentState]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def current_version(self, agent_id: str) -> Optional[Tuple[int, int]]:
+        """(agent version, global epoch), or None if the stamps cannot be read (the caller should bypass the cache)."""
+        try:
+            agent_version, epoch = await self.redis_client.mget(agent_version_key(agent_id), EPOCH_KEY)
+        except Exception as e:
+            logger.warning(f"Reading agent state version for {agent_id} failed: {e}")
+            return None
+        return int(agent_version or 0), int(epoch or 0)
+
+    def get(self, key: Hashable, version: Tuple[int, int]) -> Optional[AgentState]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] != version or time.monotonic() - entry[1] > self.ttl_seconds):
+                del self._entries[key]
+                reason = "stale" if entry[0] != version else "expired"
+                entry = None
+            else:
+                reason = "absent"
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            MetricRegistry().agent_state_cache_miss_counter.add(1, attributes={"reason": reason})
+            return None
+        MetricRegistry().agent_state_cache_hit_counter.add(1)
+        # Callers mutate the state they get back (message_ids, memory), so never hand out the cached instance
+        return entry[2].model_copy(deep=True)
+
+    def put(self, key: Hashable, version: Tuple[int, int], agent_state: AgentState) -> None:
+        if self.max_entries <= 0:
+            return
+        entry = (version, time.monotonic(), agent_state.model_copy(deep=True))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def drop_local(self, agent_ids: Optional[Iterable[str]] = None) -> None:
+        """Forget local entries for ``agent_ids`` (or all of them). Other workers rely on the version bump."""
+        with self._lock:
+            if agent_ids is None:
+                self._entries.clear()
+                return
+            agent_ids = set(agent_ids)
+            for key in [key for key in self._entries if key[0] in agent_ids]:
+                del self._entries[key]
+
+    async def invalidate(self, agent_ids: Iterable[str] = (), everything: bool = False) -> None:
+        agent_ids = sorted(set(agent_ids))
+        keys = [agent_version_key(agent_id) for agent_id in agent_ids] + ([EPOCH_KEY] if everything else [])
+        if not keys:
+            return
+        self.drop_local(None if everything else agent_ids)
+        try:
+            await self.redis_client.incr_many(*keys, ex=VERSION_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Publishing agent state invalidation failed: {e}")
+            return
+        if agent_ids:
+            MetricRegistry().agent_state_cache_invalidation_counter.add(len(agent_ids), attributes={"scope": "agent"})
+        if everything:
+            MetricRegistry().agent_state_cache_invalidation_counter.add(1, attributes={"scope": "global"})
+
+
+_cache: Optional[AgentStateCache] = None
+
+
+async def get_agent_state_cache() -> Optional[AgentStateCache]:
+    """Process-wide cache, or None when disabled or when Redis (needed for cross-worker versions) is unavailable."""
+    global _cache
+    if not settings.agent_state_cache_enabled:
+        return None
+    if _cache is None:
+        from letta.data_sources.redis_client import NoopAsyncRedisClient, get_redis_client
+
+        redis_client = await get_redis_client()
+        if isinstance(redis_client, NoopAsyncRedisClient):
+            return None
+        _cache = AgentStateCache(
+            redis_client, max_entries=settings.agent_state_cache_max_entries, ttl_seconds=settings.agent_state_cache_ttl_seconds
+        )
+    return _cache
+
+
+# ======================================================================================================================
+# Write tracking
+# ======================================================================================================================
+
+
+class _DirtyAgents:
+    def __init__(self):
+        self.agent_ids: Set[str] = set()
+        self.shared_ids: Dict[str, Set[str]] = {}
+        self.everything = False
+
+
+def _dirty(session: Session) -> _DirtyAgents:
+    dirty = session.info.get(_DIRTY_KEY)
+    if dirty is None:
+        dirty = session.info[_DIRTY_KEY] = _DirtyAgents()
+        session.info.setdefault(AFTER_COMMIT_HOOKS_KEY, {})["agent_state_cache"] = _publish_invalidations
+    return dirty
+
+
+def _record_ids(dirty: _DirtyAgents, table_name: str, ids: Optional[Set[str]], deleted: bool = False) -> None:
+    if table_name in _AGENT_ID_COLUMNS:
+        if ids is None:
+            dirty.everything = True
+        else:
+            dirty.agent_ids.update(ids)
+    elif ids is None or deleted:
+        # a deleted shared row has already lost the association rows we would resolve it through
+        dirty.everything = True
+    else:
+        dirty.shared_ids.setdefault(table_name, set()).update(ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_agent_writes(session, flush_context):
+    if not settings.agent_state_cache_enabled:
+        return
+    for objects, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for obj in objects:
+            table_name = getattr(getattr(obj, "__table__", None), "name", None)
+            if table_name in _AGENT_ID_COLUMNS:
+                column_name = _AGENT_ID_COLUMNS[table_name]
+                history = sa_inspect(obj).attrs[column_name].history
+                ids = {value for value in (*history.unchanged, *history.added, *history.deleted) if value}
+                _record_ids(_dirty(session), table_name, ids)
+            elif table_name in _SHARED_TABLES:
+                _record_ids(_dirty(session), table_name, {obj.id}, deleted=deleted)
+
+
+def _bound_values(statement, column_name: str, parameters) -> Optional[Set[str]]:
+    """Values bound to ``column_name`` by a DML statement, or None if they cannot be determined."""
+    values: Set[str] = set()
+    if statement.is_insert:
+        rows = parameters if isinstance(parameters, list) else [parameters] if parameters else []
+        for row in rows:
+            if column_name in row:
+                values.add(row[column_name])
+        if not rows:
+            try:
+                params = statement.compile().params
+            except Exception:
+                return None
+            for name, value in params.items():
+                match = _MULTI_VALUES_PARAM.match(name)
+                if name == column_name or (match and match.group("name") == column_name):
+                    values.add(value)
+        return values or None
+
+    if isinstance(parameters, list):
+        # ORM bulk UPDATE by primary key
+        values.update(row[column_name] for row in parameters if column_name in row)
+    if statement.whereclause is not None:
+        for element in iterate(statement.whereclause):
+            if (
+                isinstance(element, BinaryExpression)
+                and getattr(element.left, "name", None) == column_name
+                and isinstance(element.right, BindParameter)
+            ):
+                value = element.right.effective_value
+                values.update(value if isinstance(value, (list, tuple, set)) else [value])
+    return values or None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_agent_writes(orm_execute_state):
+    if orm_execute_state.is_select or not settings.agent_state_cache_enabled:
+        return
+    statement = orm_execute_state.statement
+    table_name = getattr(getattr(statement, "table", None), "name", None)
+    if table_name in _AGENT_ID_COLUMNS:
+        ids = _bound_values(statement, _AGENT_ID_COLUMNS[table_name], orm_execute_state.parameters)
+        _record_ids(_dirty(orm_execute_state.session), table_name, ids)
+    elif table_name in _SHARED_TABLES:
+        ids = None if orm_execute_state.is_delete else _bound_values(statement, "id", orm_execute_state.parameters)
+        _record_ids(_dirty(orm_execute_state.session), table_name, ids, deleted=orm_execute_state.is_delete)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_committed_local_entries(session):
+    # Runs before the (async) version bump below, so this worker never serves its own pre-commit copy in between
+    dirty: Optional[_DirtyAgents] = session.info.get(_DIRTY_KEY)
+    if dirty is None or _cache is None:
+        return
+    _cache.drop_local(None if dirty.everything or dirty.shared_ids else dirty.agent_ids)
+
+
+async def _publish_invalidations(session) -> None:
+    dirty: Optional[_DirtyAgents] = session.info.pop(_DIRTY_KEY, None)
+    if dirty is None:
+        return
+    cache = await get_agent_state_cache()
+    if cache is None:
+        return
+
+    agent_ids = set(dirty.agent_ids)
+    everything = dirty.everything
+    if not everything:
+        try:
+            for table_name, ids in dirty.shared_ids.items():
+                association, reference_column = _SHARED_TABLES[table_name]
+                query = select(column("agent_id")).select_from(table(association)).where(column(reference_column).in_(ids))
+                agent_ids.update((await session.execute(query)).scalars().all())
+        except Exception as e:
+            logger.warning(f"Resolving agents for shared rows failed, invalidating all cached agent states: {e}")
+            everything = True
+    await cache.invalidate(agent_ids, everything=everything)
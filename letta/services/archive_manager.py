@@ -3,7 +3,9 @@ from typing import Dict, List, Optional
 
 from sqlalchemy import delete, or_, select
 
+from letta.helpers.embedding_cache import request_embeddings_cached
 from letta.helpers.tpuf_client import should_use_tpuf
+from letta.helpers.vector_index import ARCHIVE_SCOPE, passage_vector_indexes
 from letta.log import get_logger
 from letta.orm import ArchivalPassage, Archive as ArchiveModel, ArchivesAgents
 from letta.otel.tracing import trace_method
@@ -276,6 +278,7 @@ class ArchiveManager:
                 actor=actor,
             )
             await archive_model.hard_delete_async(session, actor=actor)
+            passage_vector_indexes.invalidate(ARCHIVE_SCOPE, archive_id)
             logger.info(f"Deleted archive {archive_id}")
 
     @enforce_types
@@ -319,7 +322,7 @@ class ArchiveManager:
                 provider_type=archive.embedding_config.embedding_endpoint_type,
                 actor=actor,
             )
-            embeddings = await embedding_client.request_embeddings([text], archive.embedding_config)
+            embeddings = await request_embeddings_cached(embedding_client, [text], archive.embedding_config)
             embedding = embeddings[0] if embeddings else None
 
         # Parse created_at from ISO string if provided
@@ -406,7 +409,7 @@ class ArchiveManager:
             provider_type=archive.embedding_config.embedding_endpoint_type,
             actor=actor,
         )
-        embeddings = await embedding_client.request_embeddings(texts, archive.embedding_config)
+        embeddings = await request_embeddings_cached(embedding_client, texts, archive.embedding_config)
 
         if len(embeddings) != len(passages):
             raise ValueError("Embedding response count does not match passages count")
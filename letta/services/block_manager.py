@@ -23,6 +23,7 @@ from letta.schemas.block import Block as PydanticBlock, BlockUpdate
 from letta.schemas.enums import ActorType, PrimitiveType
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.system_prompt_rebuild_scheduler import get_system_prompt_rebuild_scheduler
 from letta.settings import DatabaseChoice, settings
 from letta.utils import bounded_gather, decrypt_agent_secrets, enforce_types
 from letta.validators import raise_on_invalid_id
@@ -59,13 +60,28 @@ class BlockManager:
         self.agent_manager = AgentManager(block_manager=self)
 
     async def _rebuild_system_prompts_for_connected_agents(self, block_id: str, actor: PydanticUser) -> None:
-        """Rebuild system prompts for all agents connected to the given block."""
+        """Rebuild system prompts for all agents connected to the given block.
+
+        Small fan-outs are rebuilt inline in one batch; blocks shared by more than
+        ``system_prompt_rebuild_inline_max_agents`` agents are handed to the deferred rebuild scheduler.
+        """
         agent_ids = await self.get_agent_ids_for_block_async(block_id=block_id, actor=actor)
-        for agent_id in agent_ids:
-            try:
-                await self.agent_manager.rebuild_system_prompt_async(agent_id=agent_id, actor=actor, force=True, update_timestamp=False)
-            except Exception:
-                logger.exception(f"Failed to rebuild system prompt for agent {agent_id} after block {block_id} was updated")
+        await self._rebuild_system_prompts_for_agents(agent_ids, actor)
+
+    async def _rebuild_system_prompts_for_agents(self, agent_ids: List[str], actor: PydanticUser) -> None:
+        """Rebuild the given agents' system prompts inline, or defer them if there are too many."""
+        if not agent_ids:
+            return
+        if len(agent_ids) > settings.system_prompt_rebuild_inline_max_agents:
+            scheduler = await get_system_prompt_rebuild_scheduler()
+            await scheduler.mark_dirty(agent_ids, actor)
+            return
+        try:
+            await self.agent_manager.rebuild_system_prompts_async(
+                agent_ids=agent_ids, actor=actor, max_concurrency=settings.system_prompt_rebuild_max_concurrency
+            )
+        except Exception:
+            logger.exception(f"Failed to rebuild system prompts for agents {agent_ids}")
 
     # ======================================================================================================================
     # Helper methods for pivot tables
@@ -1,10 +1,11 @@
+from bisect import bisect_left
 from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
     from letta.server.server import SyncServer
 
 # Import AgentState outside TYPE_CHECKING for @enforce_types decorator
-from sqlalchemy import and_, asc, delete, desc, func, nulls_last, or_, select, update
+from sqlalchemy import and_, asc, case, delete, desc, func, nulls_last, or_, select, update
 
 from letta.errors import LettaInvalidArgumentError
 from letta.helpers.datetime_helpers import get_utc_time
@@ -27,6 +28,54 @@ from letta.services.helpers.agent_manager_helper import validate_agent_exists_as
 from letta.utils import enforce_types
 
 
+def plan_in_context_positions(in_context_message_ids: List[str], current_positions: Dict[str, int]) -> Dict[str, int]:
+    """
+    Choose positions that order ``in_context_message_ids`` as listed while moving as few rows as possible.
+
+    Rows on the longest run of already-increasing positions keep theirs, and the remaining rows are placed in
+    the gaps between them. Positions only need to be ordered, not contiguous, so appending messages or dropping
+    evicted ones renumbers nothing. IDs without a row in ``current_positions`` are skipped.
+    """
+    message_ids = [message_id for message_id in dict.fromkeys(in_context_message_ids) if message_id in current_positions]
+
+    # Longest strictly increasing subsequence of the current positions (patience sorting)
+    tail_positions: List[int] = []
+    tail_indices: List[int] = []
+    predecessors = [-1] * len(message_ids)
+    for i, message_id in enumerate(message_ids):
+        position = current_positions[message_id]
+        j = bisect_left(tail_positions, position)
+        if j > 0:
+            predecessors[i] = tail_indices[j - 1]
+        if j == len(tail_positions):
+            tail_positions.append(position)
+            tail_indices.append(i)
+        else:
+            tail_positions[j] = position
+            tail_indices[j] = i
+    anchors = set()
+    i = tail_indices[-1] if tail_indices else -1
+    while i >= 0:
+        anchors.add(i)
+        i = predecessors[i]
+
+    positions: Dict[str, int] = {}
+    pending: List[str] = []
+    previous = -1
+    for i, message_id in enumerate(message_ids):
+        position = current_positions[message_id]
+        # An anchor without room below it for the rows waiting to be placed gets moved along with them
+        if i in anchors and position - previous > len(pending):
+            positions.update(zip(pending, range(previous + 1, position)))
+            positions[message_id] = position
+            previous = position
+            pending = []
+        else:
+            pending.append(message_id)
+    positions.update(zip(pending, range(previous + 1, previous + 1 + len(pending))))
+    return positions
+
+
 class ConversationManager:
     """Manager class to handle business logic related to Conversations."""
 
@@ -760,6 +809,8 @@ class ConversationManager:
 
         Sets in_context=True for messages in the list, False for others.
         Also updates positions to preserve the order specified in in_context_message_ids.
+        Only rows whose in_context flag or position changes are written, so the cost follows the size of the
+        context window rather than the length of the conversation.
 
         This is critical for correctness: when summarization inserts a summary message
         that needs to appear before an approval request, the positions must reflect
@@ -771,31 +822,63 @@ class ConversationManager:
             actor: The user performing the action
         """
         async with db_registry.async_session() as session:
-            # Get all conversation messages for this conversation
-            query = select(ConversationMessageModel).where(
-                ConversationMessageModel.conversation_id == conversation_id,
-                ConversationMessageModel.organization_id == actor.organization_id,
-                ConversationMessageModel.is_deleted == False,
+            await self._update_in_context_messages_with_session(
+                session=session,
+                conversation_id=conversation_id,
+                in_context_message_ids=in_context_message_ids,
+                actor=actor,
             )
-            result = await session.execute(query)
-            conv_messages = result.scalars().all()
-
-            # Build lookup dict
-            conv_msg_dict = {cm.message_id: cm for cm in conv_messages}
-
-            # Update in_context status AND positions
-            in_context_set = set(in_context_message_ids)
-            for conv_msg in conv_messages:
-                conv_msg.in_context = conv_msg.message_id in in_context_set
-
-            # Update positions to match the order in in_context_message_ids
-            # This ensures ORDER BY position returns messages in the correct order
-            for position, message_id in enumerate(in_context_message_ids):
-                if message_id in conv_msg_dict:
-                    conv_msg_dict[message_id].position = position
-
             await session.commit()
 
+    async def _update_in_context_messages_with_session(
+        self,
+        session,
+        conversation_id: str,
+        in_context_message_ids: List[str],
+        actor: PydanticUser,
+    ) -> None:
+        # Only rows that are in context now or will be matter; the rest of the history is never read or written
+        conversation_filter = and_(
+            ConversationMessageModel.conversation_id == conversation_id,
+            ConversationMessageModel.organization_id == actor.organization_id,
+            ConversationMessageModel.is_deleted == False,
+        )
+        membership = ConversationMessageModel.in_context == True
+        if in_context_message_ids:
+            membership = or_(membership, ConversationMessageModel.message_id.in_(in_context_message_ids))
+        result = await session.execute(
+            select(ConversationMessageModel.message_id, ConversationMessageModel.position, ConversationMessageModel.in_context).where(
+                conversation_filter, membership
+            )
+        )
+        rows = result.all()
+        current_positions = {row.message_id: row.position for row in rows}
+        currently_in_context = {row.message_id for row in rows if row.in_context}
+
+        # Positions keep ORDER BY position in the intended order, e.g. a summary inserted before an approval request
+        positions = plan_in_context_positions(in_context_message_ids, current_positions)
+        evicted = currently_in_context - positions.keys()
+        changed = {
+            message_id: position
+            for message_id, position in positions.items()
+            if message_id not in currently_in_context or position != current_positions[message_id]
+        }
+
+        if evicted:
+            await session.execute(
+                update(ConversationMessageModel)
+                .where(conversation_filter, ConversationMessageModel.message_id.in_(evicted))
+                .values(in_context=False)
+                .execution_options(synchronize_session=False)
+            )
+        if changed:
+            await session.execute(
+                update(ConversationMessageModel)
+                .where(conversation_filter, ConversationMessageModel.message_id.in_(changed))
+                .values(in_context=True, position=case(changed, value=ConversationMessageModel.message_id))
+                .execution_options(synchronize_session=False)
+            )
+
     @enforce_types
     @trace_method
     async def list_conversation_messages(
@@ -886,7 +969,11 @@ class ConversationManager:
 
             # Convert to LettaMessages (reverse=False keeps sub-messages in natural order)
             return PydanticMessage.to_letta_messages_from_list(
-                messages, reverse=False, include_err=include_err, text_is_assistant_message=True, include_return_message_types=include_return_message_types
+                messages,
+                reverse=False,
+                include_err=include_err,
+                text_is_assistant_message=True,
+                include_return_message_types=include_return_message_types,
             )
 
     # ==================== Isolated Blocks Methods ====================
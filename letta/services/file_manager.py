@@ -9,6 +9,7 @@ from sqlalchemy.orm import selectinload
 
 from letta.constants import MAX_FILENAME_LENGTH
 from letta.helpers.pinecone_utils import list_pinecone_index_for_files, should_use_pinecone
+from letta.helpers.vector_index import SOURCE_SCOPE, passage_vector_indexes
 from letta.log import get_logger
 from letta.orm.errors import NoResultFound
 from letta.orm.file import FileContent as FileContentModel, FileMetadata as FileMetadataModel
@@ -20,6 +21,7 @@ from letta.schemas.source import Source as PydanticSource
 from letta.schemas.source_metadata import FileStats, OrganizationSourcesStats, SourceStats
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.file_processor.line_index import file_line_indexes
 from letta.settings import settings
 from letta.utils import bounded_gather, enforce_types
 from letta.validators import raise_on_invalid_id
@@ -43,6 +45,8 @@ class FileManager:
         self, file_id: str, actor: PydanticUser, original_filename: str | None = None, source_id: str | None = None
     ):
         """Invalidate all caches related to a file."""
+        file_line_indexes.invalidate(file_id)
+
         # TEMPORARILY DISABLED - caching is disabled
         # # invalidate file content cache (all variants)
         # await self.get_file_by_id.cache_invalidate(self, file_id, actor, include_content=True)
@@ -373,14 +377,16 @@ class FileManager:
             await FileMetadataModel.read_async(session, file_id, actor)
 
             dialect_name = session.bind.dialect.name
+            # updated_at versions the content for shared file views (see file_views.render_file_views)
+            now = datetime.now(timezone.utc)
 
             if dialect_name == "postgresql":
                 stmt = (
                     pg_insert(FileContentModel)
-                    .values(file_id=file_id, text=text)
+                    .values(file_id=file_id, text=text, updated_at=now)
                     .on_conflict_do_update(
                         index_elements=[FileContentModel.file_id],
-                        set_={"text": text},
+                        set_={"text": text, "updated_at": now},
                     )
                 )
                 await session.execute(stmt)
@@ -391,9 +397,11 @@ class FileManager:
                 existing = result.scalar_one_or_none()
 
                 if existing:
-                    await session.execute(update(FileContentModel).where(FileContentModel.file_id == file_id).values(text=text))
+                    await session.execute(
+                        update(FileContentModel).where(FileContentModel.file_id == file_id).values(text=text, updated_at=now)
+                    )
                 else:
-                    session.add(FileContentModel(file_id=file_id, text=text))
+                    session.add(FileContentModel(file_id=file_id, text=text, updated_at=now))
 
             await session.commit()
 
@@ -485,6 +493,8 @@ class FileManager:
             await self._invalidate_file_caches(file_id, actor, file.original_file_name, file.source_id)
 
             await file.hard_delete_async(db_session=session, actor=actor)
+            # passages cascade with the file, so drop the source's in-process vector index
+            passage_vector_indexes.invalidate(SOURCE_SCOPE, file.source_id)
             return file.to_pydantic()
 
     @enforce_types
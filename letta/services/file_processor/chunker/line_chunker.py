@@ -110,6 +110,19 @@ class LineChunker:
 
         return [line for line in lines if line.strip()]
 
+    def chunk_lines(self, file_metadata: FileMetadata, strategy: Optional[ChunkingStrategy] = None) -> List[str]:
+        """The file's lines (or sentences) as chunk_text numbers them, without numbers or metadata"""
+        strategy = strategy or self._determine_chunking_strategy(file_metadata)
+        text = file_metadata.content
+
+        # Apply the appropriate chunking strategy
+        if strategy == ChunkingStrategy.DOCUMENTATION:
+            return self._chunk_by_sentences(text)
+        elif strategy == ChunkingStrategy.CODE:
+            return self._chunk_by_lines(text, preserve_indentation=True)
+        else:  # STRUCTURED_DATA or LINE_BASED
+            return self._chunk_by_lines(text, preserve_indentation=False)
+
     def chunk_text(
         self,
         file_metadata: FileMetadata,
@@ -120,21 +133,13 @@ class LineChunker:
     ) -> List[str]:
         """Content-aware text chunking based on file type"""
         strategy = self._determine_chunking_strategy(file_metadata)
-        text = file_metadata.content
 
         # early stop, can happen if the there's nothing on a specific file
-        if not text:
+        if not file_metadata.content:
             logger.warning(f"File ({file_metadata}) has no content")
             return []
 
-        # Apply the appropriate chunking strategy
-        if strategy == ChunkingStrategy.DOCUMENTATION:
-            content_lines = self._chunk_by_sentences(text)
-        elif strategy == ChunkingStrategy.CODE:
-            content_lines = self._chunk_by_lines(text, preserve_indentation=True)
-        else:  # STRUCTURED_DATA or LINE_BASED
-            content_lines = self._chunk_by_lines(text, preserve_indentation=False)
-
+        content_lines = self.chunk_lines(file_metadata, strategy=strategy)
         total_chunks = len(content_lines)
         chunk_type = "sentences" if strategy == ChunkingStrategy.DOCUMENTATION else "lines"
 
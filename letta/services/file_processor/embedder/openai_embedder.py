@@ -2,6 +2,7 @@ import asyncio
 import time
 from typing import List, Optional, Tuple, cast
 
+from letta.helpers.embedding_cache import request_embeddings_cached
 from letta.llm_api.llm_client import LLMClient
 from letta.llm_api.openai_client import OpenAIClient
 from letta.log import get_logger
@@ -58,7 +59,7 @@ class OpenAIEmbedder(BaseEmbedder):
         )
 
         try:
-            embeddings = await self.client.request_embeddings(inputs=batch, embedding_config=self.embedding_config)
+            embeddings = await request_embeddings_cached(self.client, batch, self.embedding_config)
             log_event("embedder.batch_completed", {"batch_size": len(batch), "embeddings_generated": len(embeddings)})
             return [(idx, e) for idx, e in zip(batch_indices, embeddings)]
         except Exception as e:
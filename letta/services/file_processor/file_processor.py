@@ -16,6 +16,7 @@ from letta.services.agent_manager import AgentManager
 from letta.services.file_manager import FileManager
 from letta.services.file_processor.chunker.llama_index_chunker import LlamaIndexChunker
 from letta.services.file_processor.embedder.base_embedder import BaseEmbedder
+from letta.services.file_processor.line_index import file_line_indexes
 from letta.services.file_processor.parser.base_parser import FileParser
 from letta.services.job_manager import JobManager
 from letta.services.passage_manager import PassageManager
@@ -204,6 +205,8 @@ class FileProcessor:
             )
 
             file_metadata = await self.file_manager.upsert_file_content(file_id=file_metadata.id, text=raw_markdown_text, actor=self.actor)
+            # index the lines now so the agent's first grep_files over this file doesn't pay for it
+            await asyncio.to_thread(file_line_indexes.get, file_metadata)
 
             await self.agent_manager.insert_file_into_context_windows(
                 source_id=source_id,
@@ -0,0 +1,69 @@
+"""Rendering of shared file views.
+
+Opening a file used to store the agent's whole chunked view of it in ``files_agents.visible_content``, so a file
+attached through a source with N agents was chunked once and then written N times. A shared-view row stores only the
+line range (``start_line``/``end_line``); the view is rendered when the row is read, from the file's ``FileLineIndex``
+in ``file_line_indexes``. Each render checks the index against the stored content's version
+(``file_contents.updated_at``) and loads the text only for files whose index is missing or stale.
+"""
+
+import asyncio
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from letta.orm.file import FileContent as FileContentModel, FileMetadata as FileMetadataModel
+from letta.orm.files_agents import FileAgent as FileAgentModel
+from letta.schemas.file import FileMetadata as PydanticFileMetadata
+from letta.services.file_processor.line_index import FileLineIndex, file_line_indexes
+
+
+async def render_file_views(
+    session: AsyncSession, file_agents: Sequence[FileAgentModel], max_chars: Optional[int] = None
+) -> Dict[str, str]:
+    """Rendered views of the open shared-view rows among ``file_agents``, keyed by row id.
+
+    With ``max_chars`` (the agent's per-file view window), rendering stops past that length; the views are then only
+    good for ``FileAgent.to_pydantic_block`` with the same limit.
+    """
+    shared = [file_agent for file_agent in file_agents if file_agent.shared_view and file_agent.is_open]
+    if not shared:
+        return {}
+
+    file_ids = {file_agent.file_id for file_agent in shared}
+    versions = await session.execute(
+        select(
+            FileContentModel.file_id,
+            FileContentModel.updated_at,
+            FileMetadataModel.file_name,
+            FileMetadataModel.file_type,
+            FileMetadataModel.source_id,
+        )
+        .join(FileMetadataModel, FileMetadataModel.id == FileContentModel.file_id)
+        .where(FileContentModel.file_id.in_(file_ids))
+    )
+
+    indexes: Dict[str, FileLineIndex] = {}
+    stale = {}
+    for file_id, version, file_name, file_type, source_id in versions:
+        index = file_line_indexes.peek(file_id, version)
+        if index is not None:
+            indexes[file_id] = index
+        else:
+            stale[file_id] = (version, file_name, file_type, source_id)
+
+    if stale:
+        texts = await session.execute(select(FileContentModel.file_id, FileContentModel.text).where(FileContentModel.file_id.in_(stale)))
+        for file_id, text in texts:
+            version, file_name, file_type, source_id = stale[file_id]
+            file_metadata = PydanticFileMetadata(id=file_id, file_name=file_name, file_type=file_type, source_id=source_id, content=text)
+            indexes[file_id] = await asyncio.to_thread(file_line_indexes.get, file_metadata, version)
+
+    views = {}
+    for file_agent in shared:
+        index = indexes.get(file_agent.file_id)
+        # files whose content hasn't been stored yet have an empty view, as chunk_text gives for them
+        start = file_agent.start_line - 1 if file_agent.start_line is not None else None
+        views[file_agent.id] = index.render(start, file_agent.end_line, max_chars) if index is not None else ""
+    return views
@@ -0,0 +1,228 @@
+"""In-process line index of file contents for grep_files.
+
+grep_files used to re-chunk every attached file with ``LineChunker`` on each call, split each numbered line again to
+recover its number, and rescan the file for every match to find its context. A ``FileLineIndex`` keeps a file's
+chunked lines as one newline-joined text plus the offset where each line starts, so a search is a single regex scan
+over the file with hits mapped back to line numbers by bisection, and context is a slice.
+
+Indexes are built when a file's content is stored (``FileProcessor``) or on first search, are keyed by the content
+they were built from, and are dropped by ``FileManager`` whenever a file's content changes or the file is deleted.
+
+The same indexes back shared file views (``file_views``): an open file's view is rendered from the index for the
+agent's line range instead of every agent storing its own copy of the chunked text.
+"""
+
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable, List, Optional, Tuple
+
+from letta.schemas.file import FileMetadata
+from letta.services.file_processor.chunker.line_chunker import LineChunker
+from letta.services.file_processor.file_types import ChunkingStrategy
+from letta.settings import tool_settings
+
+# Lookarounds, \A / \Z, atomic groups and possessive quantifiers can behave differently once the text continues past
+# a line's end, so patterns using them are matched line by line
+_LINE_SENSITIVE_SYNTAX = re.compile(r"\(\?(<?[=!]|>)|\\[AZz]|[*+?}]\+")
+
+
+class FileLineIndex:
+    """A file's lines as ``LineChunker`` numbers them, searchable the way grep_files matches them (each line stripped)."""
+
+    def __init__(self, lines: List[str], chunk_type: str = "lines", has_content: bool = True):
+        self.chunk_type = chunk_type
+        self.has_content = has_content
+        stripped = [line.strip() for line in lines]
+        self._text = "\n".join(stripped)
+        self._starts = array("Q")
+        position = 0
+        for line in stripped:
+            self._starts.append(position)
+            position += len(line) + 1
+        # only code keeps its indentation for display; every other strategy already yields stripped lines
+        self._display: Optional[List[str]] = lines if lines != stripped else None
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def size(self) -> int:
+        return len(self._text) * (2 if self._display is not None else 1)
+
+    def _bounds(self, i: int) -> Tuple[int, int]:
+        end = self._starts[i + 1] - 1 if i + 1 < len(self._starts) else len(self._text)
+        return self._starts[i], end
+
+    def line(self, i: int) -> str:
+        if self._display is not None:
+            return self._display[i]
+        start, end = self._bounds(i)
+        return self._text[start:end]
+
+    def matching_lines(self, pattern: re.Pattern, limit: int) -> List[int]:
+        """0-based indexes of the first ``limit`` lines ``pattern`` matches, each line searched on its own."""
+        matches: List[int] = []
+        if limit <= 0 or not self._starts:
+            return matches
+
+        if _LINE_SENSITIVE_SYNTAX.search(pattern.pattern):
+            for i in range(len(self._starts)):
+                if pattern.search(self._text, *self._bounds(i)):
+                    matches.append(i)
+                    if len(matches) >= limit:
+                        break
+            return matches
+
+        position = 0
+        while len(matches) < limit:
+            hit = pattern.search(self._text, position)
+            if hit is None:
+                break
+            # No line before the hit can match on its own. The hit itself may run into the next line (e.g. via \s),
+            # so confirm it within its line, then resume from the next line
+            i = bisect_right(self._starts, hit.start()) - 1
+            if pattern.search(self._text, *self._bounds(i)):
+                matches.append(i)
+            if i + 1 >= len(self._starts):
+                break
+            position = self._starts[i + 1]
+        return matches
+
+    def context(self, i: int, context_lines: int) -> List[str]:
+        """Numbered lines around line ``i``, the match marked with '>' (the grep_files result format)."""
+        start = max(0, i - context_lines)
+        end = min(len(self._starts), i + context_lines + 1)
+        return [f"{'>' if j == i else ' '} {j + 1}: {self.line(j)}" for j in range(start, end)]
+
+    def check_range(self, file_name: str, start: Optional[int], end: Optional[int]) -> None:
+        """Raise the errors ``LineChunker.chunk_text(..., validate_range=True)`` raises for a 0-based [start, end)."""
+        if not self.has_content:
+            return
+        if start is not None and end is not None and start >= end:
+            raise ValueError(f"Invalid range: start ({start}) must be less than end ({end})")
+        if start is not None and start >= len(self._starts):
+            raise ValueError(
+                f"File {file_name} has only {len(self._starts)} {self.chunk_type}, but requested offset {start + 1} is out of range"
+            )
+
+    def render(self, start: Optional[int] = None, end: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+        """The view ``"\n".join(LineChunker().chunk_text(file, start, end))`` produces, with an out-of-range start clamped
+        instead of raising (the file may have changed since the range was chosen). With ``max_chars``, rendering stops
+        once the view is longer than that: the result is then a prefix of the full view, which is all
+        ``truncate_file_visible_content`` keeps of it."""
+        if not self.has_content:
+            return ""
+        total = len(self._starts)
+        first = min(max(0, start), total) if start is not None else 0
+        stop = max(first, min(end, total)) if end is not None else total
+
+        if start is not None and end is not None:
+            header = f"[Viewing {self.chunk_type} {max(0, start) + 1} to {min(end, total)} (out of {total} {self.chunk_type})]"
+        elif start is not None:
+            header = f"[Viewing {self.chunk_type} {max(0, start) + 1} to end (out of {total} {self.chunk_type})]"
+        else:
+            header = f"[Viewing file start (out of {total} {self.chunk_type})]"
+
+        parts = [header]
+        length = len(header)
+        for i in range(first, stop):
+            if max_chars is not None and length > max_chars:
+                break
+            part = f"{i + 1}: {self.line(i)}"
+            parts.append(part)
+            length += len(part) + 1
+        return "\n".join(parts)
+
+
+class FileLineIndexRegistry:
+    """LRU of file line indexes bounded by total indexed characters.
+
+    Entries remember the content they were built from and, when known, the stored content's version (its
+    ``file_contents.updated_at``), so shared views can check an index is current without loading the text.
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._indexes: "OrderedDict[str, Tuple[Tuple[int, int], Optional[Hashable], FileLineIndex]]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_metadata: FileMetadata, version: Optional[Hashable] = None) -> FileLineIndex:
+        """The index for the file's current content, built if missing or stale. ``file_metadata`` must include content;
+        ``version`` is the stored content's version, if the caller knows it."""
+        content = file_metadata.content or ""
+        content_key = (len(content), hash(content))
+        with self._lock:
+            entry = self._indexes.get(file_metadata.id)
+            if entry is not None and entry[0] == content_key:
+                if version is not None and entry[1] != version:
+                    self._indexes[file_metadata.id] = (content_key, version, entry[2])
+                self._indexes.move_to_end(file_metadata.id)
+                return entry[2]
+
+        chunker = LineChunker()
+        strategy = chunker._determine_chunking_strategy(file_metadata)
+        index = FileLineIndex(
+            chunker.chunk_lines(file_metadata, strategy=strategy) if content else [],
+            chunk_type="sentences" if strategy == ChunkingStrategy.DOCUMENTATION else "lines",
+            has_content=bool(content),
+        )
+        with self._lock:
+            self._remove(file_metadata.id)
+            if index.size <= self.max_chars:
+                self._indexes[file_metadata.id] = (content_key, version, index)
+                self._chars += index.size
+                while self._chars > self.max_chars:
+                    _, (_, _, evicted) = self._indexes.popitem(last=False)
+                    self._chars -= evicted.size
+        return index
+
+    def peek(self, file_id: str, version: Hashable) -> Optional[FileLineIndex]:
+        """The cached index for ``file_id`` if it was built from the content at ``version``, else None."""
+        with self._lock:
+            entry = self._indexes.get(file_id)
+            if entry is None or entry[1] is None or entry[1] != version:
+                return None
+            self._indexes.move_to_end(file_id)
+            return entry[2]
+
+    def invalidate(self, file_id: str) -> None:
+        with self._lock:
+            self._remove(file_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._chars = 0
+
+    def _remove(self, file_id: str) -> None:
+        entry = self._indexes.pop(file_id, None)
+        if entry is not None:
+            self._chars -= entry[2].size
+
+
+file_line_indexes = FileLineIndexRegistry(max_chars=tool_settings.grep_line_index_max_chars)
+
+_grep_executor: Optional[ThreadPoolExecutor] = None
+_grep_executor_lock = threading.Lock()
+
+
+def get_grep_executor() -> Optional[ThreadPoolExecutor]:
+    """Dedicated pool for grep_files matching, or None when ``grep_match_threads`` is 0 (match inline)."""
+    global _grep_executor
+    if tool_settings.grep_match_threads <= 0:
+        return None
+    with _grep_executor_lock:
+        if _grep_executor is None:
+            _grep_executor = ThreadPoolExecutor(max_workers=tool_settings.grep_match_threads, thread_name_prefix="GrepWorker")
+        return _grep_executor
+
+
+def grep_file(file_metadata: FileMetadata, pattern: re.Pattern, limit: int, context_lines: int) -> List[Tuple[int, List[str]]]:
+    """The first ``limit`` matches in a file as (1-based line number, context lines) pairs."""
+    index = file_line_indexes.get(file_metadata)
+    return [(i + 1, index.context(i, context_lines)) for i in index.matching_lines(pattern, limit)]
@@ -1,7 +1,9 @@
+import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Union
 
 from sqlalchemy import and_, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from letta.log import get_logger
 from letta.orm.errors import NoResultFound
@@ -12,6 +14,7 @@ from letta.schemas.block import Block as PydanticBlock, FileBlock as PydanticFil
 from letta.schemas.file import FileAgent as PydanticFileAgent, FileMetadata
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.file_processor.file_views import render_file_views
 from letta.utils import enforce_types
 
 logger = get_logger(__name__)
@@ -87,6 +90,7 @@ class FileAgentManager:
 
                     if visible_content is not None and existing.visible_content != visible_content:
                         existing.visible_content = visible_content
+                        existing.shared_view = False
 
                     existing.last_accessed_at = now_ts
                     existing.start_line = start_line
@@ -131,6 +135,7 @@ class FileAgentManager:
                 assoc.is_open = is_open
             if visible_content is not None:
                 assoc.visible_content = visible_content
+                assoc.shared_view = False
             if start_line is not None:
                 assoc.start_line = start_line
             if end_line is not None:
@@ -161,6 +166,7 @@ class FileAgentManager:
                 assoc.is_open = is_open
             if visible_content is not None:
                 assoc.visible_content = visible_content
+                assoc.shared_view = False
 
             # touch timestamp
             assoc.last_accessed_at = datetime.now(timezone.utc)
@@ -198,7 +204,7 @@ class FileAgentManager:
         total_deleted = 0
 
         for i in range(0, len(agent_file_pairs), BATCH_SIZE):
-            batch = agent_file_pairs[i:i + BATCH_SIZE]
+            batch = agent_file_pairs[i : i + BATCH_SIZE]
             async with db_registry.async_session() as session:
                 stmt = (
                     update(FileAgentModel)
@@ -223,7 +229,7 @@ class FileAgentManager:
         async with db_registry.async_session() as session:
             try:
                 assoc = await self._get_association_by_file_id(session, agent_id, file_id, actor)
-                return assoc.to_pydantic()
+                return (await self._to_pydantic(session, [assoc]))[0]
             except NoResultFound:
                 return None
 
@@ -267,7 +273,11 @@ class FileAgentManager:
             rows = (await session.execute(query)).scalars().all()
 
             # Convert to Pydantic models
-            return [row.to_pydantic_block(per_file_view_window_char_limit=per_file_view_window_char_limit) for row in rows]
+            shared_views = await render_file_views(session, rows, max_chars=per_file_view_window_char_limit)
+            return [
+                row.to_pydantic_block(per_file_view_window_char_limit=per_file_view_window_char_limit, shared_views=shared_views)
+                for row in rows
+            ]
 
     @enforce_types
     @trace_method
@@ -275,7 +285,7 @@ class FileAgentManager:
         async with db_registry.async_session() as session:
             try:
                 assoc = await self._get_association_by_file_name(session, agent_id, file_name, actor)
-                return assoc.to_pydantic()
+                return (await self._to_pydantic(session, [assoc]))[0]
             except NoResultFound:
                 return None
 
@@ -302,9 +312,13 @@ class FileAgentManager:
             rows = (await session.execute(select(FileAgentModel).where(and_(*conditions)))).scalars().all()
 
             if return_as_blocks:
-                return [r.to_pydantic_block(per_file_view_window_char_limit=per_file_view_window_char_limit) for r in rows]
+                shared_views = await render_file_views(session, rows, max_chars=per_file_view_window_char_limit)
+                return [
+                    r.to_pydantic_block(per_file_view_window_char_limit=per_file_view_window_char_limit, shared_views=shared_views)
+                    for r in rows
+                ]
             else:
-                return [r.to_pydantic() for r in rows]
+                return await self._to_pydantic(session, rows)
 
     @enforce_types
     @trace_method
@@ -410,7 +424,7 @@ class FileAgentManager:
             # get cursor for next page (ID of last item in current page)
             next_cursor = rows[-1].id if rows else None
 
-            return [r.to_pydantic() for r in rows], next_cursor, has_more
+            return await self._to_pydantic(session, rows), next_cursor, has_more
 
     @enforce_types
     @trace_method
@@ -431,7 +445,7 @@ class FileAgentManager:
                 conditions.append(FileAgentModel.is_open.is_(True))
 
             rows = (await session.execute(select(FileAgentModel).where(and_(*conditions)))).scalars().all()
-            return [r.to_pydantic() for r in rows]
+            return await self._to_pydantic(session, rows)
 
     @enforce_types
     @trace_method
@@ -518,7 +532,7 @@ class FileAgentManager:
         file_name: str,
         source_id: str,
         actor: PydanticUser,
-        visible_content: str,
+        visible_content: Optional[str],
         max_files_open: int,
         start_line: Optional[int] = None,
         end_line: Optional[int] = None,
@@ -532,7 +546,8 @@ class FileAgentManager:
             file_name: Name of the file to open
             source_id: ID of the source
             actor: User performing the action
-            visible_content: Content to set for the opened file
+            visible_content: Content to set for the opened file, or None to open it as a shared view of
+                [start_line, end_line) rendered from the file's content when read
 
         Returns:
             Tuple of (closed_file_names, file_was_already_open, previous_ranges)
@@ -619,6 +634,7 @@ class FileAgentManager:
                 # Update existing file
                 file_to_open.is_open = True
                 file_to_open.visible_content = visible_content
+                file_to_open.shared_view = visible_content is None
                 file_to_open.last_accessed_at = now_ts
                 file_to_open.start_line = start_line
                 file_to_open.end_line = end_line
@@ -633,6 +649,7 @@ class FileAgentManager:
                     organization_id=actor.organization_id,
                     is_open=True,
                     visible_content=visible_content,
+                    shared_view=visible_content is None,
                     last_accessed_at=now_ts,
                     start_line=start_line,
                     end_line=end_line,
@@ -650,9 +667,13 @@ class FileAgentManager:
         files_metadata: list[FileMetadata],
         max_files_open: int,
         visible_content_map: Optional[dict[str, str]] = None,
+        shared_views: bool = False,
         actor: PydanticUser,
     ) -> list[str]:
-        """Atomically attach many files, applying an LRU cap with one commit."""
+        """Atomically attach many files, applying an LRU cap with one commit.
+
+        Opened files show their ``visible_content_map`` entry, or with ``shared_views`` a shared view of the whole file.
+        """
         if not files_metadata:
             return []
 
@@ -734,11 +755,15 @@ class FileAgentManager:
             # upsert requested files
             for meta in ordered_unique:
                 is_now_open = meta.file_name in final_open_set
-                vc = vc_for.get(meta.file_name, "") if is_now_open else None
+                vc = vc_for.get(meta.file_name, "") if is_now_open and not shared_views else None
 
                 if row := existing_by_name.get(meta.file_name):
                     row.is_open = is_now_open
                     row.visible_content = vc
+                    row.shared_view = shared_views
+                    if shared_views:
+                        # the shared view is of the whole file
+                        row.start_line = row.end_line = None
                     row.last_accessed_at = now
                     session.add(row)  # already present, but safe
                 else:
@@ -751,6 +776,7 @@ class FileAgentManager:
                             organization_id=actor.organization_id,
                             is_open=is_now_open,
                             visible_content=vc,
+                            shared_view=shared_views,
                             last_accessed_at=now,
                         )
                     )
@@ -771,6 +797,127 @@ class FileAgentManager:
             # await session.commit()
             return closed_file_names
 
+    @enforce_types
+    @trace_method
+    async def attach_file_to_agents(
+        self,
+        *,
+        file_metadata: FileMetadata,
+        max_files_open_by_agent: Dict[str, int],
+        actor: PydanticUser,
+    ) -> List[str]:
+        """Open one file as a shared view for many agents, closing each agent's least recently used files over its cap.
+
+        Unlike calling ``attach_files_bulk`` per agent, this runs a fixed number of set-based statements: one upsert per
+        batch of agents and one LRU close per distinct cap. Returns the closed file names.
+        """
+        if not max_files_open_by_agent:
+            return []
+
+        async with db_registry.async_session() as session:
+            if session.bind.dialect.name != "postgresql":
+                closed_file_names = []
+                for agent_id, max_files_open in max_files_open_by_agent.items():
+                    closed_file_names.extend(
+                        await self.attach_files_bulk(
+                            agent_id=agent_id, files_metadata=[file_metadata], max_files_open=max_files_open, shared_views=True, actor=actor
+                        )
+                    )
+                return closed_file_names
+
+            # the file may have been deleted since it was processed
+            if await session.scalar(select(FileMetadataModel.id).where(FileMetadataModel.id == file_metadata.id)) is None:
+                logger.warning("attach_file_to_agents: skipping missing file %s", file_metadata.id)
+                return []
+
+            now = datetime.now(timezone.utc)
+            agent_ids = list(max_files_open_by_agent)
+            # Batch to stay under asyncpg's 32,767 parameter limit (each row binds ~12 params)
+            BATCH_SIZE = 1000
+            for i in range(0, len(agent_ids), BATCH_SIZE):
+                rows = [
+                    {
+                        "id": f"file_agent-{uuid.uuid4()}",
+                        "file_id": file_metadata.id,
+                        "agent_id": agent_id,
+                        "source_id": file_metadata.source_id,
+                        "file_name": file_metadata.file_name,
+                        "organization_id": actor.organization_id,
+                        "is_open": True,
+                        "shared_view": True,
+                        "last_accessed_at": now,
+                        "_created_by_id": actor.id,
+                        "_last_updated_by_id": actor.id,
+                    }
+                    for agent_id in agent_ids[i : i + BATCH_SIZE]
+                ]
+                stmt = pg_insert(FileAgentModel).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_agent_filename",
+                    set_={
+                        "file_id": stmt.excluded.file_id,
+                        "source_id": stmt.excluded.source_id,
+                        "is_open": True,
+                        "shared_view": True,
+                        "visible_content": None,
+                        "start_line": None,
+                        "end_line": None,
+                        "is_deleted": False,
+                        "last_accessed_at": now,
+                        "updated_at": now,
+                        "_last_updated_by_id": actor.id,
+                    },
+                )
+                await session.execute(stmt)
+
+            agent_ids_by_cap: Dict[int, List[str]] = {}
+            for agent_id, max_files_open in max_files_open_by_agent.items():
+                agent_ids_by_cap.setdefault(max_files_open, []).append(agent_id)
+
+            closed_file_names = []
+            for max_files_open, capped_agent_ids in agent_ids_by_cap.items():
+                for i in range(0, len(capped_agent_ids), BATCH_SIZE):
+                    # rank each agent's open files newest first, the file just opened ahead of any tie
+                    ranked = (
+                        select(
+                            FileAgentModel.id,
+                            func.row_number()
+                            .over(
+                                partition_by=FileAgentModel.agent_id,
+                                order_by=(
+                                    (FileAgentModel.file_id == file_metadata.id).desc(),
+                                    FileAgentModel.last_accessed_at.desc(),
+                                ),
+                            )
+                            .label("recency"),
+                        )
+                        .where(
+                            FileAgentModel.agent_id.in_(capped_agent_ids[i : i + BATCH_SIZE]),
+                            FileAgentModel.organization_id == actor.organization_id,
+                            FileAgentModel.is_deleted == False,
+                            FileAgentModel.is_open.is_(True),
+                        )
+                        .subquery()
+                    )
+                    close_stmt = (
+                        update(FileAgentModel)
+                        .where(FileAgentModel.id.in_(select(ranked.c.id).where(ranked.c.recency > max_files_open)))
+                        .values(is_open=False, visible_content=None)
+                        .returning(FileAgentModel.file_name)
+                        .execution_options(synchronize_session=False)
+                    )
+                    closed_file_names.extend(row.file_name for row in await session.execute(close_stmt))
+
+            return closed_file_names
+
+    async def _to_pydantic(self, session, rows: List[FileAgentModel]) -> List[PydanticFileAgent]:
+        """Rows as schemas, with shared views rendered into ``visible_content``."""
+        shared_views = await render_file_views(session, rows)
+        return [
+            row.to_pydantic().model_copy(update={"visible_content": shared_views[row.id]}) if row.id in shared_views else row.to_pydantic()
+            for row in rows
+        ]
+
     async def _get_association_by_file_id(self, session, agent_id: str, file_id: str, actor: PydanticUser) -> FileAgentModel:
         q = select(FileAgentModel).where(
             and_(
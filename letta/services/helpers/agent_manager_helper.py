@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import List, Literal, Optional, Set
+from typing import List, Literal, Optional, Set, Tuple, Type, Union
 
 from letta.log import get_logger
 from letta.schemas.letta_stop_reason import StopReasonType
@@ -8,7 +8,9 @@ from letta.schemas.letta_stop_reason import StopReasonType
 logger = get_logger(__name__)
 
 import numpy as np
-from sqlalchemy import Select, and_, asc, desc, func, literal, nulls_last, or_, select, union_all
+from sqlalchemy import Select, String, and_, asc, cast, desc, func, literal, nulls_last, or_, select, union_all
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import noload
 from sqlalchemy.sql.expression import exists
 
@@ -27,6 +29,9 @@ from letta.constants import (
 from letta.errors import LettaAgentNotFoundError
 from letta.helpers import ToolRulesSolver
 from letta.helpers.datetime_helpers import get_local_time
+from letta.helpers.embedding_cache import request_embeddings_cached
+from letta.helpers.hybrid_search import fts_document, fts_query
+from letta.helpers.vector_index import ARCHIVE_SCOPE, SOURCE_SCOPE, passage_vector_indexes
 from letta.llm_api.llm_client import LLMClient
 from letta.orm.agent import Agent as AgentModel
 from letta.orm.agents_tags import AgentsTags
@@ -40,7 +45,7 @@ from letta.prompts import gpt_system
 from letta.prompts.prompt_generator import PromptGenerator
 from letta.schemas.agent import AgentState
 from letta.schemas.embedding_config import EmbeddingConfig
-from letta.schemas.enums import AgentType, MessageRole
+from letta.schemas.enums import AgentType, MessageRole, TagMatchMode
 from letta.schemas.letta_message_content import TextContent
 from letta.schemas.memory import Memory
 from letta.schemas.message import Message, MessageCreate, ToolReturn
@@ -882,7 +887,7 @@ async def build_passage_query(
             provider_type=embedding_config.embedding_endpoint_type,
             actor=actor,
         )
-        embeddings = await embedding_client.request_embeddings([query_text], embedding_config)
+        embeddings = await request_embeddings_cached(embedding_client, [query_text], embedding_config)
         embedded_text = np.array(embeddings[0])
         embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
 
@@ -1071,6 +1076,77 @@ async def build_passage_query(
     return main_query
 
 
+async def embed_passage_query(actor: User, query_text: str, embedding_config: EmbeddingConfig) -> List[float]:
+    """Embed a passage search query, zero-padded to MAX_EMBEDDING_DIM to match stored passage embeddings."""
+    embedding_client = LLMClient.create(
+        provider_type=embedding_config.embedding_endpoint_type,
+        actor=actor,
+    )
+    embeddings = await request_embeddings_cached(embedding_client, [query_text], embedding_config)
+    embedded_text = np.array(embeddings[0])
+    return np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+
+
+def use_in_process_vector_index() -> bool:
+    """SQLite has no vector index, so passage similarity search is ranked in-process instead of per-row in SQL."""
+    return settings.database_engine is DatabaseChoice.SQLITE
+
+
+@trace_method
+async def search_passages_with_vector_index(
+    session: AsyncSession,
+    filter_query: Select,
+    passage_model: Union[Type[ArchivalPassage], Type[SourcePassage]],
+    query_embedding: List[float],
+    limit: Optional[int] = None,
+) -> List[Tuple[Union[ArchivalPassage, SourcePassage], float]]:
+    """Rank the passages matched by ``filter_query`` by cosine distance using the in-process vector indexes.
+
+    ``filter_query`` is a passage query with all non-vector filters applied (scope, dates, pagination).
+    Only passage ids are read from it; embeddings come from the per-archive/source index, which is built
+    lazily on first use.
+
+    Returns:
+        List of ``(passage, cosine_distance)`` tuples, closest first.
+    """
+    if passage_model is ArchivalPassage:
+        scope, scope_column = ARCHIVE_SCOPE, ArchivalPassage.archive_id
+        loader_options = [noload(ArchivalPassage.organization), noload(ArchivalPassage.passage_tags)]
+    else:
+        scope, scope_column = SOURCE_SCOPE, SourcePassage.source_id
+        loader_options = [noload(SourcePassage.organization)]
+
+    candidate_rows = await session.execute(filter_query.with_only_columns(passage_model.id, scope_column).order_by(None))
+    candidates_by_scope: dict[str, List[str]] = {}
+    for passage_id, scope_id in candidate_rows.all():
+        candidates_by_scope.setdefault(scope_id, []).append(passage_id)
+
+    ranked: List[Tuple[str, float]] = []
+    for scope_id, candidate_ids in candidates_by_scope.items():
+
+        async def _load_embeddings(scope_id=scope_id):
+            rows = await session.execute(select(passage_model.id, passage_model.embedding).where(scope_column == scope_id))
+            return rows.all()
+
+        index = await passage_vector_indexes.get_or_build(scope, scope_id, _load_embeddings)
+        if any(passage_id not in index for passage_id in candidate_ids):
+            # Rows were written outside the passage manager (or the index is otherwise stale); rebuild once.
+            passage_vector_indexes.invalidate(scope, scope_id)
+            index = await passage_vector_indexes.get_or_build(scope, scope_id, _load_embeddings)
+        ranked.extend(index.search(query_embedding, k=limit, candidate_ids=candidate_ids))
+
+    ranked.sort(key=lambda item: item[1])
+    if limit:
+        ranked = ranked[:limit]
+    if not ranked:
+        return []
+
+    ranked_ids = [passage_id for passage_id, _ in ranked]
+    passages = await session.execute(select(passage_model).options(*loader_options).where(passage_model.id.in_(ranked_ids)))
+    by_id = {p.id: p for p in passages.scalars().all()}
+    return [(by_id[passage_id], distance) for passage_id, distance in ranked if passage_id in by_id]
+
+
 async def build_source_passage_query(
     actor: User,
     agent_id: Optional[str] = None,
@@ -1092,15 +1168,7 @@ async def build_source_passage_query(
     if embed_query:
         assert embedding_config is not None, "embedding_config must be specified for vector search"
         assert query_text is not None, "query_text must be specified for vector search"
-
-        # Use the new LLMClient for embeddings
-        embedding_client = LLMClient.create(
-            provider_type=embedding_config.embedding_endpoint_type,
-            actor=actor,
-        )
-        embeddings = await embedding_client.request_embeddings([query_text], embedding_config)
-        embedded_text = np.array(embeddings[0])
-        embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+        embedded_text = await embed_passage_query(actor=actor, query_text=query_text, embedding_config=embedding_config)
 
     # Base query for source passages - use noload to prevent lazy loading which can block the event loop
     query = select(SourcePassage).options(noload(SourcePassage.organization)).where(SourcePassage.organization_id == actor.organization_id)
@@ -1177,6 +1245,23 @@ async def build_source_passage_query(
     return query
 
 
+def _apply_passage_tag_filter(query: Select, tags: List[str], tag_match_mode: Optional[TagMatchMode] = None) -> Select:
+    """Filter archival passages on their ``tags`` JSON column (ANY by default, or ALL)."""
+    unique_tags = list(set(tags))
+    if settings.database_engine is DatabaseChoice.POSTGRES:
+        passage_tags = cast(ArchivalPassage.tags, JSONB)
+        tag_array = array(unique_tags, type_=String)
+        if tag_match_mode == TagMatchMode.ALL:
+            return query.where(passage_tags.has_all(tag_array))
+        return query.where(passage_tags.has_any(tag_array))
+
+    tag_values = func.json_each(ArchivalPassage.tags).table_valued("value")
+    matched_tags = select(func.count(func.distinct(tag_values.c.value))).where(tag_values.c.value.in_(unique_tags)).scalar_subquery()
+    if tag_match_mode == TagMatchMode.ALL:
+        return query.where(matched_tags == len(unique_tags))
+    return query.where(matched_tags > 0)
+
+
 async def build_agent_passage_query(
     actor: User,
     agent_id: Optional[str] = None,
@@ -1189,11 +1274,16 @@ async def build_agent_passage_query(
     embed_query: bool = False,
     ascending: bool = True,
     embedding_config: Optional[EmbeddingConfig] = None,
+    tags: Optional[List[str]] = None,
+    tag_match_mode: Optional[TagMatchMode] = None,
+    full_text_search: bool = False,
 ) -> Select:
     """Build query for agent/archive passages with all filters applied.
 
     Can provide agent_id, archive_id, both, or neither (org-wide search).
     If both are provided, agent_id takes precedence.
+    If full_text_search is set (Postgres only), query_text is matched with the full-text index and results are
+    ranked by relevance instead of filtered by substring.
     """
 
     # Handle embedding for vector search
@@ -1201,15 +1291,7 @@ async def build_agent_passage_query(
     embedded_text = None
     if embed_query and embedding_config is not None:
         assert query_text is not None, "query_text must be specified for vector search"
-
-        # Use the new LLMClient for embeddings
-        embedding_client = LLMClient.create(
-            provider_type=embedding_config.embedding_endpoint_type,
-            actor=actor,
-        )
-        embeddings = await embedding_client.request_embeddings([query_text], embedding_config)
-        embedded_text = np.array(embeddings[0])
-        embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+        embedded_text = await embed_passage_query(actor=actor, query_text=query_text, embedding_config=embedding_config)
 
     # Base query for passages - use noload to prevent lazy loading which can block the event loop
     if agent_id:
@@ -1237,6 +1319,8 @@ async def build_agent_passage_query(
         query = query.where(ArchivalPassage.created_at >= start_date)
     if end_date:
         query = query.where(ArchivalPassage.created_at <= end_date)
+    if tags:
+        query = _apply_passage_tag_filter(query, tags, tag_match_mode)
 
     # Handle text search or vector search
     if embedded_text:
@@ -1253,6 +1337,10 @@ async def build_agent_passage_query(
                 ArchivalPassage.created_at.asc() if ascending else ArchivalPassage.created_at.desc(),
                 ArchivalPassage.id.asc(),
             )
+    elif query_text and full_text_search and settings.database_engine is DatabaseChoice.POSTGRES:
+        # Full-text match served by the GIN index on to_tsvector(text), most relevant first
+        document, tsquery = fts_document(ArchivalPassage.text), fts_query(query_text)
+        query = query.where(document.op("@@")(tsquery)).order_by(func.ts_rank_cd(document, tsquery).desc())
     else:
         if query_text:
             query = query.where(func.lower(ArchivalPassage.text).contains(func.lower(query_text)))
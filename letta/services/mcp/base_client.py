@@ -128,6 +128,11 @@ class AsyncBaseMCPClient:
 
         return final_content, not result.isError
 
+    async def ping(self) -> None:
+        """Round-trip a ping to check the connection is still usable."""
+        self._check_initialized()
+        await self.session.send_ping()
+
     def _check_initialized(self):
         if not self.initialized:
             logger.error("MCPClient has not been initialized")
@@ -166,6 +166,11 @@ class AsyncFastMCPSSEClient:
 
         return final_content, not result.is_error
 
+    async def ping(self) -> None:
+        """Round-trip a ping to check the connection is still usable."""
+        self._check_initialized()
+        await self.client.ping()
+
     def _check_initialized(self):
         """Check if the client has been initialized."""
         if not self.initialized:
@@ -323,6 +328,11 @@ class AsyncFastMCPStreamableHTTPClient:
 
         return final_content, not result.is_error
 
+    async def ping(self) -> None:
+        """Round-trip a ping to check the connection is still usable."""
+        self._check_initialized()
+        await self.client.ping()
+
     def _check_initialized(self):
         """Check if the client has been initialized."""
         if not self.initialized:
@@ -0,0 +1,243 @@
+"""Long-lived MCP client sessions shared across tool calls.
+
+Connecting per tool call means spawning and initializing a new process for stdio servers and a fresh
+handshake for SSE / streamable-HTTP servers. ``MCPSessionPool`` keeps one connected client per
+``(organization, server config hash, agent id, user id)``. The config hash covers the resolved environment, headers
+and tokens, so changing any of them gets a new session. The agent and user ids are part of the key only for HTTP
+transports, which send the agent id as a header and authenticate with the calling user's own OAuth session.
+Calls borrow the session under a per-server semaphore.
+
+Each session is owned by a dedicated task that connects, waits until the session is closed, then cleans up,
+because the MCP SDK's transports hold anyio cancel scopes that must be exited by the task that entered them.
+Sessions are health-checked with a ping before reuse after ``mcp_session_health_check_seconds`` of inactivity
+(or right after a failed call) and reconnected if the ping fails. They are closed after
+``mcp_session_idle_seconds`` idle. ``list_tools`` results are cached per session for
+``mcp_list_tools_cache_seconds``.
+"""
+
+import asyncio
+import hashlib
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+from mcp import Tool as MCPTool
+
+from letta.functions.mcp_client.types import MCPServerType, SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig
+from letta.log import get_logger
+from letta.otel.tracing import log_event
+from letta.schemas.user import User as PydanticUser
+from letta.settings import tool_settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+SessionKey = Tuple[str, str, str, Optional[str], Optional[str]]
+ClientFactory = Callable[[], Awaitable]
+
+
+def mcp_session_key(
+    actor: PydanticUser,
+    server_config: Union[SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig],
+    agent_id: Optional[str] = None,
+) -> SessionKey:
+    """Pool key for ``actor``'s session to a server. Secrets in the config only contribute to a hash."""
+    config_hash = hashlib.sha256(server_config.model_dump_json().encode("utf-8")).hexdigest()
+    if server_config.type == MCPServerType.STDIO:
+        # stdio clients send neither the agent id nor user credentials anywhere, so the whole organization shares the process
+        return (actor.organization_id, server_config.server_name, config_hash, None, None)
+    # HTTP clients carry the actor's OAuth session, which must never serve another user
+    return (actor.organization_id, server_config.server_name, config_hash, agent_id, actor.id)
+
+
+class _PooledSession:
+    def __init__(self, key: SessionKey, max_concurrency: int):
+        self.key = key
+        self.client = None
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self.needs_health_check = False
+        self.tools: Optional[Tuple[float, List[MCPTool]]] = None
+        self._closed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, factory: ClientFactory) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        self._task = safe_create_task(self._own(factory, ready), label="mcp_session")
+        try:
+            await ready
+        except BaseException:
+            # e.g. the caller was cancelled mid-connect: let the owner task clean up once it gets there
+            self._closed.set()
+            raise
+
+    async def _own(self, factory: ClientFactory, ready: asyncio.Future) -> None:
+        """Connect, hold the session open until closed, and clean up, all in this one task."""
+        client = None
+        try:
+            client = await factory()
+            await client.connect_to_server()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            if client is not None:
+                await client.cleanup()
+            return
+
+        self.client = client
+        ready.set_result(None)
+        try:
+            await self._closed.wait()
+        finally:
+            await client.cleanup()
+
+    @property
+    def alive(self) -> bool:
+        return self.client is not None and self._task is not None and not self._task.done() and not self._closed.is_set()
+
+    async def healthy(self) -> bool:
+        try:
+            await asyncio.wait_for(self.client.ping(), timeout=tool_settings.mcp_connect_to_server_timeout)
+            return True
+        except Exception as e:
+            logger.info(f"MCP session for server {self.key[1]} failed its health check, reconnecting: {e}")
+            return False
+
+    async def close(self) -> None:
+        self._closed.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    def __init__(self, max_sessions: int, idle_seconds: float, max_concurrency: int, health_check_seconds: float, tools_ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.max_concurrency = max_concurrency
+        self.health_check_seconds = health_check_seconds
+        self.tools_ttl_seconds = tools_ttl_seconds
+        self._sessions: "OrderedDict[SessionKey, _PooledSession]" = OrderedDict()
+        self._connecting: dict[SessionKey, asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @asynccontextmanager
+    async def session(self, key: SessionKey, factory: ClientFactory) -> AsyncIterator:
+        """Borrow the connected client for ``key``, connecting with ``factory`` if there is none (or it is unhealthy)."""
+        pooled = await self._acquire(key, factory)
+        async with self._borrow(pooled):
+            yield pooled.client
+
+    async def execute_tool(self, key: SessionKey, factory: ClientFactory, tool_name: str, tool_args: Optional[dict]) -> Tuple[str, bool]:
+        pooled = await self._acquire(key, factory)
+        async with self._borrow(pooled):
+            result, success = await pooled.client.execute_tool(tool_name, tool_args)
+        if not success:
+            # Clients report transport failures as failed results, so check the session before its next call
+            pooled.needs_health_check = True
+        return result, success
+
+    async def list_tools(self, key: SessionKey, factory: ClientFactory, force_refresh: bool = False) -> List[MCPTool]:
+        pooled = self._sessions.get(key)
+        if not force_refresh and pooled is not None and pooled.alive and pooled.tools is not None:
+            fetched_at, tools = pooled.tools
+            if time.monotonic() - fetched_at < self.tools_ttl_seconds:
+                log_event(name="mcp_list_tools_cache_hit", attributes={"server_name": key[1]})
+                return [tool.model_copy(deep=True) for tool in tools]
+
+        pooled = await self._acquire(key, factory)
+        async with self._borrow(pooled):
+            tools = await pooled.client.list_tools()
+        pooled.tools = (time.monotonic(), [tool.model_copy(deep=True) for tool in tools])
+        return tools
+
+    @asynccontextmanager
+    async def _borrow(self, pooled: _PooledSession) -> AsyncIterator[None]:
+        async with pooled.semaphore:
+            pooled.in_flight += 1
+            try:
+                yield
+            except BaseException:
+                pooled.needs_health_check = True
+                raise
+            finally:
+                pooled.in_flight -= 1
+                pooled.last_used = time.monotonic()
+
+    async def evict(self, organization_id: str, server_name: Optional[str] = None) -> None:
+        """Close sessions for a server (or every server of an organization) after its config changed or was deleted."""
+        for key in [k for k in self._sessions if k[0] == organization_id and (server_name is None or k[1] == server_name)]:
+            await self._sessions.pop(key).close()
+
+    async def aclose(self) -> None:
+        sessions, self._sessions = list(self._sessions.values()), OrderedDict()
+        await asyncio.gather(*(pooled.close() for pooled in sessions), return_exceptions=True)
+
+    async def _acquire(self, key: SessionKey, factory: ClientFactory) -> _PooledSession:
+        self._evict_idle()
+        lock = self._connecting.setdefault(key, asyncio.Lock())
+        async with lock:
+            pooled = self._sessions.get(key)
+            if pooled is not None and pooled.alive:
+                idle_for = time.monotonic() - pooled.last_used
+                if not (pooled.needs_health_check or idle_for >= self.health_check_seconds) or await pooled.healthy():
+                    pooled.needs_health_check = False
+                    pooled.last_used = time.monotonic()
+                    self._sessions.move_to_end(key)
+                    log_event(name="mcp_session_reused", attributes={"server_name": key[1]})
+                    return pooled
+            if pooled is not None:
+                self._close_in_background(self._sessions.pop(key))
+
+            pooled = _PooledSession(key, self.max_concurrency)
+            await pooled.start(factory)
+            log_event(name="mcp_session_connected", attributes={"server_name": key[1]})
+            self._sessions[key] = pooled
+            while len(self._sessions) > self.max_sessions:
+                oldest_key = next((k for k, s in self._sessions.items() if s.in_flight == 0 and k != key), None)
+                if oldest_key is None:
+                    break
+                self._close_in_background(self._sessions.pop(oldest_key))
+            return pooled
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, pooled in list(self._sessions.items()):
+            if pooled.in_flight == 0 and (now - pooled.last_used >= self.idle_seconds or not pooled.alive):
+                self._close_in_background(self._sessions.pop(key))
+                self._connecting.pop(key, None)
+
+    def _close_in_background(self, pooled: _PooledSession) -> None:
+        safe_create_task(pooled.close(), label="mcp_session_close")
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool]" = weakref.WeakKeyDictionary()
+
+
+def get_mcp_session_pool() -> Optional[MCPSessionPool]:
+    """Session pool for the running event loop, or None when pooling is disabled."""
+    if not tool_settings.mcp_session_pool_enabled:
+        return None
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = MCPSessionPool(
+            max_sessions=tool_settings.mcp_session_pool_max_size,
+            idle_seconds=tool_settings.mcp_session_idle_seconds,
+            max_concurrency=tool_settings.mcp_session_max_concurrency,
+            health_check_seconds=tool_settings.mcp_session_health_check_seconds,
+            tools_ttl_seconds=tool_settings.mcp_list_tools_cache_seconds,
+        )
+    return pool
+
+
+async def reset_mcp_session_pools() -> None:
+    """Close the running loop's pooled sessions and forget every pool (used by tests)."""
+    pool = _pools.get(asyncio.get_running_loop())
+    if pool is not None:
+        await pool.aclose()
+    _pools.clear()
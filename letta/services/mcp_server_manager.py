@@ -44,6 +44,7 @@ from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.mcp.fastmcp_client import AsyncFastMCPSSEClient, AsyncFastMCPStreamableHTTPClient
 from letta.services.mcp.server_side_oauth import ServerSideOAuth
+from letta.services.mcp.session_pool import get_mcp_session_pool, mcp_session_key
 from letta.services.mcp.sse_client import MCP_CONFIG_TOPLEVEL_KEY
 from letta.services.mcp.stdio_client import AsyncStdioMCPClient
 from letta.services.tool_manager import ToolManager
@@ -160,17 +161,29 @@ class MCPServerManager:
             return tool.to_pydantic()
 
     @enforce_types
-    async def list_mcp_server_tools(self, mcp_server_id: str, actor: PydanticUser, agent_id: Optional[str] = None) -> List[MCPTool]:
-        """Get a list of all tools for a specific MCP server by server ID."""
+    async def list_mcp_server_tools(
+        self, mcp_server_id: str, actor: PydanticUser, agent_id: Optional[str] = None, force_refresh: bool = False
+    ) -> List[MCPTool]:
+        """Get a list of all tools for a specific MCP server by server ID.
+
+        Served from the pooled session's cached tool list unless ``force_refresh`` is set.
+        """
         mcp_client = None
         try:
             mcp_config = await self.get_mcp_server_by_id_async(mcp_server_id, actor=actor)
             server_config = await mcp_config.to_config_async()
-            mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
-            await mcp_client.connect_to_server()
 
-            # list tools
-            tools = await mcp_client.list_tools()
+            session_pool = get_mcp_session_pool()
+            if session_pool is not None:
+                tools = await session_pool.list_tools(
+                    mcp_session_key(actor, server_config, agent_id),
+                    lambda: self.get_mcp_client(server_config, actor, agent_id=agent_id),
+                    force_refresh=force_refresh,
+                )
+            else:
+                mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
+                await mcp_client.connect_to_server()
+                tools = await mcp_client.list_tools()
             # Add health information to each tool
             for tool in tools:
                 # Try to normalize the schema and re-validate
@@ -211,11 +224,20 @@ class MCPServerManager:
             mcp_config = await self.get_mcp_server_by_id_async(mcp_server_id, actor=actor)
             server_config = await mcp_config.to_config_async(environment_variables)
 
-            mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
-            await mcp_client.connect_to_server()
-
             # call tool
-            result, success = await mcp_client.execute_tool(tool_name, tool_args)
+            session_pool = get_mcp_session_pool()
+            if session_pool is not None:
+                result, success = await session_pool.execute_tool(
+                    mcp_session_key(actor, server_config, agent_id),
+                    lambda: self.get_mcp_client(server_config, actor, agent_id=agent_id),
+                    tool_name,
+                    tool_args,
+                )
+            else:
+                mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
+                await mcp_client.connect_to_server()
+                result, success = await mcp_client.execute_tool(tool_name, tool_args)
+
             logger.info(f"MCP Result: {result}, Success: {success}")
             return result, success
         finally:
@@ -302,7 +324,7 @@ class MCPServerManager:
 
         # Fetch current tools from MCP server
         try:
-            current_mcp_tools = await self.list_mcp_server_tools(mcp_server_id, actor=actor, agent_id=agent_id)
+            current_mcp_tools = await self.list_mcp_server_tools(mcp_server_id, actor=actor, agent_id=agent_id, force_refresh=True)
         except Exception as e:
             logger.error(f"Failed to fetch tools from MCP server {mcp_server_name}: {e}")
             raise HTTPException(
@@ -834,6 +856,7 @@ class MCPServerManager:
                     raise NoResultFound(f"MCP server with id {mcp_server_id} not found.")
 
                 server_url = getattr(mcp_server, "server_url", None)
+                server_name = mcp_server.server_name
                 # Get all tools with matching metadata
                 stmt = select(ToolModel).where(ToolModel.organization_id == actor.organization_id)
                 result = await session.execute(stmt)
@@ -910,6 +933,11 @@ class MCPServerManager:
                 logger.error(f"Failed to delete MCP server {mcp_server_id}: {e}")
                 raise
 
+        # Close pooled connections to the deleted server
+        session_pool = get_mcp_session_pool()
+        if session_pool is not None:
+            await session_pool.evict(actor.organization_id, server_name)
+
     def read_mcp_config(self) -> dict[str, Union[SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig]]:
         mcp_server_list = {}
 
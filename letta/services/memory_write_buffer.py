@@ -0,0 +1,94 @@
+"""Step-scoped buffer for core memory edits.
+
+Without it every memory tool call (``memory_replace``, ``memory_insert``, ``core_memory_append``, ...) runs
+``AgentManager.update_memory_if_changed_async`` on its own: reload the agent, fetch the system message, write the
+block, refetch all blocks and rebuild the system prompt. With a ``MemoryWriteBuffer`` open for the step, tools only
+apply their edit to the step's in-memory ``AgentState`` (which validates it against the block's limit) and record it
+here. ``flush`` then writes every edited block and rebuilds the system prompt once, in a single transaction
+(``AgentManager.apply_memory_edits_async``), when the agent checkpoints the step.
+
+Sleeptime agents do not buffer: they edit blocks shared with a foreground agent that may be mid-conversation, so
+each edit is written (and the foreground agent's prompt rebuilt) as soon as it is made.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional
+
+from letta.log import get_logger
+from letta.otel.context import get_ctx_attributes
+from letta.otel.metric_registry import MetricRegistry
+from letta.otel.tracing import log_event
+from letta.schemas.agent import AgentState, AgentType
+from letta.schemas.user import User
+from letta.settings import settings
+
+if TYPE_CHECKING:
+    from letta.services.agent_manager import AgentManager
+
+logger = get_logger(__name__)
+
+UNBUFFERED_AGENT_TYPES = frozenset({AgentType.sleeptime_agent, AgentType.voice_sleeptime_agent})
+
+
+class MemoryWriteBuffer:
+    """Memory edits of one agent, pending until the step checkpoint."""
+
+    def __init__(self, agent_manager: "AgentManager", actor: User):
+        self.agent_manager = agent_manager
+        self.actor = actor
+        self.flushes = 0
+        self.edits_coalesced = 0
+        self._agent_state: Optional[AgentState] = None
+        self._edited_block_ids: Dict[str, None] = {}
+        self._edits = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._agent_state is not None
+
+    def record(self, agent_state: AgentState, label: Optional[str] = None) -> None:
+        """Note that a tool changed ``agent_state.memory``: the block ``label`` was edited, or (without a label) the
+        memory changed in a way that only needs the system prompt recompiled (e.g. a block was attached)."""
+        if self._agent_state is not None and self._agent_state.id != agent_state.id:
+            raise ValueError(f"Memory write buffer for agent {self._agent_state.id} got an edit for agent {agent_state.id}")
+        self._agent_state = agent_state
+        if label is not None:
+            self._edited_block_ids[agent_state.memory.get_block(label).id] = None
+        self._edits += 1
+
+    async def flush(self) -> bool:
+        """Write the pending edits; returns whether the system prompt was rewritten."""
+        if self._agent_state is None:
+            return False
+        agent_state, edited_block_ids, edits = self._agent_state, list(self._edited_block_ids), self._edits
+        self._agent_state, self._edited_block_ids, self._edits = None, {}, 0
+
+        try:
+            rebuilt = await self.agent_manager.apply_memory_edits_async(
+                agent_state=agent_state, edited_block_ids=edited_block_ids, actor=self.actor
+            )
+        except Exception:
+            # keep the edits pending (merged with any recorded meanwhile) so a later flush can retry them
+            self._agent_state = self._agent_state or agent_state
+            self._edited_block_ids = {**dict.fromkeys(edited_block_ids), **self._edited_block_ids}
+            self._edits += edits
+            raise
+        self.flushes += 1
+        coalesced = edits - 1
+        if coalesced:
+            self.edits_coalesced += coalesced
+            try:
+                MetricRegistry().memory_edits_coalesced_counter.add(coalesced, get_ctx_attributes())
+            except Exception as e:
+                logger.debug(f"Failed to record coalesced memory edits: {e}")
+        log_event(
+            name="memory_write_buffer_flushed",
+            attributes={"edits": edits, "blocks": len(edited_block_ids), "system_prompt_rebuilt": rebuilt},
+        )
+        return rebuilt
+
+
+def open_memory_write_buffer(agent_manager: "AgentManager", actor: User, agent_state: AgentState) -> Optional[MemoryWriteBuffer]:
+    """Buffer for a step of ``agent_state``, or None if its memory tools should write immediately."""
+    if not settings.memory_write_buffer_enabled or agent_state.agent_type in UNBUFFERED_AGENT_TYPES:
+        return None
+    return MemoryWriteBuffer(agent_manager, actor)
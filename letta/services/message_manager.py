@@ -1,11 +1,13 @@
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy import cast, delete, exists, func, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 
 from letta.constants import CONVERSATION_SEARCH_TOOL_NAME, DEFAULT_MESSAGE_TOOL, DEFAULT_MESSAGE_TOOL_KWARG
+from letta.helpers.hybrid_search import fts_document, fts_query
 from letta.log import get_logger
 from letta.orm.conversation_messages import ConversationMessage
 from letta.orm.errors import NoResultFound
@@ -405,6 +407,68 @@ class MessageManager:
             orm_messages.append(MessageModel(**msg_data))
         return orm_messages
 
+    def _replace_base64_images_with_placeholders(self, messages: List[PydanticMessage]) -> None:
+        for message in messages:
+            if isinstance(message.content, list):
+                for content in message.content:
+                    if content.type == MessageContentType.image and content.source.type == ImageSourceType.base64:
+                        # TODO: actually persist image files in db
+                        file_id_placeholder = "file-" + str(uuid.uuid4())
+                        content.source = LettaImage(
+                            file_id=file_id_placeholder,
+                            data=content.source.data,
+                            media_type=content.source.media_type,
+                            detail=content.source.detail,
+                        )
+
+    async def _clear_missing_run_ids_with_session(self, session, messages: List[PydanticMessage], actor: PydanticUser) -> None:
+        """Null out run_ids that no longer exist (e.g. the run was deleted mid-step) so the insert does not hit a FK violation."""
+        unique_run_ids = {msg.run_id for msg in messages if msg.run_id}
+        if not unique_run_ids:
+            return
+
+        from letta.orm.run import Run as RunModel
+
+        query = select(RunModel.id).where(RunModel.id.in_(unique_run_ids), RunModel.organization_id == actor.organization_id)
+        result = await session.execute(query)
+        missing_run_ids = unique_run_ids - set(result.scalars().all())
+        if missing_run_ids:
+            logger.warning(
+                f"Messages reference run_id(s) that don't exist: {missing_run_ids}. "
+                f"Setting run_id to None for affected messages to prevent ForeignKeyViolationError."
+            )
+            for msg in messages:
+                if msg.run_id in missing_run_ids:
+                    msg.run_id = None
+
+    async def _embed_created_messages(
+        self,
+        messages: List[PydanticMessage],
+        actor: PydanticUser,
+        strict_mode: bool,
+        project_id: Optional[str],
+        template_id: Optional[str],
+    ) -> None:
+        from letta.helpers.tpuf_client import should_use_tpuf_for_messages
+
+        if not should_use_tpuf_for_messages() or not messages:
+            return
+        agent_id = messages[0].agent_id
+        if not agent_id:
+            return
+        # Filter out system messages before embedding to avoid unnecessary processing
+        # System messages (especially initial agent system messages) can be very large
+        messages_to_embed = [msg for msg in messages if msg.role != MessageRole.system]
+        if not messages_to_embed:
+            return
+        if strict_mode:
+            await self._embed_messages_background(messages_to_embed, actor, agent_id, project_id, template_id)
+        else:
+            fire_and_forget(
+                self._embed_messages_background(messages_to_embed, actor, agent_id, project_id, template_id),
+                task_name=f"embed_messages_for_agent_{agent_id}",
+            )
+
     @enforce_types
     @trace_method
     async def check_run_exists_async(self, run_id: str, actor: PydanticUser) -> bool:
@@ -519,54 +583,13 @@ class MessageManager:
                     result = await session.execute(query)
                     return [msg.to_pydantic() for msg in result.scalars()]
 
-        for message in messages_to_create:
-            if isinstance(message.content, list):
-                for content in message.content:
-                    if content.type == MessageContentType.image and content.source.type == ImageSourceType.base64:
-                        # TODO: actually persist image files in db
-                        # file = await self.file_manager.create_file( # TODO: use batch create to prevent multiple db round trips
-                        #     db_session=session,
-                        #     image_create=FileMetadata(
-                        #         user_id=actor.id, # TODO: add field
-                        #         source_id= '' # TODO: make optional
-                        #         organization_id=actor.organization_id,
-                        #         file_type=content.source.media_type,
-                        #         processing_status=FileProcessingStatus.COMPLETED,
-                        #         content= '' # TODO: should content be added here or in top level text field?
-                        #     ),
-                        #     actor=actor,
-                        #     text=content.source.data,
-                        # )
-                        file_id_placeholder = "file-" + str(uuid.uuid4())
-                        content.source = LettaImage(
-                            file_id=file_id_placeholder,
-                            data=content.source.data,
-                            media_type=content.source.media_type,
-                            detail=content.source.detail,
-                        )
+        self._replace_base64_images_with_placeholders(messages_to_create)
 
         # Validate run_ids exist before inserting to prevent ForeignKeyViolationError
         # This handles the case where a run is deleted while messages are being created
-        unique_run_ids = {msg.run_id for msg in messages_to_create if msg.run_id}
-        if unique_run_ids:
-            from letta.orm.run import Run as RunModel
-
+        if any(msg.run_id for msg in messages_to_create):
             async with db_registry.async_session() as session:
-                # Check which run_ids actually exist
-                query = select(RunModel.id).where(RunModel.id.in_(unique_run_ids), RunModel.organization_id == actor.organization_id)
-                result = await session.execute(query)
-                existing_run_ids = set(result.scalars().all())
-
-            # For any non-existent run_ids, set to None and log a warning
-            missing_run_ids = unique_run_ids - existing_run_ids
-            if missing_run_ids:
-                logger.warning(
-                    f"Messages reference run_id(s) that don't exist: {missing_run_ids}. "
-                    f"Setting run_id to None for affected messages to prevent ForeignKeyViolationError."
-                )
-                for msg in messages_to_create:
-                    if msg.run_id in missing_run_ids:
-                        msg.run_id = None
+                await self._clear_missing_run_ids_with_session(session, messages_to_create, actor)
 
         orm_messages = self._create_many_preprocess(messages_to_create, actor)
         async with db_registry.async_session() as session:
@@ -575,22 +598,7 @@ class MessageManager:
             # context manager now handles commits
             # await session.commit()
 
-        from letta.helpers.tpuf_client import should_use_tpuf_for_messages
-
-        if should_use_tpuf_for_messages() and result:
-            agent_id = result[0].agent_id
-            if agent_id:
-                # Filter out system messages before embedding to avoid unnecessary processing
-                # System messages (especially initial agent system messages) can be very large
-                messages_to_embed = [msg for msg in result if msg.role != MessageRole.system]
-                if messages_to_embed:
-                    if strict_mode:
-                        await self._embed_messages_background(messages_to_embed, actor, agent_id, project_id, template_id)
-                    else:
-                        fire_and_forget(
-                            self._embed_messages_background(messages_to_embed, actor, agent_id, project_id, template_id),
-                            task_name=f"embed_messages_for_agent_{agent_id}",
-                        )
+        await self._embed_created_messages(result, actor, strict_mode, project_id, template_id)
 
         if allow_partial and existing_messages:
             async with db_registry.async_session() as session:
@@ -602,6 +610,77 @@ class MessageManager:
 
         return result
 
+    @enforce_types
+    @trace_method
+    async def checkpoint_step_messages_async(
+        self,
+        new_messages: List[PydanticMessage],
+        in_context_message_ids: List[str],
+        agent_id: str,
+        actor: PydanticUser,
+        conversation_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        template_id: Optional[str] = None,
+    ) -> List[PydanticMessage]:
+        """
+        Persist one completed agent step in a single transaction.
+
+        Inserts the step's new messages and then either records them in the conversation (membership, in-context
+        flags and positions) or, for the default agent-level history, overwrites `agents.message_ids`. Either every
+        write lands or none does, so a crash mid-checkpoint cannot leave messages that are missing from context
+        (or context pointing at messages that were never written).
+
+        Args:
+            new_messages: Messages produced by the step, already stamped with run_id/step_id/conversation_id
+            in_context_message_ids: The full in-context message ID list after the step, in order
+            agent_id: The agent that ran the step
+            actor: User performing the action
+            conversation_id: Conversation the step belongs to, if any
+            project_id: Optional project ID for the messages (for Turbopuffer indexing)
+            template_id: Optional template ID for the messages (for Turbopuffer indexing)
+
+        Returns:
+            The created messages
+        """
+        from letta.orm.agent import Agent as AgentModel
+        from letta.services.conversation_manager import ConversationManager
+
+        self._replace_base64_images_with_placeholders(new_messages)
+
+        async with db_registry.async_session() as session:
+            await self._clear_missing_run_ids_with_session(session, new_messages, actor)
+            orm_messages = self._create_many_preprocess(new_messages, actor)
+            created_messages = await MessageModel.batch_create_async(orm_messages, session, actor=actor, no_commit=True, no_refresh=True)
+            result = [msg.to_pydantic() for msg in created_messages]
+
+            if conversation_id:
+                conversation_manager = ConversationManager()
+                await conversation_manager._add_messages_to_conversation_with_session(
+                    session=session,
+                    conversation_id=conversation_id,
+                    agent_id=agent_id,
+                    message_ids=[m.id for m in new_messages],
+                    actor=actor,
+                )
+                await session.flush()
+                await conversation_manager._update_in_context_messages_with_session(
+                    session=session,
+                    conversation_id=conversation_id,
+                    in_context_message_ids=in_context_message_ids,
+                    actor=actor,
+                )
+            else:
+                await session.execute(
+                    update(AgentModel)
+                    .where(AgentModel.id == agent_id, AgentModel.organization_id == actor.organization_id)
+                    .values(message_ids=in_context_message_ids, updated_at=datetime.now(timezone.utc), _last_updated_by_id=actor.id)
+                    .execution_options(synchronize_session=False)
+                )
+            # context manager commits the whole checkpoint at once
+
+        await self._embed_created_messages(result, actor, False, project_id, template_id)
+        return result
+
     async def _embed_messages_background(
         self,
         messages: List[PydanticMessage],
@@ -724,19 +803,36 @@ class MessageManager:
             template_id: Optional template ID for the message (for Turbopuffer indexing)
         """
         async with db_registry.async_session() as session:
-            # Fetch existing message from database
-            message = await MessageModel.read_async(
-                db_session=session,
-                identifier=message_id,
-                actor=actor,
-            )
-
-            message = self._update_message_by_id_impl(message_id, message_update, actor, message)
-            await message.update_async(db_session=session, actor=actor, no_commit=True, no_refresh=True)
-            pydantic_message = message.to_pydantic()
+            pydantic_message = await self._update_message_by_id_with_session(session, message_id, message_update, actor)
             # context manager now handles commits
             # await session.commit()
 
+        await self._sync_updated_message_embedding(pydantic_message, actor, strict_mode, project_id, template_id)
+        return pydantic_message
+
+    async def _update_message_by_id_with_session(
+        self, session, message_id: str, message_update: MessageUpdate, actor: PydanticUser
+    ) -> PydanticMessage:
+        """Apply a message update inside the caller's transaction (the caller commits and then syncs embeddings)."""
+        # Fetch existing message from database
+        message = await MessageModel.read_async(
+            db_session=session,
+            identifier=message_id,
+            actor=actor,
+        )
+
+        message = self._update_message_by_id_impl(message_id, message_update, actor, message)
+        await message.update_async(db_session=session, actor=actor, no_commit=True, no_refresh=True)
+        return message.to_pydantic()
+
+    async def _sync_updated_message_embedding(
+        self,
+        pydantic_message: PydanticMessage,
+        actor: PydanticUser,
+        strict_mode: bool = False,
+        project_id: Optional[str] = None,
+        template_id: Optional[str] = None,
+    ) -> None:
         from letta.helpers.tpuf_client import should_use_tpuf_for_messages
 
         if should_use_tpuf_for_messages() and pydantic_message.agent_id:
@@ -748,11 +844,9 @@ class MessageManager:
                 else:
                     fire_and_forget(
                         self._update_message_embedding_background(pydantic_message, text, actor, project_id, template_id),
-                        task_name=f"update_message_embedding_{message_id}",
+                        task_name=f"update_message_embedding_{pydantic_message.id}",
                     )
 
-        return pydantic_message
-
     async def _update_message_embedding_background(
         self, message: PydanticMessage, text: str, actor: PydanticUser, project_id: Optional[str] = None, template_id: Optional[str] = None
     ) -> None:
@@ -1238,6 +1332,22 @@ class MessageManager:
                     }
                     message_tuples.append((message, metadata))
                 return message_tuples
+        elif (
+            query_text
+            and search_mode != "timestamp"
+            and settings.use_local_hybrid_search
+            and settings.database_engine is DatabaseChoice.POSTGRES
+        ):
+            # messages have no SQL-side embeddings, so local search ranks by full-text relevance only
+            return await self._search_messages_full_text_async(
+                agent_id=agent_id,
+                actor=actor,
+                query_text=query_text,
+                roles=roles,
+                limit=limit,
+                start_date=start_date,
+                end_date=end_date,
+            )
         else:
             # use sql-based search
             messages = await self.list_messages(
@@ -1259,6 +1369,56 @@ class MessageManager:
                 message_tuples.append((message, metadata))
             return message_tuples
 
+    @trace_method
+    async def _search_messages_full_text_async(
+        self,
+        agent_id: str,
+        actor: PydanticUser,
+        query_text: str,
+        roles: Optional[List[MessageRole]] = None,
+        limit: int = 50,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[PydanticMessage, dict]]:
+        """Rank an agent's messages with Postgres full-text search over their content parts (GIN-indexed)."""
+        document, tsquery = fts_document(cast(MessageModel.content, JSONB)), fts_query(query_text)
+        fts_score = func.ts_rank_cd(document, tsquery)
+
+        async with db_registry.async_session() as session:
+            await validate_agent_exists_async(session, agent_id, actor)
+            query = (
+                select(MessageModel, fts_score)
+                .where(
+                    MessageModel.agent_id == agent_id,
+                    MessageModel.organization_id == actor.organization_id,
+                    MessageModel.is_deleted == False,
+                    document.op("@@")(tsquery),
+                )
+                .order_by(fts_score.desc(), MessageModel.sequence_id.desc())
+                .limit(limit)
+            )
+            if roles:
+                query = query.where(MessageModel.role.in_([r.value for r in roles]))
+            if start_date:
+                query = query.where(MessageModel.created_at >= start_date)
+            if end_date:
+                query = query.where(MessageModel.created_at <= end_date)
+
+            rows = (await session.execute(query)).all()
+
+        message_tuples = []
+        for fts_rank, (message, score) in enumerate(rows, start=1):
+            pydantic_message = message.to_pydantic()
+            if self._extract_message_text(pydantic_message) == "":
+                continue
+            metadata = {
+                "search_mode": "fts",
+                "combined_score": float(score),
+                "fts_rank": fts_rank,
+            }
+            message_tuples.append((pydantic_message, metadata))
+        return message_tuples
+
     async def search_messages_org_async(
         self,
         actor: PydanticUser,
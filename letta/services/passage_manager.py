@@ -12,6 +12,8 @@ from sqlalchemy.orm import noload
 
 from letta.constants import MAX_EMBEDDING_DIM
 from letta.helpers.decorators import async_redis_cache
+from letta.helpers.embedding_cache import request_embeddings_cached
+from letta.helpers.vector_index import ARCHIVE_SCOPE, SOURCE_SCOPE, passage_vector_indexes
 from letta.llm_api.llm_client import LLMClient
 from letta.log import get_logger
 from letta.orm import ArchivesAgents
@@ -40,6 +42,29 @@ async def get_openai_embedding_async(text: str, model: str, endpoint: str) -> li
     return response.data[0].embedding
 
 
+def _index_passages(passages: List[PydanticPassage]) -> None:
+    """Add newly written passages to any in-process vector index already built for their archive/source."""
+    grouped: Dict[tuple, List[PydanticPassage]] = {}
+    for passage in passages:
+        if passage.archive_id:
+            grouped.setdefault((ARCHIVE_SCOPE, passage.archive_id), []).append(passage)
+        elif passage.source_id:
+            grouped.setdefault((SOURCE_SCOPE, passage.source_id), []).append(passage)
+    for (scope, scope_id), scoped in grouped.items():
+        passage_vector_indexes.add_passages(scope, scope_id, [p.id for p in scoped], [p.embedding for p in scoped])
+
+
+def _unindex_passages(scope: str, passages: List[PydanticPassage]) -> None:
+    """Remove deleted passages from any in-process vector index built for their archive/source."""
+    grouped: Dict[str, List[str]] = {}
+    for passage in passages:
+        scope_id = passage.archive_id if scope == ARCHIVE_SCOPE else passage.source_id
+        if scope_id:
+            grouped.setdefault(scope_id, []).append(passage.id)
+    for scope_id, passage_ids in grouped.items():
+        passage_vector_indexes.remove_passages(scope, scope_id, passage_ids)
+
+
 class PassageManager:
     """Manager class to handle business logic related to Passages."""
 
@@ -192,7 +217,9 @@ class PassageManager:
                     actor=actor,
                 )
 
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            _index_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -279,7 +306,9 @@ class PassageManager:
                     actor=actor,
                 )
 
-            return [p.to_pydantic() for p in created_passages]
+            result = [p.to_pydantic() for p in created_passages]
+            _index_passages(result)
+            return result
 
     @enforce_types
     @trace_method
@@ -338,7 +367,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             passage = await passage.create_async(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            _index_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -350,7 +381,9 @@ class PassageManager:
         passage = self._preprocess_passage_for_creation(pydantic_passage=pydantic_passage)
         async with db_registry.async_session() as session:
             passage = await passage.create_async(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            _index_passages([pydantic_passage])
+            return pydantic_passage
 
     @trace_method
     def _preprocess_passage_for_creation(self, pydantic_passage: PydanticPassage) -> "SqlalchemyBase":
@@ -433,7 +466,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             archival_created = await ArchivalPassage.batch_create_async(items=archival_passages, db_session=session, actor=actor)
-            return [p.to_pydantic() for p in archival_created]
+            result = [p.to_pydantic() for p in archival_created]
+            _index_passages(result)
+            return result
 
     @enforce_types
     @trace_method
@@ -491,7 +526,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             source_created = await SourcePassage.batch_create_async(items=source_passages, db_session=session, actor=actor)
-            return [p.to_pydantic() for p in source_created]
+            result = [p.to_pydantic() for p in source_created]
+            _index_passages(result)
+            return result
 
     # DEPRECATED - Use specific methods above
     @enforce_types
@@ -536,7 +573,9 @@ class PassageManager:
                 source_created = await SourcePassage.batch_create_async(items=source_passages, db_session=session, actor=actor)
                 results.extend(source_created)
 
-            return [p.to_pydantic() for p in results]
+            pydantic_results = [p.to_pydantic() for p in results]
+            _index_passages(pydantic_results)
+            return pydantic_results
 
     @enforce_types
     @trace_method
@@ -576,7 +615,7 @@ class PassageManager:
                     provider_type=agent_state.embedding_config.embedding_endpoint_type,
                     actor=actor,
                 )
-                embeddings = await embedding_client.request_embeddings(text_chunks, agent_state.embedding_config)
+                embeddings = await request_embeddings_cached(embedding_client, text_chunks, agent_state.embedding_config)
             else:
                 # No embedding config - store passages without embeddings (text search only)
                 embeddings = [None] * len(text_chunks)
@@ -644,7 +683,7 @@ class PassageManager:
             actor=actor,
         )
 
-        embeddings = await embedding_client.request_embeddings(text_chunks, embedding_config)
+        embeddings = await request_embeddings_cached(embedding_client, text_chunks, embedding_config)
         return embeddings
 
     @enforce_types
@@ -716,7 +755,10 @@ class PassageManager:
 
             # Commit changes
             await curr_passage.update_async(session, actor=actor)
-            return curr_passage.to_pydantic()
+            updated_passage = curr_passage.to_pydantic()
+            if "embedding" in update_data:
+                _index_passages([updated_passage])
+            return updated_passage
 
     @enforce_types
     @trace_method
@@ -760,7 +802,10 @@ class PassageManager:
 
             # Commit changes
             await curr_passage.update_async(session, actor=actor)
-            return curr_passage.to_pydantic()
+            updated_passage = curr_passage.to_pydantic()
+            if "embedding" in update_data:
+                _index_passages([updated_passage])
+            return updated_passage
 
     @enforce_types
     @trace_method
@@ -776,6 +821,8 @@ class PassageManager:
 
                 # Delete from SQL first
                 await passage.hard_delete_async(session, actor=actor)
+                if archive_id:
+                    passage_vector_indexes.remove_passages(ARCHIVE_SCOPE, archive_id, [passage_id])
 
                 # Check if archive uses Turbopuffer and dual-delete
                 if archive_id:
@@ -805,7 +852,9 @@ class PassageManager:
         async with db_registry.async_session() as session:
             try:
                 passage = await SourcePassage.read_async(db_session=session, identifier=passage_id, actor=actor)
+                source_id = passage.source_id
                 await passage.hard_delete_async(session, actor=actor)
+                passage_vector_indexes.remove_passages(SOURCE_SCOPE, source_id, [passage_id])
                 return True
             except NoResultFound:
                 raise NoResultFound(f"Source passage with id {passage_id} not found.")
@@ -827,13 +876,17 @@ class PassageManager:
             # Try source passages first
             try:
                 passage = await SourcePassage.read_async(db_session=session, identifier=passage_id, actor=actor)
+                source_id = passage.source_id
                 await passage.hard_delete_async(session, actor=actor)
+                passage_vector_indexes.remove_passages(SOURCE_SCOPE, source_id, [passage_id])
                 return True
             except NoResultFound:
                 # Try archival passages
                 try:
                     passage = await ArchivalPassage.read_async(db_session=session, identifier=passage_id, actor=actor)
+                    archive_id = passage.archive_id
                     await passage.hard_delete_async(session, actor=actor)
+                    passage_vector_indexes.remove_passages(ARCHIVE_SCOPE, archive_id, [passage_id])
                     return True
                 except NoResultFound:
                     raise NoResultFound(f"Passage with id {passage_id} not found.")
@@ -867,6 +920,7 @@ class PassageManager:
         async with db_registry.async_session() as session:
             # Delete from SQL first
             await ArchivalPassage.bulk_hard_delete_async(db_session=session, identifiers=[p.id for p in passages], actor=actor)
+            _unindex_passages(ARCHIVE_SCOPE, passages)
 
             # Group passages by archive_id for efficient Turbopuffer deletion
             passages_by_archive = {}
@@ -915,6 +969,7 @@ class PassageManager:
     ) -> bool:
         async with db_registry.async_session() as session:
             await SourcePassage.bulk_hard_delete_async(db_session=session, identifiers=[p.id for p in passages], actor=actor)
+            _unindex_passages(SOURCE_SCOPE, passages)
             return True
 
     # DEPRECATED - Use specific methods above
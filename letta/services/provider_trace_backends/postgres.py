@@ -7,6 +7,13 @@ from letta.schemas.provider_trace import ProviderTrace, ProviderTraceMetadata
 from letta.schemas.user import User
 from letta.server.db import db_registry
 from letta.services.provider_trace_backends.base import ProviderTraceBackendClient
+from letta.services.provider_trace_backends.postgres_writer import (
+    get_provider_trace_writer,
+    load_blobs,
+    manifest_blob_ids,
+    peek_provider_trace_writer,
+    restore_request,
+)
 from letta.settings import telemetry_settings
 
 
@@ -20,6 +27,8 @@ class PostgresProviderTraceBackend(ProviderTraceBackendClient):
     ) -> ProviderTrace | ProviderTraceMetadata:
         if telemetry_settings.provider_trace_pg_metadata_only:
             return await self._create_metadata_only_async(actor, provider_trace)
+        if telemetry_settings.provider_trace_pg_deduplicate:
+            return await self._create_deduplicated_async(actor, provider_trace)
         return await self._create_full_async(actor, provider_trace)
 
     async def _create_full_async(
@@ -43,6 +52,16 @@ class PostgresProviderTraceBackend(ProviderTraceBackendClient):
             await provider_trace_model.create_async(session, actor=actor, no_commit=True, no_refresh=True)
             return provider_trace_model.to_pydantic()
 
+    async def _create_deduplicated_async(
+        self,
+        actor: User,
+        provider_trace: ProviderTrace,
+    ) -> ProviderTrace | None:
+        """Queue the trace for the batched writer, which stores the request as a manifest of deduplicated blobs."""
+        if await get_provider_trace_writer().submit(actor, provider_trace):
+            return provider_trace
+        return None
+
     async def _create_metadata_only_async(
         self,
         actor: User,
@@ -81,13 +100,26 @@ class PostgresProviderTraceBackend(ProviderTraceBackendClient):
         actor: User,
     ) -> ProviderTrace | None:
         """Read from provider_traces table."""
+        writer = peek_provider_trace_writer()
+        if writer is not None and writer.pending():
+            # read your own writes: the trace may still be queued on this process
+            await writer.flush()
+
         async with db_registry.async_session() as session:
             provider_trace_model = await ProviderTraceModel.read_async(
                 db_session=session,
                 step_id=step_id,
                 actor=actor,
             )
-            return provider_trace_model.to_pydantic() if provider_trace_model else None
+            if provider_trace_model is None:
+                return None
+            provider_trace = provider_trace_model.to_pydantic()
+
+        blob_ids = manifest_blob_ids(provider_trace.request_json)
+        if blob_ids:
+            blobs = await load_blobs(blob_ids, actor.organization_id)
+            provider_trace.request_json = restore_request(provider_trace.request_json, blobs)
+        return provider_trace
 
     async def _get_metadata_by_step_id_async(
         self,
@@ -0,0 +1,346 @@
+"""Deduplicated, batched provider trace writes for the Postgres backend.
+
+With ``provider_trace_pg_deduplicate`` set, consecutive steps of an agent no longer store the same context window over
+and over: each message, tool schema and system prompt of a request is stored once per organization in
+``provider_trace_blobs`` under its content hash, and ``provider_traces.request_json`` holds a manifest of blob ids
+(``restore_request`` reassembles it on read).
+
+Blobs are shared between traces, so deleting traces (e.g. a retention job) does not free them. Such a job should
+call ``delete_unreferenced_blobs`` after deleting traces; until something does, the blob table only grows, like
+``provider_traces`` itself.
+
+Traces are handed to a per-event-loop ``ProviderTraceWriter`` instead of being written on the request path. It
+buffers them in a bounded queue and inserts them in batches; when the queue is full a caller waits up to
+``provider_trace_writer_enqueue_timeout_seconds`` for room and the trace is otherwise dropped and counted.
+"""
+
+import asyncio
+import hashlib
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from letta.helpers.json_helpers import json_dumps, json_loads
+from letta.log import get_logger
+from letta.orm.provider_trace import ProviderTrace as ProviderTraceModel
+from letta.orm.provider_trace_blob import ProviderTraceBlob as ProviderTraceBlobModel
+from letta.otel.metric_registry import MetricRegistry
+from letta.otel.tracing import log_event
+from letta.schemas.provider_trace import ProviderTrace
+from letta.schemas.user import User
+from letta.server.db import db_registry
+from letta.settings import telemetry_settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+MANIFEST_KEY = "_letta_blob_refs"
+# Stands in for a request element whose blob is missing when a trace is read
+MISSING_BLOB_KEY = "_letta_blob_unavailable"
+# Request fields holding the context window across providers (chat completions, responses, anthropic, google)
+DEDUPLICATED_FIELDS = ("messages", "input", "contents", "system", "instructions", "system_instruction", "tools")
+_BLOB_INSERT_CHUNK = 1000
+# A writer re-upserts a blob it wrote longer ago than this, which refreshes the blob's updated_at
+KNOWN_BLOB_TTL_SECONDS = 3600.0
+# Blobs updated more recently than this are never collected, so a blob a writer still skips as known is kept
+BLOB_GC_MIN_AGE_SECONDS = 24 * 3600.0
+
+
+def _blob(organization_id: str, element: Any) -> Tuple[str, bytes]:
+    try:
+        raw = orjson.dumps(element, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        raw = None
+    if raw is None or b"\\u0000" in raw:
+        # same sanitization as full traces: null bytes stripped, bytes and datetimes stringified
+        raw = json_dumps(element, indent=None).encode()
+    digest = hashlib.sha256(organization_id.encode() + b"\x00" + raw).hexdigest()
+    return f"provider_trace_blob-{digest}", raw
+
+
+def split_request(organization_id: str, request_json: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """Manifest for ``request_json`` and the serialized blobs it references, by blob id."""
+    manifest = {key: value for key, value in request_json.items() if key not in DEDUPLICATED_FIELDS}
+    manifest = json_loads(json_dumps(manifest, indent=None))
+    blobs: Dict[str, bytes] = {}
+    refs = []
+    for field in DEDUPLICATED_FIELDS:
+        value = request_json.get(field)
+        if not value:
+            if field in request_json:
+                manifest[field] = value
+            continue
+        if isinstance(value, list):
+            ids = []
+            for element in value:
+                blob_id, raw = _blob(organization_id, element)
+                blobs[blob_id] = raw
+                ids.append(blob_id)
+            manifest[field] = ids
+        else:
+            blob_id, raw = _blob(organization_id, value)
+            blobs[blob_id] = raw
+            manifest[field] = blob_id
+        refs.append(field)
+    if refs:
+        manifest[MANIFEST_KEY] = refs
+    return manifest, blobs
+
+
+def manifest_blob_ids(request_json: Optional[Dict[str, Any]]) -> List[str]:
+    if not request_json or MANIFEST_KEY not in request_json:
+        return []
+    ids = []
+    for field in request_json[MANIFEST_KEY]:
+        value = request_json[field]
+        ids.extend(value if isinstance(value, list) else [value])
+    return ids
+
+
+def restore_request(request_json: Dict[str, Any], blobs: Dict[str, Any]) -> Dict[str, Any]:
+    """Reassemble a request stored as a manifest; ``blobs`` maps blob ids to their content.
+
+    A blob that is missing (e.g. deleted by hand) is replaced by ``{MISSING_BLOB_KEY: blob_id}`` rather than failing
+    the read.
+    """
+    if MANIFEST_KEY not in request_json:
+        return request_json
+    missing = []
+
+    def blob(blob_id: str) -> Any:
+        if blob_id in blobs:
+            return blobs[blob_id]
+        missing.append(blob_id)
+        return {MISSING_BLOB_KEY: blob_id}
+
+    restored = {key: value for key, value in request_json.items() if key != MANIFEST_KEY}
+    for field in request_json[MANIFEST_KEY]:
+        value = request_json[field]
+        restored[field] = [blob(blob_id) for blob_id in value] if isinstance(value, list) else blob(value)
+    if missing:
+        logger.warning(f"Provider trace request references {len(missing)} missing blobs, e.g. {missing[0]}")
+    return restored
+
+
+async def load_blobs(blob_ids: List[str], organization_id: str) -> Dict[str, Any]:
+    async with db_registry.async_session() as session:
+        result = await session.execute(
+            select(ProviderTraceBlobModel.id, ProviderTraceBlobModel.content).where(
+                ProviderTraceBlobModel.id.in_(set(blob_ids)), ProviderTraceBlobModel.organization_id == organization_id
+            )
+        )
+        return dict(result.all())
+
+
+async def delete_unreferenced_blobs(organization_id: str, min_age_seconds: float = BLOB_GC_MIN_AGE_SECONDS) -> int:
+    """Delete an organization's blobs that no stored trace references any more; returns how many were deleted.
+
+    Meant to run from a retention job after it deleted traces. Blobs updated within ``min_age_seconds`` are kept,
+    since a writer may still reference them without re-sending them; it must exceed ``KNOWN_BLOB_TTL_SECONDS``.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=min_age_seconds)
+    async with db_registry.async_session() as session:
+        referenced = set()
+        manifests = await session.stream_scalars(
+            select(ProviderTraceModel.request_json)
+            .where(ProviderTraceModel.organization_id == organization_id)
+            .execution_options(yield_per=_BLOB_INSERT_CHUNK)
+        )
+        async for request_json in manifests:
+            referenced.update(manifest_blob_ids(request_json))
+        candidates = (
+            await session.scalars(
+                select(ProviderTraceBlobModel.id).where(
+                    ProviderTraceBlobModel.organization_id == organization_id, ProviderTraceBlobModel.updated_at < cutoff
+                )
+            )
+        ).all()
+        unreferenced = [blob_id for blob_id in candidates if blob_id not in referenced]
+        for start in range(0, len(unreferenced), _BLOB_INSERT_CHUNK):
+            await session.execute(
+                sa.delete(ProviderTraceBlobModel).where(ProviderTraceBlobModel.id.in_(unreferenced[start : start + _BLOB_INSERT_CHUNK]))
+            )
+        await session.commit()
+    return len(unreferenced)
+
+
+class ProviderTraceWriter:
+    def __init__(
+        self,
+        queue_size: int,
+        batch_size: int,
+        flush_interval_seconds: float,
+        enqueue_timeout_seconds: float,
+        max_known_blobs: int = 100_000,
+        known_blob_ttl_seconds: float = KNOWN_BLOB_TTL_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self.max_known_blobs = max_known_blobs
+        self.known_blob_ttl_seconds = known_blob_ttl_seconds
+        self.written = 0
+        self.dropped = 0
+        self._queue: "asyncio.Queue[Tuple[User, ProviderTrace]]" = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight = 0
+        # blobs this process has written recently, and when, so repeated context is neither re-sent nor re-inserted
+        self._known_blobs: "OrderedDict[str, float]" = OrderedDict()
+
+    async def submit(self, actor: User, provider_trace: ProviderTrace) -> bool:
+        """Queue a trace for writing; returns False if it was dropped because the queue stayed full."""
+        if self._task is None or self._task.done():
+            self._task = safe_create_task(self._run(), label="provider_trace_writer")
+        try:
+            self._queue.put_nowait((actor, provider_trace))
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put((actor, provider_trace)), timeout=self.enqueue_timeout_seconds)
+            except asyncio.TimeoutError:
+                self._record_dropped(1, reason="queue_full")
+                return False
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize() + self._in_flight
+
+    async def flush(self) -> None:
+        """Wait until every queued trace has been written (or dropped)."""
+        await self._queue.join()
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            self._in_flight = len(batch)
+            try:
+                await self._write(batch)
+                self.written += len(batch)
+            except Exception:
+                logger.exception(f"Failed to write a batch of {len(batch)} provider traces")
+                self._record_dropped(len(batch), reason="write_failed")
+            finally:
+                self._in_flight = 0
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> List[Tuple[User, ProviderTrace]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _prepare(self, batch: List[Tuple[User, ProviderTrace]]) -> Tuple[List[ProviderTraceModel], List[dict]]:
+        traces = []
+        new_blobs: Dict[str, dict] = {}
+        known_since = time.monotonic() - self.known_blob_ttl_seconds
+        for actor, provider_trace in batch:
+            manifest, blobs = split_request(actor.organization_id, provider_trace.request_json or {})
+            for blob_id, raw in blobs.items():
+                if self._known_blobs.get(blob_id, known_since) <= known_since and blob_id not in new_blobs:
+                    new_blobs[blob_id] = {
+                        "id": blob_id,
+                        "content": orjson.loads(raw),
+                        "organization_id": actor.organization_id,
+                        "_created_by_id": actor.id,
+                        "_last_updated_by_id": actor.id,
+                    }
+            trace = ProviderTraceModel(**provider_trace.model_dump(exclude={"billing_context"}))
+            trace.organization_id = actor.organization_id
+            trace.request_json = manifest
+            if provider_trace.response_json:
+                trace.response_json = json_loads(json_dumps(provider_trace.response_json))
+            trace._set_created_and_updated_by_fields(actor.id)
+            traces.append(trace)
+        return traces, list(new_blobs.values())
+
+    async def _write(self, batch: List[Tuple[User, ProviderTrace]]) -> None:
+        # hashing a batch of context windows is CPU-bound, keep it off the event loop
+        traces, new_blobs = await asyncio.to_thread(self._prepare, batch)
+        async with db_registry.async_session() as session:
+            dialect = session.bind.dialect.name
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            for start in range(0, len(new_blobs), _BLOB_INSERT_CHUNK):
+                rows = new_blobs[start : start + _BLOB_INSERT_CHUNK]
+                # an existing blob keeps its content; touching updated_at keeps it from being collected
+                stmt = insert(ProviderTraceBlobModel.__table__).values(rows)
+                stmt = stmt.on_conflict_do_update(index_elements=["id"], set_={"updated_at": sa.func.now()})
+                await session.execute(stmt)
+            session.add_all(traces)
+        written_at = time.monotonic()
+        for row in new_blobs:
+            self._known_blobs[row["id"]] = written_at
+            self._known_blobs.move_to_end(row["id"])
+        while len(self._known_blobs) > self.max_known_blobs:
+            self._known_blobs.popitem(last=False)
+
+    def _record_dropped(self, count: int, reason: str) -> None:
+        self.dropped += count
+        log_event(name="provider_traces_dropped", attributes={"count": count, "reason": reason})
+        try:
+            MetricRegistry().provider_trace_dropped_counter.add(count, attributes={"reason": reason})
+        except Exception as e:
+            logger.debug(f"Failed to record dropped provider traces: {e}")
+
+
+_writers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ProviderTraceWriter]" = weakref.WeakKeyDictionary()
+
+
+def get_provider_trace_writer() -> ProviderTraceWriter:
+    """Writer for the running event loop, configured from settings."""
+    loop = asyncio.get_running_loop()
+    writer = _writers.get(loop)
+    if writer is None:
+        writer = _writers.setdefault(
+            loop,
+            ProviderTraceWriter(
+                queue_size=telemetry_settings.provider_trace_writer_queue_size,
+                batch_size=telemetry_settings.provider_trace_writer_batch_size,
+                flush_interval_seconds=telemetry_settings.provider_trace_writer_flush_interval_seconds,
+                enqueue_timeout_seconds=telemetry_settings.provider_trace_writer_enqueue_timeout_seconds,
+            ),
+        )
+    return writer
+
+
+def peek_provider_trace_writer() -> Optional[ProviderTraceWriter]:
+    """The running loop's writer if one was started, without creating it."""
+    return _writers.get(asyncio.get_running_loop())
+
+
+async def reset_provider_trace_writers(flush_timeout_seconds: float = 5.0) -> None:
+    """Write out the running loop's queued traces, stop its writer and forget every writer (used by tests and on shutdown)."""
+    writer = _writers.get(asyncio.get_running_loop())
+    if writer is not None:
+        try:
+            await asyncio.wait_for(writer.flush(), timeout=flush_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {writer.pending()} provider traces still queued at shutdown")
+        await writer.aclose()
+    _writers.clear()
@@ -0,0 +1,202 @@
+"""Push-based run cancellation.
+
+Streams used to notice a cancel by re-reading the run every 0.5s. Instead, ``RunManager`` publishes the run id
+when a run is cancelled, and every worker's bus sets that run's cancellation event
+(``get_cancellation_event_for_run``), which the stream wrapper and the LLM stream adapters already watch.
+
+The channel is Redis pub/sub when Redis is configured, Postgres LISTEN/NOTIFY otherwise, and only the
+in-process event with SQLite (single node). Buses are kept per event loop, since their listener task and
+connection are bound to the loop that started them. The server subscribes once at start-up
+(``start_run_cancellation_bus``); requests only look the bus up and never wait for the subscription.
+"""
+
+import asyncio
+import weakref
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+
+from letta.data_sources.redis_client import NoopAsyncRedisClient, get_redis_client
+from letta.log import get_logger
+from letta.otel.tracing import log_event
+from letta.settings import DatabaseChoice, settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+REDIS_CHANNEL = "letta:run_cancellations"
+POSTGRES_CHANNEL = "letta_run_cancellations"
+
+# Global registry of cancellation events per run_id
+# Note: Events are small and we don't bother cleaning them up
+_cancellation_events: Dict[str, asyncio.Event] = {}
+
+
+def get_cancellation_event_for_run(run_id: str) -> asyncio.Event:
+    """Get or create a cancellation event for a run."""
+    if run_id not in _cancellation_events:
+        _cancellation_events[run_id] = asyncio.Event()
+    return _cancellation_events[run_id]
+
+
+def _set_cancelled(run_id: str) -> None:
+    # Created if missing, so a stream or adapter that looks the event up after the notice still sees it set
+    event = get_cancellation_event_for_run(run_id)
+    if not event.is_set():
+        log_event(name="run_cancellation_received", attributes={"run_id": run_id})
+        event.set()
+
+
+class RunCancellationBus:
+    """Single-node bus: a cancel only has to reach this process's events."""
+
+    async def publish(self, run_id: str) -> None:
+        _set_cancelled(run_id)
+
+    def start(self) -> None:
+        """Start relaying notices from other workers in the background, if this bus has to."""
+
+    async def wait_until_subscribed(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds until notices published from now on will be received."""
+        return True
+
+    async def close(self) -> None:
+        pass
+
+
+class _ListeningRunCancellationBus(RunCancellationBus, ABC):
+    """Bus with a background task that relays notices published by other workers."""
+
+    def __init__(self, reconnect_backoff: float = 1.0):
+        self.reconnect_backoff = reconnect_backoff
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the listener task (or restart it if it died) without waiting for it to subscribe."""
+        if self._task is None or self._task.done():
+            self._task = safe_create_task(self._run(), label=f"{type(self).__name__}_listener")
+
+    async def wait_until_subscribed(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Notices published while disconnected are lost; streams check the run once when they start
+                logger.warning(f"Run cancellation listener disconnected, reconnecting in {self.reconnect_backoff}s: {e}")
+            finally:
+                self._subscribed.clear()
+            await asyncio.sleep(self.reconnect_backoff)
+
+    @abstractmethod
+    async def _listen(self) -> None:
+        """Subscribe, set ``_subscribed``, and relay notices until the connection drops."""
+
+
+class RedisRunCancellationBus(_ListeningRunCancellationBus):
+    def __init__(self, redis_client, reconnect_backoff: float = 1.0):
+        super().__init__(reconnect_backoff=reconnect_backoff)
+        self.redis = redis_client
+
+    async def publish(self, run_id: str) -> None:
+        await super().publish(run_id)
+        await self.redis.publish(REDIS_CHANNEL, run_id)
+
+    async def _listen(self) -> None:
+        pubsub = await self.redis.pubsub()
+        try:
+            await pubsub.subscribe(REDIS_CHANNEL)
+            self._subscribed.set()
+            while True:
+                # Waits on the socket for up to a second, so the connection's read timeout never trips while idle
+                message = await pubsub.get_message(timeout=1.0)
+                if message is not None and message["type"] == "message":
+                    _set_cancelled(message["data"])
+        finally:
+            await pubsub.aclose()
+
+
+class PostgresRunCancellationBus(_ListeningRunCancellationBus):
+    async def publish(self, run_id: str) -> None:
+        from letta.server.db import db_registry
+
+        await super().publish(run_id)
+        async with db_registry.async_session() as session:
+            await session.execute(select(func.pg_notify(POSTGRES_CHANNEL, run_id)))
+
+    async def _listen(self) -> None:
+        from letta.server.db import engine
+
+        # Holds one pooled connection for as long as the listener runs
+        async with engine.connect() as connection:
+            driver_connection = (await connection.get_raw_connection()).driver_connection
+            terminated = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _connection: terminated.set())
+
+            def on_notify(_connection, _pid, _channel, payload):
+                _set_cancelled(payload)
+
+            await driver_connection.add_listener(POSTGRES_CHANNEL, on_notify)
+            self._subscribed.set()
+            try:
+                await terminated.wait()
+                raise ConnectionError("LISTEN connection closed")
+            finally:
+                if not driver_connection.is_closed():
+                    await driver_connection.remove_listener(POSTGRES_CHANNEL, on_notify)
+
+
+_buses: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RunCancellationBus]" = weakref.WeakKeyDictionary()
+
+
+async def get_run_cancellation_bus() -> RunCancellationBus:
+    """Cancellation bus for the running event loop, using the best channel available.
+
+    Makes sure its listener is running but does not wait for it to subscribe: a stream opened before the
+    subscription completes still catches an earlier cancel through its initial read of the run.
+    """
+    loop = asyncio.get_running_loop()
+    bus = _buses.get(loop)
+    if bus is None:
+        redis_client = await get_redis_client()
+        if not isinstance(redis_client, NoopAsyncRedisClient):
+            bus = RedisRunCancellationBus(redis_client)
+        elif settings.database_engine is DatabaseChoice.POSTGRES:
+            bus = PostgresRunCancellationBus()
+        else:
+            bus = RunCancellationBus()
+        bus = _buses.setdefault(loop, bus)
+    bus.start()
+    return bus
+
+
+async def start_run_cancellation_bus(subscribe_timeout: float = 5.0) -> RunCancellationBus:
+    """Start the running loop's bus and wait for its subscription (called once at server start-up)."""
+    bus = await get_run_cancellation_bus()
+    if not await bus.wait_until_subscribed(subscribe_timeout):
+        logger.warning(f"Run cancellation listener not subscribed after {subscribe_timeout}s; it keeps retrying in the background")
+    return bus
+
+
+async def reset_run_cancellation_buses() -> None:
+    """Stop the running loop's listener and forget every bus (used by tests and on shutdown)."""
+    bus = _buses.get(asyncio.get_running_loop())
+    if bus is not None:
+        await bus.close()
+    _buses.clear()
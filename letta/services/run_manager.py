@@ -22,13 +22,15 @@ from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.run import Run as PydanticRun, RunUpdate
 from letta.schemas.run_metrics import RunMetrics as PydanticRunMetrics
 from letta.schemas.step import Step as PydanticStep
-from letta.schemas.usage import LettaUsageStatistics, normalize_cache_tokens, normalize_reasoning_tokens
+from letta.schemas.usage import LettaUsageStatistics
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.agent_manager import AgentManager
 from letta.services.helpers.agent_manager_helper import validate_agent_exists_async
 from letta.services.message_manager import MessageManager
+from letta.services.run_cancellation_bus import get_run_cancellation_bus
 from letta.services.step_manager import StepManager
+from letta.services.usage_rollup_manager import UsageRollupManager
 from letta.utils import enforce_types
 from letta.validators import raise_on_invalid_id
 
@@ -43,6 +45,7 @@ class RunManager:
         self.step_manager = StepManager()
         self.message_manager = MessageManager()
         self.agent_manager = AgentManager()
+        self.usage_rollup_manager = UsageRollupManager()
 
     @enforce_types
     async def create_run(self, pydantic_run: PydanticRun, actor: PydanticUser) -> PydanticRun:
@@ -387,6 +390,13 @@ class RunManager:
             # context manager now handles commits
             # await session.commit()
 
+        # Wake streams for this run on every worker instead of waiting for them to poll
+        if update.status == RunStatus.cancelled:
+            try:
+                await (await get_run_cancellation_bus()).publish(run_id)
+            except Exception as e:
+                logger.warning(f"Failed to publish cancellation for run {run_id}: {e}")
+
         # Release conversation lock if conversation_id was provided
         if is_terminal_update and conversation_id:
             try:
@@ -512,32 +522,13 @@ class RunManager:
     @enforce_types
     @raise_on_invalid_id(param_name="run_id", expected_prefix=PrimitiveType.RUN)
     async def get_run_usage(self, run_id: str, actor: PydanticUser) -> LettaUsageStatistics:
-        """Get usage statistics for a run."""
+        """Get usage statistics for a run, read from its usage rollup."""
         async with db_registry.async_session() as session:
             run = await RunModel.read_async(db_session=session, identifier=run_id, actor=actor, access_type=AccessType.ORGANIZATION)
             if not run:
                 raise NoResultFound(f"Run with id {run_id} not found")
 
-        steps = await self.step_manager.list_steps_async(run_id=run_id, actor=actor)
-        total_usage = LettaUsageStatistics()
-        for step in steps:
-            total_usage.prompt_tokens += step.prompt_tokens
-            total_usage.completion_tokens += step.completion_tokens
-            total_usage.total_tokens += step.total_tokens
-            total_usage.step_count += 1
-
-            # Aggregate cache and reasoning tokens from detailed breakdowns using normalized helpers
-            # Handle None defaults: only set if we have data, accumulate if already set
-            cached_input, cache_write = normalize_cache_tokens(step.prompt_tokens_details)
-            if cached_input > 0 or total_usage.cached_input_tokens is not None:
-                total_usage.cached_input_tokens = (total_usage.cached_input_tokens or 0) + cached_input
-            if cache_write > 0 or total_usage.cache_write_tokens is not None:
-                total_usage.cache_write_tokens = (total_usage.cache_write_tokens or 0) + cache_write
-            reasoning = normalize_reasoning_tokens(step.completion_tokens_details)
-            if reasoning > 0 or total_usage.reasoning_tokens is not None:
-                total_usage.reasoning_tokens = (total_usage.reasoning_tokens or 0) + reasoning
-
-        return total_usage
+        return await self.usage_rollup_manager.get_run_usage_async(run_id=run_id, actor=actor)
 
     @enforce_types
     @raise_on_invalid_id(param_name="run_id", expected_prefix=PrimitiveType.RUN)
@@ -0,0 +1,326 @@
+"""Bounded, durable executor for sleeptime agent runs.
+
+``SleeptimeMultiAgentV4`` used to start every sleeptime step as an uncapped task on the web worker's event loop. It now
+enqueues a ``created`` run whose metadata carries a ``SleeptimeJob``, so the runs table is the queue:
+
+- Coalescing: a turn for a sleeptime agent that already has a queued run is folded into that run, which then reviews
+  every message since the earliest folded turn in one transcript.
+- Limits: runs execute under a global and a per-organization cap and one at a time per sleeptime agent, and wait (up
+  to ``sleeptime_executor_max_yield_seconds``) while more than ``sleeptime_executor_foreground_yield_threshold``
+  foreground runs are in flight on this process.
+- Durability: a worker claims a run by flipping it from ``created`` to ``running`` and holds a lease on it (the run's
+  ``updated_at``, renewed every third of ``sleeptime_executor_lease_seconds`` while it executes). ``recover`` picks up
+  runs still queued when a process stopped, and reclaims ``running`` runs whose lease lapsed because their worker
+  died; other workers never take over a run whose lease is live. A run that fails after being claimed is marked
+  ``failed``. With ``sleeptime_executor_external`` set, web workers only enqueue and ``letta sleeptime-worker``
+  processes poll the queue and run them.
+"""
+
+import asyncio
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, or_, select, update
+
+from letta.log import get_logger
+from letta.monitoring.load_gate import get_load_gate
+from letta.orm.run import Run as RunModel
+from letta.otel.tracing import log_event
+from letta.schemas.enums import RunStatus
+from letta.schemas.letta_stop_reason import StopReasonType
+from letta.schemas.run import Run as PydanticRun
+from letta.schemas.user import User as PydanticUser
+from letta.server.db import db_registry
+from letta.settings import settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+SLEEPTIME_RUN_TYPE = "sleeptime_agent_send_message_async"
+JOB_METADATA_KEY = "sleeptime_job"
+_FOREGROUND_POLL_SECONDS = 0.1
+
+
+class SleeptimeJob(BaseModel):
+    """What a queued sleeptime run has to review, stored in the run's metadata."""
+
+    group_id: str = Field(..., description="The sleeptime group the run belongs to.")
+    foreground_agent_id: str = Field(..., description="The agent whose conversation is reviewed.")
+    actor_id: str = Field(..., description="The user the run executes as.")
+    last_processed_message_id: Optional[str] = Field(None, description="Last message reviewed before the earliest folded turn.")
+    response_message_ids: List[str] = Field(default_factory=list, description="Response messages of the latest folded turn.")
+    coalesced_turns: int = Field(1, description="Number of foreground turns folded into the run.")
+    billing_context: Optional[dict] = Field(None, description="Billing context of the latest folded turn.")
+
+
+class SleeptimeExecutor:
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_concurrency_per_org: int,
+        foreground_yield_threshold: int,
+        max_yield_seconds: float,
+        external: bool = False,
+        recovery_window_hours: float = 24.0,
+        lease_seconds: float = 60.0,
+    ):
+        self.max_concurrency_per_org = max_concurrency_per_org
+        self.foreground_yield_threshold = foreground_yield_threshold
+        self.max_yield_seconds = max_yield_seconds
+        self.external = external
+        self.recovery_window_hours = recovery_window_hours
+        self.lease_seconds = lease_seconds
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self._org_limits: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+        self._agent_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._recovery_task: Optional[asyncio.Task] = None
+
+    async def enqueue(self, job: SleeptimeJob, sleeptime_agent_id: str, actor: PydanticUser) -> str:
+        """Queue a sleeptime run for ``job``, folding it into the agent's queued run if there is one, and return the run id."""
+        run_id = await self._coalesce(job, sleeptime_agent_id, actor)
+        if run_id is not None:
+            log_event(name="sleeptime_run_coalesced", attributes={"run_id": run_id, "agent_id": sleeptime_agent_id})
+            return run_id
+
+        from letta.services.run_manager import RunManager
+
+        run = await RunManager().create_run(
+            pydantic_run=PydanticRun(
+                agent_id=sleeptime_agent_id,
+                status=RunStatus.created,
+                metadata={
+                    "run_type": SLEEPTIME_RUN_TYPE,
+                    "agent_id": sleeptime_agent_id,
+                    JOB_METADATA_KEY: job.model_dump(mode="json"),
+                },
+            ),
+            actor=actor,
+        )
+        if not self.external:
+            self._schedule(run.id, sleeptime_agent_id, actor.organization_id)
+        return run.id
+
+    async def recover(self) -> int:
+        """Schedule queued or abandoned sleeptime runs that no task on this process owns, returning how many were scheduled."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.recovery_window_hours)
+        async with db_registry.async_session() as session:
+            result = await session.execute(
+                select(RunModel.id, RunModel.agent_id, RunModel.organization_id, RunModel.metadata_)
+                .where(self._claimable(), RunModel.created_at >= cutoff)
+                .order_by(RunModel.created_at)
+            )
+            rows = result.all()
+
+        scheduled = 0
+        for run_id, agent_id, organization_id, metadata in rows:
+            if JOB_METADATA_KEY in (metadata or {}) and run_id not in self._tasks:
+                self._schedule(run_id, agent_id, organization_id)
+                scheduled += 1
+        if scheduled:
+            log_event(name="sleeptime_runs_recovered", attributes={"num_runs": scheduled})
+        return scheduled
+
+    async def run_forever(self, poll_interval_seconds: float) -> None:
+        """Poll the queue and execute sleeptime runs until cancelled (the body of ``letta sleeptime-worker``)."""
+        while True:
+            try:
+                await self.recover()
+            except Exception:
+                logger.exception("Failed to poll queued sleeptime runs")
+            await asyncio.sleep(poll_interval_seconds)
+
+    def start_recovery(self) -> None:
+        """Recover runs now and again every lease period in the background (web workers that execute runs)."""
+        if self._recovery_task is None or self._recovery_task.done():
+            self._recovery_task = safe_create_task(self.run_forever(self.lease_seconds), label="recover_sleeptime_runs")
+
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def aclose(self) -> None:
+        """Cancel this process's tasks; their runs stay queued, or running until their lease lapses, for ``recover``."""
+        tasks = list(self._tasks.values())
+        if self._recovery_task is not None:
+            tasks.append(self._recovery_task)
+            self._recovery_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _coalesce(self, job: SleeptimeJob, sleeptime_agent_id: str, actor: PydanticUser) -> Optional[str]:
+        async with db_registry.async_session() as session:
+            result = await session.execute(
+                select(RunModel.id, RunModel.metadata_)
+                .where(
+                    RunModel.agent_id == sleeptime_agent_id,
+                    RunModel.organization_id == actor.organization_id,
+                    RunModel.status == RunStatus.created,
+                )
+                .order_by(RunModel.created_at)
+            )
+            for run_id, metadata in result.all():
+                queued = (metadata or {}).get(JOB_METADATA_KEY)
+                if queued is None or queued["group_id"] != job.group_id:
+                    continue
+                merged = job.model_copy(
+                    update={
+                        "last_processed_message_id": queued["last_processed_message_id"],
+                        "coalesced_turns": queued["coalesced_turns"] + job.coalesced_turns,
+                    }
+                )
+                # Only while still queued: a run a worker has claimed must not change under it
+                updated = await session.execute(
+                    update(RunModel)
+                    .where(RunModel.id == run_id, RunModel.status == RunStatus.created)
+                    .values(metadata_={**metadata, JOB_METADATA_KEY: merged.model_dump(mode="json")})
+                )
+                if updated.rowcount:
+                    return run_id
+        return None
+
+    def _claimable(self):
+        """Runs that are queued, or running under a lease their worker stopped renewing."""
+        lease_expired_before = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        return or_(
+            RunModel.status == RunStatus.created,
+            and_(RunModel.status == RunStatus.running, RunModel.updated_at < lease_expired_before),
+        )
+
+    async def _claim(self, run_id: str) -> Optional[dict]:
+        """Take the run and its lease, returning its metadata, or None if it is not claimable (anymore)."""
+        async with db_registry.async_session() as session:
+            claimed = await session.execute(
+                update(RunModel)
+                .where(RunModel.id == run_id, self._claimable())
+                .values(status=RunStatus.running, updated_at=datetime.now(timezone.utc))
+            )
+            if not claimed.rowcount:
+                # another worker holds it, or it finished or was cancelled
+                return None
+            return (await session.execute(select(RunModel.metadata_).where(RunModel.id == run_id))).scalar_one()
+
+    async def _renew_lease(self, run_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with db_registry.async_session() as session:
+                    await session.execute(
+                        update(RunModel)
+                        .where(RunModel.id == run_id, RunModel.status == RunStatus.running)
+                        .values(updated_at=datetime.now(timezone.utc))
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to renew the lease on sleeptime run {run_id}: {e}")
+
+    async def _mark_failed(self, run_id: str, error: Exception) -> None:
+        # Only while still running: run_sleeptime_job may already have recorded the failure
+        try:
+            async with db_registry.async_session() as session:
+                metadata = (await session.execute(select(RunModel.metadata_).where(RunModel.id == run_id))).scalar_one()
+                await session.execute(
+                    update(RunModel)
+                    .where(RunModel.id == run_id, RunModel.status == RunStatus.running)
+                    .values(
+                        status=RunStatus.failed,
+                        stop_reason=StopReasonType.error,
+                        completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                        metadata_={**(metadata or {}), "error": str(error)},
+                    )
+                )
+        except Exception:
+            logger.exception(f"Failed to mark sleeptime run {run_id} as failed")
+
+    def _schedule(self, run_id: str, sleeptime_agent_id: str, organization_id: str) -> None:
+        if run_id in self._tasks:
+            return
+        task = safe_create_task(self._execute(run_id, sleeptime_agent_id, organization_id), label=f"sleeptime_run_{run_id}")
+        self._tasks[run_id] = task
+        task.add_done_callback(lambda _task: self._tasks.pop(run_id, None))
+
+    async def _execute(self, run_id: str, sleeptime_agent_id: str, organization_id: str) -> None:
+        from letta.groups.sleeptime_multi_agent_v4 import run_sleeptime_job
+        from letta.services.user_manager import UserManager
+
+        await self._yield_to_foreground()
+
+        agent_lock = self._agent_locks.get(sleeptime_agent_id)
+        if agent_lock is None:
+            agent_lock = self._agent_locks[sleeptime_agent_id] = asyncio.Lock()
+        org_limit = self._org_limits.get(organization_id)
+        if org_limit is None:
+            org_limit = self._org_limits[organization_id] = asyncio.Semaphore(self.max_concurrency_per_org)
+
+        # Turns for this agent keep folding into the run until it is claimed, so wait for the agent lock first
+        async with agent_lock, org_limit, self._global_limit:
+            metadata = await self._claim(run_id)
+            if metadata is None:
+                return
+            # From here the run is ours: renew the lease until it ends, and never leave it ``running`` on an error.
+            # A cancellation (shutdown) leaves it running, so another worker reclaims it once the lease lapses.
+            lease = safe_create_task(self._renew_lease(run_id), label=f"sleeptime_lease_{run_id}")
+            load_gate = get_load_gate()
+            load_gate.on_bg_start()
+            try:
+                job = SleeptimeJob.model_validate(metadata[JOB_METADATA_KEY])
+                actor = await UserManager().get_actor_by_id_async(job.actor_id)
+                await run_sleeptime_job(run_id=run_id, sleeptime_agent_id=sleeptime_agent_id, job=job, actor=actor)
+            except Exception as e:
+                logger.exception(f"Sleeptime run {run_id} failed")
+                await self._mark_failed(run_id, e)
+            finally:
+                lease.cancel()
+                load_gate.on_bg_end()
+
+    async def _yield_to_foreground(self) -> None:
+        deadline = time.monotonic() + self.max_yield_seconds
+        load_gate = get_load_gate()
+        while load_gate.fg_in_flight > self.foreground_yield_threshold and time.monotonic() < deadline:
+            await asyncio.sleep(_FOREGROUND_POLL_SECONDS)
+
+
+_executors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SleeptimeExecutor]" = weakref.WeakKeyDictionary()
+
+
+def get_sleeptime_executor() -> SleeptimeExecutor:
+    """Executor for the running event loop, configured from settings."""
+    loop = asyncio.get_running_loop()
+    executor = _executors.get(loop)
+    if executor is None:
+        executor = _executors.setdefault(
+            loop,
+            SleeptimeExecutor(
+                max_concurrency=settings.sleeptime_executor_max_concurrency,
+                max_concurrency_per_org=settings.sleeptime_executor_max_concurrency_per_org,
+                foreground_yield_threshold=settings.sleeptime_executor_foreground_yield_threshold,
+                max_yield_seconds=settings.sleeptime_executor_max_yield_seconds,
+                external=settings.sleeptime_executor_external,
+                recovery_window_hours=settings.sleeptime_executor_recovery_window_hours,
+                lease_seconds=settings.sleeptime_executor_lease_seconds,
+            ),
+        )
+    return executor
+
+
+async def reset_sleeptime_executors() -> None:
+    """Cancel the running loop's sleeptime tasks and forget every executor (used by tests and on shutdown)."""
+    executor = _executors.get(asyncio.get_running_loop())
+    if executor is not None:
+        await executor.aclose()
+    _executors.clear()
+
+
+async def run_sleeptime_worker() -> None:
+    """Entry point of ``letta sleeptime-worker``: execute queued sleeptime runs in this process."""
+    executor = get_sleeptime_executor()
+    # web workers in external mode never execute runs, so this process must regardless of the setting
+    executor.external = False
+    logger.info("Sleeptime worker started")
+    try:
+        await executor.run_forever(settings.sleeptime_executor_poll_interval_seconds)
+    finally:
+        await reset_sleeptime_executors()
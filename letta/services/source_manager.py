@@ -4,6 +4,7 @@ from sqlalchemy import and_, exists, select
 
 from letta.helpers.pinecone_utils import should_use_pinecone
 from letta.helpers.tpuf_client import should_use_tpuf
+from letta.helpers.vector_index import SOURCE_SCOPE, passage_vector_indexes
 from letta.orm import Agent as AgentModel
 from letta.orm.errors import NoResultFound
 from letta.orm.source import Source as SourceModel
@@ -236,6 +237,7 @@ class SourceManager:
         async with db_registry.async_session() as session:
             source = await SourceModel.read_async(db_session=session, identifier=source_id)
             await source.hard_delete_async(db_session=session, actor=actor)
+            passage_vector_indexes.invalidate(SOURCE_SCOPE, source_id)
             return source.to_pydantic()
 
     @enforce_types
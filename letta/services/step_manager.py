@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from letta.helpers.datetime_helpers import get_utc_time
 from letta.helpers.singleton import singleton
 from letta.log import get_logger
 
@@ -27,6 +28,7 @@ from letta.schemas.usage import normalize_cache_tokens, normalize_reasoning_toke
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.server.rest_api.middleware.request_id import get_request_id
+from letta.services.usage_rollup_manager import UsageRollupManager, step_usage_counters
 from letta.services.webhook_service import WebhookService
 from letta.utils import enforce_types
 from letta.validators import raise_on_invalid_id
@@ -222,6 +224,8 @@ class StepManager:
             "status": status if status else StepStatus.PENDING,
             "error_type": error_type,
             "error_data": error_data,
+            # set here rather than by the database so the usage rollups bucket the step by the same time
+            "created_at": get_utc_time(),
         }
         if step_id:
             step_data["id"] = step_id
@@ -244,6 +248,7 @@ class StepManager:
 
             new_step = StepModel(**step_data)
             await new_step.create_async(session, no_commit=True, no_refresh=True)
+            await UsageRollupManager().record_step_usage_async(session, new_step, {"step_count": 1, **step_usage_counters(new_step)})
             pydantic_step = new_step.to_pydantic()
             return pydantic_step
 
@@ -444,6 +449,7 @@ class StepManager:
             if step.organization_id != actor.organization_id:
                 raise Exception("Unauthorized")
 
+            usage_before = step_usage_counters(step)
             step.status = StepStatus.SUCCESS
             step.completion_tokens = usage.completion_tokens
             step.prompt_tokens = usage.prompt_tokens
@@ -467,6 +473,12 @@ class StepManager:
                 if reasoning > 0:
                     step.reasoning_tokens = reasoning
 
+            # keep the usage rollups in step with the final usage, in the same transaction
+            usage_after = step_usage_counters(step)
+            await UsageRollupManager().record_step_usage_async(
+                session, step, {counter: usage_after[counter] - usage_before[counter] for counter in usage_after}
+            )
+
             # context manager now handles commits
             # await session.commit()
             pydantic_step = step.to_pydantic()
@@ -572,6 +584,7 @@ class StepManager:
         template_id: Optional[str] = None,
         base_template_id: Optional[str] = None,
         allow_partial: Optional[bool] = False,
+        llm_request_bytes: Optional[int] = None,
     ) -> PydanticStepMetrics:
         """Record performance metrics for a step.
 
@@ -586,6 +599,7 @@ class StepManager:
             project_id: The ID of the project
             template_id: The ID of the template
             base_template_id: The ID of the base template
+            llm_request_bytes: Size of the request body sent to the LLM provider in bytes
 
         Returns:
             The created step metrics
@@ -623,6 +637,8 @@ class StepManager:
                     metrics.template_id = template_id
                 if base_template_id is not None:
                     metrics.base_template_id = base_template_id
+                if llm_request_bytes is not None:
+                    metrics.llm_request_bytes = llm_request_bytes
                 await session.commit()
                 return metrics.to_pydantic()
             except NoResultFound:
@@ -635,6 +651,7 @@ class StepManager:
                 "run_id": run_id,
                 "project_id": project_id or step.project_id,
                 "llm_request_ns": llm_request_ns,
+                "llm_request_bytes": llm_request_bytes,
                 "tool_execution_ns": tool_execution_ns,
                 "step_ns": step_ns,
                 "template_id": template_id,
@@ -14,7 +14,7 @@ from letta.schemas.provider_trace import BillingContext
 from letta.schemas.user import User
 from letta.services.summarizer.constants import SUMMARY_TRUNCATION_SUFFIX
 from letta.services.summarizer.summarizer_config import CompactionSettings, get_default_prompt_for_mode
-from letta.services.summarizer.summarizer_sliding_window import count_tokens
+from letta.services.summarizer.summarizer_sliding_window import find_sliding_window_cutoff
 from letta.services.telemetry_manager import TelemetryManager
 
 logger = get_logger(__name__)
@@ -177,8 +177,6 @@ async def self_summarize_sliding_window(
         logger.warning("Too few messages to summarize")
         return "No conversation to summarize.", messages
 
-    system_prompt = messages[0]
-
     # cannot evict a pending approval request (will cause client-side errors)
     total_message_count = len(messages)
     if messages[-1].role == MessageRole.approval:
@@ -186,49 +184,14 @@ async def self_summarize_sliding_window(
     else:
         maximum_message_index = total_message_count - 1
 
-    eviction_percentage = compaction_settings.sliding_window_percentage
     assert compaction_settings.sliding_window_percentage <= 1.0, "Sliding window percentage must be less than or equal to 1.0"
-    assistant_message_index = None
-
-    goal_tokens = (1 - compaction_settings.sliding_window_percentage) * agent_llm_config.context_window
-    approx_token_count = agent_llm_config.context_window
-
-    # allow approvals to be cutoffs (for headless agents) but ensure proper grouping with tool calls
-    def is_valid_cutoff(message: Message):
-        if message.role == MessageRole.assistant:
-            return True
-        if message.role == MessageRole.approval:
-            return message.tool_calls is not None and len(message.tool_calls) > 0
-        return False
-
-    post_summarization_buffer = []
-    while approx_token_count >= goal_tokens and eviction_percentage < 1.0:
-        # more eviction percentage
-        eviction_percentage += 0.10
-
-        # calculate message_cutoff_index
-        message_cutoff_index = round(eviction_percentage * total_message_count)
-
-        # get index of first assistant message after the cutoff point ()
-        assistant_message_index = next(
-            (i for i in reversed(range(1, message_cutoff_index + 1)) if i < len(messages) and is_valid_cutoff(messages[i])),
-            None,
-        )
-        if assistant_message_index is None:
-            logger.warning(
-                f"No assistant/approval message found for evicting up to index {message_cutoff_index}, incrementing eviction percentage"
-            )
-            continue
-
-        # update token count
-        logger.info(f"Attempting to compact messages to index {assistant_message_index} messages")
-        post_summarization_buffer = list(messages[assistant_message_index:])
-        approx_token_count = await count_tokens(actor, agent_llm_config, [system_prompt, *post_summarization_buffer])
-        logger.info(
-            f"Compacting messages index 1:{assistant_message_index} messages resulted in {approx_token_count} tokens, goal is {goal_tokens}"
-        )
-
-    if assistant_message_index is None or eviction_percentage >= 1.0:
+    assistant_message_index, _ = await find_sliding_window_cutoff(
+        actor=actor,
+        agent_llm_config=agent_llm_config,
+        messages=messages,
+        sliding_window_percentage=compaction_settings.sliding_window_percentage,
+    )
+    if assistant_message_index is None:
         raise ValueError("No assistant message found for sliding window summarization")  # fall back to complete summarization
 
     if assistant_message_index >= maximum_message_index:
@@ -259,7 +222,7 @@ async def self_summarize_sliding_window(
     )
 
     # final_messages should just be the system prompt
-    return summary_text, final_messages + post_summarization_buffer
+    return summary_text, final_messages + messages[assistant_message_index:]
 
 
 def _get_protected_messages(in_context_messages: List[Message]) -> Tuple[List[Message], List[Message]]:
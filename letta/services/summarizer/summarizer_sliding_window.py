@@ -1,3 +1,8 @@
+import hashlib
+import json
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
 if TYPE_CHECKING:
@@ -10,7 +15,7 @@ from letta.schemas.llm_config import LLMConfig
 from letta.schemas.message import Message
 from letta.schemas.provider_trace import BillingContext
 from letta.schemas.user import User
-from letta.services.context_window_calculator.token_counter import create_token_counter
+from letta.services.context_window_calculator.token_counter import ApproxTokenCounter, create_token_counter
 from letta.services.summarizer.constants import SUMMARY_TRUNCATION_SUFFIX
 from letta.services.summarizer.summarizer import simple_summary
 from letta.services.summarizer.summarizer_config import CompactionSettings
@@ -23,6 +28,13 @@ logger = get_logger(__name__)
 # due to structural overhead (brackets, quotes, colons) each becoming tokens.
 APPROX_TOKEN_SAFETY_MARGIN = 1.3
 
+# Per-message token estimates, keyed by (message id, fingerprint of the fields that reach the LLM) so a
+# message edited in place gets re-estimated. In-context messages are re-used across steps, so most of
+# the prefix is already here by the time a compaction runs.
+MESSAGE_TOKEN_ESTIMATE_CACHE_SIZE = 10_000
+_ESTIMATED_FIELDS = {"role", "content", "name", "tool_calls", "tool_call_id", "tool_returns", "approvals"}
+_message_token_estimates: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+
 
 async def count_tokens(actor: User, llm_config: LLMConfig, messages: List[Message]) -> int:
     """Count tokens in messages using the appropriate token counter for the model configuration."""
@@ -35,8 +47,6 @@ async def count_tokens(actor: User, llm_config: LLMConfig, messages: List[Messag
     tokens = await token_counter.count_message_tokens(converted_messages)
 
     # Apply safety margin for approximate counting to avoid underestimating
-    from letta.services.context_window_calculator.token_counter import ApproxTokenCounter
-
     if isinstance(token_counter, ApproxTokenCounter):
         return int(tokens * APPROX_TOKEN_SAFETY_MARGIN)
     return tokens
@@ -71,8 +81,6 @@ async def count_tokens_with_tools(
     # Count tools
     from openai.types.beta.function_tool import FunctionTool as OpenAITool
 
-    from letta.services.context_window_calculator.token_counter import ApproxTokenCounter
-
     token_counter = create_token_counter(
         model_endpoint_type=llm_config.model_endpoint_type,
         model=llm_config.model,
@@ -95,6 +103,89 @@ async def count_tokens_with_tools(
     return message_tokens + tool_tokens
 
 
+def estimate_message_tokens(message: Message) -> int:
+    """Local (bytes/4 + safety margin) token estimate for a single message, cached per message."""
+    fingerprint = hashlib.sha256(message.model_dump_json(include=_ESTIMATED_FIELDS).encode("utf-8")).hexdigest()[:16]
+    key = (message.id, fingerprint)
+    estimate = _message_token_estimates.get(key)
+    if estimate is not None:
+        _message_token_estimates.move_to_end(key)
+        return estimate
+
+    converted = Message.to_openai_dicts_from_list([message])
+    estimate = int(ApproxTokenCounter()._approx_token_count(json.dumps(converted)) * APPROX_TOKEN_SAFETY_MARGIN) if converted else 0
+    _message_token_estimates[key] = estimate
+    while len(_message_token_estimates) > MESSAGE_TOKEN_ESTIMATE_CACHE_SIZE:
+        _message_token_estimates.popitem(last=False)
+    return estimate
+
+
+def is_valid_sliding_window_cutoff(message: Message) -> bool:
+    # allow approvals to be cutoffs (for headless agents) but ensure proper grouping with tool calls
+    if message.role == MessageRole.assistant:
+        return True
+    if message.role == MessageRole.approval:
+        return message.tool_calls is not None and len(message.tool_calls) > 0
+    return False
+
+
+async def find_sliding_window_cutoff(
+    actor: User,
+    agent_llm_config: LLMConfig,
+    messages: List[Message],
+    sliding_window_percentage: float,
+) -> Tuple[Optional[int], int]:
+    """Find the earliest valid cutoff that brings ``[messages[0], *messages[cutoff:]]`` under the compaction goal.
+
+    The goal is ``(1 - sliding_window_percentage)`` of the agent's context window, and at least
+    ``sliding_window_percentage + 10%`` of the messages are evicted. Candidate cutoffs are ranked with a
+    prefix sum over cached per-message estimates, so the search is a binary search instead of a token count
+    per 10% step. Only the chosen window is counted with the agent's real token counter (which may be a
+    remote API call); if that exact count is still over the goal, the estimates are rescaled by the observed
+    error and the search continues past the rejected cutoff.
+
+    Returns:
+    - The cutoff index, or None if no valid cutoff reaches the goal
+    - The exact token count of the kept window (or of the smallest window tried)
+    """
+    total_message_count = len(messages)
+    goal_tokens = (1 - sliding_window_percentage) * agent_llm_config.context_window
+
+    # The smallest eviction is the last valid message at or before the first 10% step past the window percentage
+    first_cutoff_index = min(round((sliding_window_percentage + 0.10) * total_message_count), total_message_count - 1)
+    first_candidate = next((i for i in range(first_cutoff_index, 0, -1) if is_valid_sliding_window_cutoff(messages[i])), None)
+    if first_candidate is None:
+        logger.warning(f"No assistant/approval message found for evicting up to index {first_cutoff_index}")
+        first_candidate = first_cutoff_index + 1
+    candidates = [i for i in range(first_candidate, total_message_count) if is_valid_sliding_window_cutoff(messages[i])]
+    if not candidates:
+        return None, agent_llm_config.context_window
+
+    # prefix_tokens[i] = estimated tokens of messages[:i], so the kept window is system + total - prefix_tokens[cutoff]
+    estimates = [estimate_message_tokens(m) for m in messages]
+    prefix_tokens = [0, *accumulate(estimates)]
+    # Kept-window estimates shrink as the cutoff moves right; negate so bisect sees an ascending list
+    negated_window_tokens = [-(estimates[0] + prefix_tokens[-1] - prefix_tokens[i]) for i in candidates]
+
+    scale = 1.0
+    position = 0
+    exact_token_count = agent_llm_config.context_window
+    while position < len(candidates):
+        # If the estimates say nothing fits, still give the smallest window an exact count (estimates can overshoot)
+        position = min(max(position, bisect_right(negated_window_tokens, -goal_tokens / scale)), len(candidates) - 1)
+        cutoff_index = candidates[position]
+        logger.info(f"Attempting to compact messages index 1:{cutoff_index} messages")
+        exact_token_count = await count_tokens(actor, agent_llm_config, [messages[0], *messages[cutoff_index:]])
+        logger.info(f"Compacting messages index 1:{cutoff_index} messages resulted in {exact_token_count} tokens, goal is {goal_tokens}")
+        if exact_token_count < goal_tokens:
+            return cutoff_index, exact_token_count
+
+        scale = max(scale, exact_token_count / max(-negated_window_tokens[position], 1))
+        position += 1
+
+    return None, exact_token_count
+
+
 @trace_method
 async def summarize_via_sliding_window(
     # Required to tag LLM calls
@@ -117,11 +208,10 @@ async def summarize_via_sliding_window(
     then summarize and rearrange the in-context messages (with the summary in front).
 
     Finding the summarization cutoff point (target of final post-summarize count is N% of agent's context window):
-    1. Start at a message index cutoff (1-N%)
-    2. Count tokens with system prompt, prior summary (if it exists), and messages past cutoff point (messages[0] + messages[cutoff:])
-    3. Is count(post_sum_messages) <= N% of agent's context window?
-      3a. Yes -> create new summary with [prior summary, cutoff:], and safety truncate summary with char count
-      3b. No -> increment cutoff by 10%, and repeat
+    1. Estimate the tokens of messages[0] + messages[cutoff:] for every valid cutoff from cached per-message estimates
+    2. Binary search for the earliest cutoff whose estimate is under N% of agent's context window
+    3. Count that window exactly; if it is still over, rescale the estimates and search further right (see find_sliding_window_cutoff)
+    4. Create new summary with [prior summary, cutoff:], and safety truncate summary with char count
 
     Returns:
     - The summary string
@@ -136,61 +226,14 @@ async def summarize_via_sliding_window(
     else:
         maximum_message_index = total_message_count - 1
 
-    # simple version: summarize(in_context[1:round(summarizer_config.sliding_window_percentage * len(in_context_messages))])
-    # this evicts 30% of the messages (via summarization) and keeps the remaining 70%
-    # problem: we need the cutoff point to be an assistant message, so will grow the cutoff point until we find an assistant message
-    # also need to grow the cutoff point until the token count is less than the target token count
-
-    # Starts at N% (eg 70%), and increments up until 100%
-    max(
-        1 - summarizer_config.sliding_window_percentage, 0.10
-    )  # Some arbitrary minimum value (10%) to avoid negatives from badly configured summarizer percentage
-    eviction_percentage = summarizer_config.sliding_window_percentage
     assert summarizer_config.sliding_window_percentage <= 1.0, "Sliding window percentage must be less than or equal to 1.0"
-    assistant_message_index = None
-
-    goal_tokens = (1 - summarizer_config.sliding_window_percentage) * agent_llm_config.context_window
-    approx_token_count = agent_llm_config.context_window
-
-    # allow approvals to be cutoffs (for headless agents) but ensure proper grouping with tool calls
-    def is_valid_cutoff(message: Message):
-        if message.role == MessageRole.assistant:
-            return True
-        if message.role == MessageRole.approval:
-            return message.tool_calls is not None and len(message.tool_calls) > 0
-        return False
-
-    while approx_token_count >= goal_tokens and eviction_percentage < 1.0:
-        # more eviction percentage
-        eviction_percentage += 0.10
-
-        # calculate message_cutoff_index
-        message_cutoff_index = round(eviction_percentage * total_message_count)
-
-        # get index of first assistant message after the cutoff point ()
-        assistant_message_index = next(
-            (
-                i
-                for i in reversed(range(1, message_cutoff_index + 1))
-                if i < len(in_context_messages) and is_valid_cutoff(in_context_messages[i])
-            ),
-            None,
-        )
-        if assistant_message_index is None:
-            logger.warning(
-                f"No assistant/approval message found for evicting up to index {message_cutoff_index}, incrementing eviction percentage"
-            )
-            continue
-
-        # update token count
-        logger.info(f"Attempting to compact messages index 1:{assistant_message_index} messages")
-        post_summarization_buffer = [system_prompt, *in_context_messages[assistant_message_index:]]
-        approx_token_count = await count_tokens(actor, agent_llm_config, post_summarization_buffer)
-        logger.info(
-            f"Compacting messages index 1:{assistant_message_index} messages resulted in {approx_token_count} tokens, goal is {goal_tokens}"
-        )
-
-    if assistant_message_index is None or eviction_percentage >= 1.0:
+    assistant_message_index, _ = await find_sliding_window_cutoff(
+        actor=actor,
+        agent_llm_config=agent_llm_config,
+        messages=in_context_messages,
+        sliding_window_percentage=summarizer_config.sliding_window_percentage,
+    )
+    if assistant_message_index is None:
         raise ValueError("No assistant message found for sliding window summarization")  # fall back to complete summarization
 
     if assistant_message_index >= maximum_message_index:
@@ -0,0 +1,182 @@
+"""Deferred, coalesced system prompt rebuilds.
+
+Editing a block recompiles the system message of every agent it is attached to. For a block shared by thousands
+of agents (org-wide human or policy blocks) doing that inline took minutes. Past
+``system_prompt_rebuild_inline_max_agents`` agents, ``BlockManager`` marks them dirty here instead. Each dirty agent is
+rebuilt once, by whichever comes first:
+
+- the agent's next step, which claims the mark and force-refreshes its system prompt, or
+- the background drain, which waits ``system_prompt_rebuild_delay_seconds`` (so repeated edits coalesce), then claims
+  agents in batches of ``system_prompt_rebuild_batch_size`` and rebuilds them with ``rebuild_system_prompts_async``.
+
+Marks live in a Redis hash (agent id -> id of the user who made the edit) so any worker's step or drain can claim
+them, or in process memory without Redis. Claiming deletes the mark first, so an edit that lands mid-rebuild marks
+the agent again rather than being lost.
+"""
+
+import asyncio
+import weakref
+from typing import Dict, List, Optional
+
+from letta.data_sources.redis_client import NoopAsyncRedisClient, get_redis_client
+from letta.log import get_logger
+from letta.otel.metric_registry import MetricRegistry
+from letta.otel.tracing import log_event
+from letta.schemas.user import User as PydanticUser
+from letta.settings import settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+DIRTY_AGENTS_KEY = "system_prompt_rebuild:dirty"
+
+
+class _LocalDirtyAgents:
+    def __init__(self):
+        self._dirty: Dict[str, str] = {}
+
+    async def mark(self, mapping: Dict[str, str]) -> None:
+        self._dirty.update(mapping)
+
+    async def claim(self, agent_ids: List[str]) -> List[str]:
+        return [agent_id for agent_id in agent_ids if self._dirty.pop(agent_id, None) is not None]
+
+    async def pending(self) -> Dict[str, str]:
+        return dict(self._dirty)
+
+
+class _RedisDirtyAgents:
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    async def mark(self, mapping: Dict[str, str]) -> None:
+        await self.redis.hset_many(DIRTY_AGENTS_KEY, mapping)
+
+    async def claim(self, agent_ids: List[str]) -> List[str]:
+        # HDEL per field so concurrent claimers (steps, other workers' drains) each win a disjoint set
+        claimed = await asyncio.gather(*(self.redis.hdel(DIRTY_AGENTS_KEY, agent_id) for agent_id in agent_ids))
+        return [agent_id for agent_id, removed in zip(agent_ids, claimed) if removed]
+
+    async def pending(self) -> Dict[str, str]:
+        return await self.redis.hgetall(DIRTY_AGENTS_KEY)
+
+
+class SystemPromptRebuildScheduler:
+    def __init__(self, dirty_agents, delay_seconds: float, batch_size: int, max_concurrency: int):
+        self.dirty_agents = dirty_agents
+        self.delay_seconds = delay_seconds
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self._drain_task: Optional[asyncio.Task] = None
+        self._rerun = False
+
+    async def mark_dirty(self, agent_ids: List[str], actor: PydanticUser) -> None:
+        """Schedule a forced system prompt rebuild for ``agent_ids``; marking an already dirty agent is a no-op."""
+        if not agent_ids:
+            return
+        await self.dirty_agents.mark({agent_id: actor.id for agent_id in agent_ids})
+        log_event(name="system_prompt_rebuild_marked", attributes={"num_agents": len(agent_ids)})
+        await self._record_queue_depth()
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = safe_create_task(self._drain(), label="system_prompt_rebuild_drain")
+        else:
+            # the running drain may have already listed pending agents
+            self._rerun = True
+
+    async def claim(self, agent_id: str) -> bool:
+        """Take ownership of ``agent_id``'s pending rebuild, returning True if it was dirty (used on the agent's next step)."""
+        return bool(await self.dirty_agents.claim([agent_id]))
+
+    async def queue_depth(self) -> int:
+        return len(await self.dirty_agents.pending())
+
+    async def drain(self) -> int:
+        """Rebuild every dirty agent now, returning how many system messages were rewritten."""
+        from letta.services.agent_manager import AgentManager
+        from letta.services.user_manager import UserManager
+
+        agent_manager = AgentManager()
+        user_manager = UserManager()
+        actors: Dict[str, PydanticUser] = {}
+        rewritten = 0
+
+        pending = await self.dirty_agents.pending()
+        by_actor: Dict[str, List[str]] = {}
+        for agent_id, actor_id in pending.items():
+            by_actor.setdefault(actor_id, []).append(agent_id)
+
+        for actor_id, agent_ids in by_actor.items():
+            if actor_id not in actors:
+                try:
+                    actors[actor_id] = await user_manager.get_actor_by_id_async(actor_id)
+                except Exception as e:
+                    logger.warning(f"Dropping deferred system prompt rebuilds for {len(agent_ids)} agents, actor {actor_id} not found: {e}")
+                    await self.dirty_agents.claim(agent_ids)
+                    continue
+            for i in range(0, len(agent_ids), self.batch_size):
+                claimed = await self.dirty_agents.claim(agent_ids[i : i + self.batch_size])
+                if not claimed:
+                    continue
+                try:
+                    rewritten += await agent_manager.rebuild_system_prompts_async(
+                        agent_ids=claimed, actor=actors[actor_id], max_concurrency=self.max_concurrency
+                    )
+                except Exception:
+                    logger.exception(f"Deferred system prompt rebuild failed for {len(claimed)} agents")
+                await self._record_queue_depth()
+
+        log_event(name="system_prompt_rebuild_drained", attributes={"num_agents": len(pending), "rewritten": rewritten})
+        return rewritten
+
+    async def _drain(self) -> None:
+        while True:
+            self._rerun = False
+            await asyncio.sleep(self.delay_seconds)
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Deferred system prompt rebuild drain failed")
+            if not self._rerun:
+                return
+
+    async def _record_queue_depth(self) -> None:
+        try:
+            MetricRegistry().system_prompt_rebuild_queue_depth_gauge.set(await self.queue_depth())
+        except Exception as e:
+            logger.debug(f"Failed to record system prompt rebuild queue depth: {e}")
+
+    async def aclose(self) -> None:
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+            self._drain_task = None
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SystemPromptRebuildScheduler]" = weakref.WeakKeyDictionary()
+
+
+async def get_system_prompt_rebuild_scheduler() -> SystemPromptRebuildScheduler:
+    """Scheduler for the running event loop, sharing dirty marks across workers through Redis when it is configured."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        redis_client = await get_redis_client()
+        dirty_agents = _LocalDirtyAgents() if isinstance(redis_client, NoopAsyncRedisClient) else _RedisDirtyAgents(redis_client)
+        scheduler = _schedulers.setdefault(
+            loop,
+            SystemPromptRebuildScheduler(
+                dirty_agents,
+                delay_seconds=settings.system_prompt_rebuild_delay_seconds,
+                batch_size=settings.system_prompt_rebuild_batch_size,
+                max_concurrency=settings.system_prompt_rebuild_max_concurrency,
+            ),
+        )
+    return scheduler
+
+
+async def reset_system_prompt_rebuild_schedulers() -> None:
+    """Cancel the running loop's pending drain and forget every scheduler (used by tests)."""
+    scheduler = _schedulers.get(asyncio.get_running_loop())
+    if scheduler is not None:
+        await scheduler.aclose()
+    _schedulers.clear()
@@ -17,6 +17,7 @@ from letta.schemas.sandbox_config import SandboxConfig
 from letta.schemas.tool import Tool
 from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.user import User
+from letta.services.memory_write_buffer import MemoryWriteBuffer
 from letta.services.tool_executor.tool_executor_base import ToolExecutor
 from letta.utils import get_friendly_error_msg
 
@@ -26,6 +27,9 @@ logger = get_logger(__name__)
 class LettaCoreToolExecutor(ToolExecutor):
     """Executor for LETTA core tools with direct implementation of functions."""
 
+    # Set by ToolExecutionManager when the agent step buffers memory writes until its checkpoint
+    memory_write_buffer: Optional[MemoryWriteBuffer] = None
+
     async def execute(
         self,
         function_name: str,
@@ -75,6 +79,13 @@ class LettaCoreToolExecutor(ToolExecutor):
                 stderr=[get_friendly_error_msg(function_name=function_name, exception_name=type(e).__name__, exception_message=str(e))],
             )
 
+    async def _save_memory(self, agent_state: AgentState, actor: User, label: Optional[str] = None) -> None:
+        """Persist the memory edited in ``agent_state`` (block ``label``), or defer it to the step checkpoint."""
+        if self.memory_write_buffer is not None:
+            self.memory_write_buffer.record(agent_state, label)
+            return
+        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+
     async def send_message(self, agent_state: AgentState, actor: User, message: str) -> Optional[str]:
         return "Sent message successfully."
 
@@ -322,7 +333,7 @@ class LettaCoreToolExecutor(ToolExecutor):
         current_value = str(agent_state.memory.get_block(label).value)
         new_value = current_value + "\n" + str(content)
         agent_state.memory.update_block_value(label=label, value=new_value)
-        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self._save_memory(agent_state, actor, label=label)
         return new_value
 
     async def core_memory_replace(
@@ -340,7 +351,7 @@ class LettaCoreToolExecutor(ToolExecutor):
             raise ValueError(f"Old content '{old_content}' not found in memory block '{label}'")
         new_value = current_value.replace(str(old_content), str(new_content))
         agent_state.memory.update_block_value(label=label, value=new_value)
-        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self._save_memory(agent_state, actor, label=label)
         return new_value
 
     async def memory_replace(
@@ -396,7 +407,7 @@ class LettaCoreToolExecutor(ToolExecutor):
         # Write the new content to the block
         agent_state.memory.update_block_value(label=label, value=new_value)
 
-        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self._save_memory(agent_state, actor, label=label)
 
         return new_value
 
@@ -532,7 +543,7 @@ class LettaCoreToolExecutor(ToolExecutor):
 
             new_value = apply_unified_patch_to_value(str(memory_block.value), patch)
             agent_state.memory.update_block_value(label=label, value=new_value)
-            await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+            await self._save_memory(agent_state, actor, label=label)
 
             return new_value
 
@@ -668,7 +679,7 @@ class LettaCoreToolExecutor(ToolExecutor):
                 patch_text = "\n".join(action["patch_lines"])
                 new_value = apply_unified_patch_to_value(str(memory_block.value), patch_text)
                 agent_state.memory.update_block_value(label=action["label"], value=new_value)
-                await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+                await self._save_memory(agent_state, actor, label=action["label"])
                 results.append(f"Updated memory block '{action['label']}'")
 
             else:
@@ -736,7 +747,7 @@ class LettaCoreToolExecutor(ToolExecutor):
         # Write into the block
         agent_state.memory.update_block_value(label=label, value=new_value)
 
-        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self._save_memory(agent_state, actor, label=label)
 
         return new_value
 
@@ -768,7 +779,7 @@ class LettaCoreToolExecutor(ToolExecutor):
 
         agent_state.memory.update_block_value(label=label, value=new_memory)
 
-        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self._save_memory(agent_state, actor, label=label)
 
         return new_memory
 
@@ -875,7 +886,7 @@ class LettaCoreToolExecutor(ToolExecutor):
         # Add the persisted block to memory
         agent_state.memory.set_block(persisted_block)
 
-        await self.agent_manager.update_memory_if_changed_async(agent_id=agent_state.id, new_memory=agent_state.memory, actor=actor)
+        await self._save_memory(agent_state, actor)
         return (
             f"Successfully created memory block '{label}'. "
             f"Your system prompt has been recompiled with the new memory block and is now active in your context."
@@ -938,6 +949,11 @@ class LettaCoreToolExecutor(ToolExecutor):
         # Replace old_string with new_string
         new_value = current_value.replace(str(old_string), str(new_string))
 
+        if self.memory_write_buffer is not None:
+            agent_state.memory.update_block_value(label=label, value=new_value)
+            self.memory_write_buffer.record(agent_state, label)
+            return new_value
+
         # Write the new content to the block
         await self.block_manager.update_block_async(block_id=memory_block.id, block_update=BlockUpdate(value=new_value), actor=actor)
 
@@ -1001,6 +1017,11 @@ class LettaCoreToolExecutor(ToolExecutor):
         new_value = "\n".join(new_value_lines)
         "\n".join(snippet_lines)
 
+        if self.memory_write_buffer is not None:
+            agent_state.memory.update_block_value(label=label, value=new_value)
+            self.memory_write_buffer.record(agent_state, label)
+            return new_value
+
         # Write into the block
         await self.block_manager.update_block_async(block_id=memory_block.id, block_update=BlockUpdate(value=new_value), actor=actor)
 
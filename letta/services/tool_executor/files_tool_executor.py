@@ -2,8 +2,6 @@ import asyncio
 import re
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.exc import NoResultFound
-
 from letta.constants import PINECONE_TEXT_FIELD_NAME
 from letta.functions.types import FileOpenRequest
 from letta.helpers.pinecone_utils import search_pinecone_index, should_use_pinecone
@@ -20,7 +18,7 @@ from letta.schemas.user import User
 from letta.services.agent_manager import AgentManager
 from letta.services.block_manager import BlockManager
 from letta.services.file_manager import FileManager
-from letta.services.file_processor.chunker.line_chunker import LineChunker
+from letta.services.file_processor.line_index import file_line_indexes, get_grep_executor, grep_file
 from letta.services.files_agents_manager import FileAgentManager
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
@@ -43,6 +41,7 @@ class LettaFileToolExecutor(ToolExecutor):
     GREP_TIMEOUT_SECONDS = 30  # Max time for grep_files operation
     MAX_CONTEXT_LINES = 1  # Lines of context around matches
     MAX_TOTAL_COLLECTED = 1000  # Reasonable upper limit to prevent memory issues
+    GREP_LOAD_BATCH_SIZE = 25  # Attached files loaded per query by grep_files
 
     def __init__(
         self,
@@ -184,9 +183,8 @@ class LettaFileToolExecutor(ToolExecutor):
             file_id = file_agent.file_id
             file = await self.file_manager.get_file_by_id(file_id=file_id, actor=self.actor, include_content=True)
 
-            # Process file content
-            content_lines = LineChunker().chunk_text(file_metadata=file, start=start, end=end, validate_range=True)
-            visible_content = "\n".join(content_lines)
+            # Validate the range against the file's line index; the view itself is rendered from it when memory is compiled
+            file_line_indexes.get(file).check_range(file_name, start, end)
 
             # Handle LRU eviction and file opening
             closed_files, _was_already_open, previous_ranges = await self.files_agents_manager.enforce_max_open_files_and_open(
@@ -195,7 +193,7 @@ class LettaFileToolExecutor(ToolExecutor):
                 file_name=file_name,
                 source_id=file.source_id,
                 actor=self.actor,
-                visible_content=visible_content,
+                visible_content=None,
                 max_files_open=agent_state.max_files_open,
                 start_line=start + 1 if start is not None else None,  # convert to 1-indexed for user display
                 end_line=end if end is not None else None,  # end is already exclusive, shows as 1-indexed inclusive
@@ -263,50 +261,6 @@ class LettaFileToolExecutor(ToolExecutor):
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
 
-    def _get_context_lines(
-        self,
-        formatted_lines: List[str],
-        match_line_num: int,
-        context_lines: int,
-    ) -> List[str]:
-        """Get context lines around a match from already-chunked lines.
-
-        Args:
-            formatted_lines: Already chunked lines from LineChunker (format: "line_num: content")
-            match_line_num: The 1-based line number of the match
-            context_lines: Number of context lines before and after
-        """
-        if not formatted_lines or context_lines < 0:
-            return []
-
-        # Find the index of the matching line in the formatted_lines list
-        match_formatted_idx = None
-        for i, line in enumerate(formatted_lines):
-            if line and ":" in line:
-                try:
-                    line_num = int(line.split(":", 1)[0].strip())
-                    if line_num == match_line_num:
-                        match_formatted_idx = i
-                        break
-                except ValueError:
-                    continue
-
-        if match_formatted_idx is None:
-            return []
-
-        # Calculate context range with bounds checking
-        start_idx = max(0, match_formatted_idx - context_lines)
-        end_idx = min(len(formatted_lines), match_formatted_idx + context_lines + 1)
-
-        # Extract context lines and add match indicator
-        context_lines_with_indicator = []
-        for i in range(start_idx, end_idx):
-            line = formatted_lines[i]
-            prefix = ">" if i == match_formatted_idx else " "
-            context_lines_with_indicator.append(f"{prefix} {line}")
-
-        return context_lines_with_indicator
-
     @trace_method
     async def grep_files(
         self,
@@ -389,68 +343,72 @@ class LettaFileToolExecutor(ToolExecutor):
         async def _search_files():
             nonlocal all_matches, total_content_size, files_processed, files_skipped, files_with_matches
 
-            for file_agent in file_agents:
-                # Load file content
-                try:
-                    file = await self.file_manager.get_file_by_id(file_id=file_agent.file_id, actor=self.actor, include_content=True)
-                except NoResultFound:
-                    files_skipped += 1
-                    self.logger.warning(f"Grep: Skipping file {file_agent.file_name} - no content available")
-                    continue
-
-                # Check individual file size
-                content_size = len(file.content.encode("utf-8"))
-                if content_size > self.MAX_FILE_SIZE_BYTES:
-                    files_skipped += 1
-                    self.logger.warning(
-                        f"Grep: Skipping file {file.file_name} - too large ({content_size:,} bytes > {self.MAX_FILE_SIZE_BYTES:,} limit)"
-                    )
-                    continue
-
-                # Check total content size across all files
-                total_content_size += content_size
-                if total_content_size > self.MAX_TOTAL_CONTENT_SIZE:
-                    files_skipped += 1
-                    self.logger.warning(
-                        f"Grep: Skipping file {file.file_name} - total content size limit exceeded ({total_content_size:,} bytes > {self.MAX_TOTAL_CONTENT_SIZE:,} limit)"
-                    )
-                    break
-
-                files_processed += 1
-
-                # Use LineChunker to get all lines with proper formatting
-                chunker = LineChunker()
-                formatted_lines = chunker.chunk_text(file_metadata=file)
-
-                # Remove metadata header
-                if formatted_lines and formatted_lines[0].startswith("[Viewing"):
-                    formatted_lines = formatted_lines[1:]
-
-                # Search for matches in formatted lines
-                for formatted_line in formatted_lines:
-                    if len(all_matches) >= self.MAX_TOTAL_COLLECTED:
-                        # Stop collecting if we hit the upper limit
+            loop = asyncio.get_running_loop()
+            executor = get_grep_executor()
+            for batch_start in range(0, len(file_agents), self.GREP_LOAD_BATCH_SIZE):
+                batch = file_agents[batch_start : batch_start + self.GREP_LOAD_BATCH_SIZE]
+                loaded = await self.file_manager.get_files_by_ids_async(
+                    file_ids=[fa.file_id for fa in batch], actor=self.actor, include_content=True
+                )
+                files_by_id = {file.id: file for file in loaded}
+
+                # Apply the size limits in attachment order
+                files = []
+                stop = False
+                for file_agent in batch:
+                    file = files_by_id.get(file_agent.file_id)
+                    if file is None or file.content is None:
+                        files_skipped += 1
+                        self.logger.warning(f"Grep: Skipping file {file_agent.file_name} - no content available")
+                        continue
+
+                    # Check individual file size
+                    content_size = len(file.content.encode("utf-8"))
+                    if content_size > self.MAX_FILE_SIZE_BYTES:
+                        files_skipped += 1
+                        self.logger.warning(
+                            f"Grep: Skipping file {file.file_name} - too large ({content_size:,} bytes > {self.MAX_FILE_SIZE_BYTES:,} limit)"
+                        )
+                        continue
+
+                    # Check total content size across all files
+                    total_content_size += content_size
+                    if total_content_size > self.MAX_TOTAL_CONTENT_SIZE:
+                        files_skipped += 1
+                        self.logger.warning(
+                            f"Grep: Skipping file {file.file_name} - total content size limit exceeded ({total_content_size:,} bytes > {self.MAX_TOTAL_CONTENT_SIZE:,} limit)"
+                        )
+                        stop = True
                         break
 
-                    # Extract line number and content from formatted line
-                    if ":" in formatted_line:
-                        try:
-                            line_parts = formatted_line.split(":", 1)
-                            line_num = int(line_parts[0].strip())
-                            line_content = line_parts[1].strip() if len(line_parts) > 1 else ""
-                        except (ValueError, IndexError):
-                            continue
-
-                        if pattern_regex.search(line_content):
-                            # Mark this file as having matches for LRU tracking
-                            files_with_matches.add(file.file_name)
-                            context = self._get_context_lines(formatted_lines, match_line_num=line_num, context_lines=context_lines or 0)
+                    files_processed += 1
+                    files.append(file)
+
+                # Search the batch; no file can contribute more than what is left of the collection limit, and
+                # results are kept in file order so the first MAX_TOTAL_COLLECTED match a sequential search
+                limit = self.MAX_TOTAL_COLLECTED - len(all_matches)
+                if executor is None:
+                    results = []
+                    for file in files:
+                        file_matches = grep_file(file, pattern_regex, limit, context_lines or 0)
+                        results.append(file_matches)
+                        limit -= len(file_matches)
+                        if limit <= 0:
+                            break
+                else:
+                    results = await asyncio.gather(
+                        *(loop.run_in_executor(executor, grep_file, file, pattern_regex, limit, context_lines or 0) for file in files)
+                    )
 
-                            # Store match data for later pagination
-                            all_matches.append((file.file_name, line_num, context))
+                for file, file_matches in zip(files, results):
+                    for line_num, context in file_matches[: self.MAX_TOTAL_COLLECTED - len(all_matches)]:
+                        # Mark this file as having matches for LRU tracking
+                        files_with_matches.add(file.file_name)
+                        # Store match data for later pagination
+                        all_matches.append((file.file_name, line_num, context))
 
                 # Break if we've collected enough matches
-                if len(all_matches) >= self.MAX_TOTAL_COLLECTED:
+                if stop or len(all_matches) >= self.MAX_TOTAL_COLLECTED:
                     break
 
         # Execute with timeout
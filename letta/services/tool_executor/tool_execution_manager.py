@@ -17,6 +17,7 @@ from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.user import User
 from letta.services.agent_manager import AgentManager
 from letta.services.block_manager import BlockManager
+from letta.services.memory_write_buffer import MemoryWriteBuffer
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
 from letta.services.run_manager import RunManager
@@ -79,6 +80,7 @@ class ToolExecutionManager:
         agent_state: Optional[AgentState] = None,
         sandbox_config: Optional[SandboxConfig] = None,
         sandbox_env_vars: Optional[Dict[str, Any]] = None,
+        memory_write_buffer: Optional[MemoryWriteBuffer] = None,
     ):
         self.message_manager = message_manager
         self.agent_manager = agent_manager
@@ -90,6 +92,7 @@ class ToolExecutionManager:
         self.actor = actor
         self.sandbox_config = sandbox_config
         self.sandbox_env_vars = sandbox_env_vars
+        self.memory_write_buffer = memory_write_buffer
 
     @trace_method
     async def execute_tool_async(
@@ -109,6 +112,12 @@ class ToolExecutionManager:
                 passage_manager=self.passage_manager,
                 actor=self.actor,
             )
+            if self.memory_write_buffer is not None:
+                if isinstance(executor, LettaCoreToolExecutor):
+                    executor.memory_write_buffer = self.memory_write_buffer
+                elif isinstance(executor, SandboxToolExecutor):
+                    # sandboxed tools can read the agent's blocks back through the API
+                    await self.memory_write_buffer.flush()
 
             def _metrics_callback(exec_time_ms: int, exc):
                 return MetricRegistry().tool_execution_time_ms_histogram.record(
@@ -22,11 +22,15 @@ from letta.services.helpers.tool_execution_helper import (
 )
 from letta.services.helpers.tool_parser_helper import parse_stdout_best_effort
 from letta.services.tool_sandbox.base import AsyncToolSandboxBase
+from letta.services.tool_sandbox.local_worker_pool import WorkerCrashedError, get_local_sandbox_worker_pool
 from letta.settings import tool_settings
 from letta.utils import get_friendly_error_msg, parse_stderr_error_msg, safe_create_task
 
 logger = get_logger(__name__)
 
+# (python executable, requirements hash) pairs already pip-installed by this process
+_installed_requirements: set[tuple[str, str]] = set()
+
 
 class AsyncToolSandboxLocal(AsyncToolSandboxBase):
     METADATA_CONFIG_STATE_KEY = "config_state"
@@ -87,9 +91,12 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
 
         # If using a virtual environment, ensure it's prepared in parallel
         venv_preparation_task = None
+        requirements_hash = self._requirements_hash(local_configs)
         if use_venv:
             venv_path = str(os.path.join(sandbox_dir, local_configs.venv_name))
-            venv_preparation_task = safe_create_task(self._prepare_venv(local_configs, venv_path, env), label="prepare_venv")
+            venv_preparation_task = safe_create_task(
+                self._prepare_venv(local_configs, venv_path, env, requirements_hash), label="prepare_venv"
+            )
 
         # Generate and write execution script (always with markers, since we rely on stdout)
         code = await self.generate_execution_script(agent_state=agent_state, wrap_print_with_markers=True)
@@ -135,6 +142,22 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
                 }
             )
 
+            worker_pool = get_local_sandbox_worker_pool()
+            if worker_pool is not None:
+                try:
+                    return await self._execute_tool_in_worker(
+                        worker_pool,
+                        sbx_config=sbx_config,
+                        python_executable=python_executable,
+                        code=code,
+                        temp_file_path=temp_file_path,
+                        env=exec_env,
+                        cwd=sandbox_dir,
+                        requirements_hash=requirements_hash,
+                    )
+                except WorkerCrashedError as e:
+                    logger.warning(f"{e}; running {self.tool_name} in a subprocess")
+
             # Execute in subprocess
             return await self._execute_tool_subprocess(
                 sbx_config=sbx_config,
@@ -155,11 +178,22 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             if not settings.debug:
                 await asyncio.to_thread(os.remove, temp_file_path)
 
-    async def _prepare_venv(self, local_configs, venv_path: str, env: Dict[str, str]):
+    def _requirements_hash(self, local_configs) -> str:
+        """Stable hash of the sandbox-level and tool-level pip requirements."""
+        sandbox_packages = sorted(
+            f"{req.name}=={req.version}" if req.version else req.name for req in (local_configs.pip_requirements or [])
+        )
+        tool_packages = sorted(str(req) for req in ((self.tool.pip_requirements if self.tool else None) or []))
+        return hashlib.sha256("\n".join([*sandbox_packages, "", *tool_packages]).encode("utf-8")).hexdigest()[:16]
+
+    async def _prepare_venv(self, local_configs, venv_path: str, env: Dict[str, str], requirements_hash: str):
         """
         Prepare virtual environment asynchronously (in a background thread).
+        Requirements are installed once per venv and requirements set, not on every call.
         """
+        python_executable = os.path.join(venv_path, "bin", "python3")
         if self.force_recreate_venv or not await asyncio.to_thread(os.path.isdir, venv_path):
+            _installed_requirements.difference_update({entry for entry in _installed_requirements if entry[0] == python_executable})
             sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)
             log_event(name="start create_venv_for_local_sandbox", attributes={"venv_path": venv_path})
             await asyncio.to_thread(
@@ -171,12 +205,57 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             )
             log_event(name="finish create_venv_for_local_sandbox")
 
-        if local_configs.pip_requirements or (self.tool and self.tool.pip_requirements):
+            self._discard_workers(python_executable)
+
+        if (local_configs.pip_requirements or (self.tool and self.tool.pip_requirements)) and (
+            python_executable,
+            requirements_hash,
+        ) not in _installed_requirements:
             log_event(name="start install_pip_requirements_for_sandbox", attributes={"local_configs": local_configs.model_dump_json()})
             await asyncio.to_thread(
                 install_pip_requirements_for_sandbox, local_configs, upgrade=True, user_install_if_no_venv=False, env=env, tool=self.tool
             )
             log_event(name="finish install_pip_requirements_for_sandbox", attributes={"local_configs": local_configs.model_dump_json()})
+            _installed_requirements.add((python_executable, requirements_hash))
+            # Workers for other requirement sets already imported the packages that were just upgraded
+            self._discard_workers(python_executable)
+
+    @staticmethod
+    def _discard_workers(python_executable: str) -> None:
+        worker_pool = get_local_sandbox_worker_pool()
+        if worker_pool is not None:
+            worker_pool.discard(python_executable)
+
+    async def _execute_tool_in_worker(
+        self,
+        worker_pool,
+        sbx_config,
+        python_executable: str,
+        code: str,
+        temp_file_path: str,
+        env: Dict[str, str],
+        cwd: str,
+        requirements_hash: str,
+    ) -> ToolExecutionResult:
+        """
+        Execute the generated script in a warm worker process. The worker hands back the same
+        return code and stdout/stderr a fresh subprocess would have produced.
+        """
+        log_event(name="start sandbox worker")
+        try:
+            result = await worker_pool.run(
+                python_executable=python_executable,
+                code=code,
+                filename=temp_file_path,
+                env=env,
+                cwd=cwd,
+                requirements_hash=requirements_hash,
+                timeout=tool_settings.tool_sandbox_timeout,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Executing tool {self.tool_name} timed out after {tool_settings.tool_sandbox_timeout} seconds.")
+        log_event(name="finish sandbox worker")
+        return self._build_execution_result(sbx_config, result.returncode, result.stdout, result.stderr)
 
     async def _execute_tool_subprocess(
         self, sbx_config, python_executable: str, temp_file_path: str, env: Dict[str, str], cwd: str
@@ -206,29 +285,8 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
 
                 raise TimeoutError(f"Executing tool {self.tool_name} timed out after {tool_settings.tool_sandbox_timeout} seconds.")
 
-            stderr = stderr_bytes.decode("utf-8") if stderr_bytes else ""
             log_event(name="finish subprocess")
-
-            # Parse markers to isolate the function result
-            func_result_bytes, stdout_text = self.parse_out_function_results_markers(stdout_bytes)
-            func_return, agent_state = parse_stdout_best_effort(func_result_bytes)
-
-            if process.returncode != 0 and func_return is None:
-                exception_name, msg = parse_stderr_error_msg(stderr)
-                func_return = get_friendly_error_msg(
-                    function_name=self.tool_name,
-                    exception_name=exception_name,
-                    exception_message=msg,
-                )
-
-            return ToolExecutionResult(
-                func_return=func_return,
-                agent_state=agent_state,
-                stdout=[stdout_text] if stdout_text else [],
-                stderr=[stderr] if stderr else [],
-                status="success" if process.returncode == 0 else "error",
-                sandbox_config_fingerprint=sbx_config.fingerprint(),
-            )
+            return self._build_execution_result(sbx_config, process.returncode, stdout_bytes, stderr_bytes)
 
         except (TimeoutError, Exception) as e:
             # Distinguish between timeouts and other exceptions for clarity
@@ -250,6 +308,30 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
                 sandbox_config_fingerprint=sbx_config.fingerprint(),
             )
 
+    def _build_execution_result(self, sbx_config, returncode: int, stdout_bytes: bytes, stderr_bytes: bytes) -> ToolExecutionResult:
+        stderr = stderr_bytes.decode("utf-8") if stderr_bytes else ""
+
+        # Parse markers to isolate the function result
+        func_result_bytes, stdout_text = self.parse_out_function_results_markers(stdout_bytes)
+        func_return, agent_state = parse_stdout_best_effort(func_result_bytes)
+
+        if returncode != 0 and func_return is None:
+            exception_name, msg = parse_stderr_error_msg(stderr)
+            func_return = get_friendly_error_msg(
+                function_name=self.tool_name,
+                exception_name=exception_name,
+                exception_message=msg,
+            )
+
+        return ToolExecutionResult(
+            func_return=func_return,
+            agent_state=agent_state,
+            stdout=[stdout_text] if stdout_text else [],
+            stderr=[stderr] if stderr else [],
+            status="success" if returncode == 0 else "error",
+            sandbox_config_fingerprint=sbx_config.fingerprint(),
+        )
+
     def parse_out_function_results_markers(self, data: bytes) -> tuple[bytes, str]:
         """
         Parse the function results out of the stdout using special markers.
@@ -0,0 +1,146 @@
+"""Long-lived worker process for the local tool sandbox.
+
+Started by ``LocalSandboxWorkerPool`` as ``python local_sandbox_worker.py`` with the sandbox's interpreter (which
+may be a venv without letta installed), so this file must only use the standard library.
+
+The worker pre-imports the modules every generated tool script needs, then serves requests read from stdin.
+Each request is a length-prefixed JSON object ``{"code", "filename", "env", "cwd"}``. The worker never runs tool
+code itself: it forks a child per request, which runs ``code`` as ``__main__`` with ``env`` as its environment and
+``cwd`` as its working directory, with fd 1/2 pointed at capture files exactly like a fresh ``python script.py``.
+The child inherits the warm imports but anything it changes (``builtins``, ``sys.modules``, module globals, the
+environment) dies with it, so one call can never observe or tamper with another. The child closes every descriptor
+above 2, so it has no handle on the request or reply pipes. The reply, written by the worker once the child has
+exited, is a length-prefixed JSON object ``{"returncode", "stdout", "stderr"}`` (outputs base64-encoded).
+"""
+
+import base64
+import builtins
+import importlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import traceback
+
+PRELOAD_MODULES = (
+    "typing",
+    "pickle",
+    "json",
+    "base64",
+    "struct",
+    "hashlib",
+    "asyncio",
+    "pydantic",
+    "packaging.version",
+    "letta_client",
+    "letta",
+    "letta.functions.ast_parsers",
+)
+
+_HEADER = struct.Struct(">I")
+
+
+def _preload() -> None:
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError
+        data += chunk
+    return data
+
+
+def _run(request: dict) -> int:
+    """Run the request's script in this (forked) process and return its exit code."""
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+    sys.argv = [request["filename"]]
+    sys.path[0] = os.path.dirname(request["filename"])
+
+    namespace = {"__name__": "__main__", "__file__": request["filename"], "__builtins__": builtins}
+    try:
+        exec(compile(request["code"], request["filename"], "exec"), namespace)
+        returncode = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            returncode = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return returncode
+
+
+def _fork_and_run(request: dict, stdout_fd: int, stderr_fd: int) -> int:
+    """Run the request in a child process and return its exit status as ``subprocess`` reports it."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        returncode = 1
+        try:
+            os.dup2(stdout_fd, 1)
+            os.dup2(stderr_fd, 2)
+            # drop every other descriptor the worker holds, the request and reply pipes included
+            os.closerange(3, os.sysconf("SC_OPEN_MAX"))
+            returncode = _run(request)
+        finally:
+            os._exit(returncode)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+def main() -> None:
+    # Keep private handles on the request and reply pipes, and point fds 0-2 away from them,
+    # so a forked tool can reach neither
+    requests = os.fdopen(os.dup(0), "rb")
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    sys.stdin = open(os.devnull)
+
+    _preload()
+    replies.write(_HEADER.pack(0))
+    replies.flush()
+
+    while True:
+        try:
+            (size,) = _HEADER.unpack(_read_exact(requests, _HEADER.size))
+            request = json.loads(_read_exact(requests, size))
+        except EOFError:
+            return
+
+        with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+            returncode = _fork_and_run(request, stdout_file.fileno(), stderr_file.fileno())
+            del request
+            stdout_file.seek(0)
+            stderr_file.seek(0)
+            reply = {
+                "returncode": returncode,
+                "stdout": base64.b64encode(stdout_file.read()).decode("ascii"),
+                "stderr": base64.b64encode(stderr_file.read()).decode("ascii"),
+            }
+
+        payload = json.dumps(reply).encode("utf-8")
+        replies.write(_HEADER.pack(len(payload)) + payload)
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Warm worker processes for the local tool sandbox.
+
+Spawning ``python script.py`` per tool call pays interpreter start-up plus ``import letta`` (several seconds)
+on every call. Instead, ``LocalSandboxWorkerPool`` keeps pre-started workers (``local_sandbox_worker.py``) that
+have already imported what generated tool scripts use, keyed by interpreter, working directory and installed
+requirements. A call borrows an idle worker, sends it the rendered script over its stdin pipe, and gets back
+the return code and captured stdout/stderr, so the result is parsed exactly as for a fresh subprocess. The worker
+runs every call in a freshly forked child, so workers can be shared across agents and organizations without one
+call seeing another's environment or leftover state.
+
+Workers are recycled after ``tool_exec_worker_max_calls`` calls, after a timeout or crash, and after sitting
+idle for ``tool_exec_worker_idle_seconds``. Pools are kept per event loop, since asyncio subprocess pipes are
+bound to the loop that created them.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import signal
+import struct
+import sys
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from letta.log import get_logger
+from letta.otel.tracing import log_event
+from letta.settings import tool_settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_sandbox_worker.py")
+
+# Interpreter start-up reads these, so they are fixed per worker; everything else is applied per call
+_STARTUP_ENV_VARS = ("PATH", "VIRTUAL_ENV", "PYTHONPATH", "PYTHONHOME", "PYTHONWARNINGS", "NO_COLOR", "TERM", "PYTHONUNBUFFERED")
+
+_HEADER = struct.Struct(">I")
+
+# Pipe buffer limit for replies; a tool's captured stdout comes back in a single message
+_STREAM_LIMIT = 64 * 1024 * 1024
+
+WorkerKey = Tuple[str, str, str, Optional[str]]
+
+
+@dataclass
+class SandboxRunResult:
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+
+
+class WorkerCrashedError(Exception):
+    """No worker could be started, or the worker process failed before replying."""
+
+
+class _SandboxWorker:
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.calls = 0
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def start(cls, python_executable: str, env: Dict[str, str], cwd: str, timeout: float) -> "_SandboxWorker":
+        process = await asyncio.create_subprocess_exec(
+            python_executable,
+            WORKER_SCRIPT,
+            env=env,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=_STREAM_LIMIT,
+            # own process group, so killing the worker also kills the child running the current call
+            start_new_session=True,
+        )
+        worker = cls(process)
+        try:
+            # The worker writes an empty frame once its imports are done
+            await asyncio.wait_for(worker._read_frame(), timeout=timeout)
+        except BaseException:
+            await worker.stop()
+            raise
+        return worker
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def _read_frame(self) -> bytes:
+        try:
+            (size,) = _HEADER.unpack(await self.process.stdout.readexactly(_HEADER.size))
+            return await self.process.stdout.readexactly(size)
+        except asyncio.IncompleteReadError:
+            raise WorkerCrashedError()
+
+    async def run(self, code: str, filename: str, env: Dict[str, str], cwd: str) -> SandboxRunResult:
+        self.calls += 1
+        payload = json.dumps({"code": code, "filename": filename, "env": env, "cwd": cwd}).encode("utf-8")
+        try:
+            self.process.stdin.write(_HEADER.pack(len(payload)) + payload)
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise WorkerCrashedError()
+        reply = json.loads(await self._read_frame())
+        self.last_used = time.monotonic()
+        return SandboxRunResult(
+            returncode=reply["returncode"],
+            stdout=base64.b64decode(reply["stdout"]),
+            stderr=base64.b64decode(reply["stderr"]),
+        )
+
+    def kill(self) -> None:
+        if self.alive:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    async def stop(self) -> None:
+        """Kill the worker and wait for it, so its pipes are closed while the event loop is still running."""
+        self.kill()
+        await self.process.wait()
+
+
+class LocalSandboxWorkerPool:
+    def __init__(self, size: int, max_calls: int, idle_seconds: float):
+        self.size = size
+        self.max_calls = max_calls
+        self.idle_seconds = idle_seconds
+        self._idle: Dict[WorkerKey, List[_SandboxWorker]] = defaultdict(list)
+        self._starting: Dict[WorkerKey, int] = defaultdict(int)
+        # Every worker this pool started and has not reaped yet, idle or busy
+        self._workers: Set[_SandboxWorker] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def worker_key(python_executable: str, cwd: str, requirements_hash: str, env: Dict[str, str]) -> WorkerKey:
+        return (python_executable, cwd, requirements_hash, env.get("PYTHONPATH"))
+
+    async def run(
+        self,
+        python_executable: str,
+        code: str,
+        filename: str,
+        env: Dict[str, str],
+        cwd: str,
+        requirements_hash: str,
+        timeout: float,
+    ) -> SandboxRunResult:
+        """Run ``code`` in a warm worker and return what ``python filename`` would have produced.
+
+        Raises ``asyncio.TimeoutError`` (after killing the worker) if the call does not finish within ``timeout``,
+        and ``WorkerCrashedError`` if no worker could be started or the worker failed, in which case the caller
+        should run the script in a subprocess instead.
+        """
+        key = self.worker_key(python_executable, cwd, requirements_hash, env)
+        startup_env = {name: env[name] for name in _STARTUP_ENV_VARS if name in env}
+
+        worker = self._take_idle(key)
+        log_event(name="sandbox_worker_acquired", attributes={"warm": worker is not None})
+        if worker is None:
+            worker = await self._start_worker(python_executable, startup_env, cwd, timeout)
+        self._replenish(key, python_executable, startup_env, cwd, timeout)
+
+        try:
+            result = await asyncio.wait_for(worker.run(code, filename, env, cwd), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError, WorkerCrashedError):
+            self._retire(worker)
+            raise
+        except Exception as e:
+            self._retire(worker)
+            raise WorkerCrashedError(f"Sandbox worker failed: {e!r}") from e
+
+        self._release(key, worker)
+        return result
+
+    def discard(self, python_executable: str) -> None:
+        """Stop idle workers for an interpreter whose environment changed (venv recreated, packages installed)."""
+        for key in list(self._idle):
+            if key[0] == python_executable:
+                for worker in self._idle.pop(key):
+                    self._retire(worker)
+
+    async def aclose(self) -> None:
+        """Stop every worker, including busy ones and ones still starting."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._idle.clear()
+        workers, self._workers = list(self._workers), set()
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+
+    async def _start_worker(self, python_executable: str, startup_env: Dict[str, str], cwd: str, timeout: float) -> _SandboxWorker:
+        try:
+            worker = await _SandboxWorker.start(python_executable, startup_env, cwd, timeout=timeout)
+        except WorkerCrashedError:
+            raise
+        except Exception as e:
+            # including a start-up timeout, which is not the tool's timeout
+            raise WorkerCrashedError(f"Could not start a sandbox worker for {python_executable}: {e!r}") from e
+        self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker: _SandboxWorker) -> None:
+        worker.kill()
+        self._spawn_task(self._reap(worker), label="reap_sandbox_worker")
+
+    async def _reap(self, worker: _SandboxWorker) -> None:
+        await worker.process.wait()
+        self._workers.discard(worker)
+
+    def _spawn_task(self, coro, label: str) -> None:
+        task = safe_create_task(coro, label=label)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _take_idle(self, key: WorkerKey) -> Optional[_SandboxWorker]:
+        self._evict_idle()
+        workers = self._idle.get(key)
+        while workers:
+            worker = workers.pop()
+            if worker.alive:
+                return worker
+        return None
+
+    def _release(self, key: WorkerKey, worker: _SandboxWorker) -> None:
+        if worker.alive and worker.calls < self.max_calls and len(self._idle[key]) < self.size:
+            self._idle[key].append(worker)
+        else:
+            self._retire(worker)
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key in list(self._idle):
+            workers = self._idle[key]
+            keep = [w for w in workers if w.alive and now - w.last_used < self.idle_seconds]
+            for worker in workers:
+                if worker not in keep:
+                    self._retire(worker)
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+
+    def _replenish(self, key: WorkerKey, python_executable: str, startup_env: Dict[str, str], cwd: str, timeout: float) -> None:
+        # The worker serving the current call usually comes back to the pool too
+        missing = self.size - len(self._idle.get(key, ())) - self._starting[key] - 1
+        for _ in range(missing):
+            self._starting[key] += 1
+            self._spawn_task(self._start_idle(key, python_executable, startup_env, cwd, timeout), label="start_sandbox_worker")
+
+    async def _start_idle(self, key: WorkerKey, python_executable: str, startup_env: Dict[str, str], cwd: str, timeout: float) -> None:
+        try:
+            worker = await self._start_worker(python_executable, startup_env, cwd, timeout)
+        except Exception as e:
+            logger.warning(f"Failed to start local sandbox worker for {python_executable}: {e}")
+            return
+        finally:
+            self._starting[key] -= 1
+        self._release(key, worker)
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LocalSandboxWorkerPool]" = weakref.WeakKeyDictionary()
+
+
+def get_local_sandbox_worker_pool() -> Optional[LocalSandboxWorkerPool]:
+    """Worker pool for the running event loop, or None when pooling is disabled (or on Windows)."""
+    if not tool_settings.tool_exec_worker_pool_enabled or sys.platform.startswith("win"):
+        return None
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = LocalSandboxWorkerPool(
+            size=tool_settings.tool_exec_worker_pool_size,
+            max_calls=tool_settings.tool_exec_worker_max_calls,
+            idle_seconds=tool_settings.tool_exec_worker_idle_seconds,
+        )
+    return pool
+
+
+async def reset_local_sandbox_worker_pools() -> None:
+    """Stop the running loop's pooled workers and forget every pool (used by tests)."""
+    pool = _pools.get(asyncio.get_running_loop())
+    if pool is not None:
+        await pool.aclose()
+    _pools.clear()
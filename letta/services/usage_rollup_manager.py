@@ -0,0 +1,183 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from letta.orm.step import Step as StepModel
+from letta.orm.usage_rollup import AgentUsageRollup, OrganizationUsageRollup, RunUsageRollup
+from letta.otel.tracing import trace_method
+from letta.schemas.enums import PrimitiveType, UsageRollupGranularity
+from letta.schemas.usage import LettaUsageStatistics
+from letta.schemas.usage_rollup import UsageRollupBucket
+from letta.schemas.user import User as PydanticUser
+from letta.server.db import db_registry
+from letta.utils import enforce_types
+from letta.validators import raise_on_invalid_id
+
+# token counters carried by a step; the rollups additionally count the steps themselves
+STEP_USAGE_COUNTERS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cached_input_tokens",
+    "cache_write_tokens",
+    "reasoning_tokens",
+)
+USAGE_ROLLUP_COUNTERS = ("step_count", *STEP_USAGE_COUNTERS)
+
+
+def step_usage_counters(step: StepModel) -> Dict[str, int]:
+    """The usage a step currently contributes to the rollups (unreported counts as 0)."""
+    return {counter: getattr(step, counter) or 0 for counter in STEP_USAGE_COUNTERS}
+
+
+def as_utc(timestamp: datetime) -> datetime:
+    """``timestamp`` in UTC; naive timestamps are taken to be UTC already."""
+    return timestamp.replace(tzinfo=timezone.utc) if timestamp.tzinfo is None else timestamp.astimezone(timezone.utc)
+
+
+def bucket_start(timestamp: datetime, granularity: UsageRollupGranularity) -> datetime:
+    """Start of the UTC hour or day containing ``timestamp``."""
+    timestamp = as_utc(timestamp).replace(minute=0, second=0, microsecond=0)
+    if granularity == UsageRollupGranularity.DAY:
+        timestamp = timestamp.replace(hour=0)
+    return timestamp
+
+
+class UsageRollupManager:
+    """Maintains and reads the run, agent and organization usage rollups.
+
+    The rollups are updated with atomic ``INSERT ... ON CONFLICT DO UPDATE`` increments in the same transaction that
+    logs a step or records its final usage, so they always agree with the committed steps and reading usage never
+    has to scan ``steps``. Usage is bucketed by the step's creation time. Deleting steps does not subtract from the
+    agent and organization rollups: they record usage that was billed, not the steps that still exist.
+    """
+
+    def _increment_statements(self, dialect_name: str, step: StepModel, counters: Dict[str, int]) -> list:
+        insert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        created_at = step.created_at or datetime.now(timezone.utc)
+        targets = []
+        if step.run_id:
+            targets.append((RunUsageRollup, {"run_id": step.run_id, "organization_id": step.organization_id, "agent_id": step.agent_id}))
+        if step.agent_id:
+            for granularity in UsageRollupGranularity:
+                targets.append(
+                    (
+                        AgentUsageRollup,
+                        {
+                            "agent_id": step.agent_id,
+                            "granularity": granularity.value,
+                            "bucket_start": bucket_start(created_at, granularity),
+                            "organization_id": step.organization_id,
+                        },
+                    )
+                )
+        targets.append(
+            (
+                OrganizationUsageRollup,
+                {"organization_id": step.organization_id, "bucket_start": bucket_start(created_at, UsageRollupGranularity.DAY)},
+            )
+        )
+
+        statements = []
+        for model, key in targets:
+            table = model.__table__
+            stmt = insert(table).values(**key, **counters)
+            # add the increments to the existing row; always in the same order (run, agent, organization) to avoid deadlocks
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[column.name for column in table.primary_key.columns],
+                set_={
+                    **{counter: table.c[counter] + stmt.excluded[counter] for counter in counters},
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+            statements.append(stmt)
+        return statements
+
+    @trace_method
+    async def record_step_usage_async(self, session: AsyncSession, step: StepModel, counters: Dict[str, int]) -> None:
+        """Add ``counters`` (increments of ``USAGE_ROLLUP_COUNTERS``) for ``step`` to its rollups, within ``session``."""
+        counters = {counter: value for counter, value in counters.items() if value}
+        if not counters or not step.organization_id:
+            return
+        for stmt in self._increment_statements(session.bind.dialect.name, step, counters):
+            await session.execute(stmt)
+
+    @enforce_types
+    @raise_on_invalid_id(param_name="run_id", expected_prefix=PrimitiveType.RUN)
+    @trace_method
+    async def get_run_usage_async(self, run_id: str, actor: PydanticUser) -> LettaUsageStatistics:
+        """Usage of a run, summed over all of its steps. Cache and reasoning counts are None if no step reported them."""
+        async with db_registry.async_session() as session:
+            rollup = await session.scalar(
+                select(RunUsageRollup).where(RunUsageRollup.run_id == run_id, RunUsageRollup.organization_id == actor.organization_id)
+            )
+        if rollup is None:
+            return LettaUsageStatistics()
+        return LettaUsageStatistics(
+            prompt_tokens=rollup.prompt_tokens,
+            completion_tokens=rollup.completion_tokens,
+            total_tokens=rollup.total_tokens,
+            step_count=rollup.step_count,
+            cached_input_tokens=rollup.cached_input_tokens or None,
+            cache_write_tokens=rollup.cache_write_tokens or None,
+            reasoning_tokens=rollup.reasoning_tokens or None,
+        )
+
+    @enforce_types
+    @raise_on_invalid_id(param_name="agent_id", expected_prefix=PrimitiveType.AGENT)
+    @trace_method
+    async def list_agent_usage_async(
+        self,
+        agent_id: str,
+        actor: PydanticUser,
+        granularity: UsageRollupGranularity = UsageRollupGranularity.DAY,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[UsageRollupBucket]:
+        """Hourly or daily usage of an agent, oldest first.
+
+        Returns the buckets from the one containing ``start_date`` up to (excluding) ``end_date``; buckets without
+        any steps are omitted.
+        """
+        query = select(AgentUsageRollup).where(
+            AgentUsageRollup.agent_id == agent_id,
+            AgentUsageRollup.organization_id == actor.organization_id,
+            AgentUsageRollup.granularity == granularity.value,
+        )
+        if start_date:
+            query = query.where(AgentUsageRollup.bucket_start >= bucket_start(start_date, granularity))
+        if end_date:
+            query = query.where(AgentUsageRollup.bucket_start < as_utc(end_date))
+        async with db_registry.async_session() as session:
+            rollups = (await session.scalars(query.order_by(AgentUsageRollup.bucket_start))).all()
+            return [self._to_bucket(rollup, granularity) for rollup in rollups]
+
+    @enforce_types
+    @trace_method
+    async def list_organization_usage_async(
+        self,
+        actor: PydanticUser,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[UsageRollupBucket]:
+        """Daily usage of the actor's organization, oldest first, with the same range semantics as ``list_agent_usage_async``."""
+        query = select(OrganizationUsageRollup).where(OrganizationUsageRollup.organization_id == actor.organization_id)
+        if start_date:
+            query = query.where(OrganizationUsageRollup.bucket_start >= bucket_start(start_date, UsageRollupGranularity.DAY))
+        if end_date:
+            query = query.where(OrganizationUsageRollup.bucket_start < as_utc(end_date))
+        async with db_registry.async_session() as session:
+            rollups = (await session.scalars(query.order_by(OrganizationUsageRollup.bucket_start))).all()
+            return [self._to_bucket(rollup, UsageRollupGranularity.DAY) for rollup in rollups]
+
+    @staticmethod
+    def _to_bucket(rollup, granularity: UsageRollupGranularity) -> UsageRollupBucket:
+        return UsageRollupBucket(
+            bucket_start=bucket_start(rollup.bucket_start, granularity),
+            granularity=granularity,
+            **{counter: getattr(rollup, counter) for counter in USAGE_ROLLUP_COUNTERS},
+        )
@@ -1,7 +1,7 @@
 import os
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -36,12 +36,39 @@ class ToolSettings(BaseSettings):
     tool_sandbox_timeout: float = 180
     tool_exec_venv_name: Optional[str] = None
     tool_exec_autoreload_venv: bool = True
+    tool_exec_worker_pool_enabled: bool = Field(
+        default=False,
+        description="Run local sandbox tools in pre-started worker processes (each call in a fresh fork) instead of a fresh python subprocess per call.",
+    )
+    tool_exec_worker_pool_size: int = Field(default=2, description="Warm local sandbox workers kept per interpreter/requirements set.")
+    tool_exec_worker_max_calls: int = Field(default=50, description="Tool calls a local sandbox worker serves before it is recycled.")
+    tool_exec_worker_idle_seconds: float = Field(default=600, description="Idle local sandbox workers are stopped after this many seconds.")
+
+    # File tool settings
+    grep_line_index_max_chars: int = Field(
+        default=50_000_000, ge=0, description="Total characters of file line indexes kept in memory for grep_files (0 disables caching)."
+    )
+    grep_match_threads: int = Field(
+        default=0,
+        ge=0,
+        description="Worker threads grep_files matches attached files on. 0 matches on the event loop; regex matching holds the GIL, so threads mainly keep large searches from stalling other requests.",
+    )
 
     # MCP settings
     mcp_connect_to_server_timeout: float = 30.0
     mcp_list_tools_timeout: float = 30.0
     mcp_execute_tool_timeout: float = 60.0
     mcp_read_from_config: bool = False  # if False, will throw if attempting to read/write from file
+    mcp_session_pool_enabled: bool = Field(
+        default=True, description="Keep MCP client sessions connected between tool calls instead of connecting per call."
+    )
+    mcp_session_pool_max_size: int = Field(default=128, description="Maximum number of pooled MCP sessions per process.")
+    mcp_session_idle_seconds: float = Field(default=300.0, description="Pooled MCP sessions idle for this long are closed.")
+    mcp_session_max_concurrency: int = Field(default=8, description="Maximum concurrent tool calls sent over one pooled MCP session.")
+    mcp_session_health_check_seconds: float = Field(
+        default=30.0, description="Ping a pooled MCP session before reuse if it has been idle for this long."
+    )
+    mcp_list_tools_cache_seconds: float = Field(default=300.0, description="How long a pooled MCP session's list_tools result is reused.")
     mcp_disable_stdio: bool = Field(
         default=True,
         description=(
@@ -293,6 +320,12 @@ class Settings(BaseSettings):
     # SSE Streaming cancellation settings
     enable_cancellation_aware_streaming: bool = Field(True, description="Enable cancellation aware streaming")
 
+    # SSE Streaming Redis read settings
+    enable_sse_stream_hub: bool = Field(
+        True, description="Read resumable SSE streams through one shared blocking XREAD per process instead of per-client XRANGE polling"
+    )
+    sse_stream_hub_block_ms: int = Field(100, ge=1, description="Milliseconds each shared XREAD blocks waiting for new chunks")
+
     # default handles
     default_llm_handle: Optional[str] = None
     default_embedding_handle: Optional[str] = None
@@ -445,6 +478,84 @@ class Settings(BaseSettings):
     embed_all_messages: bool = False
     embed_tools: bool = False
 
+    # Self-hosted hybrid search (Postgres full-text search + pgvector, fused with RRF) when Turbopuffer is not used
+    use_local_hybrid_search: bool = Field(
+        default=False,
+        description="Rank archival and message search with Postgres full-text search (fused with pgvector for passages) instead of substring matching",
+    )
+
+    # Content-addressed embedding cache (in-process LRU, plus Redis when configured)
+    embedding_cache_enabled: bool = Field(default=True, description="Reuse embeddings for identical (model, dim, text) inputs")
+    embedding_cache_max_entries: int = Field(default=10000, ge=0, description="Max embeddings kept in the in-process LRU tier")
+    embedding_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, ge=1, description="TTL for embeddings stored in the Redis tier")
+
+    # In-process AgentState cache, validated against per-agent version stamps in Redis (disabled without Redis)
+    agent_state_cache_enabled: bool = Field(default=True, description="Serve get_agent_by_id from a version-checked in-process cache")
+    agent_state_cache_max_entries: int = Field(default=1000, ge=0, description="Max cached AgentState objects per process")
+    agent_state_cache_ttl_seconds: float = Field(default=300.0, gt=0, description="Upper bound on how long a cached AgentState is served")
+
+    # Pooled provider SDK clients (shared keep-alive HTTP connections across requests)
+    llm_client_pool_enabled: bool = Field(default=True, description="Reuse provider SDK clients and HTTP connection pools across requests")
+    llm_client_pool_max_size: int = Field(default=256, ge=1, description="Max pooled SDK clients (and shared HTTP clients) per event loop")
+    llm_client_pool_idle_seconds: float = Field(default=900.0, gt=0, description="Drop pooled clients unused for this many seconds")
+
+    # System prompt rebuilds after a shared block changes (larger fan-outs are deferred and coalesced)
+    system_prompt_rebuild_inline_max_agents: int = Field(
+        default=16, ge=0, description="Rebuild inline when a block is attached to at most this many agents, otherwise defer"
+    )
+    system_prompt_rebuild_delay_seconds: float = Field(
+        default=2.0, ge=0, description="How long deferred rebuilds wait so repeated edits to a block coalesce"
+    )
+    system_prompt_rebuild_batch_size: int = Field(default=200, ge=1, description="Agents loaded per deferred rebuild batch")
+    system_prompt_rebuild_max_concurrency: int = Field(default=8, ge=1, description="Concurrent system message writes per batch")
+
+    # Sleeptime agent runs (queued in the runs table, executed with bounded concurrency)
+    sleeptime_executor_max_concurrency: int = Field(default=4, ge=1, description="Max sleeptime runs executing at once per process")
+    sleeptime_executor_max_concurrency_per_org: int = Field(
+        default=2, ge=1, description="Max sleeptime runs executing at once per organization per process"
+    )
+    sleeptime_executor_foreground_yield_threshold: int = Field(
+        default=4, ge=0, description="Hold back queued sleeptime runs while more foreground runs than this are in flight"
+    )
+    sleeptime_executor_max_yield_seconds: float = Field(
+        default=30.0, ge=0, description="Longest a queued sleeptime run waits for foreground load to drop before starting anyway"
+    )
+    sleeptime_executor_external: bool = Field(
+        default=False, description="Only enqueue sleeptime runs on web workers and leave execution to `letta sleeptime-worker` processes"
+    )
+    sleeptime_executor_poll_interval_seconds: float = Field(
+        default=2.0, gt=0, description="How often `letta sleeptime-worker` polls for queued sleeptime runs"
+    )
+    sleeptime_executor_recovery_window_hours: float = Field(
+        default=24.0, gt=0, description="Queued sleeptime runs older than this are not resumed after a restart"
+    )
+    sleeptime_executor_lease_seconds: float = Field(
+        default=60.0, gt=0, description="A running sleeptime run whose worker has not renewed its lease for this long is reclaimed"
+    )
+
+    # Runtime argument type checks by @enforce_types on manager methods
+    enforce_types_mode: Literal["strict", "sampled", "off"] = Field(
+        default="strict",
+        description="Check argument types on every call ('strict'), one in enforce_types_sample_every ('sampled'), or never ('off')",
+    )
+    enforce_types_sample_every: int = Field(default=100, ge=1, description="Check one in this many calls per function when sampled")
+
+    # Per-message provider dict memoization (letta.helpers.message_dict_cache)
+    message_dict_cache_max_entries: int = Field(
+        default=20000, ge=0, description="Converted messages kept across agent steps; 0 converts every message on every step"
+    )
+
+    # Core memory edits made by tools during an agent step (letta.services.memory_write_buffer)
+    memory_write_buffer_enabled: bool = Field(
+        default=True, description="Apply memory tool edits in memory and write them, with one system prompt rebuild, at the step checkpoint"
+    )
+
+    # OpenAI Responses API requests of a run chained with previous_response_id (letta.llm_api.openai_responses_chain)
+    openai_responses_stateful: bool = Field(
+        default=False,
+        description="Chain the OpenAI Responses API requests of a streaming run and send only the new input items per step",
+    )
+
     # For encryption
     encryption_key: Optional[str] = None
 
@@ -581,10 +692,42 @@ class TelemetrySettings(BaseSettings):
         default=None,
         description="Source identifier for telemetry (memgpt-server, lettuce-py, etc.).",
     )
+    # @trace_method parameter capture (only on spans the sampler records)
+    trace_parameter_capture: Literal["ids", "capped", "full"] = Field(
+        default="capped",
+        description=(
+            "How traced functions record their parameters: 'ids' (ids only), 'capped' (each cut to trace_parameter_max_chars) "
+            "or 'full' (up to 2MB each). Under 'capped' the LLM request payload (the request_data attribute) is truncated too; "
+            "use 'full', or a trace_parameter_capture_overrides entry for the function, to record it whole."
+        ),
+    )
+    trace_parameter_capture_overrides: str = Field(
+        default="",
+        description="Per-function capture policies (comma-separated qualname=policy). Example: 'LettaAgentV3.step=full,AgentManager.get_agent_by_id_async=ids'.",
+    )
+    trace_parameter_max_chars: int = Field(default=1024, ge=64, description="Per-parameter size limit for the 'ids' and 'capped' policies.")
     provider_trace_pg_metadata_only: bool = Field(
         default=False,
         description="Write only metadata to Postgres (no request/response JSON). Requires provider_trace_metadata table to exist.",
     )
+    provider_trace_pg_deduplicate: bool = Field(
+        default=False,
+        description=(
+            "Store request messages, tools and system prompts once per organization in provider_trace_blobs, with "
+            "provider_traces.request_json holding a manifest. Traces are written in batches by a background writer. "
+            "Deleting traces does not delete their blobs; a retention job should call delete_unreferenced_blobs afterwards."
+        ),
+    )
+    provider_trace_writer_queue_size: int = Field(
+        default=1000, ge=1, description="Traces the background writer buffers before callers wait."
+    )
+    provider_trace_writer_batch_size: int = Field(default=50, ge=1, description="Traces inserted per batch by the background writer.")
+    provider_trace_writer_flush_interval_seconds: float = Field(
+        default=0.5, ge=0, description="How long the background writer waits to fill a batch."
+    )
+    provider_trace_writer_enqueue_timeout_seconds: float = Field(
+        default=0.05, ge=0, description="How long a caller waits for room in a full writer queue before the trace is dropped."
+    )
 
     @property
     def provider_trace_backends(self) -> list[str]:
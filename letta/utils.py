@@ -4,6 +4,7 @@ import difflib
 import hashlib
 import inspect
 import io
+import itertools
 import os
 import pickle
 import platform
@@ -41,6 +42,7 @@ from letta.log import get_logger
 from letta.otel.tracing import log_attributes, trace_method
 from letta.schemas.openai.chat_completion_response import ChatCompletionResponse
 from letta.server.rest_api.dependencies import HeaderParams
+from letta.settings import settings
 
 logger = get_logger(__name__)
 
@@ -530,56 +532,77 @@ def is_optional_type(hint):
     return False
 
 
+def _compile_type_check(hint) -> Callable[[Any], bool]:
+    """Build a checker for ``hint`` once, with the matching rules ``enforce_types`` has always applied."""
+    origin = get_origin(hint)
+    args = get_args(hint)
+
+    if origin is Union or (hasattr(hint, "__class__") and hint.__class__.__name__ == "UnionType"):  # Union, Optional, X | Y
+        if all(isinstance(arg, type) for arg in args):
+            return lambda value: isinstance(value, args)
+        checks = [_compile_type_check(arg) for arg in args]
+        return lambda value: any(check(value) for check in checks)
+    elif origin is list:  # Handle List[T]
+        element_type = args[0] if args else None
+        if element_type:
+            return lambda value: isinstance(value, list) and all(isinstance(v, element_type) for v in value)
+        return lambda value: isinstance(value, list)
+    elif origin is not None and (str(origin).endswith("Literal") or getattr(origin, "_name", None) == "Literal"):  # Handle Literal types
+        return lambda value: value in args
+    elif origin:  # Handle other generics like Dict, Tuple, etc.
+        return lambda value: isinstance(value, origin)
+    else:  # Handle non-generic types
+        return lambda value: isinstance(value, hint)
+
+
+def _build_type_check_plan(func) -> tuple[list, dict]:
+    # Get type hints, excluding the return type hint
+    hints = {k: v for k, v in get_type_hints(func).items() if k != "return"}
+
+    # Get the function's argument names; positional arguments skip 'self'
+    arg_names = inspect.getfullargspec(func).args
+    positional = [
+        (index, name, hints[name], _compile_type_check(hints[name])) for index, name in enumerate(arg_names) if index and name in hints
+    ]
+    keyword = {name: (hint, _compile_type_check(hint)) for name, hint in hints.items()}
+    return positional, keyword
+
+
 def enforce_types(func):
     """Enforces that values passed in match the expected types.
         Technically will handle coroutines as well.
 
+    Type hints are resolved into a per-function plan on the first checked call. ``settings.enforce_types_mode``
+    selects whether every call is checked (strict), one in ``enforce_types_sample_every`` (sampled) or none (off).
+
     TODO (cliandy): use stricter pydantic fields
     """
+    plan = None
+    calls = itertools.count()
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        # Get type hints, excluding the return type hint
-        hints = {k: v for k, v in get_type_hints(func).items() if k != "return"}
-
-        # Get the function's argument names
-        arg_names = inspect.getfullargspec(func).args
-
-        # Pair each argument with its corresponding type hint
-        args_with_hints = dict(zip(arg_names[1:], args[1:], strict=False))  # Skipping 'self'
-
-        # Function to check if a value matches a given type hint
-        def matches_type(value, hint):
-            origin = get_origin(hint)
-            args = get_args(hint)
-
-            if origin is Union:  # Handle Union types (including Optional)
-                return any(matches_type(value, arg) for arg in args)
-            elif hasattr(hint, "__class__") and hint.__class__.__name__ == "UnionType":  # Handle Python 3.10+ X | Y syntax
-                return any(matches_type(value, arg) for arg in args)
-            elif origin is list and isinstance(value, list):  # Handle List[T]
-                element_type = args[0] if args else None
-                return all(isinstance(v, element_type) for v in value) if element_type else True
-            elif origin is not None and (
-                str(origin).endswith("Literal") or getattr(origin, "_name", None) == "Literal"
-            ):  # Handle Literal types
-                return value in args
-            elif origin:  # Handle other generics like Dict, Tuple, etc.
-                return isinstance(value, origin)
-            else:  # Handle non-generic types
-                return isinstance(value, hint)
+        nonlocal plan
+        mode = settings.enforce_types_mode
+        if mode == "off" or (mode == "sampled" and next(calls) % settings.enforce_types_sample_every):
+            return func(*args, **kwargs)
+        if plan is None:
+            plan = _build_type_check_plan(func)
+        positional, keyword = plan
 
         # Check types of arguments
-        for arg_name, arg_value in args_with_hints.items():
-            hint = hints.get(arg_name)
-            if hint and not matches_type(arg_value, hint):
+        for index, arg_name, hint, check in positional:
+            if index >= len(args):
+                break
+            arg_value = args[index]
+            if not check(arg_value):
                 raise ValueError(f"Argument {arg_name} does not match type {hint}; is {arg_value}")
 
         # Check types of keyword arguments
         for arg_name, arg_value in kwargs.items():
-            hint = hints.get(arg_name)
-            if hint and not matches_type(arg_value, hint):
-                raise ValueError(f"Argument {arg_name} does not match type {hint}; is {arg_value} of type {type(arg_value)}")
+            entry = keyword.get(arg_name)
+            if entry is not None and not entry[1](arg_value):
+                raise ValueError(f"Argument {arg_name} does not match type {entry[0]}; is {arg_value} of type {type(arg_value)}")
 
         return func(*args, **kwargs)
 
@@ -1,3 +1,4 @@
+import inspect
 import logging
 import os
 import threading
@@ -11,8 +12,17 @@ from anthropic.types.beta.messages import BetaMessageBatch, BetaMessageBatchRequ
 from dotenv import load_dotenv
 from letta_client import Letta
 
+from letta.helpers.embedding_cache import reset_embedding_cache
+from letta.helpers.message_dict_cache import reset_message_dict_cache
+from letta.llm_api.client_pool import reset_client_pools
 from letta.server.db import db_registry
+from letta.services.mcp.session_pool import reset_mcp_session_pools
 from letta.services.organization_manager import OrganizationManager
+from letta.services.provider_trace_backends.postgres_writer import reset_provider_trace_writers
+from letta.services.run_cancellation_bus import reset_run_cancellation_buses
+from letta.services.sleeptime_executor import reset_sleeptime_executors
+from letta.services.system_prompt_rebuild_scheduler import reset_system_prompt_rebuild_schedulers
+from letta.services.tool_sandbox.local_worker_pool import reset_local_sandbox_worker_pools
 from letta.services.user_manager import UserManager
 
 
@@ -66,6 +76,36 @@ def client(server_url: str) -> Letta:
     yield client_instance
 
 
+# Process-wide caches, pools and background workers that one test could leak into the next (or leave bound to its
+# closed event loop), in the order they are reset. Each hook is sync or async and must be safe to call when idle.
+RESET_HOOKS = (
+    reset_provider_trace_writers,  # flushes queued traces, so before anything they might need goes away
+    reset_sleeptime_executors,
+    reset_system_prompt_rebuild_schedulers,
+    reset_run_cancellation_buses,
+    reset_mcp_session_pools,
+    reset_local_sandbox_worker_pools,
+    reset_client_pools,
+    reset_message_dict_cache,
+    reset_embedding_cache,
+)
+
+
+async def _reset_process_state():
+    for reset in RESET_HOOKS:
+        result = reset()
+        if inspect.isawaitable(result):
+            await result
+
+
+@pytest.fixture(autouse=True)
+async def isolate_process_state():
+    """Start every test from empty caches and pools, and stop what it started before its event loop closes."""
+    await _reset_process_state()
+    yield
+    await _reset_process_state()
+
+
 @pytest.fixture(autouse=True)
 async def cleanup_db_connections():
     """Cleanup database connections after each test."""
@@ -0,0 +1,117 @@
+import pytest
+
+from letta.schemas.agent import UpdateAgent
+from letta.schemas.block import BlockUpdate
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.message import Message as PydanticMessage
+from letta.server.server import SyncServer
+from letta.services import agent_state_cache
+from letta.services.agent_state_cache import AgentStateCache, agent_state_cache_key
+
+
+class _FakeRedis:
+    """The two calls the cache makes: MGET for stamps and pipelined INCR to bump them."""
+
+    def __init__(self):
+        self.values = {}
+        self.mget_calls = 0
+
+    async def mget(self, *keys):
+        self.mget_calls += 1
+        return [self.values.get(key) for key in keys]
+
+    async def incr_many(self, *keys, ex=None):
+        for key in keys:
+            self.values[key] = str(int(self.values.get(key) or 0) + 1)
+        return [int(self.values[key]) for key in keys]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = AgentStateCache(_FakeRedis(), max_entries=100, ttl_seconds=300)
+    monkeypatch.setattr(agent_state_cache, "_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def db_loads(server: SyncServer, monkeypatch):
+    calls = []
+    original = server.agent_manager._get_agent_by_id_uncached_async
+
+    async def counting(*args, **kwargs):
+        calls.append(args[0])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(server.agent_manager, "_get_agent_by_id_uncached_async", counting)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_cache_hands_out_copies_and_rejects_old_versions(server: SyncServer, sarah_agent, default_user, cache):
+    key = agent_state_cache_key(sarah_agent.id, default_user.organization_id, None, [])
+    cache.put(key, (0, 0), sarah_agent)
+
+    hit = cache.get(key, (0, 0))
+    assert hit == sarah_agent
+    hit.message_ids.append("message-mutated-by-caller")
+    assert cache.get(key, (0, 0)).message_ids == sarah_agent.message_ids
+
+    assert cache.get(key, (1, 0)) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_reads_are_served_from_cache_until_the_agent_is_updated(server: SyncServer, sarah_agent, default_user, cache, db_loads):
+    first = await server.agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    second = await server.agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert first == second
+    assert db_loads == [sarah_agent.id]
+
+    # a different relationship set is a different entry
+    await server.agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user, include_relationships=["memory"])
+    assert len(db_loads) == 2
+
+    await server.agent_manager.update_agent_async(sarah_agent.id, UpdateAgent(description="updated"), actor=default_user)
+    updated = await server.agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert updated.description == "updated"
+    assert len(db_loads) == 3
+
+
+@pytest.mark.asyncio
+async def test_writes_to_shared_and_association_rows_invalidate(
+    server: SyncServer, sarah_agent, charles_agent, default_user, default_block, print_tool, cache, db_loads
+):
+    agent_manager = server.agent_manager
+    await agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    await agent_manager.attach_block_async(sarah_agent.id, default_block.id, actor=default_user)
+    agent = await agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert [b.id for b in agent.blocks] == [default_block.id]
+
+    # shared block: resolved to the agents it is attached to
+    await server.block_manager.update_block_async(default_block.id, BlockUpdate(value="new value"), actor=default_user)
+    agent = await agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert agent.blocks[0].value == "new value"
+
+    await agent_manager.get_agent_by_id_async(charles_agent.id, actor=default_user)
+    loads_before = len(db_loads)
+
+    # association row inserted with a Core INSERT
+    await agent_manager.attach_tool_async(sarah_agent.id, print_tool.id, actor=default_user)
+    agent = await agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert print_tool.id in [t.id for t in agent.tools]
+
+    # bulk UPDATE of agents.message_ids from the step checkpoint
+    message = PydanticMessage(agent_id=sarah_agent.id, role="user", content=[TextContent(text="hi")])
+    await server.message_manager.checkpoint_step_messages_async(
+        new_messages=[message],
+        in_context_message_ids=[*agent.message_ids, message.id],
+        agent_id=sarah_agent.id,
+        actor=default_user,
+    )
+    agent = await agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert agent.message_ids[-1] == message.id
+
+    # writes keyed by agent id leave other agents cached
+    assert len(db_loads) == loads_before + 2
+    await agent_manager.get_agent_by_id_async(charles_agent.id, actor=default_user)
+    assert len(db_loads) == loads_before + 2
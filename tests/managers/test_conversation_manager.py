@@ -5,11 +5,12 @@ Tests for ConversationManager.
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import select
 
 from letta.orm.errors import NoResultFound
 from letta.schemas.conversation import CreateConversation, UpdateConversation
 from letta.server.server import SyncServer
-from letta.services.conversation_manager import ConversationManager
+from letta.services.conversation_manager import ConversationManager, plan_in_context_positions
 
 # ======================================================================================================================
 # ConversationManager Tests
@@ -1831,3 +1832,74 @@ async def test_fork_conversation_messages_appear_in_list(conversation_manager, s
     assert "system_message" in message_types
     assert "user_message" in message_types
     assert "assistant_message" in message_types
+
+
+def test_plan_in_context_positions_moves_as_few_rows_as_possible():
+    """Appends and evictions keep existing positions; inserted rows go into the gaps."""
+    current = {"system": 0, "m1": 1, "m2": 2, "m3": 3, "m4": 4, "summary": 5}
+
+    # append + evict: nothing moves
+    assert plan_in_context_positions(["system", "m3", "m4", "summary"], current) == {"system": 0, "m3": 3, "m4": 4, "summary": 5}
+
+    # summary inserted after the system message lands in the gap left by evicted messages
+    assert plan_in_context_positions(["system", "summary", "m3", "m4"], current) == {"system": 0, "summary": 1, "m3": 3, "m4": 4}
+
+    # no gap: the rows in the way are moved too, and the order always follows the list
+    planned = plan_in_context_positions(["summary", "system", "m1", "m2", "missing"], current)
+    assert "missing" not in planned
+    assert sorted(planned, key=planned.get) == ["summary", "system", "m1", "m2"]
+    assert len(set(planned.values())) == 4
+
+
+async def _conversation_with_messages(conversation_manager, server: SyncServer, agent, actor, count: int):
+    from letta.schemas.letta_message_content import TextContent
+    from letta.schemas.message import Message as PydanticMessage
+
+    conversation = await conversation_manager.create_conversation(
+        agent_id=agent.id,
+        conversation_create=CreateConversation(summary="Long"),
+        actor=actor,
+    )
+    messages = await server.message_manager.create_many_messages_async(
+        [PydanticMessage(agent_id=agent.id, role="user", content=[TextContent(text=f"Message {i}")]) for i in range(count)],
+        actor=actor,
+    )
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=conversation.id,
+        agent_id=agent.id,
+        message_ids=[m.id for m in messages],
+        actor=actor,
+    )
+    system_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation.id, actor=actor)
+    return conversation, system_ids[:1], [m.id for m in messages]
+
+
+@pytest.mark.asyncio
+async def test_update_in_context_messages_only_writes_changed_rows(conversation_manager, server: SyncServer, sarah_agent, default_user):
+    """A summary inserted ahead of kept messages is ordered correctly without renumbering the kept ones."""
+    from letta.orm.conversation_messages import ConversationMessage as ConversationMessageModel
+    from letta.server.db import db_registry
+
+    conversation, system_ids, message_ids = await _conversation_with_messages(conversation_manager, server, sarah_agent, default_user, 6)
+    summary_id = message_ids[-1]
+    kept = message_ids[3:5]
+
+    await conversation_manager.update_in_context_messages(
+        conversation_id=conversation.id,
+        in_context_message_ids=[*system_ids, summary_id, *kept],
+        actor=default_user,
+    )
+
+    in_context_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation.id, actor=default_user)
+    assert in_context_ids == [*system_ids, summary_id, *kept]
+
+    async with db_registry.async_session() as session:
+        result = await session.execute(
+            select(ConversationMessageModel.message_id, ConversationMessageModel.position).where(
+                ConversationMessageModel.conversation_id == conversation.id
+            )
+        )
+        positions = dict(result.all())
+    # kept messages were not renumbered; the summary took the first free slot after the system message
+    assert [positions[m] for m in kept] == [4, 5]
+    assert positions[summary_id] == 1
@@ -9,6 +9,7 @@ from conftest import (
     USING_SQLITE,
 )
 
+from letta.schemas.agent import UpdateAgent
 from letta.schemas.file import FileMetadata as PydanticFileMetadata
 
 # ======================================================================================================================
@@ -1175,3 +1176,167 @@ async def test_attach_files_bulk_oversized_bulk(server, default_user, sarah_agen
         sarah_agent.id, per_file_view_window_char_limit=sarah_agent.per_file_view_window_char_limit, actor=default_user
     )
     assert len(all_files_after) == max_files_open + 3
+
+
+# ======================================================================================================================
+# grep_files Tests
+# ======================================================================================================================
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("grep_match_threads", [0, 2])
+async def test_grep_files_searches_attached_files_in_order(
+    server, default_user, sarah_agent, default_source, grep_match_threads, monkeypatch
+):
+    from letta.services.tool_executor.files_tool_executor import LettaFileToolExecutor
+    from letta.settings import tool_settings
+
+    monkeypatch.setattr(tool_settings, "grep_match_threads", grep_match_threads)
+    files = []
+    for i in range(3):
+        file = await server.file_manager.create_file(
+            file_metadata=PydanticFileMetadata(
+                file_name=f"grep_{i}.py", organization_id=default_user.organization_id, source_id=default_source.id
+            ),
+            actor=default_user,
+            text="\n".join([f"def handler_{i}():", "    return 'needle'", "", "# needle again"]),
+        )
+        await server.file_agent_manager.attach_file(
+            agent_id=sarah_agent.id,
+            file_id=file.id,
+            file_name=file.file_name,
+            source_id=file.source_id,
+            actor=default_user,
+            max_files_open=sarah_agent.max_files_open,
+        )
+        files.append(file)
+
+    executor = LettaFileToolExecutor(
+        message_manager=server.message_manager,
+        agent_manager=server.agent_manager,
+        block_manager=server.block_manager,
+        run_manager=server.run_manager,
+        passage_manager=server.passage_manager,
+        actor=default_user,
+    )
+    result = await executor.grep_files(agent_state=sarah_agent, pattern="needle")
+    assert "Found 6 total matches across 3 files" in result
+    attached = await server.file_agent_manager.list_files_for_agent(
+        sarah_agent.id, per_file_view_window_char_limit=sarah_agent.per_file_view_window_char_limit, actor=default_user
+    )
+    headers = [line for line in result.splitlines() if line.startswith("=== ")]
+    assert headers == [f"=== {fa.file_name}:{n} ===" for fa in attached for n in (2, 3)]
+    assert "> 2:     return 'needle'" in result
+
+    # changing a file's content drops its line index
+    await server.file_manager.upsert_file_content(file_id=files[0].id, text="no match here", actor=default_user)
+    result = await executor.grep_files(agent_state=sarah_agent, pattern="needle")
+    assert "Found 4 total matches across 2 files" in result
+
+
+# ======================================================================================================================
+# Shared file view tests
+# ======================================================================================================================
+
+
+def _file_tool_executor(server, actor):
+    from letta.services.tool_executor.files_tool_executor import LettaFileToolExecutor
+
+    return LettaFileToolExecutor(
+        message_manager=server.message_manager,
+        agent_manager=server.agent_manager,
+        block_manager=server.block_manager,
+        run_manager=server.run_manager,
+        passage_manager=server.passage_manager,
+        actor=actor,
+    )
+
+
+async def _file_block_value(server, agent_id, file_name, actor) -> str:
+    agent_state = await server.agent_manager.get_agent_by_id_async(agent_id=agent_id, actor=actor)
+    return next(block.value for block in agent_state.memory.file_blocks if block.label == file_name)
+
+
+@pytest.mark.asyncio
+async def test_insert_file_into_context_windows_shares_one_view(server, default_user, default_source, sarah_agent, charles_agent):
+    from sqlalchemy import select
+
+    from letta.functions.types import FileOpenRequest
+    from letta.orm.files_agents import FileAgent as FileAgentModel
+    from letta.server.db import db_registry
+    from letta.services.file_processor.chunker.line_chunker import LineChunker
+    from letta.services.file_processor.line_index import file_line_indexes
+
+    for agent in (sarah_agent, charles_agent):
+        await server.agent_manager.attach_source_async(agent_id=agent.id, source_id=default_source.id, actor=default_user)
+    file = await server.file_manager.create_file(
+        file_metadata=PydanticFileMetadata(
+            file_name="shared.py", organization_id=default_user.organization_id, source_id=default_source.id
+        ),
+        actor=default_user,
+        text="\n".join(f"line_{i} = {i}" for i in range(20)),
+    )
+    file = await server.file_manager.get_file_by_id(file.id, actor=default_user, include_content=True)
+
+    await server.agent_manager.insert_file_into_context_windows(
+        source_id=default_source.id, file_metadata_with_content=file, actor=default_user
+    )
+
+    # the rows only reference the file; the view is rendered when read
+    async with db_registry.async_session() as session:
+        rows = (await session.execute(select(FileAgentModel).where(FileAgentModel.file_id == file.id))).scalars().all()
+    assert {row.agent_id for row in rows} == {sarah_agent.id, charles_agent.id}
+    assert all(row.shared_view and row.is_open and row.visible_content is None for row in rows)
+
+    expected = "\n".join(LineChunker().chunk_text(file_metadata=file))
+    for agent in (sarah_agent, charles_agent):
+        assert await _file_block_value(server, agent.id, file.file_name, default_user) == expected
+    file_agent = await server.file_agent_manager.get_file_agent_by_id(agent_id=sarah_agent.id, file_id=file.id, actor=default_user)
+    assert file_agent.visible_content == expected
+
+    # an agent's range only changes its own view
+    await _file_tool_executor(server, default_user).open_files(
+        agent_state=sarah_agent, file_requests=[FileOpenRequest(file_name=file.file_name, offset=5, length=2)]
+    )
+    assert await _file_block_value(server, sarah_agent.id, file.file_name, default_user) == "\n".join(
+        LineChunker().chunk_text(file_metadata=file, start=5, end=7)
+    )
+    assert await _file_block_value(server, charles_agent.id, file.file_name, default_user) == expected
+
+    # views follow content changes, including ones another process made (stale index, new version)
+    file = await server.file_manager.upsert_file_content(file_id=file.id, text="rewritten = True", actor=default_user)
+    file_line_indexes.clear()
+    assert await _file_block_value(server, charles_agent.id, file.file_name, default_user) == "\n".join(
+        LineChunker().chunk_text(file_metadata=file)
+    )
+
+
+@pytest.mark.asyncio
+async def test_insert_file_into_context_windows_closes_least_recently_used(
+    server, default_user, default_source, sarah_agent, charles_agent
+):
+    for agent in (sarah_agent, charles_agent):
+        await server.agent_manager.update_agent_async(agent.id, UpdateAgent(max_files_open=2), actor=default_user)
+        await server.agent_manager.attach_source_async(agent_id=agent.id, source_id=default_source.id, actor=default_user)
+
+    files = []
+    for i in range(3):
+        file = await server.file_manager.create_file(
+            file_metadata=PydanticFileMetadata(
+                file_name=f"lru_{i}.txt", organization_id=default_user.organization_id, source_id=default_source.id
+            ),
+            actor=default_user,
+            text=f"file {i}",
+        )
+        files.append(await server.file_manager.get_file_by_id(file.id, actor=default_user, include_content=True))
+        await server.agent_manager.insert_file_into_context_windows(
+            source_id=default_source.id, file_metadata_with_content=files[-1], actor=default_user
+        )
+        if USING_SQLITE:
+            time.sleep(CREATE_DELAY_SQLITE)
+
+    for agent in (sarah_agent, charles_agent):
+        file_agents = await server.file_agent_manager.list_files_for_agent(
+            agent.id, per_file_view_window_char_limit=1000, actor=default_user
+        )
+        assert {fa.file_name: fa.is_open for fa in file_agents} == {"lru_0.txt": False, "lru_1.txt": True, "lru_2.txt": True}
@@ -0,0 +1,107 @@
+import pytest
+
+from letta.schemas.agent import AgentType
+from letta.services.agent_manager import AgentManager
+from letta.services.memory_write_buffer import MemoryWriteBuffer, open_memory_write_buffer
+from letta.services.tool_executor.core_tool_executor import LettaCoreToolExecutor
+from letta.settings import settings
+
+
+def _executor(server, actor, memory_write_buffer=None) -> LettaCoreToolExecutor:
+    executor = LettaCoreToolExecutor(
+        message_manager=server.message_manager,
+        agent_manager=server.agent_manager,
+        block_manager=server.block_manager,
+        run_manager=server.run_manager,
+        passage_manager=server.passage_manager,
+        actor=actor,
+    )
+    executor.memory_write_buffer = memory_write_buffer
+    return executor
+
+
+async def _edit_three_times(executor: LettaCoreToolExecutor, agent_state, actor) -> None:
+    await executor.memory_replace(agent_state, actor, label="human", old_string="Charles", new_string="Charles Darwin")
+    await executor.memory_insert(agent_state, actor, label="human", new_string="Likes finches.")
+    await executor.core_memory_append(agent_state, actor, label="persona", content="I take notes.")
+
+
+async def _system_prompt(server, agent_id, actor) -> str:
+    agent_state = await server.agent_manager.get_agent_by_id_async(agent_id=agent_id, actor=actor)
+    system_message = await server.message_manager.get_message_by_id_async(message_id=agent_state.message_ids[0], actor=actor)
+    return system_message.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_buffered_edits_are_written_once_at_flush(server, default_user, charles_agent, monkeypatch):
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("memory tools should not write immediately while a buffer is open")
+
+    monkeypatch.setattr(AgentManager, "update_memory_if_changed_async", unexpected)
+    buffer = MemoryWriteBuffer(server.agent_manager, default_user)
+    await _edit_three_times(_executor(server, default_user, buffer), charles_agent, default_user)
+
+    # nothing is written before the checkpoint
+    human = charles_agent.memory.get_block("human")
+    assert (await server.block_manager.get_block_by_id_async(human.id, actor=default_user)).value == "Charles"
+    assert buffer.pending
+
+    assert await buffer.flush() is True
+    assert not buffer.pending and buffer.edits_coalesced == 2
+
+    blocks = await server.block_manager.get_blocks_by_agent_async(charles_agent.id, actor=default_user)
+    values = {block.label: block.value for block in blocks}
+    assert values["human"] == "Charles Darwin\nLikes finches."
+    assert values["persona"] == "I am a helpful assistant\nI take notes."
+    system_prompt = await _system_prompt(server, charles_agent.id, default_user)
+    assert "Likes finches." in system_prompt and "I take notes." in system_prompt
+
+    # a flush with nothing pending is free
+    assert await buffer.flush() is False
+
+
+@pytest.mark.asyncio
+async def test_flush_rebuilds_agents_sharing_an_edited_block(server, default_user, charles_agent, sarah_agent):
+    human = charles_agent.memory.get_block("human")
+    await server.agent_manager.attach_block_async(agent_id=sarah_agent.id, block_id=human.id, actor=default_user)
+
+    buffer = MemoryWriteBuffer(server.agent_manager, default_user)
+    await _executor(server, default_user, buffer).core_memory_append(charles_agent, default_user, label="human", content="Shared edit.")
+    await buffer.flush()
+
+    assert "Shared edit." in await _system_prompt(server, sarah_agent.id, default_user)
+
+
+@pytest.mark.asyncio
+async def test_buffered_edits_produce_the_same_prompt_as_immediate_writes(server, default_user, charles_agent):
+    unbuffered_agent = await server.agent_manager.get_agent_by_id_async(agent_id=charles_agent.id, actor=default_user)
+    await _edit_three_times(_executor(server, default_user), unbuffered_agent, default_user)
+    expected = await _system_prompt(server, charles_agent.id, default_user)
+
+    # undo the edits, then make them again through a buffer
+    for label, value in (("human", "Charles"), ("persona", "I am a helpful assistant")):
+        unbuffered_agent.memory.update_block_value(label=label, value=value)
+    await server.agent_manager.update_memory_if_changed_async(
+        agent_id=charles_agent.id, new_memory=unbuffered_agent.memory, actor=default_user
+    )
+    buffered_agent = await server.agent_manager.get_agent_by_id_async(agent_id=charles_agent.id, actor=default_user)
+    buffer = MemoryWriteBuffer(server.agent_manager, default_user)
+    await _edit_three_times(_executor(server, default_user, buffer), buffered_agent, default_user)
+    await buffer.flush()
+
+    # identical memory section (only the last-edit timestamp differs)
+    assert (
+        expected.split("</memory_metadata>")[-1]
+        == (await _system_prompt(server, charles_agent.id, default_user)).split("</memory_metadata>")[-1]
+    )
+
+
+@pytest.mark.asyncio
+async def test_sleeptime_agents_write_memory_edits_immediately(server, default_user, charles_agent, monkeypatch):
+    assert isinstance(open_memory_write_buffer(server.agent_manager, default_user, charles_agent), MemoryWriteBuffer)
+    for agent_type in (AgentType.sleeptime_agent, AgentType.voice_sleeptime_agent):
+        sleeptime_agent = charles_agent.model_copy(update={"agent_type": agent_type})
+        assert open_memory_write_buffer(server.agent_manager, default_user, sleeptime_agent) is None
+
+    monkeypatch.setattr(settings, "memory_write_buffer_enabled", False)
+    assert open_memory_write_buffer(server.agent_manager, default_user, charles_agent) is None
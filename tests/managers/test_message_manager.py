@@ -563,6 +563,38 @@ async def test_message_listing_text_search(server: SyncServer, hello_world_messa
     assert len(search_results) == 0
 
 
+@pytest.mark.asyncio
+async def test_search_messages_local_full_text(server: SyncServer, sarah_agent, default_user, monkeypatch):
+    """Without Turbopuffer, local hybrid search ranks messages by Postgres full-text relevance"""
+    from letta.settings import settings
+
+    monkeypatch.setattr(settings, "use_local_hybrid_search", True)
+
+    texts = [
+        "The quarterly budget review is scheduled for Monday",
+        "I had pizza for lunch",
+        "Budget budget budget: please review the budget spreadsheet",
+        "Reviewing nothing in particular",
+    ]
+    await server.message_manager.create_many_messages_async(
+        pydantic_msgs=[PydanticMessage(agent_id=sarah_agent.id, role=MessageRole.user, content=[TextContent(text=text)]) for text in texts],
+        actor=default_user,
+    )
+
+    results = await server.message_manager.search_messages_async(
+        agent_id=sarah_agent.id, actor=default_user, query_text="budget review", limit=10
+    )
+    result_texts = [message.content[0].text for message, _ in results]
+    assert set(result_texts) == {texts[0], texts[2]}
+    assert [metadata["fts_rank"] for _, metadata in results] == [1, 2]
+    assert results[0][1]["combined_score"] >= results[1][1]["combined_score"]
+
+    results = await server.message_manager.search_messages_async(
+        agent_id=sarah_agent.id, actor=default_user, query_text="budget", roles=[MessageRole.assistant], limit=10
+    )
+    assert results == []
+
+
 @pytest.mark.asyncio
 async def test_create_many_messages_async_basic(server: SyncServer, sarah_agent, default_user):
     """Test basic batch creation of messages"""
@@ -1102,3 +1134,86 @@ async def test_convert_assistant_message_with_dict_content(server: SyncServer, s
     assert isinstance(assistant_msg_nested.content, str)
     parsed_nested = json.loads(assistant_msg_nested.content)
     assert parsed_nested == {"status": "success", "data": {"count": 42, "items": ["a", "b"]}, "meta": None}
+
+
+# ======================================================================================================================
+# MessageManager Tests - Step checkpoints
+# ======================================================================================================================
+
+
+def _step_messages(agent_id: str, texts, conversation_id=None):
+    return [
+        PydanticMessage(agent_id=agent_id, role=MessageRole.user, content=[TextContent(text=text)], conversation_id=conversation_id)
+        for text in texts
+    ]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_step_messages_updates_agent_message_ids(server: SyncServer, sarah_agent, default_user):
+    agent = await server.agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    new_messages = _step_messages(sarah_agent.id, ["hi", "there"])
+
+    created = await server.message_manager.checkpoint_step_messages_async(
+        new_messages=new_messages,
+        in_context_message_ids=agent.message_ids + [m.id for m in new_messages],
+        agent_id=sarah_agent.id,
+        actor=default_user,
+    )
+
+    assert [m.id for m in created] == [m.id for m in new_messages]
+    agent = await server.agent_manager.get_agent_by_id_async(sarah_agent.id, actor=default_user)
+    assert agent.message_ids[-2:] == [m.id for m in new_messages]
+    assert [m.id for m in await server.message_manager.get_messages_by_ids_async(agent.message_ids[-2:], actor=default_user)] == [
+        m.id for m in new_messages
+    ]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_step_messages_updates_conversation_context_and_positions(server: SyncServer, sarah_agent, default_user):
+    from letta.schemas.conversation import CreateConversation
+    from letta.services.conversation_manager import ConversationManager
+
+    conversation_manager = ConversationManager()
+    conversation = await conversation_manager.create_conversation(
+        agent_id=sarah_agent.id, conversation_create=CreateConversation(summary="checkpoint"), actor=default_user
+    )
+    system_id, *_ = await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation.id, actor=default_user)
+
+    first = _step_messages(sarah_agent.id, ["a", "b"], conversation.id)
+    await server.message_manager.checkpoint_step_messages_async(
+        new_messages=first,
+        in_context_message_ids=[system_id] + [m.id for m in first],
+        agent_id=sarah_agent.id,
+        actor=default_user,
+        conversation_id=conversation.id,
+    )
+
+    # a summary inserted ahead of the older message must come back in list order, with "a" evicted
+    second = _step_messages(sarah_agent.id, ["summary", "c"], conversation.id)
+    in_context = [system_id, second[0].id, first[1].id, second[1].id]
+    await server.message_manager.checkpoint_step_messages_async(
+        new_messages=second,
+        in_context_message_ids=in_context,
+        agent_id=sarah_agent.id,
+        actor=default_user,
+        conversation_id=conversation.id,
+    )
+
+    assert await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation.id, actor=default_user) == in_context
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_step_messages_is_atomic(server: SyncServer, sarah_agent, default_user):
+    new_messages = _step_messages(sarah_agent.id, ["lost"])
+
+    # conversation membership violates the FK, so the message insert must roll back with it
+    with pytest.raises(Exception):
+        await server.message_manager.checkpoint_step_messages_async(
+            new_messages=new_messages,
+            in_context_message_ids=[m.id for m in new_messages],
+            agent_id=sarah_agent.id,
+            actor=default_user,
+            conversation_id=f"conv-{uuid.uuid4()}",
+        )
+
+    assert await server.message_manager.check_existing_message_ids([new_messages[0].id], actor=default_user) == set()
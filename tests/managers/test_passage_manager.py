@@ -281,6 +281,123 @@ async def test_agent_list_passages_vector_search(
     assert agent_only_results[1].text == "blue shoes"
 
 
+@pytest.mark.asyncio
+async def test_agent_passages_vector_search_in_process_index(server, default_user, sarah_agent, disable_turbopuffer, monkeypatch):
+    """SQLite-style vector search ranks passages with the in-process index and stays in sync with writes/deletes"""
+    import letta.services.agent_manager as agent_manager_module
+    from letta.helpers.vector_index import ARCHIVE_SCOPE, passage_vector_indexes
+
+    query_embedding = [1.0, 0.0, 0.0]
+
+    async def fake_embed_passage_query(actor, query_text, embedding_config):
+        return query_embedding
+
+    monkeypatch.setattr(agent_manager_module, "use_in_process_vector_index", lambda: True)
+    monkeypatch.setattr(agent_manager_module, "embed_passage_query", fake_embed_passage_query)
+
+    archive = await server.archive_manager.get_or_create_default_archive_for_agent_async(agent_state=sarah_agent, actor=default_user)
+    embeddings = {"closest": [1.0, 0.0, 0.0], "middle": [0.7, 0.7, 0.0], "farthest": [0.0, 0.0, 1.0]}
+    created = {}
+    for text, embedding in embeddings.items():
+        created[text] = await server.passage_manager.create_agent_passage_async(
+            PydanticPassage(
+                text=text,
+                archive_id=archive.id,
+                organization_id=default_user.organization_id,
+                embedding=embedding,
+                embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            ),
+            actor=default_user,
+        )
+
+    passage_vector_indexes.invalidate(ARCHIVE_SCOPE, archive.id)
+    results = await server.agent_manager.query_agent_passages_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        query_text="anything",
+        embed_query=True,
+        embedding_config=DEFAULT_EMBEDDING_CONFIG,
+        limit=2,
+    )
+    assert [p.text for p, _, _ in results] == ["closest", "middle"]
+    index = passage_vector_indexes.get(ARCHIVE_SCOPE, archive.id)
+    assert index is not None and len(index) == 3
+
+    # writes and deletes are applied to the already-built index
+    await server.passage_manager.delete_agent_passage_by_id_async(created["closest"].id, actor=default_user)
+    newest = await server.passage_manager.create_agent_passage_async(
+        PydanticPassage(
+            text="newest",
+            archive_id=archive.id,
+            organization_id=default_user.organization_id,
+            embedding=[0.9, 0.1, 0.0],
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+        ),
+        actor=default_user,
+    )
+    assert created["closest"].id not in index
+    assert newest.id in index
+
+    results = await server.agent_manager.query_agent_passages_async(
+        actor=default_user,
+        agent_id=sarah_agent.id,
+        query_text="anything",
+        embed_query=True,
+        embedding_config=DEFAULT_EMBEDDING_CONFIG,
+    )
+    assert [p.text for p, _, _ in results] == ["newest", "middle", "farthest"]
+
+
+@pytest.mark.asyncio
+async def test_agent_passages_local_hybrid_search_and_sql_tag_filter(server, default_user, sarah_agent, disable_turbopuffer, monkeypatch):
+    """Local hybrid search ranks passages with full-text search and applies tag filters in SQL before the limit"""
+    from letta.settings import settings
+
+    archive = await server.archive_manager.get_or_create_default_archive_for_agent_async(agent_state=sarah_agent, actor=default_user)
+    passages = [
+        ("Notes about the garden: tomatoes need water", ["garden"]),
+        ("Water the tomatoes and water the basil every morning", ["garden", "daily"]),
+        ("Meeting notes from the planning session", ["work"]),
+    ]
+    for text, tags in passages:
+        await server.passage_manager.create_agent_passage_async(
+            PydanticPassage(
+                text=text,
+                archive_id=archive.id,
+                organization_id=default_user.organization_id,
+                embedding=None,
+                embedding_config=DEFAULT_EMBEDDING_CONFIG,
+                tags=tags,
+            ),
+            actor=default_user,
+        )
+
+    # tags are filtered in SQL, so the limit applies to matching passages only
+    results = await server.agent_manager.query_agent_passages_async(
+        actor=default_user, agent_id=sarah_agent.id, tags=["work"], tag_match_mode=TagMatchMode.ANY, limit=1
+    )
+    assert [p.text for p, _, _ in results] == ["Meeting notes from the planning session"]
+    results = await server.agent_manager.query_agent_passages_async(
+        actor=default_user, agent_id=sarah_agent.id, tags=["garden", "daily"], tag_match_mode=TagMatchMode.ALL
+    )
+    assert [p.text for p, _, _ in results] == ["Water the tomatoes and water the basil every morning"]
+
+    monkeypatch.setattr(settings, "use_local_hybrid_search", True)
+    results = await server.agent_manager.query_agent_passages_async(
+        actor=default_user, agent_id=sarah_agent.id, query_text="watering tomatoes"
+    )
+    assert [p.text for p, _, _ in results] == [passages[1][0], passages[0][0]]
+    _, score, metadata = results[0]
+    assert metadata["fts_rank"] == 1
+    assert metadata["vector_rank"] is None
+    assert score == approx(metadata["combined_score"])
+
+    results = await server.agent_manager.query_agent_passages_async(
+        actor=default_user, agent_id=sarah_agent.id, query_text="tomatoes", tags=["daily"], tag_match_mode=TagMatchMode.ANY
+    )
+    assert [p.text for p, _, _ in results] == [passages[1][0]]
+
+
 @pytest.mark.asyncio
 async def test_list_source_passages_only(server: SyncServer, default_user, default_source, agent_passages_setup):
     """Test listing passages from a source without specifying an agent."""
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from letta.orm.provider_trace import ProviderTrace as ProviderTraceModel
+from letta.orm.provider_trace_blob import ProviderTraceBlob as ProviderTraceBlobModel
+from letta.schemas.provider_trace import ProviderTrace
+from letta.server.db import db_registry
+from letta.services.provider_trace_backends.postgres import PostgresProviderTraceBackend
+from letta.services.provider_trace_backends.postgres_writer import (
+    MANIFEST_KEY,
+    MISSING_BLOB_KEY,
+    ProviderTraceWriter,
+    delete_unreferenced_blobs,
+    get_provider_trace_writer,
+    split_request,
+)
+from letta.settings import telemetry_settings
+
+SYSTEM_PROMPT = "You are a helpful agent. " * 400
+TOOLS = [{"type": "function", "function": {"name": f"tool_{i}", "parameters": {"type": "object", "properties": {}}}} for i in range(10)]
+
+
+def _step_trace(step: int) -> ProviderTrace:
+    """The request of an agent's n-th step: the previous steps' messages plus one new exchange."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for i in range(step + 1):
+        messages += [{"role": "user", "content": f"question {i} " * 50}, {"role": "assistant", "content": f"answer {i} " * 80}]
+    return ProviderTrace(
+        request_json={"model": "gpt-4o-mini", "messages": messages, "tools": TOOLS},
+        response_json={"id": f"chatcmpl-{step}", "usage": {"prompt_tokens": 10, "completion_tokens": 5}},
+        step_id=f"step-dedupe-{step}",
+    )
+
+
+async def _count(model, organization_id: str) -> int:
+    async with db_registry.async_session() as session:
+        return (await session.execute(select(func.count()).select_from(model).where(model.organization_id == organization_id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_deduplicated_traces_store_each_message_once(server, default_user, monkeypatch):
+    monkeypatch.setattr(telemetry_settings, "provider_trace_pg_deduplicate", True)
+    backend = PostgresProviderTraceBackend()
+    traces = [_step_trace(step) for step in range(20)]
+
+    for trace in traces:
+        assert await backend.create_async(actor=default_user, provider_trace=trace) is trace
+
+    # reads flush this process's queue, so a trace is readable right after it was submitted
+    for trace in (traces[0], traces[-1]):
+        stored = await backend.get_by_step_id_async(step_id=trace.step_id, actor=default_user)
+        assert stored.request_json == trace.request_json
+        assert stored.response_json == trace.response_json
+
+    # system prompt, 10 tools and 2 messages per step, each stored once
+    assert await _count(ProviderTraceBlobModel, default_user.organization_id) == 1 + len(TOOLS) + 2 * len(traces)
+    assert await _count(ProviderTraceModel, default_user.organization_id) == len(traces)
+
+    async with db_registry.async_session() as session:
+        manifests = (await session.execute(select(ProviderTraceModel.request_json))).scalars().all()
+        blobs = (await session.execute(select(ProviderTraceBlobModel.content))).scalars().all()
+    assert all(manifest[MANIFEST_KEY] == ["messages", "tools"] for manifest in manifests)
+    deduplicated = sum(len(json.dumps(m)) for m in manifests) + sum(len(json.dumps(b)) for b in blobs)
+    full = sum(len(json.dumps(trace.request_json)) for trace in traces)
+    assert deduplicated < full / 5
+
+
+@pytest.mark.asyncio
+async def test_writer_drops_traces_when_the_queue_stays_full(server, default_user):
+    writer = ProviderTraceWriter(queue_size=1, batch_size=10, flush_interval_seconds=0, enqueue_timeout_seconds=0.01)
+    traces = [_step_trace(step) for step in range(3)]
+
+    # the writer task has not run yet, so the first trace fills the queue
+    results = [await writer.submit(default_user, trace) for trace in traces]
+    assert results[0] and not all(results)
+
+    await writer.flush()
+    await writer.aclose()
+    assert writer.written + writer.dropped == len(traces)
+    assert await _count(ProviderTraceModel, default_user.organization_id) == writer.written
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_concurrent_traces(server, default_user, monkeypatch):
+    monkeypatch.setattr(telemetry_settings, "provider_trace_pg_deduplicate", True)
+    monkeypatch.setattr(telemetry_settings, "provider_trace_writer_flush_interval_seconds", 0.2)
+    batches = []
+    original = ProviderTraceWriter._write
+
+    async def recording(self, batch):
+        batches.append(len(batch))
+        await original(self, batch)
+
+    monkeypatch.setattr(ProviderTraceWriter, "_write", recording)
+    backend = PostgresProviderTraceBackend()
+
+    await asyncio.gather(*(backend.create_async(actor=default_user, provider_trace=_step_trace(step)) for step in range(8)))
+    await get_provider_trace_writer().flush()
+
+    assert batches == [8]
+    assert await _count(ProviderTraceModel, default_user.organization_id) == 8
+
+
+@pytest.mark.asyncio
+async def test_missing_blobs_are_reported_not_raised(server, default_user, monkeypatch):
+    monkeypatch.setattr(telemetry_settings, "provider_trace_pg_deduplicate", True)
+    backend = PostgresProviderTraceBackend()
+    trace = _step_trace(0)
+    await backend.create_async(actor=default_user, provider_trace=trace)
+    await get_provider_trace_writer().flush()
+
+    system_blob_id = split_request(default_user.organization_id, trace.request_json)[0]["messages"][0]
+    async with db_registry.async_session() as session:
+        await session.execute(delete(ProviderTraceBlobModel).where(ProviderTraceBlobModel.id == system_blob_id))
+        await session.commit()
+
+    stored = await backend.get_by_step_id_async(step_id=trace.step_id, actor=default_user)
+    assert stored.request_json["messages"][0] == {MISSING_BLOB_KEY: system_blob_id}
+    assert stored.request_json["messages"][1:] == trace.request_json["messages"][1:]
+    assert stored.request_json["tools"] == TOOLS
+
+
+@pytest.mark.asyncio
+async def test_unreferenced_blobs_are_collected_once_old_enough(server, default_user, monkeypatch):
+    monkeypatch.setattr(telemetry_settings, "provider_trace_pg_deduplicate", True)
+    backend = PostgresProviderTraceBackend()
+    for step in range(2):
+        await backend.create_async(actor=default_user, provider_trace=_step_trace(step))
+    await get_provider_trace_writer().flush()
+
+    # a retention job deleted the second step's trace: only its new exchange is no longer referenced
+    async with db_registry.async_session() as session:
+        await session.execute(delete(ProviderTraceModel).where(ProviderTraceModel.step_id == _step_trace(1).step_id))
+        await session.commit()
+    blobs_before = await _count(ProviderTraceBlobModel, default_user.organization_id)
+
+    assert await delete_unreferenced_blobs(default_user.organization_id) == 0
+    assert await delete_unreferenced_blobs(default_user.organization_id, min_age_seconds=-60) == 2
+    assert await _count(ProviderTraceBlobModel, default_user.organization_id) == blobs_before - 2
+
+    stored = await backend.get_by_step_id_async(step_id=_step_trace(0).step_id, actor=default_user)
+    assert stored.request_json == _step_trace(0).request_json
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from letta.schemas.enums import RunStatus
+from letta.schemas.letta_stop_reason import StopReasonType
+from letta.schemas.run import RunUpdate
+from letta.server.db import db_registry
+from letta.server.rest_api.streaming_response import cancellation_aware_stream_wrapper
+from letta.server.server import SyncServer
+from letta.services import run_cancellation_bus
+from letta.services.run_cancellation_bus import (
+    POSTGRES_CHANNEL,
+    REDIS_CHANNEL,
+    PostgresRunCancellationBus,
+    RedisRunCancellationBus,
+    get_cancellation_event_for_run,
+    get_run_cancellation_bus,
+    start_run_cancellation_bus,
+)
+
+
+async def _wait_for(event: asyncio.Event, timeout: float = 5.0) -> None:
+    await asyncio.wait_for(event.wait(), timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_postgres_notify_from_another_worker_sets_the_event(server: SyncServer):
+    bus = await start_run_cancellation_bus()
+    assert isinstance(bus, PostgresRunCancellationBus)
+
+    # what another worker's publish sends
+    event = get_cancellation_event_for_run("run-from-another-worker")
+    async with db_registry.async_session() as session:
+        await session.execute(select(func.pg_notify(POSTGRES_CHANNEL, "run-from-another-worker")))
+
+    await _wait_for(event)
+
+
+class _FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = asyncio.Queue()
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.broker.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def get_message(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class _FakeRedis:
+    """Pub/sub calls the bus makes; every ``_FakeRedis`` sharing a broker is a worker on the same Redis."""
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    async def publish(self, channel, message):
+        queues = self.broker.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(queues)
+
+    async def pubsub(self):
+        return _FakePubSub(self.broker)
+
+
+@pytest.mark.asyncio
+async def test_redis_publish_reaches_every_worker():
+    broker = type("Broker", (), {"subscribers": {}})()
+    workers = [RedisRunCancellationBus(_FakeRedis(broker)) for _ in range(2)]
+    for bus in workers:
+        bus.start()
+    try:
+        for bus in workers:
+            assert await bus.wait_until_subscribed(timeout=5.0)
+        assert len(broker.subscribers[REDIS_CHANNEL]) == 2
+        event = get_cancellation_event_for_run("run-cancelled-over-redis")
+        assert await workers[0].redis.publish(REDIS_CHANNEL, "run-cancelled-over-redis") == 2
+        await _wait_for(event)
+    finally:
+        for bus in workers:
+            await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_as_soon_as_the_run_is_cancelled(server: SyncServer, default_run, default_user, monkeypatch):
+    reads = []
+    original = server.run_manager.get_run_by_id
+
+    async def counting(*args, **kwargs):
+        reads.append(kwargs.get("run_id"))
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(server.run_manager, "get_run_by_id", counting)
+
+    async def chunks():
+        for i in range(1000):
+            yield f"data: {i}\n\n"
+            await asyncio.sleep(0.01)
+
+    stream = cancellation_aware_stream_wrapper(chunks(), server.run_manager, default_run.id, default_user)
+    received = [await anext(stream)]
+
+    await server.run_manager.update_run_by_id_async(
+        default_run.id, RunUpdate(status=RunStatus.cancelled, stop_reason=StopReasonType.cancelled), actor=default_user
+    )
+    async for chunk in stream:
+        received.append(chunk)
+
+    assert '"stop_reason": "cancelled"' in received[-1]
+    assert len(received) < 100
+    # one read when the stream started, none while it ran
+    assert reads == [default_run.id]
+
+
+@pytest.mark.asyncio
+async def test_request_path_does_not_wait_for_the_subscription(server: SyncServer, monkeypatch):
+    class _StuckBus(PostgresRunCancellationBus):
+        async def _listen(self):
+            await asyncio.Event().wait()
+
+    bus = _StuckBus()
+    run_cancellation_bus._buses[asyncio.get_running_loop()] = bus
+    # returns at once with the listener started, even though it never subscribes
+    assert await asyncio.wait_for(get_run_cancellation_bus(), timeout=0.5) is bus
+    assert bus._task is not None and not bus._task.done()
+    assert not await bus.wait_until_subscribed(timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_stream_that_starts_after_the_cancel_stops_immediately(server: SyncServer, default_run, default_user, monkeypatch):
+    # a cancel that happened before this process subscribed is caught by the initial read
+    monkeypatch.setattr(run_cancellation_bus, "_cancellation_events", {})
+    await server.run_manager.update_run_by_id_async(
+        default_run.id, RunUpdate(status=RunStatus.cancelled, stop_reason=StopReasonType.cancelled), actor=default_user
+    )
+    run_cancellation_bus._cancellation_events.clear()
+
+    async def chunks():
+        yield "data: first\n\n"
+        yield "data: second\n\n"
+
+    received = [chunk async for chunk in cancellation_aware_stream_wrapper(chunks(), server.run_manager, default_run.id, default_user)]
+    assert len(received) == 1
+    assert '"stop_reason": "cancelled"' in received[0]
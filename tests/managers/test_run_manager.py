@@ -1,3 +1,4 @@
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
@@ -12,12 +13,17 @@ from letta.orm.errors import NoResultFound
 from letta.schemas.enums import (
     MessageRole,
     RunStatus,
+    UsageRollupGranularity,
 )
 from letta.schemas.job import LettaRequestConfig
 from letta.schemas.letta_message_content import TextContent
 from letta.schemas.letta_stop_reason import StopReasonType
 from letta.schemas.message import Message, Message as PydanticMessage, ToolReturn
-from letta.schemas.openai.chat_completion_response import UsageStatistics
+from letta.schemas.openai.chat_completion_response import (
+    UsageStatistics,
+    UsageStatisticsCompletionTokenDetails,
+    UsageStatisticsPromptTokenDetails,
+)
 from letta.schemas.run import Run as PydanticRun, RunUpdate
 from letta.schemas.user import User as PydanticUser
 from letta.server.server import SyncServer
@@ -1251,6 +1257,77 @@ async def test_run_usage_stats_get_nonexistent_run(server: SyncServer, default_u
         await run_manager.get_run_usage(run_id="nonexistent_run", actor=default_user)
 
 
+@pytest.mark.asyncio
+async def test_run_usage_rollups_follow_step_success(server: SyncServer, sarah_agent, default_run, default_user):
+    """Test that the usage rollups count steps when logged and their final usage when they succeed."""
+    step_manager = server.step_manager
+    usage_rollup_manager = server.usage_rollup_manager
+    now = datetime.now(timezone.utc)
+    org_usage_before = await usage_rollup_manager.list_organization_usage_async(actor=default_user, start_date=now)
+
+    # a streaming step is logged with no usage and completed with the final usage
+    pending = await step_manager.log_step_async(
+        agent_id=sarah_agent.id,
+        provider_name="anthropic",
+        provider_category="base",
+        model="claude-sonnet-4",
+        model_endpoint="https://api.anthropic.com/v1",
+        context_window_limit=200000,
+        usage=UsageStatistics(),
+        run_id=default_run.id,
+        actor=default_user,
+    )
+    await step_manager.update_step_success_async(
+        actor=default_user,
+        step_id=pending.id,
+        usage=UsageStatistics(
+            completion_tokens=120,
+            prompt_tokens=1000,
+            total_tokens=1120,
+            prompt_tokens_details=UsageStatisticsPromptTokenDetails(cache_read_tokens=800, cache_creation_tokens=150),
+            completion_tokens_details=UsageStatisticsCompletionTokenDetails(reasoning_tokens=40),
+        ),
+    )
+    await step_manager.log_step_async(
+        agent_id=sarah_agent.id,
+        provider_name="openai",
+        provider_category="base",
+        model="gpt-4o-mini",
+        model_endpoint="https://api.openai.com/v1",
+        context_window_limit=8192,
+        usage=UsageStatistics(completion_tokens=30, prompt_tokens=70, total_tokens=100),
+        run_id=default_run.id,
+        actor=default_user,
+    )
+
+    usage = await server.run_manager.get_run_usage(run_id=default_run.id, actor=default_user)
+    assert (usage.step_count, usage.prompt_tokens, usage.completion_tokens, usage.total_tokens) == (2, 1070, 150, 1220)
+    assert (usage.cached_input_tokens, usage.cache_write_tokens, usage.reasoning_tokens) == (800, 150, 40)
+
+    # the agent's hourly and daily buckets and the organization's day add up to the same usage
+    steps = await step_manager.list_steps_async(run_id=default_run.id, actor=default_user)
+    for granularity in UsageRollupGranularity:
+        buckets = await usage_rollup_manager.list_agent_usage_async(agent_id=sarah_agent.id, actor=default_user, granularity=granularity)
+        assert sum(bucket.step_count for bucket in buckets) == len(steps) == 2
+        assert sum(bucket.total_tokens for bucket in buckets) == 1220
+        assert sum(bucket.cached_input_tokens for bucket in buckets) == 800
+        assert all(bucket.granularity == granularity for bucket in buckets)
+
+    (day,) = await usage_rollup_manager.list_organization_usage_async(actor=default_user, start_date=now)
+    assert day.step_count - sum(bucket.step_count for bucket in org_usage_before) == 2
+    assert day.reasoning_tokens - sum(bucket.reasoning_tokens for bucket in org_usage_before) == 40
+
+    # ranges select buckets by their start
+    assert (
+        await usage_rollup_manager.list_agent_usage_async(agent_id=sarah_agent.id, actor=default_user, start_date=now + timedelta(days=2))
+        == []
+    )
+    assert (
+        await usage_rollup_manager.list_agent_usage_async(agent_id=sarah_agent.id, actor=default_user, end_date=now - timedelta(days=2))
+        == []
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_run_request_config(server: SyncServer, sarah_agent, default_user):
     """Test getting request config from a run."""
@@ -1324,7 +1401,6 @@ async def test_run_metrics_creation(server: SyncServer, sarah_agent, default_use
 @pytest.mark.asyncio
 async def test_run_metrics_timestamp_tracking(server: SyncServer, sarah_agent, default_user):
     """Test that run_start_ns is properly tracked."""
-    import time
 
     # Record time before creation
     before_ns = int(time.time() * 1e9)
@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+
+from letta.groups import sleeptime_multi_agent_v4
+from letta.monitoring.load_gate import get_load_gate
+from letta.schemas.enums import RunStatus
+from letta.schemas.letta_stop_reason import StopReasonType
+from letta.server.server import SyncServer
+from letta.services.sleeptime_executor import JOB_METADATA_KEY, SleeptimeExecutor, SleeptimeJob
+
+
+def _executor(**overrides) -> SleeptimeExecutor:
+    kwargs = dict(max_concurrency=4, max_concurrency_per_org=4, foreground_yield_threshold=100, max_yield_seconds=0)
+    kwargs.update(overrides)
+    return SleeptimeExecutor(**kwargs)
+
+
+def _job(actor, turn: int) -> SleeptimeJob:
+    return SleeptimeJob(
+        group_id="group-1",
+        foreground_agent_id="agent-foreground",
+        actor_id=actor.id,
+        last_processed_message_id=f"message-before-turn-{turn}",
+        response_message_ids=[f"message-turn-{turn}"],
+    )
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    """Replace the sleeptime step with one that records what ran and how many ran at once."""
+    state = {"jobs": [], "running": 0, "max_running": 0, "release": asyncio.Event()}
+
+    async def fake_run(run_id, sleeptime_agent_id, job, actor):
+        state["jobs"].append((run_id, sleeptime_agent_id, job))
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await state["release"].wait()
+        state["running"] -= 1
+
+    monkeypatch.setattr(sleeptime_multi_agent_v4, "run_sleeptime_job", fake_run)
+    return state
+
+
+async def _until(condition, timeout: float = 5.0):
+    async def wait():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(wait(), timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_turns_for_a_queued_run_are_coalesced(server: SyncServer, default_user, sarah_agent):
+    executor = _executor(external=True)
+
+    run_ids = [await executor.enqueue(_job(default_user, turn), sarah_agent.id, default_user) for turn in range(3)]
+
+    assert len(set(run_ids)) == 1
+    run = await server.run_manager.get_run_by_id(run_id=run_ids[0], actor=default_user)
+    job = SleeptimeJob.model_validate(run.metadata[JOB_METADATA_KEY])
+    # one transcript from before the first turn through the last
+    assert job.last_processed_message_id == "message-before-turn-0"
+    assert job.response_message_ids == ["message-turn-2"]
+    assert job.coalesced_turns == 3
+    assert executor.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_runs_execute_under_global_and_per_agent_limits(server: SyncServer, default_user, sarah_agent, charles_agent, executed):
+    executor = _executor(max_concurrency=1)
+
+    first = await executor.enqueue(_job(default_user, 0), sarah_agent.id, default_user)
+    await _until(lambda: executed["running"] == 1)
+    # sarah's run was claimed, so this turn queues a new run instead of changing the running one
+    second = await executor.enqueue(_job(default_user, 1), sarah_agent.id, default_user)
+    third = await executor.enqueue(_job(default_user, 2), charles_agent.id, default_user)
+    assert len({first, second, third}) == 3
+
+    await asyncio.sleep(0.05)
+    assert executed["running"] == 1
+    executed["release"].set()
+    await _until(lambda: executor.pending() == 0)
+
+    assert executed["jobs"][0][0] == first
+    assert sorted(run_id for run_id, _, _ in executed["jobs"]) == sorted([first, second, third])
+    assert executed["max_running"] == 1
+    run = await server.run_manager.get_run_by_id(run_id=second, actor=default_user)
+    assert run.status == RunStatus.running
+
+
+@pytest.mark.asyncio
+async def test_queued_runs_wait_for_foreground_load(server: SyncServer, default_user, sarah_agent, executed):
+    executor = _executor(foreground_yield_threshold=0, max_yield_seconds=30)
+    load_gate = get_load_gate()
+    executed["release"].set()
+
+    load_gate.on_fg_start()
+    try:
+        await executor.enqueue(_job(default_user, 0), sarah_agent.id, default_user)
+        await asyncio.sleep(0.3)
+        assert executed["jobs"] == []
+    finally:
+        load_gate.on_fg_end()
+
+    await _until(lambda: len(executed["jobs"]) == 1)
+
+
+@pytest.mark.asyncio
+async def test_runs_queued_before_a_restart_are_recovered_once(server: SyncServer, default_user, sarah_agent, charles_agent, executed):
+    # a web worker in external mode only enqueues
+    web_worker = _executor(external=True)
+    queued = {await web_worker.enqueue(_job(default_user, 0), agent.id, default_user) for agent in (sarah_agent, charles_agent)}
+
+    executed["release"].set()
+    workers = [_executor(), _executor()]
+    assert await workers[0].recover() == 2
+    await workers[1].recover()
+    await _until(lambda: all(worker.pending() == 0 for worker in workers))
+
+    # both workers saw the runs, but each was claimed and executed once
+    assert sorted(run_id for run_id, _, _ in executed["jobs"]) == sorted(queued)
+    assert await workers[0].recover() == 0
+
+
+@pytest.mark.asyncio
+async def test_running_runs_are_reclaimed_only_once_their_lease_lapses(server: SyncServer, default_user, sarah_agent, executed):
+    executed["release"].set()
+    # the worker that claimed this run died mid-run, so nobody renews its lease
+    dead_worker = _executor(external=True)
+    run_id = await dead_worker.enqueue(_job(default_user, 0), sarah_agent.id, default_user)
+    assert await dead_worker._claim(run_id) is not None
+
+    assert await _executor(lease_seconds=60).recover() == 0
+    worker = _executor(lease_seconds=0.1)
+    await asyncio.sleep(0.2)
+    assert await worker.recover() == 1
+    await _until(lambda: worker.pending() == 0)
+    assert [job_run_id for job_run_id, _, _ in executed["jobs"]] == [run_id]
+
+
+@pytest.mark.asyncio
+async def test_executing_runs_keep_their_lease(server: SyncServer, default_user, sarah_agent, executed):
+    worker = _executor(lease_seconds=0.3)
+    await worker.enqueue(_job(default_user, 0), sarah_agent.id, default_user)
+    await _until(lambda: executed["running"] == 1)
+
+    await asyncio.sleep(0.6)
+    assert await _executor(lease_seconds=0.3).recover() == 0
+    executed["release"].set()
+    await _until(lambda: worker.pending() == 0)
+    assert len(executed["jobs"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_runs_that_fail_after_being_claimed_are_marked_failed(
+    server: SyncServer, default_user, sarah_agent, charles_agent, monkeypatch
+):
+    async def failing_run(run_id, sleeptime_agent_id, job, actor):
+        raise RuntimeError("sleeptime step exploded")
+
+    monkeypatch.setattr(sleeptime_multi_agent_v4, "run_sleeptime_job", failing_run)
+    executor = _executor()
+    unknown_actor = _job(default_user, 1).model_copy(update={"actor_id": "user-00000000-0000-4000-8000-000000000000"})
+    run_ids = [
+        await executor.enqueue(_job(default_user, 0), sarah_agent.id, default_user),
+        # fails before the step: the actor cannot be loaded
+        await executor.enqueue(unknown_actor, charles_agent.id, default_user),
+    ]
+    await _until(lambda: executor.pending() == 0)
+
+    for run_id in run_ids:
+        run = await server.run_manager.get_run_by_id(run_id=run_id, actor=default_user)
+        assert run.status == RunStatus.failed
+        assert run.stop_reason == StopReasonType.error
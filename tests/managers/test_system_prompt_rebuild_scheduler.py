@@ -0,0 +1,86 @@
+import pytest
+
+from letta.schemas.block import Block as PydanticBlock, BlockUpdate
+from letta.server.server import SyncServer
+from letta.services.agent_manager import AgentManager
+from letta.services.system_prompt_rebuild_scheduler import get_system_prompt_rebuild_scheduler
+from letta.settings import settings
+
+
+async def _system_message_text(server: SyncServer, agent_id: str, actor) -> str:
+    agent = await server.agent_manager.get_agent_by_id_async(agent_id=agent_id, actor=actor)
+    message = await server.message_manager.get_message_by_id_async(message_id=agent.message_ids[0], actor=actor)
+    return message.content[0].text
+
+
+def _without_timestamps(text: str) -> list:
+    # the memory metadata section includes the time of the rebuild
+    return [line for line in text.splitlines() if "UTC" not in line and "last modified" not in line.lower()]
+
+
+@pytest.fixture
+async def shared_block(server: SyncServer, default_user, sarah_agent, charles_agent):
+    block = await server.block_manager.create_or_update_block_async(
+        PydanticBlock(label="policy", value="Original policy", limit=1000), actor=default_user
+    )
+    for agent in (sarah_agent, charles_agent):
+        await server.agent_manager.attach_block_async(agent_id=agent.id, block_id=block.id, actor=default_user)
+    yield block
+
+
+@pytest.mark.asyncio
+async def test_small_fan_out_is_rebuilt_inline(server: SyncServer, default_user, sarah_agent, charles_agent, shared_block):
+    await server.block_manager.update_block_async(shared_block.id, BlockUpdate(value="Inline policy"), actor=default_user)
+
+    for agent in (sarah_agent, charles_agent):
+        assert "Inline policy" in await _system_message_text(server, agent.id, default_user)
+    assert await (await get_system_prompt_rebuild_scheduler()).queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_large_fan_out_is_deferred_and_coalesced(
+    server: SyncServer, default_user, sarah_agent, charles_agent, shared_block, monkeypatch
+):
+    monkeypatch.setattr(settings, "system_prompt_rebuild_inline_max_agents", 0)
+    scheduler = await get_system_prompt_rebuild_scheduler()
+    scheduler.delay_seconds = 60
+
+    rebuilt = []
+    original = AgentManager.rebuild_system_prompts_async
+
+    async def counting(self, agent_ids, actor, max_concurrency=8):
+        rebuilt.append(sorted(agent_ids))
+        return await original(self, agent_ids=agent_ids, actor=actor, max_concurrency=max_concurrency)
+
+    monkeypatch.setattr(AgentManager, "rebuild_system_prompts_async", counting)
+
+    for value in ("Edit one", "Edit two", "Edit three"):
+        await server.block_manager.update_block_async(shared_block.id, BlockUpdate(value=value), actor=default_user)
+
+    # nothing rebuilt yet, and repeated edits leave one mark per agent
+    assert "Edit three" not in await _system_message_text(server, sarah_agent.id, default_user)
+    assert await scheduler.queue_depth() == 2
+
+    # sarah steps first: her step claims the rebuild, so the drain only does charles
+    assert await scheduler.claim(sarah_agent.id)
+    assert not await scheduler.claim(sarah_agent.id)
+
+    assert await scheduler.drain() == 1
+    assert rebuilt == [[charles_agent.id]]
+    assert "Edit three" in await _system_message_text(server, charles_agent.id, default_user)
+    assert await scheduler.queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_rebuild_matches_single_agent_rebuild(server: SyncServer, default_user, sarah_agent, charles_agent, shared_block):
+    await server.block_manager.update_block_async(shared_block.id, BlockUpdate(value="Compared policy"), actor=default_user)
+    batched = {agent.id: await _system_message_text(server, agent.id, default_user) for agent in (sarah_agent, charles_agent)}
+
+    # an already up-to-date prompt is not rewritten
+    assert await server.agent_manager.rebuild_system_prompts_async(agent_ids=[sarah_agent.id, charles_agent.id], actor=default_user) == 0
+
+    for agent in (sarah_agent, charles_agent):
+        await server.agent_manager.rebuild_system_prompt_async(agent_id=agent.id, actor=default_user, force=True)
+        single = await _system_message_text(server, agent.id, default_user)
+        # blocks are rendered in the (unordered) order the agent's core memory is loaded in
+        assert sorted(_without_timestamps(single)) == sorted(_without_timestamps(batched[agent.id]))
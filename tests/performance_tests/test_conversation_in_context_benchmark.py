@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from sqlalchemy import case, update
+
+from letta.orm.conversation_messages import ConversationMessage as ConversationMessageModel
+from letta.schemas.agent import CreateAgent
+from letta.schemas.conversation import CreateConversation
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message as PydanticMessage
+from letta.server.db import db_registry
+from letta.services.agent_manager import AgentManager
+from letta.services.conversation_manager import ConversationManager
+from letta.services.message_manager import MessageManager
+
+HISTORY = 10_000
+WINDOW = 50
+STEPS = 5
+
+
+@pytest.fixture
+async def agent(default_user):
+    agent_manager = AgentManager()
+    agent_state = await agent_manager.create_agent_async(
+        agent_create=CreateAgent(
+            name="checkpoint_benchmark_agent",
+            agent_type="memgpt_v2_agent",
+            memory_blocks=[],
+            llm_config=LLMConfig.default_config("gpt-4o-mini"),
+            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            include_base_tools=False,
+        ),
+        actor=default_user,
+    )
+    yield agent_state
+    await agent_manager.delete_agent_async(agent_id=agent_state.id, actor=default_user)
+
+
+@pytest.mark.asyncio
+async def test_in_context_checkpoint_against_full_rewrite(agent, default_user):
+    """An agent step's checkpoint on a conversation with a long history, against rewriting every row as before."""
+    conversation_manager = ConversationManager()
+    conversation = await conversation_manager.create_conversation(
+        agent_id=agent.id, conversation_create=CreateConversation(summary="Long"), actor=default_user
+    )
+    messages = await MessageManager().create_many_messages_async(
+        [PydanticMessage(agent_id=agent.id, role="user", content=[TextContent(text=f"Message {i}")]) for i in range(HISTORY)],
+        actor=default_user,
+    )
+    message_ids = [m.id for m in messages]
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=conversation.id, agent_id=agent.id, message_ids=message_ids, actor=default_user
+    )
+    system_ids = (await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation.id, actor=default_user))[:1]
+    await conversation_manager.update_in_context_messages(
+        conversation_id=conversation.id, in_context_message_ids=[*system_ids, *message_ids[-WINDOW:]], actor=default_user
+    )
+
+    async def full_rewrite(in_context_message_ids):
+        # one UPDATE over the whole conversation, as every step did before
+        async with db_registry.async_session() as session:
+            await session.execute(
+                update(ConversationMessageModel)
+                .where(ConversationMessageModel.conversation_id == conversation.id)
+                .values(
+                    in_context=ConversationMessageModel.message_id.in_(in_context_message_ids),
+                    position=case(
+                        {message_id: position for position, message_id in enumerate(in_context_message_ids)},
+                        value=ConversationMessageModel.message_id,
+                        else_=ConversationMessageModel.position,
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    async def incremental(in_context_message_ids):
+        await conversation_manager.update_in_context_messages(
+            conversation_id=conversation.id, in_context_message_ids=in_context_message_ids, actor=default_user
+        )
+
+    # each step slides the window by one message
+    timings = {}
+    for name, checkpoint in (("full rewrite", full_rewrite), ("incremental", incremental)):
+        start = time.perf_counter()
+        for step in range(STEPS):
+            await checkpoint([*system_ids, *message_ids[-WINDOW - step - 1 : -step - 1]])
+        timings[name] = (time.perf_counter() - start) / STEPS
+
+    in_context_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation.id, actor=default_user)
+    assert in_context_ids == [*system_ids, *message_ids[-WINDOW - STEPS : -STEPS]]
+
+    print(
+        f"\ncheckpoint over {HISTORY} messages: full rewrite {timings['full rewrite'] * 1000:.1f} ms, "
+        f"incremental {timings['incremental'] * 1000:.1f} ms"
+    )
+    assert timings["incremental"] < timings["full rewrite"]
@@ -0,0 +1,31 @@
+import json
+import time
+
+from letta.server.rest_api.json_parser import IncrementalJSONParser, OptimisticJSONParser
+
+
+def test_incremental_parser_against_reparsing():
+    """Feeding deltas is linear; re-parsing the growing buffer with OptimisticJSONParser is quadratic."""
+    message = "".join(f"word{i} \\n " for i in range(3000))
+    text = '{"inner_thoughts": "' + "thinking " * 200 + '", "message": "' + message + '"}'
+    pieces = [text[i : i + 4] for i in range(0, len(text), 4)]
+
+    start = time.perf_counter()
+    parser = IncrementalJSONParser()
+    incremental = "".join(parser.feed(piece).get("message", "") for piece in pieces)
+    incremental_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    optimistic = OptimisticJSONParser()
+    optimistic.on_extra_token = None
+    buffer = ""
+    reparsed = ""
+    for piece in pieces:
+        buffer += piece
+        reparsed = optimistic.parse(buffer).get("message", "")
+    reparse_s = time.perf_counter() - start
+
+    print(f"\nincremental: {incremental_s * 1000:.1f}ms, optimistic re-parse: {reparse_s * 1000:.1f}ms ({len(pieces)} deltas)")
+    assert incremental == json.loads(text)["message"]
+    assert reparsed == incremental
+    assert incremental_s < reparse_s
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from letta.schemas.sandbox_config import LocalSandboxConfig, SandboxConfigCreate
+from letta.services.sandbox_config_manager import SandboxConfigManager
+from letta.services.tool_sandbox.local_sandbox import AsyncToolSandboxLocal
+from letta.settings import tool_settings
+from tests.helpers.utils import create_tool_from_func
+
+WARM_CALLS = 5
+
+
+def echo_tool(message: str):
+    """
+    Args:
+        message (str): The message to echo.
+
+    Returns:
+        str: The message that was echoed.
+    """
+    print(message)
+    return message
+
+
+@pytest.mark.asyncio
+async def test_local_sandbox_latency_with_and_without_worker_pool(default_user, tmp_path, monkeypatch):
+    """Per-call latency of a trivial local tool: a fresh subprocess per call against a warm worker."""
+    sandbox_config = await SandboxConfigManager().create_or_update_sandbox_config_async(
+        SandboxConfigCreate(config=LocalSandboxConfig(sandbox_dir=str(tmp_path))), actor=default_user
+    )
+    tool = create_tool_from_func(echo_tool)
+
+    async def timed_call() -> float:
+        sandbox = AsyncToolSandboxLocal(
+            tool.name, {"message": "hello"}, default_user, tool_id=tool.id, tool_object=tool, sandbox_config=sandbox_config
+        )
+        start = time.perf_counter()
+        result = await sandbox.run()
+        elapsed = time.perf_counter() - start
+        assert result.func_return == "hello"
+        return elapsed
+
+    monkeypatch.setattr(tool_settings, "tool_exec_worker_pool_enabled", False)
+    subprocess_s = min([await timed_call() for _ in range(WARM_CALLS)])
+
+    monkeypatch.setattr(tool_settings, "tool_exec_worker_pool_enabled", True)
+    cold_s = await timed_call()  # starts the first worker
+    warm_s = min([await timed_call() for _ in range(WARM_CALLS)])
+
+    print(
+        f"\nlocal sandbox per call: subprocess {subprocess_s * 1000:.0f} ms, "
+        f"worker cold start {cold_s * 1000:.0f} ms, warm worker {warm_s * 1000:.0f} ms"
+    )
+    assert warm_s < subprocess_s
@@ -0,0 +1,82 @@
+import json
+import time
+from datetime import datetime, timezone
+
+from openai.types.chat.chat_completion_message_function_tool_call import ChatCompletionMessageFunctionToolCall, Function
+
+from letta.helpers.message_dict_cache import reset_message_dict_cache
+from letta.schemas.enums import MessageRole
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.message import Message, ToolReturn
+from letta.settings import settings
+
+TURNS = 166  # 499 messages with the system message
+STEPS = 5
+
+
+def _stored_conversation(turns: int) -> list:
+    """A window like one loaded from the database: every message has updated_at set."""
+    loaded_at = datetime.now(timezone.utc)
+    messages = [Message(role=MessageRole.system, content=[TextContent(text="system " * 2000)], updated_at=loaded_at)]
+    for i in range(turns):
+        call_id = f"call_{i:020d}"
+        messages += [
+            Message(role=MessageRole.user, content=[TextContent(text=json.dumps({"message": "hello " * 50}))], updated_at=loaded_at),
+            Message(
+                role=MessageRole.assistant,
+                content=[TextContent(text="thinking " * 30)],
+                tool_calls=[
+                    ChatCompletionMessageFunctionToolCall(
+                        id=call_id,
+                        type="function",
+                        function=Function(name="send_message", arguments=json.dumps({"message": "reply " * 60})),
+                    )
+                ],
+                updated_at=loaded_at,
+            ),
+            Message(
+                role=MessageRole.tool,
+                content=[TextContent(text=json.dumps({"status": "OK"}))],
+                name="send_message",
+                tool_call_id=call_id,
+                tool_returns=[
+                    ToolReturn(tool_call_id=call_id, status="success", func_response=json.dumps({"status": "OK", "message": "x" * 500}))
+                ],
+                updated_at=loaded_at,
+            ),
+        ]
+    return messages
+
+
+def _convert_all(messages: list) -> list:
+    return [
+        Message.to_openai_dicts_from_list(messages, put_inner_thoughts_in_kwargs=True),
+        Message.to_openai_responses_dicts_from_list(messages),
+        Message.to_anthropic_dicts_from_list(messages, current_model="claude-sonnet-4", put_inner_thoughts_in_kwargs=True),
+        Message.to_google_dicts_from_list(messages, current_model="gemini-2.5-flash"),
+    ]
+
+
+def test_memoized_conversion_against_uncached(monkeypatch):
+    """Steady-state conversion of a ~500-message window through all four providers, per agent step."""
+    messages = _stored_conversation(TURNS)
+
+    def per_step_ms() -> float:
+        start = time.perf_counter()
+        for _ in range(STEPS):
+            _convert_all(messages)
+        return (time.perf_counter() - start) / STEPS * 1000
+
+    monkeypatch.setattr(settings, "message_dict_cache_max_entries", 0)
+    reset_message_dict_cache()
+    uncached = per_step_ms()
+    expected = _convert_all(messages)
+
+    monkeypatch.setattr(settings, "message_dict_cache_max_entries", 20000)
+    reset_message_dict_cache()
+    _convert_all(messages)  # the first step fills the cache
+    memoized = per_step_ms()
+
+    print(f"\n{len(messages)} messages, all four providers: {uncached:.1f} ms uncached, {memoized:.1f} ms memoized")
+    assert _convert_all(messages) == expected
+    assert memoized < uncached
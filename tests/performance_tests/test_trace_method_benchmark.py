@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags
+
+import letta.otel.tracing as tracing_module
+from letta.otel.tracing import trace_method
+from letta.settings import telemetry_settings
+
+ITERATIONS = 2000
+
+
+class DiscardingSpanProcessor:
+    """Ends spans without exporting them, so only @trace_method's own work is measured."""
+
+    def on_start(self, span, parent_context):
+        pass
+
+    def on_end(self, span):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis=None):
+        pass
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tracing():
+    provider = TracerProvider()
+    provider.add_span_processor(DiscardingSpanProcessor())
+    trace.set_tracer_provider(provider)
+    tracing_module._is_tracing_initialized = True
+    yield
+    tracing_module._is_tracing_initialized = False
+
+
+def _unsampled_parent():
+    # a span whose trace the sampler dropped; children inherit the decision (ParentBased sampling)
+    context = SpanContext(trace_id=0x1234, span_id=0x5678, is_remote=False, trace_flags=TraceFlags(TraceFlags.DEFAULT))
+    return trace.use_span(NonRecordingSpan(context))
+
+
+class Manager:
+    @trace_method
+    def get(self, agent_id, request_data):
+        return agent_id
+
+
+def test_trace_method_overhead_per_capture_policy(monkeypatch):
+    """Per-call cost of @trace_method with a ~100KB request_data, unsampled and under each capture policy."""
+    manager = Manager()
+    request_data = {"messages": [{"role": "user", "content": "x" * 2000}] * 50}
+
+    def per_call_us() -> float:
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            manager.get("agent-1", request_data)
+        return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+    timings = {}
+    with _unsampled_parent():
+        timings["unsampled"] = per_call_us()
+    for policy in ("ids", "capped", "full"):
+        monkeypatch.setattr(telemetry_settings, "trace_parameter_capture", policy)
+        timings[policy] = per_call_us()
+
+    print("\ntrace_method per call: " + ", ".join(f"{name} {us:.1f} us" for name, us in timings.items()))
+    assert timings["unsampled"] < timings["capped"] < timings["full"]
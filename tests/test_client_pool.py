@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+
+from letta.llm_api import client_pool
+from letta.llm_api.client_pool import client_pool_key, get_pooled_client, shared_http_client
+from letta.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_same_config_reuses_client_and_http_pool():
+    first = get_pooled_client(AsyncOpenAI, "openai", api_key="sk-a", base_url="https://api.openai.com/v1")
+    second = get_pooled_client(AsyncOpenAI, "openai", api_key="sk-a", base_url="https://api.openai.com/v1")
+    assert first is second
+
+    # A different (BYOK) key gets its own SDK client but shares the keep-alive connections
+    other_key = get_pooled_client(AsyncOpenAI, "openai", api_key="sk-b", base_url="https://api.openai.com/v1")
+    assert other_key is not first
+    assert other_key._client is first._client
+
+    other_host = get_pooled_client(AsyncOpenAI, "openai", api_key="sk-a", base_url="https://example.com/v1")
+    assert other_host._client is not first._client
+
+    anthropic_client = get_pooled_client(AsyncAnthropic, "anthropic", api_key="sk-a", max_retries=2)
+    assert anthropic_client is get_pooled_client(AsyncAnthropic, "anthropic", api_key="sk-a", max_retries=2)
+    assert anthropic_client is not get_pooled_client(AsyncAnthropic, "anthropic", api_key="sk-a", max_retries=3)
+
+
+def test_pool_key_never_contains_secrets():
+    key = client_pool_key(
+        AsyncAnthropic, "anthropic", {"max_retries": 1, "default_headers": {"Authorization": "Bearer secret-token"}, "api_key": "sk-secret"}
+    )
+    assert "secret" not in repr(key)
+    assert key == client_pool_key(
+        AsyncAnthropic, "anthropic", {"api_key": "sk-secret", "default_headers": {"Authorization": "Bearer secret-token"}, "max_retries": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_is_bounded_and_evicts_idle(monkeypatch):
+    monkeypatch.setattr(settings, "llm_client_pool_max_size", 2)
+    monkeypatch.setattr(settings, "llm_client_pool_idle_seconds", 60)
+    clients = [get_pooled_client(AsyncOpenAI, "openai", api_key=f"sk-{i}", base_url="https://api.openai.com/v1") for i in range(3)]
+    pools = client_pool._current_pools()
+    assert len(pools.sdk) == 2
+    assert get_pooled_client(AsyncOpenAI, "openai", api_key="sk-0", base_url="https://api.openai.com/v1") is not clients[0]
+
+    now = time.monotonic()
+    monkeypatch.setattr(client_pool.time, "monotonic", lambda: now + 61)
+    get_pooled_client(AsyncOpenAI, "openai", api_key="sk-9", base_url="https://api.openai.com/v1")
+    assert len(pools.sdk) == 1
+
+
+@pytest.mark.asyncio
+async def test_pools_are_per_event_loop():
+    async with shared_http_client("openai", "https://api.openai.com/v1") as here:
+        async with shared_http_client("openai", "https://api.openai.com/v1") as again:
+            assert here is again
+
+    def other_loop():
+        return asyncio.run(_shared_client())
+
+    there = await asyncio.to_thread(other_loop)
+    assert there is not here
+
+
+async def _shared_client():
+    async with shared_http_client("openai", "https://api.openai.com/v1") as client:
+        return client
+
+
+def test_disabled_or_no_loop_constructs_fresh_clients(monkeypatch):
+    # Outside an event loop there is nothing to bind connections to
+    assert get_pooled_client(AsyncOpenAI, "openai", api_key="sk") is not get_pooled_client(AsyncOpenAI, "openai", api_key="sk")
+
+    async def pooled_twice():
+        return get_pooled_client(AsyncOpenAI, "openai", api_key="sk"), get_pooled_client(AsyncOpenAI, "openai", api_key="sk")
+
+    monkeypatch.setattr(settings, "llm_client_pool_enabled", False)
+    first, second = asyncio.run(pooled_twice())
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_unpooled_http_client_is_closed_after_use(monkeypatch):
+    monkeypatch.setattr(settings, "llm_client_pool_enabled", False)
+    async with shared_http_client("openai", "https://api.openai.com/v1") as first:
+        async with shared_http_client("openai", "https://api.openai.com/v1") as second:
+            assert first is not second
+    assert first.is_closed and second.is_closed
+
+    monkeypatch.setattr(settings, "llm_client_pool_enabled", True)
+    async with shared_http_client("openai", "https://api.openai.com/v1") as pooled:
+        pass
+    assert not pooled.is_closed
+
+
+@pytest.mark.asyncio
+async def test_evicted_http_client_is_closed_once_idle(monkeypatch):
+    monkeypatch.setattr(settings, "llm_client_pool_max_size", 1)
+    async with shared_http_client("openai", "https://api.openai.com/v1") as in_use:
+        # evicts the client while this block is still using it
+        async with shared_http_client("openai", "https://example.com/v1") as other:
+            pass
+        await asyncio.sleep(0)
+        assert not in_use.is_closed
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert in_use.is_closed
+    assert not other.is_closed
+
+    # SDK clients built on a closed HTTP client are not handed out again
+    sdk_client = get_pooled_client(AsyncOpenAI, "openai", api_key="sk", base_url="https://api.openai.com/v1")
+    get_pooled_client(AsyncOpenAI, "openai", api_key="sk", base_url="https://example.com/v1")
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert sdk_client._client.is_closed
+    rebuilt = get_pooled_client(AsyncOpenAI, "openai", api_key="sk", base_url="https://api.openai.com/v1")
+    assert rebuilt is not sdk_client and not rebuilt._client.is_closed
@@ -0,0 +1,80 @@
+import pytest
+
+from letta.errors import LLMServerError
+from letta.helpers.embedding_cache import EmbeddingCache, InMemoryEmbeddingCacheBackend, embedding_cache_key
+from letta.schemas.embedding_config import EmbeddingConfig
+
+
+def _config(model="text-embedding-3-small", dim=4, endpoint="https://api.openai.com/v1"):
+    return EmbeddingConfig(
+        embedding_endpoint_type="openai",
+        embedding_endpoint=endpoint,
+        embedding_model=model,
+        embedding_dim=dim,
+    )
+
+
+class _FakeProvider:
+    def __init__(self):
+        self.calls = []
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0, 0.0, 0.5] for text in texts]
+
+
+def test_cache_key_depends_on_endpoint_model_dim_and_text():
+    assert embedding_cache_key(_config(), "hello") == embedding_cache_key(_config(), "hello")
+    assert embedding_cache_key(_config(), "hello") != embedding_cache_key(_config(), "hello!")
+    assert embedding_cache_key(_config(), "hello") != embedding_cache_key(_config(model="other"), "hello")
+    assert embedding_cache_key(_config(), "hello") != embedding_cache_key(_config(dim=8), "hello")
+    assert embedding_cache_key(_config(), "hello") != embedding_cache_key(_config(endpoint="http://localhost:8000/v1"), "hello")
+
+
+@pytest.mark.asyncio
+async def test_mixed_batch_only_sends_misses_once():
+    provider = _FakeProvider()
+    cache = EmbeddingCache([InMemoryEmbeddingCacheBackend(max_entries=100)])
+    config = _config()
+
+    first = await cache.embed(["a", "bb", "a"], config, provider.embed)
+    assert provider.calls == [["a", "bb"]]
+    assert first[0] == first[2] == [1.0, 1.0, 0.0, 0.5]
+
+    second = await cache.embed(["bb", "ccc", "a"], config, provider.embed)
+    assert provider.calls[1] == ["ccc"]
+    assert second == [[2.0, 1.0, 0.0, 0.5], [3.0, 1.0, 0.0, 0.5], [1.0, 1.0, 0.0, 0.5]]
+
+    await cache.embed(["a"], _config(model="other"), provider.embed)
+    assert provider.calls[2] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_lower_tier_hits_are_promoted_and_lru_is_bounded():
+    provider = _FakeProvider()
+    memory = InMemoryEmbeddingCacheBackend(max_entries=2)
+    shared = InMemoryEmbeddingCacheBackend(max_entries=100)
+    config = _config()
+
+    await EmbeddingCache([shared]).embed(["a", "bb", "ccc"], config, provider.embed)
+    assert len(provider.calls) == 1
+
+    cache = EmbeddingCache([memory, shared])
+    await cache.embed(["a"], config, provider.embed)
+    assert len(provider.calls) == 1
+    assert len(memory) == 1
+
+    await cache.embed(["bb", "ccc"], config, provider.embed)
+    assert len(memory) == 2
+    assert (await memory.get_many([embedding_cache_key(config, "a")])) == [None]
+
+
+@pytest.mark.asyncio
+async def test_short_provider_response_raises():
+    async def drop_last(texts):
+        return [[1.0, 1.0, 0.0, 0.5] for _ in texts[:-1]]
+
+    cache = EmbeddingCache([InMemoryEmbeddingCacheBackend(max_entries=100)])
+    with pytest.raises(LLMServerError):
+        await cache.embed(["a", "bb"], _config(), drop_last)
+    assert len(cache.tiers[0]) == 0
@@ -0,0 +1,140 @@
+import re
+
+import pytest
+
+from letta.schemas.file import FileMetadata
+from letta.services.file_processor.chunker.line_chunker import LineChunker
+from letta.services.file_processor.line_index import FileLineIndex, FileLineIndexRegistry, grep_file
+
+FLAGS = re.MULTILINE | re.IGNORECASE
+
+CODE = "\n".join(
+    [
+        "import os",
+        "",
+        "def load(path):",
+        "    if not path:  ",
+        "        raise ValueError('empty path')",
+        "    return open(path).read()",
+        "",
+        "class Loader:",
+        "    def load_all(self, paths):",
+        "        return [load(p) for p in paths]",
+    ]
+)
+PROSE = "Letta agents remember things. They search files with grep! Does it work? Lines end here.\nA second paragraph follows."
+CSV = "id,name\n1, alpha \n2,beta\n\n3,gamma"
+
+
+def _reference_grep(file: FileMetadata, pattern: re.Pattern, context_lines: int):
+    """The numbered-line search grep_files did before line indexes."""
+    formatted_lines = LineChunker().chunk_text(file_metadata=file)
+    if formatted_lines and formatted_lines[0].startswith("[Viewing"):
+        formatted_lines = formatted_lines[1:]
+    matches = []
+    for idx, formatted_line in enumerate(formatted_lines):
+        line_num, line_content = formatted_line.split(":", 1)
+        if pattern.search(line_content.strip()):
+            start, end = max(0, idx - context_lines), min(len(formatted_lines), idx + context_lines + 1)
+            context = [f"{'>' if i == idx else ' '} {formatted_lines[i]}" for i in range(start, end)]
+            matches.append((int(line_num), context))
+    return matches
+
+
+@pytest.mark.parametrize("file_name,content", [("loader.py", CODE), ("notes.md", PROSE), ("table.csv", CSV)])
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "load",
+        r"^def",
+        r"path\)$",
+        r"\bpaths?\b",
+        r"\s+",
+        r"return\s+\[",
+        r"a\nb",
+        r"^$",
+        r"(?<=\[)load",
+        r"here\.\Z",
+        r"x*",
+        "alpha|gamma",
+        r"o{2}",
+    ],
+)
+@pytest.mark.parametrize("context_lines", [0, 2])
+def test_index_matches_like_a_line_by_line_search(file_name, content, pattern, context_lines):
+    file = FileMetadata(file_name=file_name, source_id="source", content=content)
+    regex = re.compile(pattern, FLAGS)
+    assert grep_file(file, regex, limit=1000, context_lines=context_lines) == _reference_grep(file, regex, context_lines)
+
+
+def test_matching_lines_stops_at_limit():
+    index = FileLineIndex([f"line {i}" for i in range(100)])
+    assert index.matching_lines(re.compile("line", FLAGS), limit=3) == [0, 1, 2]
+    assert index.matching_lines(re.compile("line", FLAGS), limit=0) == []
+    assert FileLineIndex([]).matching_lines(re.compile("", FLAGS), limit=10) == []
+
+
+def test_registry_rebuilds_when_content_changes_and_evicts_by_size():
+    registry = FileLineIndexRegistry(max_chars=100)
+    file = FileMetadata(id="file-00000000-0000-4000-8000-000000000001", file_name="a.txt", source_id="source", content="alpha\nbeta")
+
+    index = registry.get(file)
+    assert registry.get(file) is index
+    assert registry.get(file.model_copy(update={"content": "gamma"})) is not index
+
+    registry.invalidate(file.id)
+    assert registry.get(file) is not index
+
+    other = FileMetadata(id="file-00000000-0000-4000-8000-000000000002", file_name="b.txt", source_id="source", content="x" * 95)
+    registry.get(other)
+    assert file.id not in registry._indexes and other.id in registry._indexes
+
+    oversized = FileMetadata(id="file-00000000-0000-4000-8000-000000000003", file_name="c.txt", source_id="source", content="y" * 500)
+    assert len(registry.get(oversized)) == 1
+    assert oversized.id not in registry._indexes
+
+
+@pytest.mark.parametrize(
+    "file_name,content", [("loader.py", CODE), ("notes.md", PROSE), ("table.csv", CSV), ("empty.txt", ""), ("blank.txt", " \n ")]
+)
+@pytest.mark.parametrize("start,end", [(None, None), (0, 3), (2, None), (1, 100), (3, 3), (None, 2)])
+def test_render_matches_chunk_text(file_name, content, start, end):
+    file = FileMetadata(file_name=file_name, source_id="source", content=content)
+    index = FileLineIndexRegistry(max_chars=1000).get(file)
+    try:
+        expected = "\n".join(LineChunker().chunk_text(file_metadata=file, start=start, end=end))
+    except ValueError:
+        # chunk_text rejects a start past the end; a stored range is clamped instead
+        assert index.render(start, end).startswith("[Viewing lines")
+        return
+    assert index.render(start, end) == expected
+    # a bounded render is a prefix of the view that is still longer than the bound, which is all truncation keeps
+    for max_chars in (0, 10, 40):
+        bounded = index.render(start, end, max_chars=max_chars)
+        assert expected.startswith(bounded)
+        assert bounded == expected or len(bounded) > max_chars
+
+
+def test_check_range_raises_like_chunk_text():
+    file = FileMetadata(file_name="loader.py", source_id="source", content=CODE)
+    index = FileLineIndexRegistry(max_chars=1000).get(file)
+    for start, end in [(5, 5), (50, None), (50, 60)]:
+        with pytest.raises(ValueError) as expected:
+            LineChunker().chunk_text(file_metadata=file, start=start, end=end, validate_range=True)
+        with pytest.raises(ValueError, match=re.escape(str(expected.value))):
+            index.check_range(file.file_name, start, end)
+    index.check_range(file.file_name, 0, 100)
+    # an out-of-range start renders an empty view instead of raising
+    assert index.render(50, None) == "[Viewing lines 51 to end (out of 8 lines)]"
+
+
+def test_peek_returns_an_index_only_for_its_content_version():
+    registry = FileLineIndexRegistry(max_chars=100)
+    file = FileMetadata(id="file-00000000-0000-4000-8000-000000000004", file_name="a.txt", source_id="source", content="alpha")
+    assert registry.peek(file.id, 1) is None
+
+    index = registry.get(file)
+    assert registry.peek(file.id, 1) is None
+    assert registry.get(file, version=1) is index
+    assert registry.peek(file.id, 1) is index
+    assert registry.peek(file.id, 2) is None
@@ -0,0 +1,73 @@
+import json
+import random
+
+import pytest
+
+from letta.server.rest_api.json_parser import IncrementalJSONParser
+
+
+def _feed_in_pieces(parser, text, sizes):
+    deltas = {}
+    i = 0
+    for size in sizes:
+        for key, value in parser.feed(text[i : i + size]).items():
+            deltas[key] = deltas.get(key, "") + value
+        i += size
+        if i >= len(text):
+            break
+    return deltas
+
+
+def test_streams_field_deltas_in_order():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"inner_thoughts": "Thinking') == {"inner_thoughts": "Thinking"}
+    assert parser.keys == ["inner_thoughts"]
+    assert parser.feed(' hard", "mess') == {"inner_thoughts": " hard"}
+    assert parser.is_complete("inner_thoughts")
+    assert parser.keys == ["inner_thoughts"]
+    assert parser.feed('age": "Hi') == {"message": "Hi"}
+    assert parser.feed('!"}') == {"message": "!"}
+    assert parser.done
+    assert parser.get("inner_thoughts") == "Thinking hard"
+    assert parser.get("message") == "Hi!"
+    assert json.loads(parser.text) == {"inner_thoughts": "Thinking hard", "message": "Hi!"}
+
+
+@pytest.mark.parametrize("split", range(1, 12))
+def test_escapes_split_across_chunks(split):
+    text = json.dumps({"message": 'a "quote"\n\\ tab\t é 😀 done'}, ensure_ascii=True)
+    parser = IncrementalJSONParser()
+    deltas = _feed_in_pieces(parser, text, [split] * len(text))
+    assert deltas == {"message": 'a "quote"\n\\ tab\t é 😀 done'}
+
+
+def test_skips_nested_and_scalar_values():
+    obj = {"nested": {"a": ['"}]', {"b": "{"}]}, "n": -12.5e3, "flag": True, "none": None, "message": "after"}
+    text = json.dumps(obj, indent=2)
+    parser = IncrementalJSONParser()
+    deltas = _feed_in_pieces(parser, text, [3] * len(text))
+    assert deltas == {"message": "after"}
+    assert parser.keys == list(obj)
+    assert parser.done
+
+
+def test_matches_full_parse_on_random_chunking():
+    rng = random.Random(0)
+    alphabet = 'ab "\\\n\té😀/{}[],:'
+    for _ in range(200):
+        obj = {
+            "inner_thoughts": "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 80))),
+            "args": {"x": ["y", 1]},
+            "message": "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 80))),
+        }
+        text = json.dumps(obj, ensure_ascii=rng.random() < 0.5)
+        parser = IncrementalJSONParser()
+        deltas = _feed_in_pieces(parser, text, [rng.randint(1, 8) for _ in range(len(text))])
+        assert deltas == {"inner_thoughts": obj["inner_thoughts"], "message": obj["message"]}
+
+
+def test_invalid_input_stops_without_raising():
+    parser = IncrementalJSONParser()
+    assert parser.feed("[1, 2]") == {}
+    assert parser.keys == []
+    assert parser.text == "[1, 2]"
@@ -0,0 +1,262 @@
+import json
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+import pytest
+
+from letta.errors import LocalLLMError
+from letta.interfaces.openai_streaming_interface import SimpleOpenAIStreamingInterface
+from letta.llm_api.llm_client import LLMClient
+from letta.llm_api.local_llm_client import LocalLLMClient
+from letta.local_llm import utils as local_llm_utils
+from letta.local_llm.chat_completion_proxy import (
+    _generate_grammar_and_documentation,
+    generate_grammar_and_documentation,
+    get_chat_completion_async,
+)
+from letta.local_llm.grammars.grammar_cache import GrammarCache, grammar_cache, grammar_cache_key
+from letta.local_llm.koboldcpp.api import get_koboldcpp_completion_async
+from letta.local_llm.llamacpp.api import get_llamacpp_completion_async
+from letta.local_llm.ollama.api import get_ollama_completion_async
+from letta.local_llm.webui.api import get_webui_completion_async
+from letta.schemas.enums import AgentType, MessageRole
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message as PydanticMessage
+
+FUNCTION_CALL = json.dumps({"function": "send_message", "params": {"inner_thoughts": "Say hello.", "message": "Hello there!"}})
+FUNCTIONS = [
+    {
+        "name": "send_message",
+        "description": "Sends a message to the human user.",
+        "parameters": {
+            "type": "object",
+            "properties": {"message": {"type": "string", "description": "Message contents."}},
+            "required": ["message"],
+        },
+    }
+]
+MESSAGES = [{"role": "system", "content": "You are a helpful agent."}, {"role": "user", "content": "Hi!"}]
+
+
+def send_message(self, message: str) -> Optional[str]:
+    """
+    Sends a message to the human user.
+
+    Args:
+        message (str): Message contents. All unicode (including emojis) are supported.
+
+    Returns:
+        Optional[str]: None is always returned as this function does not produce a response.
+    """
+
+
+def archival_memory_search(self, query: str, page: Optional[int] = 0) -> Optional[str]:
+    """
+    Search archival memory using semantic (embedding-based) search.
+
+    Args:
+        query (str): String to search for.
+        page (Optional[int]): Allows you to page through results. Defaults to 0 (first page).
+
+    Returns:
+        str: Query result string
+    """
+
+
+def _pieces(text: str, size: int = 7) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _sse(chunks: list[dict], done: bool = False) -> str:
+    return "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + ("data: [DONE]\n\n" if done else "")
+
+
+def _backend(monkeypatch, handler) -> list[dict]:
+    """Route the local LLM client to ``handler``; returns the request bodies it received."""
+    received = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        received.append({"url": str(request.url), **json.loads(request.content)})
+        return handler(received[-1])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+    @asynccontextmanager
+    async def shared_http_client(provider, base_url=None):
+        yield client
+
+    monkeypatch.setattr(local_llm_utils, "shared_http_client", shared_http_client)
+    return received
+
+
+def _llamacpp(body: dict) -> httpx.Response:
+    if body.get("stream"):
+        chunks = [{"content": piece, "stop": False} for piece in _pieces(FUNCTION_CALL)]
+        return httpx.Response(200, text=_sse([*chunks, {"content": "", "stop": True, "tokens_predicted": 21}]))
+    return httpx.Response(200, json={"content": FUNCTION_CALL, "tokens_predicted": 21})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_llamacpp_completion_async(monkeypatch, stream):
+    received = _backend(monkeypatch, _llamacpp)
+    tokens = []
+    result, usage = await get_llamacpp_completion_async(
+        "http://localhost:8080", None, None, "prompt", 8000, grammar="root ::= x", on_token=tokens.append if stream else None
+    )
+    assert result == FUNCTION_CALL
+    assert usage == {"prompt_tokens": 1, "completion_tokens": 21, "total_tokens": 22}
+    assert received[0]["url"] == "http://localhost:8080/completion" and received[0]["grammar"] == "root ::= x"
+    assert tokens == (_pieces(FUNCTION_CALL) if stream else [])
+
+
+@pytest.mark.asyncio
+async def test_streaming_backends_reassemble_the_completion(monkeypatch):
+    def handler(body: dict) -> httpx.Response:
+        if body["url"].endswith("/api/extra/generate/stream"):
+            return httpx.Response(
+                200, text="".join(f"event: message\ndata: {json.dumps({'token': p})}\n\n" for p in _pieces(FUNCTION_CALL))
+            )
+        if body["url"].endswith("/api/generate"):
+            lines = [{"response": piece, "done": False} for piece in _pieces(FUNCTION_CALL)] + [
+                {"response": "", "done": True, "eval_count": 21}
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+        chunks = [{"choices": [{"text": piece}]} for piece in _pieces(FUNCTION_CALL)]
+        return httpx.Response(200, text=_sse([*chunks, {"choices": [], "usage": {"completion_tokens": 21}}], done=True))
+
+    _backend(monkeypatch, handler)
+    kobold_tokens, ollama_tokens, webui_tokens = [], [], []
+    kobold = await get_koboldcpp_completion_async("http://localhost:5001", None, None, "prompt", 8000, on_token=kobold_tokens.append)
+    ollama = await get_ollama_completion_async(
+        "http://localhost:11434", None, None, "llama3", "prompt", 8000, on_token=ollama_tokens.append
+    )
+    webui = await get_webui_completion_async("http://localhost:5000", None, None, "prompt", 8000, on_token=webui_tokens.append)
+
+    assert kobold[0] == ollama[0] == webui[0] == FUNCTION_CALL
+    assert kobold_tokens == ollama_tokens == webui_tokens == _pieces(FUNCTION_CALL)
+    assert ollama[1]["completion_tokens"] == webui[1]["completion_tokens"] == 21
+
+
+@pytest.mark.asyncio
+async def test_get_chat_completion_async(monkeypatch):
+    received = _backend(monkeypatch, _llamacpp)
+    tokens = []
+    response = await get_chat_completion_async(
+        model="local",
+        messages=MESSAGES,
+        functions=FUNCTIONS,
+        functions_python={"send_message": send_message},
+        context_window=8000,
+        wrapper="chatml-grammar",
+        endpoint="http://localhost:8080",
+        endpoint_type="llamacpp",
+        on_token=tokens.append,
+    )
+    message = response.choices[0].message
+    assert message.content == "Say hello."
+    assert message.tool_calls[0].function.name == "send_message"
+    assert json.loads(message.tool_calls[0].function.arguments) == {"message": "Hello there!"}
+    assert "".join(tokens) == FUNCTION_CALL
+    assert received[0]["stream"] is True and "send_message" in received[0]["grammar"]
+
+
+@pytest.mark.asyncio
+async def test_get_chat_completion_async_connection_error(monkeypatch):
+    from letta.errors import LocalLLMConnectionError
+
+    def refuse(body: dict) -> httpx.Response:
+        raise httpx.ConnectError("connection refused")
+
+    _backend(monkeypatch, refuse)
+    with pytest.raises(LocalLLMConnectionError):
+        await get_chat_completion_async(
+            model="local",
+            messages=MESSAGES,
+            functions=FUNCTIONS,
+            context_window=8000,
+            wrapper="chatml",
+            endpoint="http://localhost:8080",
+            endpoint_type="llamacpp",
+        )
+
+
+def test_grammar_cache_reuses_grammar_for_identical_tool_sets():
+    grammar_cache.clear()
+    tools = {"send_message": send_message, "archival_memory_search": archival_memory_search}
+    options = dict(add_inner_thoughts_top_level=False, add_inner_thoughts_param_level=True, allow_only_inner_thoughts=False)
+
+    first = generate_grammar_and_documentation(functions_python=tools, **options)
+    # same tool set (in any order) and options: the cached grammar
+    assert generate_grammar_and_documentation(functions_python=dict(reversed(tools.items())), **options) is first
+    assert first == _generate_grammar_and_documentation(functions_python=tools, **options)
+
+    # a different tool set or different wrapper options build a new one
+    assert generate_grammar_and_documentation(functions_python={"send_message": send_message}, **options) != first
+    noforce = dict(add_inner_thoughts_top_level=True, add_inner_thoughts_param_level=False, allow_only_inner_thoughts=True)
+    assert generate_grammar_and_documentation(functions_python=tools, **noforce) != first
+    assert grammar_cache.hits == 1 and grammar_cache.misses == 3
+
+
+def test_grammar_cache_evicts_least_recently_used():
+    cache = GrammarCache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get_or_create(key, lambda key=key: (key, key))
+    assert len(cache) == 2 and cache.hits == 1
+    assert grammar_cache_key({"send_message": send_message}, allow_only_inner_thoughts=True) != grammar_cache_key(
+        {"send_message": send_message}, allow_only_inner_thoughts=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_agents_reach_local_backends_through_the_llm_client(monkeypatch):
+    received = _backend(monkeypatch, _llamacpp)
+    llm_config = LLMConfig(
+        model="local", model_endpoint_type="llamacpp", model_endpoint="http://localhost:8080", model_wrapper="chatml", context_window=8000
+    )
+    client = LLMClient.create(provider_type=llm_config.model_endpoint_type)
+    assert isinstance(client, LocalLLMClient)
+
+    messages = [
+        PydanticMessage(role=MessageRole.system, content=[TextContent(text="You are a helpful agent.")]),
+        PydanticMessage(role=MessageRole.user, content=[TextContent(text="Hi!")]),
+    ]
+    request_data = client.build_request_data(AgentType.memgpt_v2_agent, messages, llm_config, tools=FUNCTIONS, system="Be brief.")
+    response = await client.convert_response_to_chat_completion(await client.request_async(request_data, llm_config), messages, llm_config)
+
+    tool_call = response.choices[0].message.tool_calls[0]
+    assert tool_call.function.name == "send_message"
+    assert json.loads(tool_call.function.arguments) == {"message": "Hello there!"}
+    assert "Be brief." in received[0]["prompt"] and "send_message" in received[0]["prompt"]
+
+    # grammar formatters need the tools' Python functions, which async agents do not have
+    with pytest.raises(LocalLLMError):
+        client.build_request_data(
+            AgentType.memgpt_v2_agent, messages, llm_config.model_copy(update={"model_wrapper": "chatml-grammar"}), tools=FUNCTIONS
+        )
+
+
+@pytest.mark.asyncio
+async def test_local_llm_client_streams_the_parsed_completion(monkeypatch):
+    _backend(monkeypatch, _llamacpp)
+    llm_config = LLMConfig(
+        model="local", model_endpoint_type="llamacpp", model_endpoint="http://localhost:8080", model_wrapper="chatml", context_window=8000
+    )
+    client = LocalLLMClient()
+    messages = [
+        PydanticMessage(role=MessageRole.system, content=[TextContent(text="You are a helpful agent.")]),
+        PydanticMessage(role=MessageRole.user, content=[TextContent(text="Hi!")]),
+    ]
+    request_data = client.build_request_data(AgentType.memgpt_v2_agent, messages, llm_config, tools=FUNCTIONS)
+
+    interface = SimpleOpenAIStreamingInterface(model=llm_config.model)
+    events = [event async for event in interface.process(await client.stream_async(request_data, llm_config))]
+
+    assert interface.total_events_received > len(_pieces(FUNCTION_CALL))  # an empty chunk per backend token
+    tool_call = interface.get_tool_call_object()
+    assert tool_call.function.name == "send_message"
+    assert json.loads(tool_call.function.arguments) == {"message": "Hello there!"}
+    assert interface.input_tokens and interface.output_tokens  # from the trailing usage chunk
+    assert events
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from letta.schemas.enums import SandboxType
+from letta.schemas.sandbox_config import LocalSandboxConfig, SandboxConfigCreate
+from letta.services.sandbox_config_manager import SandboxConfigManager
+from letta.services.tool_sandbox.local_sandbox import AsyncToolSandboxLocal
+from letta.services.tool_sandbox.local_worker_pool import LocalSandboxWorkerPool, WorkerCrashedError
+from letta.settings import tool_settings
+from tests.helpers.utils import create_tool_from_func
+
+
+@pytest.fixture
+async def pool():
+    pool = LocalSandboxWorkerPool(size=1, max_calls=3, idle_seconds=60)
+    yield pool
+    await pool.aclose()
+
+
+async def _run(pool, code, tmp_path, env=None, timeout=30):
+    return await pool.run(
+        python_executable=sys.executable,
+        code=code,
+        filename=str(tmp_path / "tool.py"),
+        env={**os.environ, **(env or {})},
+        cwd=str(tmp_path),
+        requirements_hash="",
+        timeout=timeout,
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_output_matches_a_fresh_interpreter(pool, tmp_path):
+    result = await _run(
+        pool, "import os, sys\nprint(os.environ['TOOL_SECRET'], os.getcwd())\nsys.stderr.write('warn')\n", tmp_path, {"TOOL_SECRET": "s1"}
+    )
+    assert result.returncode == 0
+    assert result.stdout.decode() == f"s1 {tmp_path}\n"
+    assert result.stderr.decode() == "warn"
+
+    failed = await _run(pool, "raise ValueError('bad input')\n", tmp_path)
+    assert failed.returncode == 1
+    assert failed.stderr.decode().splitlines()[-1] == "ValueError: bad input"
+
+    exited = await _run(pool, "import sys\nsys.exit(3)\n", tmp_path)
+    assert exited.returncode == 3
+
+
+@pytest.mark.asyncio
+async def test_calls_do_not_see_each_others_state(pool, tmp_path):
+    await _run(pool, "import os\nos.environ['LEAKED'] = '1'\nleaked_global = 1\nos.chdir('/')\n", tmp_path, {"TOOL_SECRET": "s1"})
+
+    result = await _run(
+        pool,
+        "import os\nprint(os.environ.get('TOOL_SECRET'), os.environ.get('LEAKED'), 'leaked_global' in globals(), os.getcwd())\n",
+        tmp_path,
+    )
+    assert result.stdout.decode() == f"None None False {tmp_path}\n"
+
+
+@pytest.mark.asyncio
+async def test_calls_cannot_tamper_with_later_calls(pool, tmp_path):
+    patch = (
+        "import builtins, sys, types\n"
+        "builtins.print = lambda *args, **kwargs: open('/dev/null', 'w')\n"
+        "sys.modules['json'] = types.ModuleType('json')\n"
+    )
+    await _run(pool, patch, tmp_path)
+
+    result = await _run(
+        pool, "import json, os\nprint(json.dumps({'secret': os.environ['TOOL_SECRET']}))\n", tmp_path, {"TOOL_SECRET": "s2"}
+    )
+    assert result.stdout.decode() == '{"secret": "s2"}\n'
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+async def test_calls_have_no_handle_on_the_worker_pipes(pool, tmp_path):
+    result = await _run(pool, "import os\nprint(sorted(int(fd) for fd in os.listdir('/proc/self/fd')))\n", tmp_path)
+    # stdin, the stdout/stderr capture files, and the descriptor listdir itself opened
+    assert result.stdout.decode() == "[0, 1, 2, 3]\n"
+
+
+@pytest.mark.asyncio
+async def test_workers_are_reused_then_recycled(pool, tmp_path):
+    worker_pids = [(await _run(pool, "import os\nprint(os.getppid())\n", tmp_path)).stdout for _ in range(4)]
+    # max_calls=3: the first worker serves three calls, then a fresh one takes over
+    assert len(set(worker_pids[:3])) == 1
+    assert worker_pids[3] != worker_pids[0]
+
+
+@pytest.mark.asyncio
+async def test_timeout_discards_the_worker_but_exit_does_not(pool, tmp_path):
+    pool.max_calls = 10
+    first_pid = (await _run(pool, "import os\nprint(os.getppid())\n", tmp_path)).stdout
+
+    crashed = await _run(pool, "import os\nos._exit(7)\n", tmp_path)
+    assert crashed.returncode == 7
+    assert (await _run(pool, "import os\nprint(os.getppid())\n", tmp_path)).stdout == first_pid
+
+    with pytest.raises(asyncio.TimeoutError):
+        await _run(pool, "import time\ntime.sleep(30)\n", tmp_path, timeout=1)
+    assert (await _run(pool, "import os\nprint(os.getppid())\n", tmp_path)).stdout != first_pid
+
+
+@pytest.mark.asyncio
+async def test_worker_start_failures_are_not_tool_timeouts(pool, tmp_path):
+    with pytest.raises(WorkerCrashedError):
+        await pool.run(
+            python_executable=str(tmp_path / "missing-python"),
+            code="print(1)\n",
+            filename=str(tmp_path / "tool.py"),
+            env=dict(os.environ),
+            cwd=str(tmp_path),
+            requirements_hash="",
+            timeout=30,
+        )
+    # too short for the worker's imports: reported as a pool failure, so the sandbox falls back to a subprocess
+    with pytest.raises(WorkerCrashedError):
+        await _run(pool, "print(1)\n", tmp_path, timeout=0.001)
+
+
+def echo_tool(message: str):
+    """
+    Args:
+        message (str): The message to echo.
+
+    Returns:
+        str: The message that was echoed.
+    """
+    print(message)
+    return message
+
+
+@pytest.mark.asyncio
+async def test_sandbox_results_are_unchanged_by_the_worker_pool(default_user, tmp_path, monkeypatch):
+    sandbox_config = await SandboxConfigManager().create_or_update_sandbox_config_async(
+        SandboxConfigCreate(config=LocalSandboxConfig(sandbox_dir=str(tmp_path))), actor=default_user
+    )
+    assert sandbox_config.type == SandboxType.LOCAL
+    tool = create_tool_from_func(echo_tool)
+
+    async def run_tool():
+        sandbox = AsyncToolSandboxLocal(
+            tool.name, {"message": "hello"}, default_user, tool_id=tool.id, tool_object=tool, sandbox_config=sandbox_config
+        )
+        return await sandbox.run()
+
+    monkeypatch.setattr(tool_settings, "tool_exec_worker_pool_enabled", False)
+    subprocess_result = await run_tool()
+
+    monkeypatch.setattr(tool_settings, "tool_exec_worker_pool_enabled", True)
+    await run_tool()  # cold: starts the first worker
+    pooled_result = await run_tool()
+
+    assert pooled_result.func_return == subprocess_result.func_return == "hello"
+    assert pooled_result.stdout == subprocess_result.stdout == ["hello\n"]
+    assert pooled_result.status == subprocess_result.status == "success"
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from mcp import Tool as MCPTool
+
+from letta.functions.mcp_client.types import SSEServerConfig, StdioServerConfig
+from letta.schemas.user import User as PydanticUser
+from letta.services.mcp.session_pool import MCPSessionPool, mcp_session_key
+
+_clients = []
+
+
+class _FakeClient:
+    """Records the calls the pool makes on an MCP client."""
+
+    def __init__(self):
+        self.connected = False
+        self.cleaned_up = False
+        self.ping_fails = False
+        self.calls = 0
+        self.list_calls = 0
+        self.running = 0
+        self.max_running = 0
+        _clients.append(self)
+
+    async def connect_to_server(self):
+        self.connected = True
+
+    async def execute_tool(self, tool_name, tool_args):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return f"{tool_name}:{tool_args['x']}", True
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return [MCPTool(name="echo", inputSchema={"type": "object", "properties": {}})]
+
+    async def ping(self):
+        if self.ping_fails:
+            raise ConnectionError("server went away")
+
+    async def cleanup(self):
+        self.cleaned_up = True
+
+
+async def _factory():
+    return _FakeClient()
+
+
+@pytest.fixture
+async def pool():
+    _clients.clear()
+    pool = MCPSessionPool(max_sessions=2, idle_seconds=60, max_concurrency=2, health_check_seconds=60, tools_ttl_seconds=60)
+    yield pool
+    await pool.aclose()
+
+
+KEY = ("org-1", "server", "hash", None, None)
+
+ALICE = PydanticUser(name="alice", organization_id="org-00000000-0000-4000-8000-000000000000")
+BOB = PydanticUser(name="bob", organization_id="org-00000000-0000-4000-8000-000000000000")
+
+
+def test_session_key_hashes_config_and_drops_agent_and_user_for_stdio():
+    stdio = StdioServerConfig(server_name="local", command="npx", args=["server"], env={"TOKEN": "a"})
+    assert mcp_session_key(ALICE, stdio, "agent-1") == mcp_session_key(BOB, stdio, "agent-2")
+    assert "a" not in mcp_session_key(ALICE, stdio)[2:]
+
+    rotated = StdioServerConfig(server_name="local", command="npx", args=["server"], env={"TOKEN": "b"})
+    assert mcp_session_key(ALICE, stdio) != mcp_session_key(ALICE, rotated)
+
+    sse = SSEServerConfig(server_name="remote", server_url="https://example.com/sse")
+    assert mcp_session_key(ALICE, sse, "agent-1") != mcp_session_key(ALICE, sse, "agent-2")
+
+
+@pytest.mark.asyncio
+async def test_users_in_one_organization_get_separate_http_sessions(pool):
+    # each user's client is built with their own OAuth session, so it must never be handed to another user
+    sse = SSEServerConfig(server_name="remote", server_url="https://example.com/sse")
+    clients = {}
+
+    def factory_for(user):
+        async def factory():
+            clients[user.id] = _FakeClient()
+            return clients[user.id]
+
+        return factory
+
+    for user in (ALICE, BOB, ALICE):
+        await pool.execute_tool(mcp_session_key(user, sse), factory_for(user), "add", {"x": 1})
+
+    assert len(_clients) == 2
+    assert clients[ALICE.id] is not clients[BOB.id]
+    assert (clients[ALICE.id].calls, clients[BOB.id].calls) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_calls_reuse_one_session_with_bounded_concurrency(pool):
+    results = await asyncio.gather(*(pool.execute_tool(KEY, _factory, "add", {"x": i}) for i in range(6)))
+
+    assert results == [(f"add:{i}", True) for i in range(6)]
+    assert len(_clients) == 1
+    client = _clients[0]
+    assert client.calls == 6
+    assert client.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_health_check_reconnects(pool):
+    await pool.execute_tool(KEY, _factory, "add", {"x": 1})
+    first = _clients[0]
+
+    first.ping_fails = True
+    pool._sessions[KEY].needs_health_check = True
+    assert await pool.execute_tool(KEY, _factory, "add", {"x": 2}) == ("add:2", True)
+
+    assert len(_clients) == 2
+    await asyncio.sleep(0)
+    assert first.cleaned_up
+
+
+@pytest.mark.asyncio
+async def test_idle_and_least_recently_used_sessions_are_closed(pool):
+    await pool.execute_tool(KEY, _factory, "add", {"x": 1})
+    await pool.execute_tool(("org-1", "other", "hash", None, None), _factory, "add", {"x": 1})
+    await pool.execute_tool(("org-2", "server", "hash", None, None), _factory, "add", {"x": 1})
+
+    # max_sessions=2: the least recently used session was closed
+    assert KEY not in pool._sessions
+    assert len(pool) == 2
+
+    pool.idle_seconds = 0
+    await pool.execute_tool(KEY, _factory, "add", {"x": 1})
+    assert list(pool._sessions) == [KEY]
+    await asyncio.sleep(0.01)
+    assert [c.cleaned_up for c in _clients] == [True, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_list_tools_is_cached_until_refreshed_or_evicted(pool):
+    tools = await pool.list_tools(KEY, _factory)
+    tools[0].name = "mutated-by-caller"
+    assert [t.name for t in await pool.list_tools(KEY, _factory)] == ["echo"]
+    client = _clients[0]
+    assert client.list_calls == 1
+
+    await pool.list_tools(KEY, _factory, force_refresh=True)
+    assert client.list_calls == 2
+
+    await pool.evict("org-1", "server")
+    assert len(pool) == 0
+    assert client.cleaned_up
+    await pool.list_tools(KEY, _factory)
+    assert len(_clients) == 2
@@ -1,9 +1,13 @@
+import json
+
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall, Function
 
+from letta.helpers.message_dict_cache import get_message_dict_cache, reset_message_dict_cache
 from letta.llm_api.openai_client import fill_image_content_in_responses_input
 from letta.schemas.enums import MessageRole
 from letta.schemas.letta_message_content import Base64Image, ImageContent, TextContent
 from letta.schemas.message import Message
+from letta.settings import settings
 
 
 def _user_message_with_image_first(text: str) -> Message:
@@ -126,3 +130,94 @@ def test_to_google_dict_no_signature_when_absent():
     function_calls = [p for p in serialized["parts"] if "functionCall" in p]
     assert len(function_calls) == 1
     assert "thought_signature" not in function_calls[0]
+
+
+def _stored_conversation(turns: int) -> list:
+    """A window like one loaded from the database: every message has updated_at set."""
+    from datetime import datetime, timezone
+
+    from openai.types.chat.chat_completion_message_function_tool_call import ChatCompletionMessageFunctionToolCall
+
+    from letta.schemas.message import ToolReturn
+
+    loaded_at = datetime.now(timezone.utc)
+    messages = [Message(role=MessageRole.system, content=[TextContent(text="system " * 2000)], updated_at=loaded_at)]
+    for i in range(turns):
+        call_id = f"call_{i:020d}"
+        messages += [
+            Message(role=MessageRole.user, content=[TextContent(text=json.dumps({"message": "hello " * 50}))], updated_at=loaded_at),
+            Message(
+                role=MessageRole.assistant,
+                content=[TextContent(text="thinking " * 30)],
+                tool_calls=[
+                    ChatCompletionMessageFunctionToolCall(
+                        id=call_id,
+                        type="function",
+                        function=Function(name="send_message", arguments=json.dumps({"message": "reply " * 60})),
+                    )
+                ],
+                updated_at=loaded_at,
+            ),
+            Message(
+                role=MessageRole.tool,
+                content=[TextContent(text=json.dumps({"status": "OK"}))],
+                name="send_message",
+                tool_call_id=call_id,
+                tool_returns=[
+                    ToolReturn(tool_call_id=call_id, status="success", func_response=json.dumps({"status": "OK", "message": "x" * 500}))
+                ],
+                updated_at=loaded_at,
+            ),
+        ]
+    return messages
+
+
+def _convert_all(messages: list) -> list:
+    return [
+        Message.to_openai_dicts_from_list(messages, put_inner_thoughts_in_kwargs=True),
+        Message.to_openai_responses_dicts_from_list(messages),
+        Message.to_anthropic_dicts_from_list(messages, current_model="claude-sonnet-4", put_inner_thoughts_in_kwargs=True),
+        Message.to_google_dicts_from_list(messages, current_model="gemini-2.5-flash"),
+    ]
+
+
+def test_provider_dicts_are_memoized_per_message(monkeypatch):
+    messages = _stored_conversation(turns=5)
+    monkeypatch.setattr(settings, "message_dict_cache_max_entries", 0)
+    reset_message_dict_cache()
+    uncached = _convert_all(messages)
+
+    monkeypatch.setattr(settings, "message_dict_cache_max_entries", 1000)
+    reset_message_dict_cache()
+    assert _convert_all(messages) == uncached
+    assert _convert_all(messages) == uncached
+    cache = get_message_dict_cache()
+    # the system message is never cached: request builders override its content in place
+    assert cache.misses == cache.hits == 4 * (len(messages) - 1)
+
+    # callers decorate the returned dicts, which must not leak into the next step
+    anthropic = _convert_all(messages)[2]
+    anthropic[-1]["content"][0]["cache_control"] = {"type": "ephemeral"}
+    assert _convert_all(messages)[2] == uncached[2]
+
+
+def test_changed_messages_are_converted_again():
+    from datetime import timedelta
+
+    messages = _stored_conversation(turns=2)
+    before = Message.to_openai_dicts_from_list(messages)
+
+    # a field reassigned in memory is no longer what the cached dicts describe
+    messages[1].content = [TextContent(text="edited in memory")]
+    assert Message.to_openai_dicts_from_list(messages)[1]["content"] == "edited in memory"
+
+    # a newer stored version of the message replaces the cached one
+    edited = messages[2].model_copy(update={"content": [TextContent(text="edited and saved")]})
+    reloaded = Message.model_validate({**edited.model_dump(), "updated_at": edited.updated_at + timedelta(seconds=1)})
+    after = Message.to_openai_dicts_from_list([*messages[:2], reloaded, *messages[3:]])
+    assert after[2]["content"] == "edited and saved"
+    assert after[3:] == before[3:]
+
+    # the system message is rebuilt in place with the same id
+    messages[0].content = [TextContent(text="rebuilt system prompt")]
+    assert Message.to_openai_dicts_from_list(messages)[0]["content"] == "rebuilt system prompt"
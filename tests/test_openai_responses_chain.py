@@ -0,0 +1,196 @@
+"""
+Unit tests for chaining OpenAI Responses API requests with previous_response_id.
+"""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+from openai.types.responses import ResponseErrorEvent
+
+from letta.llm_api.openai_client import OpenAIClient
+from letta.llm_api.openai_responses_chain import ResponsesChain, is_previous_response_error
+from letta.schemas.llm_config import LLMConfig
+
+SYSTEM = {"role": "developer", "content": "You are a helpful agent.\n<memory_blocks>" + "x" * 20_000 + "</memory_blocks>"}
+
+
+def _step_output(i: int) -> list[dict]:
+    """What the model produced in step ``i``: reasoning, a message and a tool call."""
+    return [
+        {"type": "reasoning", "id": f"rs_{i}", "summary": [], "encrypted_content": "e" * 500},
+        {"role": "assistant", "content": f"Looking that up ({i})."},
+        {"type": "function_call", "call_id": f"call_{i}", "name": "search", "arguments": '{"q": "x"}', "status": "completed"},
+    ]
+
+
+def _tool_result(i: int) -> dict:
+    return {"type": "function_call_output", "call_id": f"call_{i}", "output": f"result {i} " + "r" * 2_000}
+
+
+def _request(items: list[dict], system: dict = SYSTEM) -> dict:
+    return {"model": "gpt-5", "input": [system, *items], "tools": [], "store": False, "include": ["reasoning.encrypted_content"]}
+
+
+def _run_steps(chain: ResponsesChain | None, steps: int) -> list[dict]:
+    """Simulate an agent run: every step sends the full input, then appends the model output and the tool result."""
+    history = [{"role": "user", "content": "Find it."}]
+    sent = []
+    for i in range(steps):
+        request = _request(history)
+        sent.append(chain.prepare(request) if chain else request)
+        if chain:
+            chain.record(f"resp_{i}")
+        history = [*history, *_step_output(i), _tool_result(i)]
+    return sent
+
+
+class TestResponsesChain:
+    def test_first_request_sends_full_input_and_stores(self):
+        chain = ResponsesChain()
+        request = _request([{"role": "user", "content": "hi"}])
+        sent = chain.prepare(request)
+        assert sent["input"] == request["input"]
+        assert sent["store"] is True and "previous_response_id" not in sent
+        assert chain.last_request_bytes == len(json.dumps(sent).encode())
+
+    def test_next_step_sends_only_new_items(self):
+        chain = ResponsesChain()
+        sent = _run_steps(chain, 3)
+        assert sent[1]["previous_response_id"] == "resp_0"
+        assert sent[1]["input"] == [_tool_result(0)]
+        assert sent[2]["previous_response_id"] == "resp_1"
+        assert sent[2]["input"] == [_tool_result(1)]
+        assert chain.chained_requests == 2 and chain.full_requests == 1
+
+    def test_websocket_requests_are_not_stored(self):
+        chain = ResponsesChain()
+        first = chain.prepare(_request([{"role": "user", "content": "hi"}]), store=False)
+        chain.record("resp_0")
+        second = chain.prepare(_request([{"role": "user", "content": "hi"}, {"role": "user", "content": "again"}]), store=False)
+        assert first["store"] is False and second["store"] is False
+        assert second["previous_response_id"] == "resp_0"
+
+    def test_changed_prefix_sends_full_input(self):
+        chain = ResponsesChain()
+        history = [{"role": "user", "content": "Find it."}]
+        chain.prepare(_request(history))
+        chain.record("resp_0")
+        history = [*history, *_step_output(0), _tool_result(0)]
+
+        # a system prompt rebuild (e.g. a memory edit) changes the first item
+        edited = {"role": "developer", "content": SYSTEM["content"] + " edited"}
+        sent = chain.prepare(_request(history, system=edited))
+        assert "previous_response_id" not in sent and sent["input"][0] == edited
+        chain.record("resp_1")
+
+        # compaction replaces the head of the history with a summary
+        compacted = [{"role": "user", "content": "Summary of the conversation so far."}, _tool_result(0)]
+        sent = chain.prepare(_request(compacted, system=edited))
+        assert "previous_response_id" not in sent and len(sent["input"]) == 3
+
+    def test_changed_model_or_failed_step_sends_full_input(self):
+        chain = ResponsesChain()
+        history = [{"role": "user", "content": "Find it."}]
+        chain.prepare(_request(history))
+        chain.record("resp_0")
+        history = [*history, *_step_output(0), _tool_result(0)]
+
+        assert "previous_response_id" not in chain.prepare({**_request(history), "model": "gpt-5-mini"})
+        chain.record(None)
+        assert chain.response_id is None
+        assert "previous_response_id" not in chain.prepare(_request(history))
+
+    def test_is_previous_response_error(self):
+        request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+        not_found = openai.BadRequestError(
+            "Previous response with id 'resp_0' not found.",
+            response=httpx.Response(400, request=request),
+            body={"code": "previous_response_not_found", "message": "Previous response with id 'resp_0' not found."},
+        )
+        assert is_previous_response_error(not_found)
+        event = ResponseErrorEvent(type="error", code="previous_response_not_found", message="not found", param=None, sequence_number=0)
+        assert is_previous_response_error(event)
+        assert not is_previous_response_error(ValueError("rate limited"))
+
+    def test_chained_requests_send_a_fraction_of_the_bytes(self):
+        steps = 20
+        full = sum(len(json.dumps(request).encode()) for request in _run_steps(None, steps))
+        chain = ResponsesChain()
+        chained = 0
+        history = [{"role": "user", "content": "Find it."}]
+        for i in range(steps):
+            chain.prepare(_request(history))
+            chained += chain.last_request_bytes
+            chain.record(f"resp_{i}")
+            history = [*history, *_step_output(i), _tool_result(i)]
+        assert chained * 5 < full
+
+
+def _llm_config() -> LLMConfig:
+    return LLMConfig(model="gpt-5", model_endpoint_type="openai", model_endpoint="https://api.openai.com/v1", context_window=128000)
+
+
+class TestOpenAIClientChaining:
+    @pytest.mark.asyncio
+    async def test_http_resends_full_input_when_previous_response_is_gone(self):
+        chain = ResponsesChain()
+        history = [{"role": "user", "content": "Find it."}]
+        chain.prepare(_request(history))
+        chain.record("resp_0")
+        history = [*history, *_step_output(0), _tool_result(0)]
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+        expired = openai.NotFoundError(
+            "Previous response with id 'resp_0' not found.",
+            response=httpx.Response(404, request=request),
+            body={"code": "previous_response_not_found"},
+        )
+        stream = MagicMock()
+        client = MagicMock()
+        client.responses.create = AsyncMock(side_effect=[expired, stream])
+
+        with (
+            patch.object(OpenAIClient, "_prepare_client_kwargs_async", AsyncMock(return_value={})),
+            patch("letta.llm_api.openai_client.get_pooled_client", return_value=client),
+        ):
+            result = await OpenAIClient().stream_async(_request(history), _llm_config(), responses_chain=chain)
+
+        assert result is stream
+        chained, full = (call.kwargs for call in client.responses.create.call_args_list)
+        assert chained["previous_response_id"] == "resp_0" and chained["input"] == [_tool_result(0)]
+        assert "previous_response_id" not in full and len(full["input"]) == len(history) + 1
+        assert chain.last_request_bytes == len(json.dumps({k: v for k, v in full.items() if k != "stream"}).encode())
+
+    @pytest.mark.asyncio
+    async def test_websocket_resends_full_input_after_error_event(self):
+        chain = ResponsesChain()
+        history = [{"role": "user", "content": "Find it."}]
+        chain.prepare(_request(history), store=False)
+        chain.record("resp_0")
+        history = [*history, *_step_output(0), _tool_result(0)]
+
+        error = ResponseErrorEvent(type="error", code="previous_response_not_found", message="gone", param=None, sequence_number=0)
+        completed = MagicMock(type="response.completed")
+        sent = []
+
+        class FakeSession:
+            async def stream_responses(self, request_data):
+                sent.append(request_data)
+                if "previous_response_id" in request_data:
+                    yield error
+                else:
+                    yield completed
+
+        stream = await OpenAIClient().stream_async(
+            _request(history), _llm_config(), use_websocket=True, ws_session=FakeSession(), responses_chain=chain
+        )
+        events = [event async for event in stream]
+
+        assert events == [completed]
+        assert [("previous_response_id" in request) for request in sent] == [True, False]
+        assert all(request["store"] is False for request in sent)
@@ -8,10 +8,12 @@ large parameters to prevent memory bloat and RESOURCE_EXHAUSTED errors.
 import pytest
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags
 
 from letta.otel.tracing import trace_method
 from letta.schemas.letta_message_content import TextContent
 from letta.schemas.message import Message, MessageRole
+from letta.settings import telemetry_settings
 
 
 class CaptureSpanProcessor:
@@ -299,3 +301,59 @@ def test_serialization_failure_handled(span_processor):
     # Normal param should work
     assert "normal_param" in attrs
     assert attrs["normal_param"] == "test"
+
+
+class CountingRepr:
+    """Parameter that records how often tracing serialized it."""
+
+    def __init__(self):
+        self.id = "obj-123"
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "CountingRepr(" + "R" * 4096 + ")"
+
+
+def _unsampled_parent():
+    # a span whose trace the sampler dropped; children inherit the decision (ParentBased sampling)
+    context = SpanContext(trace_id=0x1234, span_id=0x5678, is_remote=False, trace_flags=TraceFlags(TraceFlags.DEFAULT))
+    return trace.use_span(NonRecordingSpan(context))
+
+
+def test_unsampled_span_skips_parameter_capture(span_processor):
+    @trace_method
+    def test_func(obj):
+        return "success"
+
+    obj = CountingRepr()
+    with _unsampled_parent():
+        assert test_func(obj=obj) == "success"
+
+    assert obj.calls == 0
+    assert span_processor.spans == []
+
+
+def test_capture_policies(span_processor, monkeypatch):
+    class Manager:
+        @trace_method
+        def get(self, agent_id, actor, data):
+            return "success"
+
+    obj = CountingRepr()
+    Manager().get("agent-1", obj, "D" * 5000)
+    attrs = get_span_attributes(span_processor.spans[-1])
+    assert "self" not in attrs
+    assert len(attrs["data"]) < 1200 and "truncated" in attrs["data"]
+    assert len(attrs["actor"]) < 1200
+
+    monkeypatch.setattr(telemetry_settings, "trace_parameter_capture_overrides", f"{Manager.get.__qualname__}=ids, test_func=bogus")
+    obj.calls = 0
+    Manager().get("agent-1", obj, "D" * 5000)
+    attrs = get_span_attributes(span_processor.spans[-1])
+    assert attrs == {"agent_id": "agent-1", "actor": "<CountingRepr id=obj-123>"}
+    assert obj.calls == 0
+
+    monkeypatch.setattr(telemetry_settings, "trace_parameter_capture_overrides", f"{Manager.get.__qualname__}=full")
+    Manager().get("agent-1", obj, "D" * 5000)
+    assert get_span_attributes(span_processor.spans[-1])["data"] == "D" * 5000
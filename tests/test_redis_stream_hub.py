@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from letta.server.rest_api.redis_stream_manager import RedisSSEStreamHub
+
+
+def _entry_key(entry_id: str) -> int:
+    return int(entry_id.split("-")[0])
+
+
+class _InMemoryStreams:
+    """Just enough of the Redis stream API (XADD/XRANGE/blocking XREAD) for the hub."""
+
+    def __init__(self):
+        self.streams: dict[str, list] = {}
+        self.next_id = 1
+        self.xread_calls = 0
+        self.xrange_calls = 0
+        self._changed = asyncio.Condition()
+
+    async def xadd(self, stream: str, fields: dict) -> str:
+        entry_id = f"{self.next_id}-0"
+        self.next_id += 1
+        self.streams.setdefault(stream, []).append((entry_id, {k: str(v) for k, v in fields.items()}))
+        async with self._changed:
+            self._changed.notify_all()
+        return entry_id
+
+    async def xrange(self, stream: str, start: str = "-", end: str = "+", count=None):
+        self.xrange_calls += 1
+        lower = 0 if start == "-" else _entry_key(start)
+        entries = [e for e in self.streams.get(stream, []) if _entry_key(e[0]) >= lower]
+        return entries[:count] if count else entries
+
+    def _read(self, streams: dict, count):
+        response = []
+        for stream, after in streams.items():
+            entries = [e for e in self.streams.get(stream, []) if _entry_key(e[0]) > _entry_key(after)]
+            if entries:
+                response.append([stream, entries[:count] if count else entries])
+        return response
+
+    async def xread(self, streams: dict, count=None, block=None):
+        self.xread_calls += 1
+        response = self._read(streams, count)
+        if response or not block:
+            return response
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(lambda: bool(self._read(streams, count))), timeout=block / 1000)
+            except asyncio.TimeoutError:
+                return []
+        return self._read(streams, count)
+
+
+async def _write(redis, run_id: str, seq_id: int, complete: bool = False):
+    fields = {"seq_id": seq_id, "data": f'data: {{"seq_id":null,"run_id":null,"n":{seq_id}}}\n\n'}
+    if complete:
+        fields["complete"] = "true"
+    await redis.xadd(f"sse:run:{run_id}", fields)
+
+
+async def _collect(hub, run_id, starting_after=None):
+    return [chunk async for chunk in hub.subscribe(run_id, starting_after=starting_after)]
+
+
+@pytest.mark.asyncio
+async def test_hub_fans_out_live_chunks_with_one_shared_xread():
+    redis = _InMemoryStreams()
+    hub = RedisSSEStreamHub(redis, block_ms=50)
+
+    readers = [asyncio.create_task(_collect(hub, f"run-{i % 3}")) for i in range(30)]
+    await asyncio.sleep(0.05)
+    assert hub.active_streams == 3
+
+    for seq_id in range(1, 6):
+        for run in range(3):
+            await _write(redis, f"run-{run}", seq_id, complete=seq_id == 5)
+        await asyncio.sleep(0)
+
+    results = await asyncio.wait_for(asyncio.gather(*readers), timeout=5)
+    for i, chunks in enumerate(results):
+        assert len(chunks) == 5
+        assert f'"run_id":"run-{i % 3}"' in chunks[0]
+        assert '"seq_id":1,' in chunks[0]
+
+    # one XREAD round trip serves all 30 subscribers instead of 30 pollers
+    assert redis.xread_calls < 30
+    assert redis.xrange_calls == 30
+    assert hub.active_streams == 0
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_replays_from_cursor_without_gaps_or_duplicates():
+    redis = _InMemoryStreams()
+    hub = RedisSSEStreamHub(redis, block_ms=50, batch_size=2)
+
+    early = asyncio.create_task(_collect(hub, "run"))
+    for seq_id in range(1, 5):
+        await _write(redis, "run", seq_id)
+    await asyncio.sleep(0.05)
+
+    late = asyncio.create_task(_collect(hub, "run", starting_after=2))
+    await asyncio.sleep(0.05)
+    for seq_id in range(5, 8):
+        await _write(redis, "run", seq_id, complete=seq_id == 7)
+
+    early_chunks, late_chunks = await asyncio.wait_for(asyncio.gather(early, late), timeout=5)
+    assert [c.split('"n":')[1].split("}")[0] for c in early_chunks] == [str(i) for i in range(1, 8)]
+    assert [c.split('"n":')[1].split("}")[0] for c in late_chunks] == [str(i) for i in range(3, 8)]
+
+
+@pytest.mark.asyncio
+async def test_completed_stream_is_served_from_replay_only():
+    redis = _InMemoryStreams()
+    hub = RedisSSEStreamHub(redis, block_ms=50)
+    for seq_id in range(1, 4):
+        await _write(redis, "done", seq_id, complete=seq_id == 3)
+
+    assert len(await _collect(hub, "done")) == 3
+    assert redis.xread_calls == 0
@@ -0,0 +1,107 @@
+import pytest
+
+from letta.schemas.enums import MessageRole
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message
+from letta.services.summarizer import summarizer_sliding_window
+from letta.services.summarizer.summarizer_sliding_window import (
+    count_tokens,
+    estimate_message_tokens,
+    find_sliding_window_cutoff,
+    is_valid_sliding_window_cutoff,
+)
+
+LLM_CONFIG = LLMConfig(model="gpt-4o-mini", model_endpoint_type="openai", context_window=4000)
+
+
+def _conversation(turns: int) -> list[Message]:
+    messages = [Message(role=MessageRole.system, content=[TextContent(text="You are a helpful assistant.")])]
+    for i in range(turns):
+        messages.append(Message(role=MessageRole.user, content=[TextContent(text=f"user message {i} " + "words " * 40)]))
+        messages.append(Message(role=MessageRole.assistant, content=[TextContent(text=f"assistant reply {i} " + "words " * 40)]))
+    return messages
+
+
+@pytest.fixture
+def exact_counts(monkeypatch):
+    counted = []
+
+    async def counting(actor, llm_config, messages):
+        counted.append(len(messages))
+        return await count_tokens(actor, llm_config, messages)
+
+    monkeypatch.setattr(summarizer_sliding_window, "count_tokens", counting)
+    return counted
+
+
+async def _linear_scan_cutoff(messages: list[Message], percentage: float) -> int:
+    """Earliest valid cutoff (at or past percentage + 10%) whose exact kept-window count is under the goal."""
+    goal_tokens = (1 - percentage) * LLM_CONFIG.context_window
+    first = max(i for i in range(1, round((percentage + 0.1) * len(messages)) + 1) if is_valid_sliding_window_cutoff(messages[i]))
+    for i in range(first, len(messages)):
+        if is_valid_sliding_window_cutoff(messages[i]) and await count_tokens(None, LLM_CONFIG, [messages[0], *messages[i:]]) < goal_tokens:
+            return i
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("percentage", [0.3, 0.5])
+async def test_cutoff_is_found_with_a_single_exact_count(exact_counts, percentage):
+    messages = _conversation(40)
+
+    cutoff, tokens = await find_sliding_window_cutoff(None, LLM_CONFIG, messages, percentage)
+
+    assert cutoff == await _linear_scan_cutoff(messages, percentage)
+    assert tokens == await count_tokens(None, LLM_CONFIG, [messages[0], *messages[cutoff:]])
+    assert exact_counts == [len(messages) - cutoff + 1]
+
+
+@pytest.mark.asyncio
+async def test_underestimated_window_moves_cutoff_right(monkeypatch):
+    messages = _conversation(40)
+    goal_tokens = 0.7 * LLM_CONFIG.context_window
+    counted = []
+
+    async def doubled(actor, llm_config, window):
+        counted.append(len(window))
+        return 2 * await count_tokens(actor, llm_config, window)
+
+    monkeypatch.setattr(summarizer_sliding_window, "count_tokens", doubled)
+    cutoff, tokens = await find_sliding_window_cutoff(None, LLM_CONFIG, messages, 0.3)
+
+    assert tokens < goal_tokens
+    # the assistant message before the chosen one would not have fit
+    assert 2 * await count_tokens(None, LLM_CONFIG, [messages[0], *messages[cutoff - 2 :]]) >= goal_tokens
+    assert len(counted) <= 3
+
+
+@pytest.mark.asyncio
+async def test_no_cutoff_when_nothing_fits(exact_counts):
+    messages = _conversation(10)
+    tiny = LLM_CONFIG.model_copy(update={"context_window": 50})
+
+    cutoff, _ = await find_sliding_window_cutoff(None, tiny, messages, 0.3)
+
+    assert cutoff is None
+    assert len(exact_counts) == 1
+
+
+def test_estimates_are_cached_per_message_content(monkeypatch):
+    conversions = []
+    to_openai_dicts_from_list = Message.to_openai_dicts_from_list
+
+    def converting(messages):
+        conversions.append(messages[0].id)
+        return to_openai_dicts_from_list(messages)
+
+    monkeypatch.setattr(Message, "to_openai_dicts_from_list", staticmethod(converting))
+    message = Message(role=MessageRole.user, content=[TextContent(text="hello " * 100)])
+
+    estimate = estimate_message_tokens(message)
+    assert estimate_message_tokens(message) == estimate
+    assert len(conversions) == 1
+
+    # edited in place: re-estimated
+    message.content = [TextContent(text="hello")]
+    assert estimate_message_tokens(message) < estimate
+    assert len(conversions) == 2
@@ -1,3 +1,5 @@
+from typing import Dict, List, Literal, Optional
+
 import pytest
 
 from letta.constants import MAX_FILENAME_LENGTH
@@ -7,7 +9,8 @@ from letta.schemas.file import FileMetadata
 from letta.server.rest_api.dependencies import HeaderParams, get_headers
 from letta.services.file_processor.chunker.line_chunker import LineChunker
 from letta.services.helpers.agent_manager_helper import safe_format
-from letta.utils import is_1_0_sdk_version, sanitize_filename, validate_function_response
+from letta.settings import settings
+from letta.utils import enforce_types, is_1_0_sdk_version, sanitize_filename, validate_function_response
 
 CORE_MEMORY_VAR = "My core memory is that I like to eat bananas"
 VARS_DICT = {"CORE_MEMORY": CORE_MEMORY_VAR}
@@ -835,3 +838,52 @@ def test_json_dumps_with_complex_nested_null_bytes():
     assert "\x00" not in result
     assert "Binarydatahere" in result
     assert "Messagewithnulls" in result
+
+
+class _TypedManager:
+    @enforce_types
+    def update(
+        self,
+        agent_id: str,
+        limit: Optional[int] = None,
+        tags: List[str] | None = None,
+        order: Literal["asc", "desc"] = "asc",
+        metadata: Dict[str, str] | List[str] | None = None,
+    ) -> str:
+        return agent_id
+
+
+@pytest.mark.parametrize("mode", ["strict", "sampled"])
+def test_enforce_types_checks_arguments(monkeypatch, mode):
+    monkeypatch.setattr(settings, "enforce_types_mode", mode)
+    monkeypatch.setattr(settings, "enforce_types_sample_every", 1)
+    manager = _TypedManager()
+
+    assert manager.update("agent-1", 5, ["a"], "desc", {"k": "v"}) == "agent-1"
+    assert manager.update(agent_id="agent-1", limit=None, tags=None, metadata=["x"]) == "agent-1"
+
+    with pytest.raises(ValueError, match="Argument limit does not match type"):
+        manager.update("agent-1", "5")
+    with pytest.raises(ValueError, match="Argument tags does not match type"):
+        manager.update("agent-1", tags=["a", 1])
+    with pytest.raises(ValueError, match="Argument order does not match type"):
+        manager.update("agent-1", order="sideways")
+    with pytest.raises(ValueError, match="Argument metadata does not match type"):
+        manager.update("agent-1", metadata=("x",))
+
+
+def test_enforce_types_sampled_and_off(monkeypatch):
+    manager = _TypedManager()
+
+    monkeypatch.setattr(settings, "enforce_types_mode", "off")
+    assert manager.update("agent-1", limit="not an int") == "agent-1"
+
+    monkeypatch.setattr(settings, "enforce_types_mode", "sampled")
+    monkeypatch.setattr(settings, "enforce_types_sample_every", 10)
+    failures = 0
+    for _ in range(30):
+        try:
+            manager.update("agent-1", limit="not an int")
+        except ValueError:
+            failures += 1
+    assert failures == 3
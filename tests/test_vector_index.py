@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from letta.helpers.vector_index import ARCHIVE_SCOPE, PassageVectorIndex, VectorIndexRegistry
+
+
+def _brute_force(ids, embeddings, query, k):
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    query = np.asarray(query, dtype=np.float32)
+    sims = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    order = np.argsort(1.0 - sims, kind="stable")[:k]
+    return [ids[i] for i in order]
+
+
+def test_search_matches_brute_force_cosine():
+    rng = np.random.default_rng(0)
+    ids = [f"passage-{i}" for i in range(200)]
+    embeddings = rng.normal(size=(200, 16)).astype(np.float32)
+    index = PassageVectorIndex(dim=16, initial_capacity=4)
+    index.add(ids, embeddings)
+
+    query = rng.normal(size=16)
+    results = index.search(query, k=10)
+    assert [pid for pid, _ in results] == _brute_force(ids, embeddings, query, 10)
+    distances = [d for _, d in results]
+    assert distances == sorted(distances)
+
+
+def test_short_embeddings_are_zero_padded():
+    index = PassageVectorIndex(dim=8)
+    index.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+
+    results = index.search([1.0, 0.0, 0.0, 0.0], k=1)
+    assert results[0][0] == "a"
+    assert results[0][1] == pytest.approx(0.0, abs=1e-6)
+
+    with pytest.raises(ValueError):
+        index.add(["c"], [[1.0] * 9])
+
+
+def test_remove_and_replace_keep_matrix_dense():
+    index = PassageVectorIndex(dim=2)
+    index.add(["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+    index.remove(["a", "unknown"])
+    assert len(index) == 2
+    assert "a" not in index
+    assert {pid for pid, _ in index.search([1.0, 0.0], k=None)} == {"b", "c"}
+
+    # re-adding an existing id replaces its embedding in place
+    index.add(["b"], [[1.0, 0.0]])
+    assert len(index) == 2
+    assert index.search([1.0, 0.0], k=1)[0][0] == "b"
+
+
+def test_search_restricted_to_candidates():
+    index = PassageVectorIndex(dim=2)
+    index.add(["a", "b", "c"], [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+
+    results = index.search([1.0, 0.0], k=5, candidate_ids=["c", "b", "missing"])
+    assert [pid for pid, _ in results] == ["b", "c"]
+    assert index.search([1.0, 0.0], k=5, candidate_ids=[]) == []
+
+
+@pytest.mark.asyncio
+async def test_registry_builds_lazily_and_evicts_lru():
+    registry = VectorIndexRegistry(max_indexes=2, dim=2)
+    loads = []
+
+    def loader_for(scope_id):
+        async def _load():
+            loads.append(scope_id)
+            return [(f"{scope_id}-p1", [1.0, 0.0]), (f"{scope_id}-p2", None)]
+
+        return _load
+
+    # incremental updates are ignored until the index has been built
+    registry.add_passages(ARCHIVE_SCOPE, "archive-1", ["early"], [[0.0, 1.0]])
+
+    index = await registry.get_or_build(ARCHIVE_SCOPE, "archive-1", loader_for("archive-1"))
+    assert len(index) == 1  # rows without embeddings are skipped
+    assert await registry.get_or_build(ARCHIVE_SCOPE, "archive-1", loader_for("archive-1")) is index
+    assert loads == ["archive-1"]
+
+    registry.add_passages(ARCHIVE_SCOPE, "archive-1", ["archive-1-p3"], [[0.0, 1.0]])
+    registry.remove_passages(ARCHIVE_SCOPE, "archive-1", ["archive-1-p1"])
+    assert [pid for pid, _ in index.search([0.0, 1.0], k=None)] == ["archive-1-p3"]
+
+    await registry.get_or_build(ARCHIVE_SCOPE, "archive-2", loader_for("archive-2"))
+    await registry.get_or_build(ARCHIVE_SCOPE, "archive-3", loader_for("archive-3"))
+    assert registry.get(ARCHIVE_SCOPE, "archive-1") is None
+
+    registry.invalidate(ARCHIVE_SCOPE, "archive-3")
+    assert registry.get(ARCHIVE_SCOPE, "archive-3") is None